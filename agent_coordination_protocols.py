@@ -6,14 +6,19 @@ coordination, and collaborative decision-making in the Agent Hive.
 """
 
 import asyncio
+import json
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple, Set
+from typing import Callable, Dict, List, Mapping, Optional, Any, Tuple, Set
 from dataclasses import dataclass, field
 from enum import Enum
 import uuid
+from types import MappingProxyType
+from bisect import bisect_right, insort
 from collections import defaultdict, deque
 
+from agent_message_transport import InProcessTransport, MessageTransport
+
 logger = logging.getLogger(__name__)
 
 
@@ -85,6 +90,32 @@ class AgentMessage:
             'metadata': self.metadata
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AgentMessage':
+        """Create message from dictionary."""
+        return cls(
+            message_id=data['message_id'],
+            sender_id=data['sender_id'],
+            recipient_id=data['recipient_id'],
+            message_type=MessageType(data['message_type']),
+            priority=Priority(data['priority']),
+            content=data['content'],
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            expires_at=datetime.fromisoformat(data['expires_at']) if data['expires_at'] else None,
+            correlation_id=data['correlation_id'],
+            requires_response=data['requires_response'],
+            metadata=data['metadata']
+        )
+
+    def to_bytes(self) -> bytes:
+        """Encode message for a transport."""
+        return json.dumps(self.to_dict(), separators=(',', ':'), default=str).encode()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'AgentMessage':
+        """Decode message received from a transport."""
+        return cls.from_dict(json.loads(payload))
+
 
 @dataclass
 class CoordinationSession:
@@ -179,6 +210,111 @@ class CollaborationProposal:
         }
 
 
+class CapabilityIndex:
+    """Known agent capabilities indexed by name and ranked by performance.
+
+    Each capability name maps to two sorted lists of ``(-score, agent_id,
+    capability_id)`` keys, one ranked by performance and one by availability,
+    so both cutoffs are found by bisection and only the smaller qualifying
+    prefix is scanned. Capabilities must be (re-)added through ``add`` when
+    their scores change.
+    """
+
+    _KEY_MAX = chr(0x10FFFF)
+
+    def __init__(self):
+        self.by_agent: Dict[str, Dict[str, AgentCapability]] = {}
+        self._ranked: Dict[str, List[Tuple[float, str, str]]] = defaultdict(list)
+        self._available: Dict[str, List[Tuple[float, str, str]]] = defaultdict(list)
+        self._keys: Dict[Tuple[str, str], Tuple[str, Tuple[float, str, str], Tuple[float, str, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, agent_id: str, capability: AgentCapability) -> None:
+        """Index a capability, replacing any earlier version with the same ID."""
+        self.remove(agent_id, capability.capability_id)
+
+        key = (-capability.performance_score, agent_id, capability.capability_id)
+        availability_key = (-capability.availability, agent_id, capability.capability_id)
+        insort(self._ranked[capability.name], key)
+        insort(self._available[capability.name], availability_key)
+        self._keys[(agent_id, capability.capability_id)] = (capability.name, key, availability_key)
+        self.by_agent.setdefault(agent_id, {})[capability.capability_id] = capability
+
+    def remove(self, agent_id: str, capability_id: str) -> None:
+        """Drop a capability from the index."""
+        entry = self._keys.pop((agent_id, capability_id), None)
+        if entry is None:
+            return
+
+        name, key, availability_key = entry
+        for lists, list_key in ((self._ranked, key), (self._available, availability_key)):
+            keys = lists[name]
+            del keys[bisect_right(keys, list_key) - 1]
+            if not keys:
+                del lists[name]
+        del self.by_agent[agent_id][capability_id]
+
+    def remove_agent(self, agent_id: str) -> None:
+        """Drop every capability of an agent."""
+        for capability_id in list(self.by_agent.get(agent_id, {})):
+            self.remove(agent_id, capability_id)
+        self.by_agent.pop(agent_id, None)
+
+    def rebuild(self, agent_capabilities: Dict[str, Dict[str, AgentCapability]]) -> None:
+        """Replace the index contents."""
+        self.by_agent = {}
+        self._ranked.clear()
+        self._available.clear()
+        self._keys.clear()
+        for agent_id, capabilities in agent_capabilities.items():
+            self.by_agent[agent_id] = {}
+            for capability in capabilities.values():
+                self.add(agent_id, capability)
+
+    def view(self) -> Mapping[str, Mapping[str, AgentCapability]]:
+        """Read-only view of the indexed capabilities, keyed by agent then capability ID."""
+        return MappingProxyType({agent_id: MappingProxyType(capabilities)
+                                 for agent_id, capabilities in self.by_agent.items()})
+
+    def top_k(
+        self,
+        capability_name: str,
+        k: Optional[int] = None,
+        min_performance: float = 0.0,
+        min_availability: float = 0.0
+    ) -> List[Tuple[str, AgentCapability]]:
+        """Return up to ``k`` (agent_id, capability) pairs, best performers first."""
+        ranked = self._ranked.get(capability_name)
+        if not ranked:
+            return []
+
+        # Keys sort by negated score, so qualifying entries form a prefix of each list
+        end = bisect_right(ranked, (-min_performance, self._KEY_MAX, self._KEY_MAX))
+        available = self._available[capability_name]
+        available_end = bisect_right(available, (-min_availability, self._KEY_MAX, self._KEY_MAX))
+
+        if available_end < end:
+            # Fewer agents are available enough than perform well enough
+            keys = sorted(key for key in (self._keys[(agent_id, capability_id)][1]
+                                          for _, agent_id, capability_id in available[:available_end])
+                          if key[0] <= -min_performance)
+            if k is not None:
+                keys = keys[:k]
+            return [(agent_id, self.by_agent[agent_id][capability_id]) for _, agent_id, capability_id in keys]
+
+        matches = []
+        for position in range(end):
+            if k is not None and len(matches) >= k:
+                break
+            _, agent_id, capability_id = ranked[position]
+            capability = self.by_agent[agent_id][capability_id]
+            if capability.availability >= min_availability:
+                matches.append((agent_id, capability))
+        return matches
+
+
 class AgentCoordinationProtocols:
     """
     Advanced agent coordination protocols for intelligent collaboration.
@@ -205,7 +341,7 @@ class AgentCoordinationProtocols:
 
         # Peer management
         self.known_agents: Dict[str, Dict[str, Any]] = {}
-        self.agent_capabilities: Dict[str, Dict[str, AgentCapability]] = {}
+        self.capability_index = CapabilityIndex()
         self.trust_scores: Dict[str, float] = {}
 
         # Performance tracking
@@ -221,11 +357,28 @@ class AgentCoordinationProtocols:
         # Initialize message handlers
         self._initialize_message_handlers()
 
-        # Communication channels
-        self.communication_channels: Dict[str, asyncio.Queue] = {}
+        # Message transport; sends are buffered per recipient and flushed in batches
+        self.transport: MessageTransport = self.config.get('transport') or InProcessTransport()
+        self.max_batch_size = self.config.get('max_batch_size', 512)
+        self._transport_started = False
+        self._outbox: Dict[str, List[bytes]] = defaultdict(list)
+        self._outbox_size = 0
+        self._flush_task: Optional[asyncio.Task] = None
 
         self.logger.info(f"Agent coordination protocols initialized for {agent_id}")
 
+    @property
+    def agent_capabilities(self) -> Mapping[str, Mapping[str, AgentCapability]]:
+        """Read-only view of other agents' capabilities, keyed by agent ID then capability ID.
+
+        Changes go through ``capability_index`` or by assigning a new mapping.
+        """
+        return self.capability_index.view()
+
+    @agent_capabilities.setter
+    def agent_capabilities(self, value: Dict[str, Dict[str, AgentCapability]]) -> None:
+        self.capability_index.rebuild(value)
+
     def _initialize_message_handlers(self) -> None:
         """Initialize message handlers for different message types."""
         self.message_handlers = {
@@ -251,7 +404,8 @@ class AgentCoordinationProtocols:
         content: Dict[str, Any],
         priority: Priority = Priority.MEDIUM,
         requires_response: bool = False,
-        timeout: float = 30.0
+        timeout: float = 30.0,
+        correlation_id: Optional[str] = None
     ) -> Optional[AgentMessage]:
         """
         Send a message to another agent.
@@ -263,6 +417,7 @@ class AgentCoordinationProtocols:
             priority: Message priority
             requires_response: Whether a response is required
             timeout: Timeout for response (if required)
+            correlation_id: ID of the request this message answers
 
         Returns:
             Response message if requires_response is True, None otherwise
@@ -278,9 +433,15 @@ class AgentCoordinationProtocols:
             priority=priority,
             content=content,
             requires_response=requires_response,
+            correlation_id=correlation_id,
             expires_at=datetime.now() + timedelta(seconds=timeout) if requires_response else None
         )
 
+        # Register for the response before the message can be answered
+        if requires_response:
+            future = asyncio.get_running_loop().create_future()
+            self.pending_responses[message_id] = future
+
         # Send message
         await self._deliver_message(message)
 
@@ -289,9 +450,6 @@ class AgentCoordinationProtocols:
 
         # Wait for response if required
         if requires_response:
-            future = asyncio.Future()
-            self.pending_responses[message_id] = future
-
             try:
                 response = await asyncio.wait_for(future, timeout=timeout)
                 return response
@@ -323,13 +481,94 @@ class AgentCoordinationProtocols:
             exclude_agents: Agents to exclude from broadcast
         """
         exclude_agents = exclude_agents or set()
+        recipients = [
+            agent_id for agent_id in self.known_agents
+            if agent_id not in exclude_agents and agent_id != self.agent_id
+        ]
 
-        # Send to all known agents except excluded ones
-        for agent_id in self.known_agents:
-            if agent_id not in exclude_agents and agent_id != self.agent_id:
-                await self.send_message(
-                    agent_id, message_type, content, priority, requires_response=False
-                )
+        # Queue every copy before yielding so they leave in one flush
+        await asyncio.gather(*(
+            self._deliver_message(AgentMessage(
+                message_id=str(uuid.uuid4()),
+                sender_id=self.agent_id,
+                recipient_id=agent_id,
+                message_type=message_type,
+                priority=priority,
+                content=content
+            ))
+            for agent_id in recipients
+        ))
+        self.coordination_metrics['messages_sent'] += len(recipients)
+
+    async def _scatter_gather(
+        self,
+        participants: List[str],
+        message_type: MessageType,
+        content: Dict[str, Any],
+        timeout: float = 30.0,
+        quorum: Optional[int] = None,
+        is_success: Optional[Callable[[AgentMessage], bool]] = None
+    ) -> Dict[str, AgentMessage]:
+        """
+        Send a request to every participant at once and gather the responses.
+
+        Requests leave together and responses are collected as they arrive.
+        Gathering stops when every participant has answered, when ``quorum``
+        responses satisfy ``is_success`` (any response counts if it is None),
+        or when ``timeout`` expires for the round as a whole.
+
+        Returns:
+            Dict mapping participant ID to its response message
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        expires_at = datetime.now() + timedelta(seconds=timeout)
+
+        waiting: Dict[asyncio.Future, Tuple[str, str]] = {}
+        for participant_id in participants:
+            message = AgentMessage(
+                message_id=str(uuid.uuid4()),
+                sender_id=self.agent_id,
+                recipient_id=participant_id,
+                message_type=message_type,
+                priority=Priority.HIGH,
+                content=content,
+                requires_response=True,
+                expires_at=expires_at
+            )
+            future = loop.create_future()
+            self.pending_responses[message.message_id] = future
+            waiting[future] = (participant_id, message.message_id)
+            await self._deliver_message(message)
+        self.coordination_metrics['messages_sent'] += len(waiting)
+
+        responses: Dict[str, AgentMessage] = {}
+        successes = 0
+        try:
+            while waiting and (quorum is None or successes < quorum):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(waiting, timeout=remaining,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    participant_id, _ = waiting.pop(future)
+                    if future.cancelled() or future.exception() is not None:
+                        continue
+                    response = future.result()
+                    responses[participant_id] = response
+                    if is_success is None or is_success(response):
+                        successes += 1
+        finally:
+            # Stragglers past the deadline or quorum are no longer awaited
+            for future, (participant_id, message_id) in waiting.items():
+                self.pending_responses.pop(message_id, None)
+                future.cancel()
+            if waiting and quorum is None:
+                self.logger.warning(f"{len(waiting)} of {len(participants)} participants did not "
+                                    f"respond within {timeout}s")
+
+        return responses
 
     async def initiate_coordination_session(
         self,
@@ -504,7 +743,8 @@ class AgentCoordinationProtocols:
         self,
         capability_name: str,
         min_performance: float = 0.5,
-        min_availability: float = 0.5
+        min_availability: float = 0.5,
+        limit: Optional[int] = None
     ) -> List[Tuple[str, AgentCapability]]:
         """
         Find agents with a specific capability.
@@ -513,23 +753,17 @@ class AgentCoordinationProtocols:
             capability_name: Name of the capability to search for
             min_performance: Minimum performance score
             min_availability: Minimum availability
+            limit: Return at most this many agents (default: all matches)
 
         Returns:
-            List of (agent_id, capability) tuples
+            List of (agent_id, capability) tuples, best performance first
         """
-        matching_agents = []
-
-        for agent_id, capabilities in self.agent_capabilities.items():
-            for capability in capabilities.values():
-                if (capability.name == capability_name and
-                    capability.performance_score >= min_performance and
-                    capability.availability >= min_availability):
-                    matching_agents.append((agent_id, capability))
-
-        # Sort by performance score (descending)
-        matching_agents.sort(key=lambda x: x[1].performance_score, reverse=True)
-
-        return matching_agents
+        return self.capability_index.top_k(
+            capability_name,
+            k=limit,
+            min_performance=min_performance,
+            min_availability=min_availability
+        )
 
     async def negotiate_resource_allocation(
         self,
@@ -586,15 +820,21 @@ class AgentCoordinationProtocols:
         self,
         session_id: str,
         decision_options: List[Dict[str, Any]],
-        voting_method: str = "majority"
+        voting_method: str = "majority",
+        timeout: float = 30.0,
+        quorum: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Conduct a vote on a decision within a coordination session.
 
+        Voting requests go to all participants concurrently.
+
         Args:
             session_id: ID of the coordination session
             decision_options: List of options to vote on
             voting_method: Voting method ("majority", "consensus", "weighted")
+            timeout: Deadline for the whole vote in seconds
+            quorum: Stop collecting once this many votes are in (default: wait for all)
 
         Returns:
             Dict containing voting results and chosen option
@@ -612,18 +852,15 @@ class AgentCoordinationProtocols:
             'deadline': (datetime.now() + timedelta(minutes=30)).isoformat()
         }
 
-        votes = []
-        for participant_id in session.participants:
-            if participant_id != self.agent_id:
-                response = await self.send_message(
-                    participant_id,
-                    MessageType.COORDINATION_REQUEST,
-                    voting_request,
-                    priority=Priority.HIGH,
-                    requires_response=True
-                )
-                if response and response.content.get('vote'):
-                    votes.append(response.content['vote'])
+        responses = await self._scatter_gather(
+            [p for p in session.participants if p != self.agent_id],
+            MessageType.COORDINATION_REQUEST,
+            voting_request,
+            timeout=timeout,
+            quorum=quorum,
+            is_success=lambda response: bool(response.content.get('vote'))
+        )
+        votes = [r.content['vote'] for r in responses.values() if r.content.get('vote')]
 
         # Process votes
         voting_results = await self._process_votes(decision_options, votes, voting_method)
@@ -643,15 +880,24 @@ class AgentCoordinationProtocols:
         self,
         session_id: str,
         proposal: Dict[str, Any],
-        max_rounds: int = 5
+        max_rounds: int = 5,
+        round_timeout: float = 30.0,
+        quorum: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Reach consensus on a decision through iterative discussion.
 
+        Each round asks all participants concurrently and is bounded by
+        ``round_timeout`` as a whole, so its latency is that of the slowest
+        participant needed rather than the sum of all of them.
+
         Args:
             session_id: ID of the coordination session
             proposal: Initial proposal
             max_rounds: Maximum discussion rounds
+            round_timeout: Deadline for each round in seconds
+            quorum: Number of supporting participants that settles a round early;
+                by default every participant that responds must support
 
         Returns:
             Dict containing consensus result
@@ -671,22 +917,19 @@ class AgentCoordinationProtocols:
                 'max_rounds': max_rounds
             }
 
-            feedback = []
-            for participant_id in session.participants:
-                if participant_id != self.agent_id:
-                    response = await self.send_message(
-                        participant_id,
-                        MessageType.COORDINATION_REQUEST,
-                        consensus_request,
-                        priority=Priority.HIGH,
-                        requires_response=True
-                    )
-                    if response:
-                        feedback.append(response.content)
+            responses = await self._scatter_gather(
+                [p for p in session.participants if p != self.agent_id],
+                MessageType.COORDINATION_REQUEST,
+                consensus_request,
+                timeout=round_timeout,
+                quorum=quorum,
+                is_success=lambda response: response.content.get('support', False)
+            )
+            feedback = [response.content for response in responses.values()]
 
             # Process feedback and update proposal
             consensus_result = await self._process_consensus_feedback(
-                current_proposal, feedback, round_num + 1
+                current_proposal, feedback, round_num + 1, required_support=quorum
             )
 
             if consensus_result['consensus_reached']:
@@ -711,16 +954,39 @@ class AgentCoordinationProtocols:
             'reason': 'Maximum rounds exceeded'
         }
 
-    async def process_messages(self) -> None:
-        """Process incoming messages from the message queue."""
+    async def process_messages(self, timeout: float = 0.0) -> None:
+        """
+        Process incoming messages.
+
+        Messages waiting on the transport are pulled into the message queue,
+        then handled in batches. Messages from one sender are handled in
+        order; different senders are handled concurrently.
+
+        Args:
+            timeout: How long to wait for messages if none are waiting
+        """
+        await self.receive_messages(timeout=timeout)
+
         while self.message_queue:
-            message = self.message_queue.popleft()
+            count = min(self.max_batch_size, len(self.message_queue))
+            by_sender: Dict[str, List[AgentMessage]] = defaultdict(list)
+            for _ in range(count):
+                message = self.message_queue.popleft()
+                by_sender[message.sender_id].append(message)
 
             # Update metrics
-            self.coordination_metrics['messages_received'] += 1
+            self.coordination_metrics['messages_received'] += count
+
+            await asyncio.gather(*(
+                self._handle_messages(messages) for messages in by_sender.values()
+            ))
 
+    async def _handle_messages(self, messages: List[AgentMessage]) -> None:
+        """Handle messages from one sender in order."""
+        now = datetime.now()
+        for message in messages:
             # Check if message has expired
-            if message.expires_at and datetime.now() > message.expires_at:
+            if message.expires_at and now > message.expires_at:
                 self.logger.warning(f"Message {message.message_id} expired")
                 continue
 
@@ -734,16 +1000,62 @@ class AgentCoordinationProtocols:
             else:
                 self.logger.warning(f"No handler for message type {message.message_type}")
 
-    async def _deliver_message(self, message: AgentMessage) -> None:
-        """Deliver a message to the recipient agent."""
-        # In a real implementation, this would use the actual communication infrastructure
-        # For now, we'll simulate by adding to a communication channel
+    async def _ensure_transport(self) -> None:
+        if not self._transport_started:
+            self._transport_started = True
+            await self.transport.start(self.agent_id)
 
-        recipient_id = message.recipient_id
-        if recipient_id not in self.communication_channels:
-            self.communication_channels[recipient_id] = asyncio.Queue()
+    async def receive_messages(self, timeout: float = 0.0) -> int:
+        """
+        Move messages waiting on the transport into the message queue.
 
-        await self.communication_channels[recipient_id].put(message)
+        Returns:
+            Number of messages received
+        """
+        await self._ensure_transport()
+        payloads = await self.transport.receive(max_messages=self.max_batch_size * 8, timeout=timeout)
+        for payload in payloads:
+            try:
+                self.message_queue.append(AgentMessage.from_bytes(payload))
+            except (ValueError, KeyError) as e:
+                self.logger.error(f"Dropping undecodable message: {e}")
+        return len(payloads)
+
+    async def _deliver_message(self, message: AgentMessage) -> None:
+        """Queue a message for the recipient; queued messages are sent in batches."""
+        self._outbox[message.recipient_id].append(message.to_bytes())
+        self._outbox_size += 1
+
+        if self._outbox_size >= self.max_batch_size:
+            await self.flush_messages()
+        elif self._flush_task is None or self._flush_task.done():
+            # Everything queued before the loop next runs goes out together
+            self._flush_task = asyncio.ensure_future(self.flush_messages())
+
+    async def flush_messages(self) -> None:
+        """Send all queued messages, one batch per recipient."""
+        if not self._outbox:
+            return
+
+        await self._ensure_transport()
+        outbox, self._outbox = self._outbox, defaultdict(list)
+        self._outbox_size = 0
+
+        results = await asyncio.gather(*(
+            self.transport.send_batch(recipient_id, payloads)
+            for recipient_id, payloads in outbox.items()
+        ), return_exceptions=True)
+
+        for recipient_id, result in zip(outbox, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to deliver {len(outbox[recipient_id])} messages "
+                                  f"to {recipient_id}: {result}")
+
+    async def close(self) -> None:
+        """Flush queued messages and close the transport."""
+        await self.flush_messages()
+        if self._transport_started:
+            await self.transport.close()
 
     async def _handle_task_request(self, message: AgentMessage) -> None:
         """Handle incoming task request."""
@@ -765,7 +1077,8 @@ class AgentCoordinationProtocols:
             message.sender_id,
             MessageType.TASK_RESPONSE,
             response_content,
-            priority=Priority.HIGH
+            priority=Priority.HIGH,
+            correlation_id=message.message_id
         )
 
     async def _handle_task_response(self, message: AgentMessage) -> None:
@@ -789,7 +1102,8 @@ class AgentCoordinationProtocols:
                 message.sender_id,
                 MessageType.COORDINATION_RESPONSE,
                 response,
-                priority=Priority.HIGH
+                priority=Priority.HIGH,
+                correlation_id=message.message_id
             )
 
     async def _handle_coordination_response(self, message: AgentMessage) -> None:
@@ -816,10 +1130,6 @@ class AgentCoordinationProtocols:
         agent_id = message.sender_id
         capability_info = message.content.get('capability', {})
 
-        # Store agent capability
-        if agent_id not in self.agent_capabilities:
-            self.agent_capabilities[agent_id] = {}
-
         capability = AgentCapability(
             capability_id=capability_info['capability_id'],
             name=capability_info['name'],
@@ -831,7 +1141,8 @@ class AgentCoordinationProtocols:
             constraints=capability_info.get('constraints', {})
         )
 
-        self.agent_capabilities[agent_id][capability.capability_id] = capability
+        # Store agent capability; re-announcements replace the indexed entry
+        self.capability_index.add(agent_id, capability)
 
         self.logger.info(f"Learned capability {capability.name} from agent {agent_id}")
 
@@ -853,7 +1164,8 @@ class AgentCoordinationProtocols:
             message.sender_id,
             MessageType.RESOURCE_RESPONSE,
             response_content,
-            priority=Priority.HIGH
+            priority=Priority.HIGH,
+            correlation_id=message.message_id
         )
 
     async def _handle_resource_response(self, message: AgentMessage) -> None:
@@ -1035,13 +1347,16 @@ class AgentCoordinationProtocols:
         self,
         proposal: Dict[str, Any],
         feedback: List[Dict[str, Any]],
-        round_num: int
+        round_num: int,
+        required_support: Optional[int] = None
     ) -> Dict[str, Any]:
         """Process consensus feedback."""
-        # Simple consensus - check if all feedback is positive
+        # Consensus when the required support is reached; by default all feedback must be positive
         positive_feedback = sum(1 for f in feedback if f.get('support', False))
+        if required_support is None:
+            required_support = len(feedback)
 
-        if positive_feedback == len(feedback):
+        if positive_feedback >= required_support:
             return {
                 'consensus_reached': True,
                 'proposal': proposal,
@@ -1087,6 +1402,8 @@ class AgentCoordinationProtocols:
             'registered_capabilities': len(self.capabilities),
             'pending_responses': len(self.pending_responses),
             'collaboration_proposals': len(self.collaboration_proposals),
+            'queued_messages': self._outbox_size,
+            'transport': {'type': type(self.transport).__name__, **self.transport.stats},
             'metrics': self.coordination_metrics,
             'trust_scores': self.trust_scores
         }
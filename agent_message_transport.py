@@ -0,0 +1,341 @@
+"""
+Agent Message Transport - Pluggable delivery for agent coordination messages
+
+This module provides the transports used by AgentCoordinationProtocols to
+move encoded messages between agents. Transports are payload-agnostic: they
+carry batches of opaque byte strings, framed with a 4-byte big-endian
+length prefix when they cross a process boundary.
+
+Backends:
+- InProcessTransport: agents sharing one event loop
+- UnixSocketTransport: agents in separate processes on one host
+- RedisStreamsTransport: agents on any host sharing a Redis server
+"""
+
+import asyncio
+import logging
+import os
+import struct
+import weakref
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FRAME_HEADER = struct.Struct(">I")
+
+
+def pack_frames(payloads: List[bytes]) -> bytes:
+    """Concatenate payloads as length-prefixed frames."""
+    parts = []
+    for payload in payloads:
+        parts.append(FRAME_HEADER.pack(len(payload)))
+        parts.append(payload)
+    return b"".join(parts)
+
+
+def split_frames(data: bytes) -> Tuple[List[bytes], int]:
+    """Split complete frames off the front of ``data``.
+
+    Returns the payloads and the number of bytes consumed; a trailing
+    partial frame is left for the caller to complete.
+    """
+    payloads = []
+    offset = 0
+    end = len(data)
+    while end - offset >= FRAME_HEADER.size:
+        (length,) = FRAME_HEADER.unpack_from(data, offset)
+        if end - offset - FRAME_HEADER.size < length:
+            break
+        offset += FRAME_HEADER.size
+        payloads.append(bytes(data[offset:offset + length]))
+        offset += length
+    return payloads, offset
+
+
+def unpack_frames(data: bytes) -> List[bytes]:
+    """Split a buffer produced by pack_frames back into payloads."""
+    payloads, consumed = split_frames(data)
+    if consumed != len(data):
+        raise ValueError("Truncated message frame")
+    return payloads
+
+
+class MessageTransport(ABC):
+    """Delivers batches of encoded messages between agents.
+
+    A transport instance is bound to one agent by ``start`` and receives
+    that agent's messages; ``send_batch`` may target any agent.
+    """
+
+    def __init__(self):
+        self.agent_id: Optional[str] = None
+        self.stats = {
+            'batches_sent': 0,
+            'messages_sent': 0,
+            'messages_received': 0
+        }
+
+    async def start(self, agent_id: str) -> None:
+        """Bind the transport to ``agent_id`` and begin receiving."""
+        self.agent_id = agent_id
+
+    @abstractmethod
+    async def send_batch(self, recipient_id: str, payloads: List[bytes]) -> None:
+        """Deliver ``payloads`` to ``recipient_id`` in one operation."""
+
+    @abstractmethod
+    async def receive(self, max_messages: int = 1000, timeout: float = 0.0) -> List[bytes]:
+        """Return up to ``max_messages`` payloads, waiting up to ``timeout`` for the first."""
+
+    async def close(self) -> None:
+        """Release transport resources."""
+
+    def _record_sent(self, count: int) -> None:
+        self.stats['batches_sent'] += 1
+        self.stats['messages_sent'] += count
+
+
+class _Inbox:
+    """Received payloads for one agent plus a wakeup event."""
+
+    def __init__(self):
+        self.payloads: Deque[bytes] = deque()
+        self.ready = asyncio.Event()
+
+    def extend(self, payloads: List[bytes]) -> None:
+        self.payloads.extend(payloads)
+        self.ready.set()
+
+    async def take(self, max_messages: int, timeout: float) -> List[bytes]:
+        if not self.payloads and timeout > 0:
+            self.ready.clear()
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+
+        count = min(max_messages, len(self.payloads))
+        batch = [self.payloads.popleft() for _ in range(count)]
+        if not self.payloads:
+            self.ready.clear()
+        return batch
+
+
+class InProcessHub:
+    """Shared inboxes for agents running in the same process."""
+
+    def __init__(self):
+        self.inboxes: Dict[str, _Inbox] = defaultdict(_Inbox)
+
+
+_default_hubs: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, InProcessHub]" = weakref.WeakKeyDictionary()
+
+
+def default_hub() -> InProcessHub:
+    """Return the shared hub for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    hub = _default_hubs.get(loop)
+    if hub is None:
+        hub = _default_hubs[loop] = InProcessHub()
+    return hub
+
+
+class InProcessTransport(MessageTransport):
+    """Transport between agents in one process; batches are handed over directly.
+
+    Without an explicit ``hub`` the transport joins the default hub of the
+    event loop it first runs on, so inboxes never outlive their loop.
+    """
+
+    def __init__(self, hub: Optional[InProcessHub] = None):
+        super().__init__()
+        self._hub = hub
+
+    @property
+    def hub(self) -> InProcessHub:
+        if self._hub is None:
+            self._hub = default_hub()
+        return self._hub
+
+    async def send_batch(self, recipient_id: str, payloads: List[bytes]) -> None:
+        self.hub.inboxes[recipient_id].extend(payloads)
+        self._record_sent(len(payloads))
+
+    async def receive(self, max_messages: int = 1000, timeout: float = 0.0) -> List[bytes]:
+        batch = await self.hub.inboxes[self.agent_id].take(max_messages, timeout)
+        self.stats['messages_received'] += len(batch)
+        return batch
+
+
+class UnixSocketTransport(MessageTransport):
+    """Transport over Unix-domain sockets, one listening socket per agent.
+
+    Each agent listens on ``<socket_dir>/<agent_id>.sock``. Senders keep one
+    connection per recipient and write a whole batch of frames per call.
+    """
+
+    def __init__(self, socket_dir: str, read_size: int = 65536):
+        super().__init__()
+        self.socket_dir = socket_dir
+        self.read_size = read_size
+        self.inbox = _Inbox()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.writers: Dict[str, asyncio.StreamWriter] = {}
+        self.connect_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def socket_path(self, agent_id: str) -> str:
+        return os.path.join(self.socket_dir, f"{agent_id}.sock")
+
+    async def start(self, agent_id: str) -> None:
+        await super().start(agent_id)
+        os.makedirs(self.socket_dir, exist_ok=True)
+        path = self.socket_path(agent_id)
+        if os.path.exists(path):
+            os.unlink(path)
+        self.server = await asyncio.start_unix_server(self._handle_connection, path=path)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        buffer = bytearray()
+        try:
+            while True:
+                chunk = await reader.read(self.read_size)
+                if not chunk:
+                    break
+                buffer += chunk
+
+                # One inbox wakeup per read, however many frames it completed
+                payloads, consumed = split_frames(buffer)
+                if payloads:
+                    del buffer[:consumed]
+                    self.inbox.extend(payloads)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _get_writer(self, recipient_id: str) -> asyncio.StreamWriter:
+        writer = self.writers.get(recipient_id)
+        if writer is not None and not writer.is_closing():
+            return writer
+
+        async with self.connect_locks[recipient_id]:
+            writer = self.writers.get(recipient_id)
+            if writer is None or writer.is_closing():
+                _, writer = await asyncio.open_unix_connection(self.socket_path(recipient_id))
+                self.writers[recipient_id] = writer
+            return writer
+
+    async def send_batch(self, recipient_id: str, payloads: List[bytes]) -> None:
+        data = pack_frames(payloads)
+        for attempt in range(2):
+            writer = await self._get_writer(recipient_id)
+            try:
+                writer.write(data)
+                await writer.drain()
+                break
+            except ConnectionError:
+                # Recipient restarted; reconnect once
+                self.writers.pop(recipient_id, None)
+                if attempt:
+                    raise
+        self._record_sent(len(payloads))
+
+    async def receive(self, max_messages: int = 1000, timeout: float = 0.0) -> List[bytes]:
+        batch = await self.inbox.take(max_messages, timeout)
+        self.stats['messages_received'] += len(batch)
+        return batch
+
+    async def close(self) -> None:
+        for writer in self.writers.values():
+            writer.close()
+        self.writers.clear()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+            path = self.socket_path(self.agent_id)
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+class RedisStreamsTransport(MessageTransport):
+    """Transport over Redis streams, one inbox stream per agent.
+
+    Each batch becomes a single XADD entry whose ``frames`` field holds the
+    packed payloads; receivers XREAD their own stream. ``client`` is any
+    object with the ``xadd``/``xread``/``xrevrange`` coroutine signatures of
+    ``redis.asyncio.Redis``.
+
+    With the default ``start_id`` of ``"$"`` a receiver starts after the
+    newest entry present when it starts, rather than replaying its whole
+    inbox; pass ``"0-0"`` or a saved ``last_id`` to resume from a point.
+    """
+
+    def __init__(self, client: Any, stream_prefix: str = "agent-hive:inbox:",
+                 maxlen: int = 100000, start_id: str = "$"):
+        super().__init__()
+        self.client = client
+        self.stream_prefix = stream_prefix
+        self.maxlen = maxlen
+        self.last_id = start_id
+        self.pending: Deque[bytes] = deque()
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisStreamsTransport":
+        """Create a transport backed by ``redis.asyncio``."""
+        import redis.asyncio as redis_asyncio
+        return cls(redis_asyncio.from_url(url), **kwargs)
+
+    def stream_name(self, agent_id: str) -> str:
+        return f"{self.stream_prefix}{agent_id}"
+
+    async def start(self, agent_id: str) -> None:
+        await super().start(agent_id)
+        if self.last_id == "$":
+            # Pin "$" to a concrete ID so entries added between reads are not skipped
+            newest = await self.client.xrevrange(self.stream_name(agent_id), "+", "-", count=1)
+            if newest:
+                entry_id = newest[0][0]
+                self.last_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+            else:
+                self.last_id = "0-0"
+
+    async def send_batch(self, recipient_id: str, payloads: List[bytes]) -> None:
+        await self.client.xadd(
+            self.stream_name(recipient_id),
+            {b"frames": pack_frames(payloads)},
+            maxlen=self.maxlen,
+            approximate=True
+        )
+        self._record_sent(len(payloads))
+
+    async def receive(self, max_messages: int = 1000, timeout: float = 0.0) -> List[bytes]:
+        # Entries carry whole batches, so a read may yield more payloads than
+        # asked for; the surplus waits in ``pending`` for the next call.
+        count = min(max_messages, len(self.pending))
+        payloads = [self.pending.popleft() for _ in range(count)]
+
+        if len(payloads) < max_messages:
+            stream = self.stream_name(self.agent_id)
+            block = int(timeout * 1000) if timeout > 0 and not payloads else None
+            response = await self.client.xread({stream: self.last_id},
+                                               count=max_messages - len(payloads), block=block)
+            for _, entries in response or []:
+                for entry_id, fields in entries:
+                    self.last_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+                    self.pending.extend(unpack_frames(fields[b"frames"]))
+
+            count = min(max_messages - len(payloads), len(self.pending))
+            payloads.extend(self.pending.popleft() for _ in range(count))
+
+        self.stats['messages_received'] += len(payloads)
+        return payloads
+
+    async def close(self) -> None:
+        close = getattr(self.client, "aclose", None) or getattr(self.client, "close", None)
+        if close is not None:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
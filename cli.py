@@ -13,88 +13,128 @@ import sys
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
-
-from advanced_orchestration.multi_agent_coordinator import MultiAgentCoordinator
-from advanced_orchestration.resource_manager import ResourceManager
-from advanced_orchestration.scaling_manager import ScalingManager
-from advanced_orchestration.models import (
-    CoordinatorConfig,
-    ResourceLimits
-)
-
-# External API Integration imports
-from external_api.webhook_server import WebhookServer
-from external_api.api_gateway import ApiGateway
-from external_api.event_streaming import EventStreaming
-from external_api.models import (
-    WebhookConfig,
-    ApiGatewayConfig,
-    EventStreamConfig
-)
-
-# Performance monitoring
-try:
-    from performance_monitor import performance_monitor
-except ImportError:
-    # Fallback for when performance_monitor is not available
-    class MockPerformanceMonitor:
-        def track_operation(self, operation_name, metadata=None):
-            from contextlib import nullcontext
-            return nullcontext()
-        
-        def print_dashboard(self):
-            print("📊 Performance monitoring not available")
-            
-        def clear_metrics(self):
-            pass
-    
-    performance_monitor = MockPerformanceMonitor()
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from advanced_orchestration.models import CoordinatorConfig, ResourceLimits
+    from advanced_orchestration.multi_agent_coordinator import MultiAgentCoordinator
+    from advanced_orchestration.resource_manager import ResourceManager
+    from advanced_orchestration.scaling_manager import ScalingManager
+    from external_api.api_gateway import ApiGateway
+    from external_api.event_streaming import EventStreaming
+    from external_api.webhook_server import WebhookServer
+
+
+class _FallbackComponentType:
+    COORDINATION = "coordination"
+
+
+class MockPerformanceMonitor:
+    """Stand-in used when performance_monitor is not available."""
+
+    def track_operation(self, operation_name, component_type=None, metadata=None, **kwargs):
+        from contextlib import nullcontext
+        return nullcontext()
+
+    def print_dashboard(self):
+        print("📊 Performance monitoring not available")
+
+    def clear_metrics(self):
+        pass
+
+
+def get_performance_monitor():
+    """Import the performance monitor on first use.
+
+    Returns the monitor and its ComponentType enum, or no-op stand-ins when
+    performance_monitor is not available.
+    """
+    try:
+        from performance_monitor import performance_monitor, ComponentType
+    except ImportError:
+        return MockPerformanceMonitor(), _FallbackComponentType
+    return performance_monitor, ComponentType
 
 
 class LeanVibeCLI:
     """Main CLI interface for LeanVibe Agent Hive."""
 
     def __init__(self):
-        """Initialize CLI with default configuration."""
-        self.config = CoordinatorConfig()
-
-        # Create default resource limits
-        self.resource_limits = ResourceLimits(
-            max_cpu_cores=8,
-            max_memory_mb=16384,  # 16GB
-            max_disk_mb=102400,   # 100GB
-            max_network_mbps=1000,  # 1Gbps
-            max_agents=10
-        )
+        """Initialize CLI with default configuration.
 
-        self.coordinator: Optional[MultiAgentCoordinator] = None
-        self.resource_manager: Optional[ResourceManager] = None
-        self.scaling_manager: Optional[ScalingManager] = None
+        Subsystems are imported when a command first needs them, so commands
+        such as ``pr`` or ``--help`` start without loading orchestration or
+        the external API stack.
+        """
+        self._config: Optional["CoordinatorConfig"] = None
+        self._resource_limits: Optional["ResourceLimits"] = None
 
-        # External API components
-        self.webhook_server: Optional[WebhookServer] = None
-        self.api_gateway: Optional[ApiGateway] = None
-        self.event_streaming: Optional[EventStreaming] = None
+        self.coordinator: Optional["MultiAgentCoordinator"] = None
+        self.resource_manager: Optional["ResourceManager"] = None
+        self.scaling_manager: Optional["ScalingManager"] = None
 
-    async def initialize_systems(self) -> None:
-        """Initialize all orchestration systems."""
+        # External API components
+        self.webhook_server: Optional["WebhookServer"] = None
+        self.api_gateway: Optional["ApiGateway"] = None
+        self.event_streaming: Optional["EventStreaming"] = None
+
+        # Subsystem registry: name -> initializer, run once on first use
+        self.subsystems: Dict[str, Callable[[], None]] = {
+            "orchestration": self._init_orchestration,
+            "external_api": self._init_external_api
+        }
+        self.initialized_subsystems = set()
+
+    @property
+    def config(self) -> "CoordinatorConfig":
+        """Coordinator configuration."""
+        if self._config is None:
+            from advanced_orchestration.models import CoordinatorConfig
+            self._config = CoordinatorConfig()
+        return self._config
+
+    @property
+    def resource_limits(self) -> "ResourceLimits":
+        """Default resource limits."""
+        if self._resource_limits is None:
+            from advanced_orchestration.models import ResourceLimits
+            self._resource_limits = ResourceLimits(
+                max_cpu_cores=8,
+                max_memory_mb=16384,  # 16GB
+                max_disk_mb=102400,   # 100GB
+                max_network_mbps=1000,  # 1Gbps
+                max_agents=10
+            )
+        return self._resource_limits
+
+    def _init_orchestration(self) -> None:
+        from advanced_orchestration.multi_agent_coordinator import MultiAgentCoordinator
+        from advanced_orchestration.resource_manager import ResourceManager
+        from advanced_orchestration.scaling_manager import ScalingManager
+
+        self.coordinator = MultiAgentCoordinator(self.config)
+        self.resource_manager = ResourceManager(self.resource_limits)
+        self.scaling_manager = ScalingManager(self.resource_limits)
+        print("✅ LeanVibe Agent Hive systems initialized")
+
+    def _init_external_api(self) -> None:
+        from external_api.api_gateway import ApiGateway
+        from external_api.event_streaming import EventStreaming
+        from external_api.models import ApiGatewayConfig, EventStreamConfig, WebhookConfig
+        from external_api.webhook_server import WebhookServer
+
+        self.webhook_server = WebhookServer(WebhookConfig())
+        self.api_gateway = ApiGateway(ApiGatewayConfig())
+        self.event_streaming = EventStreaming(EventStreamConfig())
+        print("✅ External API Integration components ready")
+
+    async def initialize_systems(self, *subsystems: str) -> None:
+        """Initialize the named subsystems (all of them if none are given)."""
         try:
-            self.coordinator = MultiAgentCoordinator(self.config)
-            self.resource_manager = ResourceManager(self.resource_limits)
-            self.scaling_manager = ScalingManager(self.resource_limits)
-
-            # Initialize External API components
-            webhook_config = WebhookConfig()
-            gateway_config = ApiGatewayConfig()
-            stream_config = EventStreamConfig()
-
-            self.webhook_server = WebhookServer(webhook_config)
-            self.api_gateway = ApiGateway(gateway_config)
-            self.event_streaming = EventStreaming(stream_config)
-
-            print("✅ LeanVibe Agent Hive systems initialized")
-            print("✅ External API Integration components ready")
+            for name in subsystems or tuple(self.subsystems):
+                if name not in self.initialized_subsystems:
+                    self.subsystems[name]()
+                    self.initialized_subsystems.add(name)
         except ImportError as e:
             print(f"❌ Import error: {e}")
             print("💡 Make sure you have installed all dependencies: pip install -r requirements.txt")
@@ -112,7 +152,7 @@ class LeanVibeCLI:
             workflow: Workflow type to execute
             validate: Whether to validate before execution
         """
-        await self.initialize_systems()
+        await self.initialize_systems("orchestration")
 
         print(f"🎯 Starting orchestration workflow: {workflow}")
         print(f"📋 Validation mode: {'enabled' if validate else 'disabled'}")
@@ -150,7 +190,7 @@ class LeanVibeCLI:
             depth: Thinking depth (standard, deep, ultrathink)
             parallel: Whether to run in parallel
         """
-        await self.initialize_systems()
+        await self.initialize_systems("orchestration")
 
         print(f"🎯 Spawning task: {task}")
         print(f"🧠 Thinking depth: {depth}")
@@ -179,7 +219,7 @@ class LeanVibeCLI:
             metrics: Show detailed metrics
             real_time: Enable real-time monitoring
         """
-        await self.initialize_systems()
+        await self.initialize_systems("orchestration")
 
         print("📊 LeanVibe Agent Hive System Monitor")
         print("=" * 40)
@@ -246,7 +286,7 @@ class LeanVibeCLI:
                 print("  No checkpoints found")
             return
 
-        await self.initialize_systems()
+        await self.initialize_systems("orchestration")
 
         if not name:
             name = f"checkpoint-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
@@ -288,7 +328,7 @@ class LeanVibeCLI:
             action: Action to perform (start, stop, status)
             port: Port to run webhook server on
         """
-        await self.initialize_systems()
+        await self.initialize_systems("external_api")
 
         if not self.webhook_server:
             print("❌ Webhook server not initialized")
@@ -331,7 +371,7 @@ class LeanVibeCLI:
             action: Action to perform (start, stop, status)
             port: Port to run API gateway on
         """
-        await self.initialize_systems()
+        await self.initialize_systems("external_api")
 
         if not self.api_gateway:
             print("❌ API Gateway not initialized")
@@ -383,7 +423,7 @@ class LeanVibeCLI:
             action: Action to perform (start, stop, status)
             publish_test: Whether to publish test events
         """
-        await self.initialize_systems()
+        await self.initialize_systems("external_api")
 
         if not self.event_streaming:
             print("❌ Event Streaming not initialized")
@@ -437,7 +477,7 @@ class LeanVibeCLI:
         Args:
             command: Command to execute (status, start-all, stop-all)
         """
-        await self.initialize_systems()
+        await self.initialize_systems("external_api")
 
         print("🌐 External API Integration Management")
 
@@ -739,7 +779,12 @@ class LeanVibeCLI:
             priority: Task priority (high, medium, low)
             update: Progress update message
         """
-        async with performance_monitor.track_operation(f"coordinate-{action}", {"priority": priority}):
+        performance_monitor, ComponentType = get_performance_monitor()
+        async with performance_monitor.track_operation(
+            f"coordinate-{action}",
+            ComponentType.COORDINATION,
+            metadata={"priority": priority}
+        ):
             try:
                 # Try to use the orchestrator pattern for better separation of concerns
                 from cli_coordination import CoordinationOrchestrator
@@ -898,7 +943,12 @@ Ready to begin! Comment on issue #{issue} to confirm start.
             agents: Comma-separated list of review agents
             format: Report format (text, markdown, json)
         """
-        async with performance_monitor.track_operation(f"review-{action}", {"pr": pr, "format": format}):
+        performance_monitor, ComponentType = get_performance_monitor()
+        async with performance_monitor.track_operation(
+            f"review-{action}",
+            ComponentType.COORDINATION,
+            metadata={"pr": pr, "format": format}
+        ):
             try:
                 # Try to use the orchestrator pattern for better separation of concerns
                 from cli_review import ReviewOrchestrator
@@ -1032,6 +1082,7 @@ Ready to begin! Comment on issue #{issue} to confirm start.
             action: Performance action (dashboard, clear)
             clear: Clear performance metrics
         """
+        performance_monitor, _ = get_performance_monitor()
         if action == "dashboard":
             performance_monitor.print_dashboard()
         elif action == "clear":
@@ -10,9 +10,10 @@ import asyncio
 import json
 import logging
 import subprocess
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
 from fastapi.responses import HTMLResponse
@@ -22,11 +23,13 @@ import uvicorn
 
 try:
     from .prompt_logger import prompt_logger, PromptLog
+    from .push import DashboardPushHub
 except ImportError:
     # Fallback for direct execution
     import sys
     sys.path.append('.')
     from prompt_logger import prompt_logger
+    from push import DashboardPushHub
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,8 +41,8 @@ class EnhancedDashboardServer:
     def __init__(self, session_name: str = "agent-hive", base_dir: str = "."):
         self.session_name = session_name
         self.base_dir = Path(base_dir)
-        self.websocket_connections: List[WebSocket] = []
-        self.recent_metrics: List[Dict[str, Any]] = []
+        self.push_hub = DashboardPushHub(topics=("metrics",))
+        self.recent_metrics: Deque[Dict[str, Any]] = deque(maxlen=50)
 
         # Create lifespan context manager
         @asynccontextmanager
@@ -210,7 +213,7 @@ class EnhancedDashboardServer:
             """Get recent metrics for dashboard display"""
             try:
                 # Return stored metrics (simplified for now)
-                return {"metrics": self.recent_metrics}
+                return {"metrics": list(self.recent_metrics)}
             except Exception as e:
                 return {"metrics": [], "error": str(e)}
 
@@ -1123,36 +1126,25 @@ class EnhancedDashboardServer:
     async def _handle_websocket(self, websocket: WebSocket):
         """Handle WebSocket connections"""
         await websocket.accept()
-        self.websocket_connections.append(websocket)
+        topics = websocket.query_params.get("topics")
+        await self.push_hub.connect(websocket, topics.split(",") if topics else None)
 
         try:
             while True:
-                await websocket.receive_text()
+                message = await websocket.receive_text()
+                await self.push_hub.handle_message(websocket, message)
         except WebSocketDisconnect:
-            self.websocket_connections.remove(websocket)
+            self.push_hub.disconnect(websocket)
 
     async def _broadcast_updates(self):
         """Broadcast updates to all WebSocket connections"""
         while True:
             try:
-                if self.websocket_connections:
-                    # Send update notification
-                    update_data = {
-                        "type": "update",
-                        "timestamp": datetime.now().isoformat()
-                    }
-
-                    # Broadcast to all connections
-                    disconnected = []
-                    for ws in self.websocket_connections:
-                        try:
-                            await ws.send_text(json.dumps(update_data))
-                        except Exception:
-                            disconnected.append(ws)
-
-                    # Remove disconnected connections
-                    for ws in disconnected:
-                        self.websocket_connections.remove(ws)
+                # Send update notification
+                await self.push_hub.publish(None, {
+                    "type": "update",
+                    "timestamp": datetime.now().isoformat()
+                })
 
             except Exception as e:
                 logger.error(f"Error broadcasting updates: {e}")
@@ -1163,27 +1155,13 @@ class EnhancedDashboardServer:
         """Broadcast metric update to all WebSocket connections"""
         # Store metric for future retrieval (keep last 50)
         self.recent_metrics.append(metric_data)
-        if len(self.recent_metrics) > 50:
-            self.recent_metrics.pop(0)
-
-        # Broadcast to WebSocket clients
-        if self.websocket_connections:
-            update_message = {
-                "type": "metric_update",
-                "data": metric_data,
-                "timestamp": datetime.now().isoformat()
-            }
-
-            disconnected = []
-            for ws in self.websocket_connections:
-                try:
-                    await ws.send_text(json.dumps(update_message))
-                except Exception:
-                    disconnected.append(ws)
 
-            # Remove disconnected connections
-            for ws in disconnected:
-                self.websocket_connections.remove(ws)
+        # Encoded once and sent to metric subscribers
+        await self.push_hub.publish("metrics", {
+            "type": "metric_update",
+            "data": metric_data,
+            "timestamp": datetime.now().isoformat()
+        })
 
     async def _run_command(self, cmd: List[str], cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
         """Run a command asynchronously"""
@@ -1199,14 +1177,15 @@ class EnhancedDashboardServer:
             cmd, process.returncode, stdout.decode(), stderr.decode()
         )
 
-def main():
+def main(compress: bool = True):
     """Main function to run the enhanced dashboard server"""
     server = EnhancedDashboardServer()
 
     logger.info("Starting LeanVibe Agent Hive Enhanced Dashboard Server")
     logger.info("Enhanced Dashboard available at: http://localhost:8001")
 
-    uvicorn.run(server.app, host="0.0.0.0", port=8002, log_level="info")
+    uvicorn.run(server.app, host="0.0.0.0", port=8002, log_level="info",
+                ws_per_message_deflate=compress)
 
 if __name__ == "__main__":
     main()
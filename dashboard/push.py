@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Dashboard Push Hub for LeanVibe Agent Hive
+
+Delta-based WebSocket push shared by the dashboard servers. Snapshots are
+diffed against the last published snapshot, every frame is encoded once
+and sent to all subscribed clients concurrently, and clients choose which
+topics they receive.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOPICS = ("agents", "metrics", "prompts")
+
+
+class DashboardClient:
+    """A connected dashboard WebSocket and its topic subscriptions."""
+
+    def __init__(self, websocket, topics: Iterable[str]):
+        self.websocket = websocket
+        self.topics: Set[str] = set(topics)
+
+
+class DashboardPushHub:
+    """Topic-based push of snapshot deltas to dashboard WebSockets.
+
+    Frames sent to clients:
+
+    - ``{"type": "<topic>_snapshot", "topic": ..., "items": {...}}`` - full state,
+      sent when a client subscribes to a topic
+    - ``{"type": "<topic>_delta", "topic": ..., "changed": {...}, "removed": [...]}`` -
+      keys whose values changed since the previous publish
+    - any message passed to ``publish`` - one-off events such as metric updates
+    """
+
+    def __init__(self, topics: Iterable[str] = DEFAULT_TOPICS, send_timeout: float = 5.0):
+        self.topics = tuple(topics)
+        self.send_timeout = send_timeout
+        self.clients: Dict[Any, DashboardClient] = {}
+        self.snapshots: Dict[str, Dict[str, Any]] = {topic: {} for topic in self.topics}
+        self.frames_sent = 0
+        self.frames_encoded = 0
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def has_subscribers(self, topic: str) -> bool:
+        """Whether any connected client receives ``topic``."""
+        return any(topic in client.topics for client in self.clients.values())
+
+    async def connect(self, websocket, topics: Optional[Iterable[str]] = None):
+        """Register an accepted WebSocket and send it the current snapshots."""
+        client = DashboardClient(websocket, self.topics if topics is None else topics)
+        self.clients[websocket] = client
+        await self._send_snapshots(client, client.topics)
+
+    def disconnect(self, websocket):
+        """Forget a WebSocket."""
+        self.clients.pop(websocket, None)
+
+    async def handle_message(self, websocket, text: str):
+        """Apply a client subscription message.
+
+        Clients send ``{"action": "subscribe" | "unsubscribe", "topics": [...]}``.
+        Other messages are ignored.
+        """
+        client = self.clients.get(websocket)
+        if client is None:
+            return
+
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+
+        topics = [t for t in message.get("topics", []) if t in self.snapshots]
+        if message.get("action") == "subscribe":
+            added = [t for t in topics if t not in client.topics]
+            client.topics.update(added)
+            await self._send_snapshots(client, added)
+        elif message.get("action") == "unsubscribe":
+            client.topics.difference_update(topics)
+
+    async def publish_snapshot(self, topic: str, items: Dict[str, Any]) -> bool:
+        """Publish the current state of ``topic`` as a delta.
+
+        ``items`` maps a stable key (agent name, metric field, prompt id) to a
+        JSON-serializable value. Returns True if anything changed.
+        """
+        previous = self.snapshots.get(topic, {})
+        changed = {key: value for key, value in items.items() if previous.get(key) != value}
+        removed = [key for key in previous if key not in items]
+        self.snapshots[topic] = dict(items)
+
+        if not changed and not removed:
+            return False
+
+        await self.publish(topic, {
+            "type": f"{topic}_delta",
+            "topic": topic,
+            "changed": changed,
+            "removed": removed
+        })
+        return True
+
+    async def publish(self, topic: Optional[str], message: Dict[str, Any]):
+        """Encode ``message`` once and send it to subscribers of ``topic``.
+
+        A ``topic`` of None sends to every client.
+        """
+        targets = [client for client in self.clients.values()
+                   if topic is None or topic in client.topics]
+        if not targets:
+            return
+
+        frame = json.dumps(message, default=str)
+        self.frames_encoded += 1
+        await self._send_frame(frame, targets)
+
+    async def _send_snapshots(self, client: DashboardClient, topics: Iterable[str]):
+        for topic in topics:
+            if topic not in self.snapshots:
+                continue
+            frame = json.dumps({
+                "type": f"{topic}_snapshot",
+                "topic": topic,
+                "items": self.snapshots[topic]
+            }, default=str)
+            self.frames_encoded += 1
+            await self._send_frame(frame, [client])
+
+    async def _send_frame(self, frame: str, targets: List[DashboardClient]):
+        results = await asyncio.gather(
+            *(asyncio.wait_for(client.websocket.send_text(frame), self.send_timeout)
+              for client in targets),
+            return_exceptions=True
+        )
+
+        # Drop clients that failed or stalled past the send timeout
+        for client, result in zip(targets, results):
+            if isinstance(result, BaseException):
+                logger.debug(f"Dropping dashboard client: {result!r}")
+                self.disconnect(client.websocket)
+            else:
+                self.frames_sent += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get push statistics."""
+        return {
+            "clients": len(self.clients),
+            "subscribers": {topic: sum(topic in c.topics for c in self.clients.values())
+                            for topic in self.topics},
+            "frames_encoded": self.frames_encoded,
+            "frames_sent": self.frames_sent
+        }
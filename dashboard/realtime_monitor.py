@@ -14,10 +14,11 @@ import asyncio
 import logging
 import psutil
 import subprocess
+import threading
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 
 logger = logging.getLogger(__name__)
@@ -54,6 +55,208 @@ class AgentMetrics:
         data['last_activity'] = self.last_activity.isoformat()
         return data
 
+class GitActivityCollector:
+    """Incremental git activity collector for agent worktrees.
+
+    Each repository is fingerprinted by the mtimes of HEAD, its reflog, the
+    checked-out branch ref and packed-refs. git is only queried when the
+    fingerprint changes (or the cached result is older than ``max_age``, so
+    the one-hour commit window still slides), and all git processes share a
+    bounded pool of ``max_concurrent`` slots.
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_age: float = 300.0):
+        self.max_concurrent = max_concurrent
+        self.max_age = max_age
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._fingerprints: Dict[Path, Tuple] = {}
+        self._cache: Dict[Path, Tuple[float, Optional[Dict[str, Any]]]] = {}
+        self.git_invocations = 0
+
+    @staticmethod
+    def _resolve_git_dirs(repo_path: Path) -> Optional[Tuple[Path, Path]]:
+        """Return (git_dir, common_dir), following worktree ``.git`` files."""
+        dot_git = repo_path / ".git"
+        if dot_git.is_dir():
+            return dot_git, dot_git
+        if not dot_git.is_file():
+            return None
+
+        content = dot_git.read_text().strip()
+        if not content.startswith("gitdir:"):
+            return None
+        git_dir = Path(content[len("gitdir:"):].strip())
+        if not git_dir.is_absolute():
+            git_dir = (repo_path / git_dir).resolve()
+
+        common_dir = git_dir
+        commondir_file = git_dir / "commondir"
+        if commondir_file.exists():
+            common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
+        return git_dir, common_dir
+
+    @staticmethod
+    def _mtime(path: Path) -> Optional[int]:
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def fingerprint(self, repo_path: Path) -> Optional[Tuple]:
+        """Cheap stat-only fingerprint of a repository's refs."""
+        dirs = self._resolve_git_dirs(repo_path)
+        if dirs is None:
+            return None
+        git_dir, common_dir = dirs
+
+        head = git_dir / "HEAD"
+        try:
+            head_content = head.read_text().strip()
+        except OSError:
+            return None
+
+        ref_mtime = None
+        if head_content.startswith("ref:"):
+            ref = head_content[4:].strip()
+            ref_mtime = self._mtime(git_dir / ref) or self._mtime(common_dir / ref)
+
+        return (
+            head_content,
+            self._mtime(head),
+            self._mtime(git_dir / "logs" / "HEAD"),
+            ref_mtime,
+            self._mtime(common_dir / "packed-refs")
+        )
+
+    @staticmethod
+    def _branch_from_fingerprint(fingerprint: Tuple) -> str:
+        head_content = fingerprint[0]
+        if head_content.startswith("ref: refs/heads/"):
+            return head_content[len("ref: refs/heads/"):]
+        return "HEAD"
+
+    async def collect(self, repo_path: Path) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Return (changed, activity) for a repository.
+
+        ``changed`` is False when the cached result was reused without
+        running git.
+        """
+        fingerprint = self.fingerprint(repo_path)
+        if fingerprint is None:
+            return False, None
+
+        cached = self._cache.get(repo_path)
+        if (cached is not None and self._fingerprints.get(repo_path) == fingerprint
+                and time.monotonic() - cached[0] < self.max_age):
+            return False, cached[1]
+
+        activity = await self._query(repo_path, fingerprint)
+        previous = cached[1] if cached else None
+        self._fingerprints[repo_path] = fingerprint
+        self._cache[repo_path] = (time.monotonic(), activity)
+        return activity != previous, activity
+
+    def get_cached(self, repo_path: Path) -> Optional[Dict[str, Any]]:
+        """Return the last collected activity without touching the repository."""
+        cached = self._cache.get(repo_path)
+        return cached[1] if cached else None
+
+    def forget(self, repo_path: Path):
+        """Drop cached state for a removed worktree."""
+        self._fingerprints.pop(repo_path, None)
+        self._cache.pop(repo_path, None)
+
+    async def _query(self, repo_path: Path, fingerprint: Tuple) -> Optional[Dict[str, Any]]:
+        result = await self._run_git(["log", "--oneline", "--since=1 hour ago"], repo_path)
+        if result.returncode != 0 or not result.stdout.strip():
+            return None
+        commits = result.stdout.strip().split('\n')
+
+        lines_changed = 0
+        diff_result = await self._run_git(["diff", "--shortstat", "HEAD~1", "HEAD"], repo_path)
+        if diff_result.returncode == 0 and diff_result.stdout:
+            # " 3 files changed, 10 insertions(+), 2 deletions(-)"
+            for part in diff_result.stdout.split(","):
+                words = part.split()
+                if words and words[0].isdigit() and ("insertion" in part or "deletion" in part):
+                    lines_changed += int(words[0])
+
+        return {
+            "recent_commits": len(commits),
+            "commit_messages": commits[:5],  # Last 5 commits
+            "lines_changed": lines_changed,
+            "branch": self._branch_from_fingerprint(fingerprint)
+        }
+
+    async def _run_git(self, args: List[str], cwd: Path) -> subprocess.CompletedProcess:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async with self._semaphore:
+            self.git_invocations += 1
+            process = await asyncio.create_subprocess_exec(
+                "git", *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd
+            )
+            stdout, stderr = await process.communicate()
+
+        return subprocess.CompletedProcess(
+            args, process.returncode, stdout.decode(), stderr.decode()
+        )
+
+
+class ResourceSampler:
+    """Samples system CPU, memory and disk usage on a background thread.
+
+    ``psutil.cpu_percent(interval=...)`` blocks for the whole interval, so it
+    runs here instead of on the event loop; readers get the latest sample.
+    """
+
+    def __init__(self, interval: float = 1.0, disk_path: str = '.'):
+        self.interval = interval
+        self.disk_path = disk_path
+        self._latest: Dict[str, float] = {"cpu_percent": 0.0, "memory_percent": 0.0, "disk_percent": 0.0}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def sample(self) -> Dict[str, float]:
+        """Take one sample; blocks for ``interval`` seconds."""
+        cpu_percent = psutil.cpu_percent(interval=self.interval)
+        self._latest = {
+            "cpu_percent": cpu_percent,
+            "memory_percent": psutil.virtual_memory().percent,
+            "disk_percent": psutil.disk_usage(self.disk_path).percent
+        }
+        return self._latest
+
+    def latest(self) -> Dict[str, float]:
+        """Most recent sample without blocking."""
+        return self._latest
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Resource sampling error: {e}")
+                self._stop_event.wait(self.interval)
+
+
 class RealtimeAgentMonitor:
     """Real-time agent activity monitoring system"""
 
@@ -66,6 +269,8 @@ class RealtimeAgentMonitor:
         self.activities: List[AgentActivity] = []
         self.agent_metrics: Dict[str, AgentMetrics] = {}
         self.git_activity_cache: Dict[str, List[Dict]] = {}
+        self.git_collector = GitActivityCollector()
+        self.resource_sampler = ResourceSampler()
 
         # Monitoring configuration
         self.monitoring_interval = 5  # seconds
@@ -83,6 +288,7 @@ class RealtimeAgentMonitor:
     async def start_monitoring(self):
         """Start real-time monitoring"""
         logger.info("🔍 Starting real-time agent activity monitoring...")
+        self.resource_sampler.start()
 
         # Start monitoring tasks
         tasks = [
@@ -97,6 +303,8 @@ class RealtimeAgentMonitor:
             await asyncio.gather(*tasks)
         except Exception as e:
             logger.error(f"❌ Monitoring error: {e}")
+        finally:
+            self.resource_sampler.stop()
 
     async def _monitor_git_activity(self):
         """Monitor git activity across all agent worktrees"""
@@ -104,9 +312,13 @@ class RealtimeAgentMonitor:
             try:
                 agents = await self._discover_agents()
 
-                for agent_name, agent_path in agents.items():
-                    git_activity = await self._get_git_activity(agent_name, agent_path)
+                # Only worktrees whose refs moved are queried; the rest are stat-only
+                results = await asyncio.gather(*(
+                    self._get_git_activity(agent_name, agent_path)
+                    for agent_name, agent_path in agents.items()
+                ))
 
+                for agent_name, git_activity in zip(agents, results):
                     if git_activity:
                         activity = AgentActivity(
                             agent_name=agent_name,
@@ -126,19 +338,17 @@ class RealtimeAgentMonitor:
         """Monitor CPU, memory, and disk usage"""
         while True:
             try:
-                # Get system-wide metrics
-                cpu_percent = psutil.cpu_percent(interval=1)
-                memory = psutil.virtual_memory()
-                disk = psutil.disk_usage('.')
+                # Latest system-wide sample from the background sampler
+                usage = self.resource_sampler.latest()
 
                 # Get agent-specific metrics (approximation)
                 agents = await self._discover_agents()
 
                 for agent_name, agent_path in agents.items():
                     # Estimate resource usage per agent
-                    agent_cpu = cpu_percent / max(len(agents), 1)
-                    agent_memory = memory.percent / max(len(agents), 1)
-                    agent_disk = disk.percent
+                    agent_cpu = usage["cpu_percent"] / max(len(agents), 1)
+                    agent_memory = usage["memory_percent"] / max(len(agents), 1)
+                    agent_disk = usage["disk_percent"]
 
                     # Update metrics
                     if agent_name not in self.agent_metrics:
@@ -265,39 +475,11 @@ class RealtimeAgentMonitor:
         return agents
 
     async def _get_git_activity(self, agent_name: str, agent_path: Path) -> Optional[Dict[str, Any]]:
-        """Get git activity for an agent"""
+        """Get new git activity for an agent, or None if nothing changed"""
         try:
-            # Get recent commits
-            result = await self._run_command([
-                "git", "log", "--oneline", "--since=1 hour ago", "--author=*"
-            ], cwd=agent_path)
-
-            if result.returncode == 0 and result.stdout.strip():
-                commits = result.stdout.strip().split('\n')
-
-                # Get file changes
-                diff_result = await self._run_command([
-                    "git", "diff", "--stat", "HEAD~1", "HEAD"
-                ], cwd=agent_path)
-
-                lines_changed = 0
-                if diff_result.returncode == 0 and diff_result.stdout:
-                    # Parse git diff stat output
-                    lines = diff_result.stdout.strip().split('\n')
-                    if lines:
-                        last_line = lines[-1]
-                        if "insertion" in last_line or "deletion" in last_line:
-                            parts = last_line.split()
-                            for part in parts:
-                                if part.isdigit():
-                                    lines_changed += int(part)
-
-                return {
-                    "recent_commits": len(commits),
-                    "commit_messages": commits[:5],  # Last 5 commits
-                    "lines_changed": lines_changed,
-                    "branch": await self._get_current_branch(agent_path)
-                }
+            changed, activity = await self.git_collector.collect(agent_path)
+            if changed:
+                return activity
 
         except Exception as e:
             logger.warning(f"Error getting git activity for {agent_name}: {e}")
@@ -337,16 +519,6 @@ class RealtimeAgentMonitor:
 
         return None
 
-    async def _get_current_branch(self, repo_path: Path) -> str:
-        """Get current git branch"""
-        try:
-            result = await self._run_command(["git", "branch", "--show-current"], cwd=repo_path)
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except:
-            pass
-        return "unknown"
-
     async def _run_command(self, cmd: List[str], cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
         """Run a command asynchronously"""
         process = await asyncio.create_subprocess_exec(
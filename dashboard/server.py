@@ -24,11 +24,24 @@ import uvicorn
 
 try:
     from .prompt_logger import prompt_logger, PromptLog
+    from .push import DashboardPushHub
 except ImportError:
     # Fallback for direct execution
     import sys
     sys.path.append('.')
     from prompt_logger import prompt_logger
+    from push import DashboardPushHub
+
+try:
+    from scripts.agent_manager import TmuxAgentManager
+except ImportError:
+    # scripts/ is not a package; resolve it from the repository root
+    import sys
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    try:
+        from scripts.agent_manager import TmuxAgentManager
+    except ImportError:
+        TmuxAgentManager = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -89,7 +102,9 @@ class DashboardServer:
         self.session_name = session_name
         self.base_dir = Path(base_dir)
         self.worktrees_dir = self.base_dir / "worktrees"
-        self.websocket_connections: List[WebSocket] = []
+        self.push_hub = DashboardPushHub()
+        self.agent_manager = (TmuxAgentManager(base_dir=str(self.base_dir), session_name=session_name)
+                              if TmuxAgentManager else None)
         self.agents: Dict[str, AgentInfo] = {}
         self.system_metrics = SystemMetrics(0, 0, 0.0, 0.0, 0.0, 0.0, 0)
 
@@ -257,9 +272,10 @@ class DashboardServer:
                 let ws = null;
                 let reconnectAttempts = 0;
                 const maxReconnectAttempts = 5;
+                const pushState = {agents: {}, metrics: {}};
 
                 function connectWebSocket() {
-                    ws = new WebSocket('ws://localhost:8000/ws');
+                    ws = new WebSocket('ws://localhost:8000/ws?topics=agents,metrics');
 
                     ws.onopen = function() {
                         console.log('WebSocket connected');
@@ -270,10 +286,20 @@ class DashboardServer:
 
                     ws.onmessage = function(event) {
                         const data = JSON.parse(event.data);
-                        if (data.type === 'agents_update') {
-                            updateAgents(data.agents);
-                        } else if (data.type === 'metrics_update') {
-                            updateMetrics(data.metrics);
+                        const state = pushState[data.topic];
+                        if (!state) {
+                            return;
+                        }
+                        if (data.type === data.topic + '_snapshot') {
+                            pushState[data.topic] = Object.assign({}, data.items);
+                        } else if (data.type === data.topic + '_delta') {
+                            Object.assign(state, data.changed);
+                            data.removed.forEach(key => delete state[key]);
+                        }
+                        if (data.topic === 'agents') {
+                            updateAgents(Object.values(pushState.agents));
+                        } else if (data.topic === 'metrics') {
+                            updateMetrics(pushState.metrics);
                         }
                     };
 
@@ -378,13 +404,15 @@ class DashboardServer:
     async def _handle_websocket(self, websocket: WebSocket):
         """Handle WebSocket connections"""
         await websocket.accept()
-        self.websocket_connections.append(websocket)
+        topics = websocket.query_params.get("topics")
+        await self.push_hub.connect(websocket, topics.split(",") if topics else None)
 
         try:
             while True:
-                await websocket.receive_text()
+                message = await websocket.receive_text()
+                await self.push_hub.handle_message(websocket, message)
         except WebSocketDisconnect:
-            self.websocket_connections.remove(websocket)
+            self.push_hub.disconnect(websocket)
 
     async def _monitor_agents(self):
         """Monitor agent status periodically"""
@@ -428,34 +456,20 @@ class DashboardServer:
             await asyncio.sleep(5)  # Monitor every 5 seconds
 
     async def _broadcast_updates(self):
-        """Broadcast updates to all WebSocket connections"""
+        """Push changes since the last cycle to subscribed WebSocket connections"""
         while True:
             try:
-                if self.websocket_connections:
-                    # Send agents update
-                    agents_data = {
-                        "type": "agents_update",
-                        "agents": [agent.to_dict() for agent in self.agents.values()]
-                    }
-
-                    # Send metrics update
-                    metrics_data = {
-                        "type": "metrics_update",
-                        "metrics": self.system_metrics.to_dict()
-                    }
-
-                    # Broadcast to all connections
-                    disconnected = []
-                    for ws in self.websocket_connections:
-                        try:
-                            await ws.send_text(json.dumps(agents_data))
-                            await ws.send_text(json.dumps(metrics_data))
-                        except Exception:
-                            disconnected.append(ws)
-
-                    # Remove disconnected connections
-                    for ws in disconnected:
-                        self.websocket_connections.remove(ws)
+                # Snapshots are diffed once per cycle, not per connection
+                await self.push_hub.publish_snapshot(
+                    "agents", {name: agent.to_dict() for name, agent in self.agents.items()}
+                )
+                await self.push_hub.publish_snapshot("metrics", self.system_metrics.to_dict())
+
+                if self.push_hub.has_subscribers("prompts"):
+                    prompts = prompt_logger.get_recent_prompts(limit=20)
+                    await self.push_hub.publish_snapshot(
+                        "prompts", {str(p.id): p.to_dict() for p in prompts}
+                    )
 
             except Exception as e:
                 logger.error(f"Error broadcasting updates: {e}")
@@ -464,111 +478,53 @@ class DashboardServer:
 
     async def _discover_agents(self) -> Dict[str, AgentInfo]:
         """Discover all agents from worktrees"""
-        agents = {}
+        if self.agent_manager is None:
+            logger.warning("Agent discovery unavailable: scripts.agent_manager could not be imported")
+            return {}
 
-        # First, discover agents in standard worktrees/ directory
-        if self.worktrees_dir.exists():
-            for worktree_dir in self.worktrees_dir.iterdir():
-                if worktree_dir.is_dir():
-                    agent_name = worktree_dir.name
-                    claude_file = worktree_dir / "CLAUDE.md"
-
-                    if claude_file.exists():
-                        status = await self._get_agent_status(agent_name)
-                        last_activity = await self._get_last_activity(worktree_dir)
-
-                        agents[agent_name] = AgentInfo(
-                            name=agent_name,
-                            status=status,
-                            window_name=f"agent-{agent_name}",
-                            path=str(worktree_dir),
-                            last_activity=last_activity
-                        )
-
-        # Then, discover agents from git worktree list (for agents outside worktrees/)
-        try:
-            result = await self._run_command(["git", "worktree", "list", "--porcelain"])
+        # Served from the shared discovery cache; only rescans when worktrees change
+        discovered = await asyncio.to_thread(lambda: self.agent_manager.agents)
+        windows = await self._get_window_states()
 
-            if result.returncode == 0:
-                current_worktree = None
-                for line in result.stdout.splitlines():
-                    if line.startswith("worktree "):
-                        current_worktree = Path(line.split(" ", 1)[1])
-                    elif line.startswith("branch ") and current_worktree:
-                        # Check if this is an agent worktree (not main repo)
-                        if (current_worktree != self.base_dir and
-                            current_worktree.name not in agents and
-                            current_worktree.name != "agent-hive"):
-                            claude_file = current_worktree / "CLAUDE.md"
-                            if claude_file.exists():
-                                # Extract agent name from path
-                                agent_name = current_worktree.name
-                                if agent_name.endswith("-worktree"):
-                                    agent_name = agent_name[:-9]  # Remove "-worktree" suffix
-
-                                # Skip if this agent looks like a generic orchestrator
-                                if self._is_agent_specific_claude(claude_file):
-                                    status = await self._get_agent_status(agent_name)
-                                    last_activity = await self._get_last_activity(current_worktree)
-
-                                    agents[agent_name] = AgentInfo(
-                                        name=agent_name,
-                                        status=status,
-                                        window_name=f"agent-{agent_name}",
-                                        path=str(current_worktree),
-                                        last_activity=last_activity
-                                    )
-        except Exception as e:
-            logger.warning(f"Could not discover git worktrees: {e}")
+        agents = {}
+        for agent_name, agent in discovered.items():
+            agents[agent_name] = AgentInfo(
+                name=agent_name,
+                status=self._window_status(windows, agent["window_name"]),
+                window_name=agent["window_name"],
+                path=str(agent["path"]),
+                last_activity=agent["last_activity"]
+            )
 
         return agents
 
-    def _is_agent_specific_claude(self, claude_file: Path) -> bool:
-        """Check if CLAUDE.md file is agent-specific (not generic orchestrator)."""
-        try:
-            content = claude_file.read_text()
-            # Skip if it looks like a generic orchestrator file
-            if "LeanVibe Orchestrator" in content and "Role: Orchestrator" in content:
-                return False
-            # Must contain agent-specific content
-            if any(term in content.lower() for term in ["agent identity", "agent instructions", "specialization", "mission statement"]):
-                return True
-            return False
-        except Exception:
-            return False
-
-    async def _get_agent_status(self, agent_name: str) -> AgentStatus:
-        """Get agent status from tmux"""
+    async def _get_window_states(self) -> Optional[Dict[str, bool]]:
+        """Get window name -> active flag for the whole tmux session in one call"""
         try:
-            window_name = f"agent-{agent_name}"
             result = await self._run_command([
                 "tmux", "list-windows", "-t", self.session_name, "-F", "#{window_name}:#{window_active}"
             ])
-
-            if result.returncode == 0:
-                for line in result.stdout.splitlines():
-                    if line.startswith(window_name + ":"):
-                        return AgentStatus.ACTIVE if line.endswith(":1") else AgentStatus.INACTIVE
-
-            return AgentStatus.INACTIVE
-
         except Exception:
+            return None
+
+        windows = {}
+        if result.returncode == 0:
+            for line in result.stdout.splitlines():
+                window_name, _, active = line.rpartition(":")
+                windows[window_name] = active == "1"
+        return windows
+
+    @staticmethod
+    def _window_status(windows: Optional[Dict[str, bool]], window_name: str) -> AgentStatus:
+        if windows is None:
             return AgentStatus.UNKNOWN
+        if windows.get(window_name):
+            return AgentStatus.ACTIVE
+        return AgentStatus.INACTIVE
 
-    async def _get_last_activity(self, worktree_dir: Path) -> Optional[datetime]:
-        """Get last git activity in worktree"""
-        try:
-            result = await self._run_command([
-                "git", "log", "-1", "--format=%ct"
-            ], cwd=worktree_dir)
-
-            if result.returncode == 0 and result.stdout.strip():
-                timestamp = int(result.stdout.strip())
-                return datetime.fromtimestamp(timestamp)
-        except Exception:
-            pass
-
-        return None
+    async def _get_agent_status(self, agent_name: str) -> AgentStatus:
+        """Get agent status from tmux"""
+        return self._window_status(await self._get_window_states(), f"agent-{agent_name}")
 
     async def _get_cpu_usage(self) -> float:
         """Get CPU usage percentage"""
@@ -634,14 +590,16 @@ class DashboardServer:
         )
 
 
-def main():
+def main(compress: bool = True):
     """Main function to run the dashboard server"""
     server = DashboardServer()
 
     logger.info("Starting LeanVibe Agent Hive Dashboard Server")
     logger.info("Dashboard available at: http://localhost:8000")
 
-    uvicorn.run(server.app, host="0.0.0.0", port=8000, log_level="info")
+    # permessage-deflate keeps large snapshot frames cheap on the wire
+    uvicorn.run(server.app, host="0.0.0.0", port=8000, log_level="info",
+                ws_per_message_deflate=compress)
 
 
 if __name__ == "__main__":
@@ -5,24 +5,43 @@ Provides end-to-end visibility into agent coordination, task execution,
 and cross-service interactions with comprehensive trace correlation.
 """
 
+import json
 import logging
+import os
+import struct
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
 from enum import Enum
 import threading
-from collections import defaultdict
+from collections import OrderedDict, deque
 from contextlib import contextmanager
 
 from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
-from opentelemetry.exporter.jaeger.thrift import JaegerExporter
+from opentelemetry.sdk.trace import TracerProvider, ReadableSpan, SpanProcessor, Event
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor, ConsoleSpanExporter, SpanExporter, SpanExportResult
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased, ALWAYS_ON
 from opentelemetry.sdk.resources import Resource
-from opentelemetry.trace import Status, StatusCode
+from opentelemetry.trace import Status, StatusCode, SpanContext, SpanKind, TraceFlags
 from opentelemetry.baggage import get_baggage
 from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
 
+# Optional network exporters; unavailable ones fall back to the local span log
+try:
+    from opentelemetry.exporter.jaeger.thrift import JaegerExporter
+except ImportError:
+    JaegerExporter = None
+
+try:
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+except ImportError:
+    OTLPSpanExporter = None
+
+# Tracing data (the span log) lives next to this module unless configured
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
 
 class WorkflowType(Enum):
     """Types of workflows to trace."""
@@ -110,15 +129,525 @@ class WorkflowTrace:
     custom_attributes: Dict[str, Any] = field(default_factory=dict)
 
 
+class AgentSpanCounters:
+    """Span counters for one agent within one time bucket."""
+    
+    __slots__ = ("bucket", "total", "errors", "tasks", "communications",
+                 "completed", "duration_sum", "workflow_ids")
+    
+    def __init__(self, bucket: int):
+        self.bucket = bucket
+        self.total = 0
+        self.errors = 0
+        self.tasks = 0
+        self.communications = 0
+        self.completed = 0
+        self.duration_sum = 0.0
+        self.workflow_ids: set = set()
+
+
+class SpanStore:
+    """Bounded, time-partitioned store for span metadata.
+    
+    Spans are grouped into fixed-width time buckets (one minute by default)
+    and expire by dropping whole buckets. Per-agent deques of span ids and
+    per-agent, per-bucket counters are maintained on insert and completion,
+    so agent summaries merge a handful of counters instead of scanning spans
+    and cleanup only touches the spans being expired.
+    """
+    
+    def __init__(self, bucket_seconds: int = 60, max_spans: int = 100000,
+                 max_spans_per_agent: int = 10000):
+        self.bucket_seconds = bucket_seconds
+        self.max_spans = max_spans
+        self.max_spans_per_agent = max_spans_per_agent
+        self._buckets: "OrderedDict[int, Dict[str, Dict[str, Any]]]" = OrderedDict()
+        self._index: Dict[str, int] = {}
+        self.agent_spans: Dict[str, deque] = {}
+        self.agent_counters: Dict[str, deque] = {}
+        self.workflow_spans: Dict[str, deque] = {}
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    def __contains__(self, span_id: str) -> bool:
+        return span_id in self._index
+    
+    def _bucket_of(self, when: datetime) -> int:
+        return int(when.timestamp() // self.bucket_seconds)
+    
+    def add(self, span_id: str, metadata: Dict[str, Any], agent_ids: Iterable[str] = ()) -> None:
+        """Store span metadata and update per-agent indexes and counters."""
+        bucket_key = self._bucket_of(metadata["start_time"])
+        if self._buckets:
+            last_key = next(reversed(self._buckets))
+            # Clock skew: never insert behind the newest bucket
+            bucket_key = max(bucket_key, last_key)
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            bucket = self._buckets[bucket_key] = {}
+        
+        metadata["agent_ids"] = tuple(agent_ids)
+        bucket[span_id] = metadata
+        self._index[span_id] = bucket_key
+        
+        span_type = metadata["span_type"]
+        workflow_id = metadata.get("workflow_id")
+        for agent_id in metadata["agent_ids"]:
+            spans = self.agent_spans.get(agent_id)
+            if spans is None:
+                spans = self.agent_spans[agent_id] = deque(maxlen=self.max_spans_per_agent)
+                self.agent_counters[agent_id] = deque()
+            spans.append(span_id)
+            
+            counters = self._agent_bucket(agent_id, bucket_key, create=True)
+            counters.total += 1
+            if span_type == SpanType.TASK.value:
+                counters.tasks += 1
+            elif span_type == SpanType.COMMUNICATION.value:
+                counters.communications += 1
+            if workflow_id:
+                counters.workflow_ids.add(workflow_id)
+        
+        if workflow_id:
+            spans = self.workflow_spans.get(workflow_id)
+            if spans is None:
+                spans = self.workflow_spans[workflow_id] = deque()
+            spans.append(span_id)
+        
+        while len(self._index) > self.max_spans:
+            if len(self._buckets) > 1:
+                self._drop_oldest_bucket()
+            else:
+                # Everything falls in one bucket: evict its oldest spans
+                self._drop_oldest_span()
+    
+    def _agent_bucket(self, agent_id: str, bucket_key: int,
+                      create: bool = False) -> Optional[AgentSpanCounters]:
+        counters = self.agent_counters.get(agent_id)
+        if counters is None:
+            return None
+        for entry in reversed(counters):
+            if entry.bucket == bucket_key:
+                return entry
+            if entry.bucket < bucket_key:
+                break
+        if not create:
+            return None
+        entry = AgentSpanCounters(bucket_key)
+        counters.append(entry)
+        return entry
+    
+    def get(self, span_id: str) -> Optional[Dict[str, Any]]:
+        bucket_key = self._index.get(span_id)
+        if bucket_key is None:
+            return None
+        return self._buckets[bucket_key].get(span_id)
+    
+    def finish(self, span_id: str, end_time: datetime, error: bool = False) -> None:
+        """Record span completion and fold its duration into agent counters."""
+        bucket_key = self._index.get(span_id)
+        if bucket_key is None:
+            return
+        metadata = self._buckets[bucket_key][span_id]
+        metadata["end_time"] = end_time
+        if error:
+            metadata["error"] = True
+        duration = (end_time - metadata["start_time"]).total_seconds()
+        for agent_id in metadata["agent_ids"]:
+            counters = self._agent_bucket(agent_id, bucket_key)
+            if counters is None:
+                continue
+            counters.completed += 1
+            counters.duration_sum += duration
+            if error:
+                counters.errors += 1
+    
+    def agent_summary(self, agent_id: str, since: datetime) -> Dict[str, Any]:
+        """Merge the agent's counters for buckets starting at or after since."""
+        since_key = self._bucket_of(since)
+        totals = AgentSpanCounters(since_key)
+        for counters in reversed(self.agent_counters.get(agent_id, ())):
+            if counters.bucket < since_key:
+                break
+            totals.total += counters.total
+            totals.errors += counters.errors
+            totals.tasks += counters.tasks
+            totals.communications += counters.communications
+            totals.completed += counters.completed
+            totals.duration_sum += counters.duration_sum
+            totals.workflow_ids |= counters.workflow_ids
+        return {
+            "total_spans": totals.total,
+            "error_spans": totals.errors,
+            "task_spans": totals.tasks,
+            "communication_spans": totals.communications,
+            "avg_span_duration": totals.duration_sum / totals.completed if totals.completed else 0.0,
+            "workflow_ids": totals.workflow_ids
+        }
+    
+    def expire_before(self, cutoff_time: datetime) -> int:
+        """Drop every bucket that ends before cutoff_time; returns spans dropped."""
+        cutoff_key = self._bucket_of(cutoff_time)
+        dropped = 0
+        while self._buckets and next(iter(self._buckets)) < cutoff_key:
+            dropped += self._drop_oldest_bucket()
+        return dropped
+    
+    def _drop_oldest_bucket(self) -> int:
+        bucket_key, bucket = self._buckets.popitem(last=False)
+        for span_id, metadata in bucket.items():
+            self._unlink(span_id, metadata)
+            for agent_id in metadata["agent_ids"]:
+                counters = self.agent_counters.get(agent_id)
+                while counters and counters[0].bucket <= bucket_key:
+                    counters.popleft()
+                if not self.agent_spans.get(agent_id) and not counters:
+                    self.agent_spans.pop(agent_id, None)
+                    self.agent_counters.pop(agent_id, None)
+        return len(bucket)
+    
+    def _drop_oldest_span(self) -> None:
+        """Evict the first span inserted into the oldest bucket.
+        
+        The bucket's agent counters are kept until the bucket itself expires.
+        """
+        bucket_key, bucket = next(iter(self._buckets.items()))
+        span_id = next(iter(bucket))
+        self._unlink(span_id, bucket.pop(span_id))
+        if not bucket:
+            del self._buckets[bucket_key]
+    
+    def _unlink(self, span_id: str, metadata: Dict[str, Any]) -> None:
+        """Remove an evicted span from the id index and the agent/workflow deques."""
+        del self._index[span_id]
+        for agent_id in metadata["agent_ids"]:
+            spans = self.agent_spans.get(agent_id)
+            if spans and spans[0] == span_id:
+                spans.popleft()
+        workflow_id = metadata.get("workflow_id")
+        if workflow_id:
+            spans = self.workflow_spans.get(workflow_id)
+            if spans and spans[0] == span_id:
+                spans.popleft()
+            if not spans:
+                self.workflow_spans.pop(workflow_id, None)
+
+
+class SpanLogExporter(SpanExporter):
+    """Exporter writing spans to a rotating, length-prefixed binary log.
+    
+    Each record is a 4-byte big-endian length followed by a compact JSON
+    encoding of the span. Files rotate at ``max_bytes`` and only the newest
+    ``max_files`` are kept. Logs can be read back with read_span_log() and
+    re-exported to a real backend later with replay_span_log(), which makes
+    this usable as an offline stand-in for Jaeger/OTLP in air-gapped setups.
+    """
+    
+    HEADER = struct.Struct(">I")
+    FILE_PREFIX = "spans-"
+    FILE_SUFFIX = ".log"
+    
+    def __init__(self, directory: str = "traces", max_bytes: int = 16 * 1024 * 1024,
+                 max_files: int = 8):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_size = 0
+        os.makedirs(directory, exist_ok=True)
+        existing = span_log_files(directory)
+        self._index = self._file_index(existing[-1]) if existing else 0
+        self.exported_count = 0
+    
+    @classmethod
+    def _file_index(cls, path: str) -> int:
+        return int(os.path.basename(path)[len(cls.FILE_PREFIX):-len(cls.FILE_SUFFIX)])
+    
+    def _path(self, index: int) -> str:
+        return os.path.join(self.directory, f"{self.FILE_PREFIX}{index:08d}{self.FILE_SUFFIX}")
+    
+    def _open_next(self) -> None:
+        if self._file:
+            self._file.close()
+        self._index += 1
+        self._file = open(self._path(self._index), "ab")
+        self._file_size = 0
+        for stale in span_log_files(self.directory)[:-self.max_files]:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    
+    @staticmethod
+    def encode_span(span: ReadableSpan) -> bytes:
+        """Encode a finished span as compact JSON bytes."""
+        context = span.get_span_context()
+        record = {
+            "n": span.name,
+            "t": format(context.trace_id, "032x"),
+            "s": format(context.span_id, "016x"),
+            "p": format(span.parent.span_id, "016x") if span.parent else None,
+            "k": span.kind.name,
+            "st": span.start_time,
+            "et": span.end_time,
+            "sc": span.status.status_code.name,
+            "sd": span.status.description,
+            "a": dict(span.attributes or {}),
+            "e": [[event.name, event.timestamp, dict(event.attributes or {})] for event in span.events],
+            "r": dict(span.resource.attributes) if span.resource else {}
+        }
+        return json.dumps(record, separators=(",", ":"), default=str).encode("utf-8")
+    
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        try:
+            payloads = [self.encode_span(span) for span in spans]
+            with self._lock:
+                for payload in payloads:
+                    if self._file is None or self._file_size + len(payload) + 4 > self.max_bytes:
+                        self._open_next()
+                    self._file.write(self.HEADER.pack(len(payload)))
+                    self._file.write(payload)
+                    self._file_size += len(payload) + 4
+                self._file.flush()
+                self.exported_count += len(payloads)
+            return SpanExportResult.SUCCESS
+        except Exception:
+            logging.getLogger(__name__).exception("Failed to write span log")
+            return SpanExportResult.FAILURE
+    
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        with self._lock:
+            if self._file:
+                self._file.flush()
+        return True
+    
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+class FallbackSpanExporter(SpanExporter):
+    """Exporter that writes a batch to a fallback when the primary fails.
+    
+    Wraps a network exporter so spans that cannot be delivered at export time
+    (collector unreachable, timeouts) land in the span log instead of being
+    dropped, ready for replay_span_log().
+    """
+    
+    def __init__(self, primary: SpanExporter, fallback: SpanExporter):
+        self.primary = primary
+        self.fallback = fallback
+        self.fallback_count = 0
+    
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        try:
+            result = self.primary.export(spans)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"{type(self.primary).__name__} export failed: {e}")
+            result = SpanExportResult.FAILURE
+        if result == SpanExportResult.SUCCESS:
+            return result
+        
+        self.fallback_count += len(spans)
+        return self.fallback.export(spans)
+    
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        primary_flushed = self.primary.force_flush(timeout_millis)
+        return self.fallback.force_flush(timeout_millis) and primary_flushed
+    
+    def shutdown(self) -> None:
+        self.primary.shutdown()
+        self.fallback.shutdown()
+
+
+def span_log_files(directory: str) -> List[str]:
+    """Span log files in a directory, oldest first."""
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(
+        name for name in os.listdir(directory)
+        if name.startswith(SpanLogExporter.FILE_PREFIX) and name.endswith(SpanLogExporter.FILE_SUFFIX)
+    )
+    return [os.path.join(directory, name) for name in names]
+
+
+def read_span_log(directory: str) -> Iterator[Dict[str, Any]]:
+    """Yield decoded span records from a span log directory in write order.
+    
+    A truncated record at the end of a file (e.g. after a crash) is skipped.
+    """
+    header = SpanLogExporter.HEADER
+    for path in span_log_files(directory):
+        with open(path, "rb") as log_file:
+            while True:
+                prefix = log_file.read(header.size)
+                if len(prefix) < header.size:
+                    break
+                (length,) = header.unpack(prefix)
+                payload = log_file.read(length)
+                if len(payload) < length:
+                    break
+                yield json.loads(payload)
+
+
+def span_from_record(record: Dict[str, Any]) -> ReadableSpan:
+    """Rebuild a ReadableSpan from a span log record."""
+    trace_flags = TraceFlags(TraceFlags.SAMPLED)
+    trace_id = int(record["t"], 16)
+    parent = SpanContext(trace_id, int(record["p"], 16), is_remote=False,
+                         trace_flags=trace_flags) if record.get("p") else None
+    return ReadableSpan(
+        name=record["n"],
+        context=SpanContext(trace_id, int(record["s"], 16), is_remote=False, trace_flags=trace_flags),
+        parent=parent,
+        resource=Resource.create(record.get("r") or {}),
+        attributes=record.get("a") or {},
+        events=[Event(name, attributes, timestamp) for name, timestamp, attributes in record.get("e", [])],
+        kind=SpanKind[record.get("k", "INTERNAL")],
+        status=Status(StatusCode[record.get("sc", "UNSET")], record.get("sd")),
+        start_time=record.get("st"),
+        end_time=record.get("et")
+    )
+
+
+def replay_span_log(directory: str, exporter: SpanExporter, batch_size: int = 512) -> int:
+    """Re-export every span in a span log through another exporter.
+    
+    Returns the number of spans exported successfully.
+    """
+    exported = 0
+    batch: List[ReadableSpan] = []
+    for record in read_span_log(directory):
+        batch.append(span_from_record(record))
+        if len(batch) >= batch_size:
+            if exporter.export(batch) == SpanExportResult.SUCCESS:
+                exported += len(batch)
+            batch = []
+    if batch and exporter.export(batch) == SpanExportResult.SUCCESS:
+        exported += len(batch)
+    return exported
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """Buffers spans per trace and decides what to export when the trace ends.
+    
+    A trace is kept when any span errored, when its local root ran longer
+    than ``slow_threshold_ms``, or otherwise with probability ``sample_rate``
+    (decided from the trace id, so the decision is consistent). Kept spans
+    are forwarded to the wrapped processor. The buffer is bounded by
+    ``max_traces`` and ``max_spans_per_trace``; evicted traces are decided
+    early with whatever they contain.
+    """
+    
+    _TRACE_ID_LIMIT = (1 << 64) - 1
+    
+    def __init__(self, delegate: SpanProcessor, sample_rate: float = 0.1,
+                 slow_threshold_ms: float = 1000.0, max_traces: int = 10000,
+                 max_spans_per_trace: int = 1000):
+        self.delegate = delegate
+        self.sample_rate = sample_rate
+        self.slow_threshold_ns = int(slow_threshold_ms * 1_000_000)
+        self.max_traces = max_traces
+        self.max_spans_per_trace = max_spans_per_trace
+        self._bound = round(sample_rate * (self._TRACE_ID_LIMIT + 1))
+        self._traces: "OrderedDict[int, List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.kept_traces = 0
+        self.dropped_traces = 0
+    
+    def on_start(self, span, parent_context=None) -> None:
+        self.delegate.on_start(span, parent_context=parent_context)
+    
+    def on_end(self, span: ReadableSpan) -> None:
+        trace_id = span.get_span_context().trace_id
+        is_root = span.parent is None or span.parent.is_remote
+        is_error = span.status.status_code == StatusCode.ERROR
+        is_slow = (is_root and span.end_time is not None and span.start_time is not None and
+                   span.end_time - span.start_time >= self.slow_threshold_ns)
+        
+        with self._lock:
+            entry = self._traces.get(trace_id)
+            if entry is None:
+                entry = self._traces[trace_id] = [False, []]
+            entry[0] = entry[0] or is_error or is_slow
+            if len(entry[1]) < self.max_spans_per_trace:
+                entry[1].append(span)
+            
+            decided = []
+            if is_root:
+                decided.append((trace_id, self._traces.pop(trace_id)))
+            while len(self._traces) > self.max_traces:
+                decided.append(self._traces.popitem(last=False))
+        
+        for decided_trace_id, (interesting, spans) in decided:
+            self._decide(decided_trace_id, interesting, spans)
+    
+    def _decide(self, trace_id: int, interesting: bool, spans: List[ReadableSpan]) -> None:
+        keep = interesting or (trace_id & self._TRACE_ID_LIMIT) < self._bound
+        with self._lock:
+            if keep:
+                self.kept_traces += 1
+            else:
+                self.dropped_traces += 1
+        if keep:
+            for span in spans:
+                self.delegate.on_end(span)
+    
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.delegate.force_flush(timeout_millis)
+    
+    def shutdown(self) -> None:
+        with self._lock:
+            pending = list(self._traces.items())
+            self._traces.clear()
+        for trace_id, (interesting, spans) in pending:
+            self._decide(trace_id, interesting, spans)
+        self.delegate.shutdown()
+
+
 class DistributedTracingSystem:
     """OpenTelemetry-based distributed tracing for multi-agent systems."""
     
     def __init__(self, service_name: str = "agent-hive", 
                  jaeger_endpoint: str = "http://localhost:14268/api/traces",
-                 enable_console_export: bool = False):
+                 enable_console_export: bool = False,
+                 max_spans: int = 100000,
+                 max_spans_per_agent: int = 10000,
+                 exporters: Optional[List[Any]] = None,
+                 span_log_dir: str = "traces",
+                 data_dir: Optional[str] = None,
+                 head_sample_rate: float = 1.0,
+                 tail_sample_rate: Optional[float] = None,
+                 slow_threshold_ms: float = 1000.0):
+        """
+        Args:
+            exporters: Exporter names ("jaeger", "otlp", "file", "console") or
+                SpanExporter instances. Defaults to ["jaeger"]. Network
+                exporters that are unavailable fall back to the span log.
+            span_log_dir: Directory for the on-disk span log; relative
+                paths are resolved against data_dir.
+            data_dir: Base directory for tracing data. Defaults to
+                DEFAULT_DATA_DIR rather than the working directory.
+            head_sample_rate: Fraction of new traces recorded at all.
+            tail_sample_rate: When set, buffer each trace and export all
+                failed or slow traces plus this fraction of the rest.
+            slow_threshold_ms: Root span duration that marks a trace as slow.
+        """
         self.logger = logging.getLogger(__name__)
         self.service_name = service_name
         self.jaeger_endpoint = jaeger_endpoint
+        self.exporter_config = exporters if exporters is not None else ["jaeger"]
+        self.data_dir = data_dir or DEFAULT_DATA_DIR
+        self.span_log_dir = os.path.join(self.data_dir, span_log_dir)
+        self.head_sample_rate = head_sample_rate
+        self.tail_sample_rate = tail_sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.exporters: List[SpanExporter] = []
+        self._span_log: Optional[SpanLogExporter] = None
         
         # Tracing components
         self.tracer_provider: Optional[TracerProvider] = None
@@ -126,19 +655,18 @@ class DistributedTracingSystem:
         
         # Workflow tracking
         self.active_workflows: Dict[str, WorkflowTrace] = {}
-        self.completed_workflows: List[WorkflowTrace] = []
-        self.workflow_spans: Dict[str, List[str]] = defaultdict(list)  # workflow_id -> span_ids
+        self.completed_workflows: deque = deque()
+        self.workflow_root_spans: Dict[str, Any] = {}  # workflow_id -> open root span
         
-        # Span tracking
-        self.span_metadata: Dict[str, Dict[str, Any]] = {}
-        self.agent_spans: Dict[str, List[str]] = defaultdict(list)  # agent_id -> span_ids
+        # Span tracking (time-partitioned, bounded)
+        self.span_store = SpanStore(max_spans=max_spans, max_spans_per_agent=max_spans_per_agent)
         
         # Configuration
         self.enable_console_export = enable_console_export
         self.max_completed_workflows = 1000
         
-        # Thread safety
-        self.lock = threading.Lock()
+        # Thread safety (re-entrant: shutdown completes workflows under the lock)
+        self.lock = threading.RLock()
         
         # Initialize tracing
         self._setup_tracing()
@@ -155,41 +683,94 @@ class DistributedTracingSystem:
                 "deployment.environment": "production"
             })
             
+            # Head-based sampling: decided once per trace when it starts
+            sampler = ALWAYS_ON if self.head_sample_rate >= 1.0 else ParentBased(
+                TraceIdRatioBased(self.head_sample_rate)
+            )
+            
             # Create tracer provider
-            self.tracer_provider = TracerProvider(resource=resource)
+            self.tracer_provider = TracerProvider(resource=resource, sampler=sampler)
             trace.set_tracer_provider(self.tracer_provider)
             
             # Setup exporters
-            exporters = []
+            configured = list(self.exporter_config)
+            if self.enable_console_export and "console" not in configured:
+                configured.append("console")
+            for exporter_spec in configured:
+                exporter = self._build_exporter(exporter_spec)
+                if exporter is not None and exporter not in self.exporters:
+                    self.exporters.append(exporter)
+            if self._span_log in self.exporters:
+                # Spans already go to the span log; no per-export fallback needed
+                self.exporters = [e.primary if isinstance(e, FallbackSpanExporter) else e
+                                  for e in self.exporters]
             
-            # Jaeger exporter
-            jaeger_exporter = JaegerExporter(
-                agent_host_name="localhost",
-                agent_port=14268,
-                collector_endpoint=self.jaeger_endpoint,
-            )
-            exporters.append(jaeger_exporter)
-            
-            # Console exporter for debugging
-            if self.enable_console_export:
-                console_exporter = ConsoleSpanExporter()
-                exporters.append(console_exporter)
-            
-            # Add span processors
-            for exporter in exporters:
+            # Add span processors (tail sampling wraps each exporter's batch processor)
+            for exporter in self.exporters:
                 span_processor = BatchSpanProcessor(exporter)
+                if self.tail_sample_rate is not None:
+                    span_processor = TailSamplingSpanProcessor(
+                        span_processor,
+                        sample_rate=self.tail_sample_rate,
+                        slow_threshold_ms=self.slow_threshold_ms
+                    )
                 self.tracer_provider.add_span_processor(span_processor)
             
             # Get tracer
-            self.tracer = trace.get_tracer(__name__)
+            self.tracer = self.tracer_provider.get_tracer(__name__)
             
-            self.logger.info("OpenTelemetry tracing configured successfully")
+            self.logger.info(f"OpenTelemetry tracing configured with exporters: "
+                             f"{[type(e).__name__ for e in self.exporters]}")
             
         except Exception as e:
             self.logger.error(f"Failed to setup tracing: {e}")
             # Fallback to no-op tracer
             self.tracer = trace.NoOpTracer()
     
+    def _build_exporter(self, spec: Any) -> Optional[SpanExporter]:
+        """Create an exporter from a name, falling back to the span log."""
+        if isinstance(spec, SpanExporter):
+            return spec
+        
+        try:
+            if spec == "file":
+                return self._span_log_exporter()
+            if spec == "console":
+                return ConsoleSpanExporter()
+            if spec == "jaeger":
+                if JaegerExporter is None:
+                    raise ImportError("opentelemetry-exporter-jaeger is not installed")
+                return FallbackSpanExporter(JaegerExporter(
+                    agent_host_name="localhost",
+                    agent_port=14268,
+                    collector_endpoint=self.jaeger_endpoint,
+                ), self._span_log_exporter())
+            if spec == "otlp":
+                if OTLPSpanExporter is None:
+                    raise ImportError("opentelemetry-exporter-otlp is not installed")
+                return FallbackSpanExporter(OTLPSpanExporter(), self._span_log_exporter())
+            self.logger.warning(f"Unknown trace exporter: {spec}")
+            return None
+        except Exception as e:
+            self.logger.warning(f"Trace exporter '{spec}' unavailable ({e}); writing spans to {self.span_log_dir}")
+            return self._span_log_exporter()
+    
+    def _span_log_exporter(self) -> SpanLogExporter:
+        """The system's single span log exporter, created on first use."""
+        if self._span_log is None:
+            self._span_log = SpanLogExporter(self.span_log_dir)
+        return self._span_log
+    
+    def _workflow_context(self, workflow_id: Optional[str]) -> Any:
+        """Parent context placing a span under its workflow's root span.
+        
+        Used only when there is no active span, so explicit nesting wins.
+        """
+        if not workflow_id or trace.get_current_span() != trace.INVALID_SPAN:
+            return None
+        root_span = self.workflow_root_spans.get(workflow_id)
+        return trace.set_span_in_context(root_span) if root_span is not None else None
+    
     def start_workflow_trace(self, workflow_id: str, workflow_type: WorkflowType,
                            participating_agents: List[str], 
                            tags: Optional[Dict[str, str]] = None) -> str:
@@ -234,15 +815,13 @@ class DistributedTracingSystem:
             
             # Store span metadata
             span_id = format(span.get_span_context().span_id, '016x')
-            self.span_metadata[span_id] = {
+            self.span_store.add(span_id, {
                 "workflow_id": workflow_id,
                 "span_type": SpanType.ROOT.value,
                 "agent_id": None,
-                "start_time": start_time,
-                "span_object": span
-            }
-            
-            self.workflow_spans[workflow_id].append(span_id)
+                "start_time": start_time
+            })
+            self.workflow_root_spans[workflow_id] = span
             
             self.logger.info(f"Started workflow trace: {workflow_id} (trace_id: {trace_id})")
             
@@ -259,7 +838,7 @@ class DistributedTracingSystem:
         
         span_name = f"agent_{agent_id}_{operation_name}"
         
-        with self.tracer.start_as_current_span(span_name) as span:
+        with self.tracer.start_as_current_span(span_name, context=self._workflow_context(workflow_id)) as span:
             # Set standard attributes
             span.set_attribute("agent.id", agent_id)
             span.set_attribute("operation.name", operation_name)
@@ -278,27 +857,25 @@ class DistributedTracingSystem:
             trace_id = format(span.get_span_context().trace_id, '032x')
             
             with self.lock:
-                self.span_metadata[span_id] = {
+                self.span_store.add(span_id, {
                     "workflow_id": workflow_id,
                     "span_type": SpanType.AGENT_OPERATION.value,
                     "agent_id": agent_id,
                     "operation_name": operation_name,
-                    "start_time": datetime.now(),
-                    "span_object": span
-                }
-                
-                self.agent_spans[agent_id].append(span_id)
+                    "start_time": datetime.now()
+                }, (agent_id,))
                 
                 if workflow_id:
-                    self.workflow_spans[workflow_id].append(span_id)
                     if workflow_id in self.active_workflows:
                         self.active_workflows[workflow_id].total_spans += 1
             
+            failed = False
             try:
                 yield span
                 span.set_status(Status(StatusCode.OK))
                 
             except Exception as e:
+                failed = True
                 span.set_status(Status(StatusCode.ERROR, str(e)))
                 span.record_exception(e)
                 
@@ -311,8 +888,7 @@ class DistributedTracingSystem:
             finally:
                 # Update span metadata
                 with self.lock:
-                    if span_id in self.span_metadata:
-                        self.span_metadata[span_id]["end_time"] = datetime.now()
+                    self.span_store.finish(span_id, datetime.now(), error=failed)
     
     @contextmanager
     def trace_task_execution(self, task_id: str, task_type: str, agent_id: str,
@@ -325,7 +901,7 @@ class DistributedTracingSystem:
         
         span_name = f"task_{task_type}"
         
-        with self.tracer.start_as_current_span(span_name) as span:
+        with self.tracer.start_as_current_span(span_name, context=self._workflow_context(workflow_id)) as span:
             # Set standard attributes
             span.set_attribute("task.id", task_id)
             span.set_attribute("task.type", task_type)
@@ -344,29 +920,27 @@ class DistributedTracingSystem:
             span_id = format(span.get_span_context().span_id, '016x')
             
             with self.lock:
-                self.span_metadata[span_id] = {
+                self.span_store.add(span_id, {
                     "workflow_id": workflow_id,
                     "span_type": SpanType.TASK.value,
                     "agent_id": agent_id,
                     "task_id": task_id,
                     "task_type": task_type,
-                    "start_time": datetime.now(),
-                    "span_object": span
-                }
-                
-                self.agent_spans[agent_id].append(span_id)
+                    "start_time": datetime.now()
+                }, (agent_id,))
                 
                 if workflow_id:
-                    self.workflow_spans[workflow_id].append(span_id)
                     if workflow_id in self.active_workflows:
                         self.active_workflows[workflow_id].total_spans += 1
             
+            failed = False
             try:
                 yield span
                 span.set_status(Status(StatusCode.OK))
                 span.add_event("task_completed")
                 
             except Exception as e:
+                failed = True
                 span.set_status(Status(StatusCode.ERROR, str(e)))
                 span.record_exception(e)
                 span.add_event("task_failed", {"error": str(e)})
@@ -378,9 +952,9 @@ class DistributedTracingSystem:
                 raise
             
             finally:
+                # Update span metadata
                 with self.lock:
-                    if span_id in self.span_metadata:
-                        self.span_metadata[span_id]["end_time"] = datetime.now()
+                    self.span_store.finish(span_id, datetime.now(), error=failed)
     
     @contextmanager
     def trace_agent_communication(self, sender_agent: str, receiver_agent: str,
@@ -393,7 +967,7 @@ class DistributedTracingSystem:
         
         span_name = f"comm_{message_type}_{sender_agent}_to_{receiver_agent}"
         
-        with self.tracer.start_as_current_span(span_name) as span:
+        with self.tracer.start_as_current_span(span_name, context=self._workflow_context(workflow_id)) as span:
             # Set communication attributes
             span.set_attribute("communication.sender", sender_agent)
             span.set_attribute("communication.receiver", receiver_agent)
@@ -411,31 +985,28 @@ class DistributedTracingSystem:
             span_id = format(span.get_span_context().span_id, '016x')
             
             with self.lock:
-                self.span_metadata[span_id] = {
+                # Indexed under both agents
+                self.span_store.add(span_id, {
                     "workflow_id": workflow_id,
                     "span_type": SpanType.COMMUNICATION.value,
                     "sender_agent": sender_agent,
                     "receiver_agent": receiver_agent,
                     "message_type": message_type,
-                    "start_time": datetime.now(),
-                    "span_object": span
-                }
-                
-                # Add to both agents' span lists
-                self.agent_spans[sender_agent].append(span_id)
-                self.agent_spans[receiver_agent].append(span_id)
+                    "start_time": datetime.now()
+                }, (sender_agent, receiver_agent))
                 
                 if workflow_id:
-                    self.workflow_spans[workflow_id].append(span_id)
                     if workflow_id in self.active_workflows:
                         self.active_workflows[workflow_id].total_spans += 1
             
+            failed = False
             try:
                 yield span
                 span.set_status(Status(StatusCode.OK))
                 span.add_event("communication_successful")
                 
             except Exception as e:
+                failed = True
                 span.set_status(Status(StatusCode.ERROR, str(e)))
                 span.record_exception(e)
                 span.add_event("communication_failed", {"error": str(e)})
@@ -447,9 +1018,9 @@ class DistributedTracingSystem:
                 raise
             
             finally:
+                # Update span metadata
                 with self.lock:
-                    if span_id in self.span_metadata:
-                        self.span_metadata[span_id]["end_time"] = datetime.now()
+                    self.span_store.finish(span_id, datetime.now(), error=failed)
     
     def complete_workflow_trace(self, workflow_id: str, status: str = "completed",
                               final_attributes: Optional[Dict[str, Any]] = None) -> None:
@@ -471,39 +1042,31 @@ class DistributedTracingSystem:
             if final_attributes:
                 workflow_trace.custom_attributes.update(final_attributes)
             
-            # Find and close root span
-            root_spans = [
-                span_id for span_id in self.workflow_spans[workflow_id]
-                if (span_id in self.span_metadata and 
-                    self.span_metadata[span_id]["span_type"] == SpanType.ROOT.value)
-            ]
-            
-            for span_id in root_spans:
-                span_meta = self.span_metadata.get(span_id)
-                if span_meta and "span_object" in span_meta:
-                    span = span_meta["span_object"]
-                    span.set_attribute("workflow.status", status)
-                    span.set_attribute("workflow.duration", duration)
-                    span.set_attribute("workflow.total_spans", workflow_trace.total_spans)
-                    span.set_attribute("workflow.error_spans", workflow_trace.error_spans)
-                    
-                    if final_attributes:
-                        for key, value in final_attributes.items():
-                            span.set_attribute(key, str(value))
-                    
-                    if status == "failed":
-                        span.set_status(Status(StatusCode.ERROR, "Workflow failed"))
-                    else:
-                        span.set_status(Status(StatusCode.OK))
-                    
-                    span.end()
+            # Close root span
+            span = self.workflow_root_spans.pop(workflow_id, None)
+            if span is not None:
+                span.set_attribute("workflow.status", status)
+                span.set_attribute("workflow.duration", duration)
+                span.set_attribute("workflow.total_spans", workflow_trace.total_spans)
+                span.set_attribute("workflow.error_spans", workflow_trace.error_spans)
+                
+                if final_attributes:
+                    for key, value in final_attributes.items():
+                        span.set_attribute(key, str(value))
+                
+                if status == "failed":
+                    span.set_status(Status(StatusCode.ERROR, "Workflow failed"))
+                else:
+                    span.set_status(Status(StatusCode.OK))
+                
+                span.end()
             
             # Move to completed workflows
             self.completed_workflows.append(workflow_trace)
             
             # Cleanup old completed workflows
-            if len(self.completed_workflows) > self.max_completed_workflows:
-                self.completed_workflows = self.completed_workflows[-self.max_completed_workflows:]
+            while len(self.completed_workflows) > self.max_completed_workflows:
+                self.completed_workflows.popleft()
             
             self.logger.info(f"Completed workflow trace: {workflow_id} (duration: {duration:.2f}s, status: {status})")
     
@@ -585,27 +1148,9 @@ class DistributedTracingSystem:
         start_time = current_time - time_window
         
         with self.lock:
-            agent_span_ids = self.agent_spans.get(agent_id, [])
-            
-            # Filter spans by time window
-            recent_spans = []
-            for span_id in agent_span_ids:
-                span_meta = self.span_metadata.get(span_id)
-                if span_meta and span_meta["start_time"] >= start_time:
-                    recent_spans.append(span_meta)
-            
-            # Calculate metrics
-            total_spans = len(recent_spans)
-            error_spans = sum(1 for span in recent_spans if span.get("error", False))
-            task_spans = [s for s in recent_spans if s["span_type"] == SpanType.TASK.value]
-            comm_spans = [s for s in recent_spans if s["span_type"] == SpanType.COMMUNICATION.value]
-            
-            # Calculate durations for completed spans
-            completed_spans = [s for s in recent_spans if "end_time" in s]
-            avg_duration = 0.0
-            if completed_spans:
-                durations = [(s["end_time"] - s["start_time"]).total_seconds() for s in completed_spans]
-                avg_duration = sum(durations) / len(durations)
+            counters = self.span_store.agent_summary(agent_id, start_time)
+            total_spans = counters["total_spans"]
+            error_spans = counters["error_spans"]
             
             return {
                 "agent_id": agent_id,
@@ -613,13 +1158,13 @@ class DistributedTracingSystem:
                 "total_spans": total_spans,
                 "error_spans": error_spans,
                 "success_rate": (total_spans - error_spans) / max(1, total_spans),
-                "task_spans": len(task_spans),
-                "communication_spans": len(comm_spans),
-                "avg_span_duration": avg_duration,
-                "active_workflows": len(set(
-                    span["workflow_id"] for span in recent_spans 
-                    if span["workflow_id"] and span["workflow_id"] in self.active_workflows
-                ))
+                "task_spans": counters["task_spans"],
+                "communication_spans": counters["communication_spans"],
+                "avg_span_duration": counters["avg_span_duration"],
+                "active_workflows": len([
+                    workflow_id for workflow_id in counters["workflow_ids"]
+                    if workflow_id in self.active_workflows
+                ])
             }
     
     def get_system_trace_overview(self) -> Dict[str, Any]:
@@ -662,8 +1207,8 @@ class DistributedTracingSystem:
                 "completed_workflows_1h": total_recent,
                 "workflow_success_rate": success_rate,
                 "avg_workflow_duration": avg_duration,
-                "total_agents_tracked": len(self.agent_spans),
-                "total_spans_tracked": len(self.span_metadata),
+                "total_agents_tracked": len(self.span_store.agent_spans),
+                "total_spans_tracked": len(self.span_store),
                 "tracing_enabled": self.tracer is not None and not isinstance(self.tracer, trace.NoOpTracer)
             }
     
@@ -672,32 +1217,17 @@ class DistributedTracingSystem:
         cutoff_time = datetime.now() - timedelta(hours=retention_hours)
         
         with self.lock:
-            # Clean up old span metadata
-            old_span_ids = [
-                span_id for span_id, meta in self.span_metadata.items()
-                if meta["start_time"] < cutoff_time
-            ]
+            # Drop whole expired time buckets
+            removed_spans = self.span_store.expire_before(cutoff_time)
             
-            for span_id in old_span_ids:
-                del self.span_metadata[span_id]
-                
-                # Remove from agent spans
-                for agent_spans in self.agent_spans.values():
-                    if span_id in agent_spans:
-                        agent_spans.remove(span_id)
-                
-                # Remove from workflow spans
-                for workflow_spans in self.workflow_spans.values():
-                    if span_id in workflow_spans:
-                        workflow_spans.remove(span_id)
-            
-            # Clean up old completed workflows
-            self.completed_workflows = [
-                w for w in self.completed_workflows
-                if w.end_time is None or w.end_time >= cutoff_time
-            ]
+            # Clean up old completed workflows (ordered by completion time)
+            while self.completed_workflows and (
+                self.completed_workflows[0].end_time is not None and
+                self.completed_workflows[0].end_time < cutoff_time
+            ):
+                self.completed_workflows.popleft()
             
-            self.logger.info(f"Cleaned up {len(old_span_ids)} old spans and old workflows")
+            self.logger.info(f"Cleaned up {removed_spans} old spans and old workflows")
     
     def shutdown(self) -> None:
         """Shutdown tracing system gracefully."""
@@ -25,6 +25,7 @@ from .load_balancer import ServiceLoadBalancer, LoadBalancingAlgorithm
 from .circuit_breaker import CircuitBreakerManager, CircuitBreakerConfig, with_circuit_breaker
 from .auth_middleware import AuthenticationMiddleware, AuthResult
 from .rate_limit_middleware import RateLimitMiddleware
+from metrics_registry import REGISTRY, MetricsRegistry
 
 
 logger = logging.getLogger(__name__)
@@ -45,9 +46,11 @@ class ApiGateway:
     - Comprehensive logging and metrics
     """
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 metrics_registry: Optional[MetricsRegistry] = None):
         """Initialize API Gateway with JWT authentication."""
         self.config = config or self._get_default_config()
+        self.metrics_registry = metrics_registry if metrics_registry is not None else REGISTRY
         
         # Initialize core components
         self.service_discovery = ServiceDiscovery(self.config.get("service_discovery", {}))
@@ -64,7 +67,7 @@ class ApiGateway:
         
         # Initialize circuit breaker manager
         cb_config = CircuitBreakerConfig(**self.config.get("circuit_breaker", {}))
-        self.circuit_breaker_manager = CircuitBreakerManager(cb_config)
+        self.circuit_breaker_manager = CircuitBreakerManager(cb_config, self.metrics_registry)
         
         self.auth_middleware = AuthenticationMiddleware(self.config.get("auth", {}))
         self.rate_limit_middleware = RateLimitMiddleware(self.config.get("rate_limiting", {}))
@@ -82,6 +85,17 @@ class ApiGateway:
         self.error_count = 0
         self.active_requests: Dict[str, datetime] = {}
         
+        # Registry metrics, shared by every gateway in the process
+        self._requests_metric = self.metrics_registry.counter(
+            "api_gateway_requests", "Requests processed by the API gateway", ["method", "status"]
+        )
+        self._request_duration_metric = self.metrics_registry.histogram(
+            "api_gateway_request_duration_seconds", "API gateway request processing time", ["method"]
+        )
+        self._active_requests_metric = self.metrics_registry.gauge(
+            "api_gateway_active_requests", "Requests currently being processed by the API gateway"
+        )
+        
         # Route handlers
         self.route_handlers: Dict[str, Callable] = {}
         self.middleware_stack: List[Callable] = []
@@ -287,21 +301,25 @@ class ApiGateway:
         """
         start_time = time.time()
         request_id = request.request_id
+        response = None
         
         try:
             # Track active request
             self.active_requests[request_id] = datetime.utcnow()
             self.request_count += 1
+            self._active_requests_metric.inc()
             
             # Check if IP is blocked
             if request.client_ip in self.blocked_ips:
-                return self._create_error_response(
+                response = self._create_error_response(
                     403, "IP address blocked due to security violations", request_id
                 )
+                return response
             
             # CORS handling
             if request.method == "OPTIONS":
-                return self._handle_cors_preflight(request)
+                response = self._handle_cors_preflight(request)
+                return response
             
             # JWT Authentication
             auth_success, auth_metadata, auth_error = await self.jwt_service.authenticate_request(
@@ -311,7 +329,8 @@ class ApiGateway:
             
             if not auth_success:
                 self.error_count += 1
-                return auth_error
+                response = auth_error
+                return response
             
             # Add authentication metadata to request context
             request.headers["X-User-ID"] = auth_metadata.user_id or ""
@@ -344,11 +363,16 @@ class ApiGateway:
         except Exception as e:
             logger.error(f"API Gateway error processing request {request_id}: {e}")
             self.error_count += 1
-            return self._create_error_response(500, "Internal server error", request_id)
+            response = self._create_error_response(500, "Internal server error", request_id)
+            return response
         
         finally:
             # Clean up active request tracking
             self.active_requests.pop(request_id, None)
+            self._active_requests_metric.dec()
+            status = response.status_code if response is not None else 500
+            self._requests_metric.labels(request.method, status).inc()
+            self._request_duration_metric.labels(request.method).observe(time.time() - start_time)
     
     async def authenticate_user(self, username: str, password: str, client_ip: str) -> ApiResponse:
         """Authenticate user and return JWT tokens."""
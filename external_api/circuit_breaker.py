@@ -8,19 +8,24 @@ failure detection, state management, and recovery mechanisms.
 import asyncio
 import logging
 import time
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, Callable, TypeVar, Awaitable
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Callable, TypeVar, Awaitable
 from dataclasses import dataclass, field
 from enum import Enum
-import uuid
 
 from .service_discovery import ServiceInstance
+from metrics_registry import REGISTRY, MetricFamily, MetricsRegistry
 
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# Outcome flags stored per slot of the sliding window
+_FAILED = 1
+_SLOW = 2
+
 
 class CircuitBreakerState(Enum):
     """Circuit breaker states."""
@@ -39,6 +44,9 @@ class CircuitBreakerConfig:
     sliding_window_size: int = 20        # Window for failure calculation
     minimum_requests: int = 10           # Minimum requests before evaluation
     failure_rate_threshold: float = 50.0 # Failure rate % to open circuit
+    half_open_max_requests: int = 3      # Concurrent probe requests allowed when half-open
+    slow_call_duration_ms: float = 0.0   # Calls slower than this count as slow (0 disables)
+    slow_call_rate_threshold: float = 100.0  # Slow call rate % to open circuit
 
 
 @dataclass
@@ -47,7 +55,7 @@ class RequestResult:
     success: bool
     response_time_ms: float
     error: Optional[str] = None
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 @dataclass
@@ -56,14 +64,22 @@ class CircuitBreakerMetrics:
     total_requests: int = 0
     successful_requests: int = 0
     failed_requests: int = 0
+    slow_requests: int = 0
     total_blocks: int = 0
     last_failure_time: Optional[datetime] = None
-    last_success_time: Optional[datetime] = None
+    last_success_timestamp: Optional[float] = None
     current_consecutive_failures: int = 0
     current_consecutive_successes: int = 0
     state_changes: int = 0
     avg_response_time_ms: float = 0.0
-    
+
+    @property
+    def last_success_time(self) -> Optional[datetime]:
+        """Time of the last successful request."""
+        if self.last_success_timestamp is None:
+            return None
+        return datetime.fromtimestamp(self.last_success_timestamp, timezone.utc)
+
     @property
     def failure_rate(self) -> float:
         """Calculate current failure rate."""
@@ -83,6 +99,12 @@ class CircuitBreaker:
     
     Provides automatic failure detection and recovery with configurable
     thresholds and timeouts. Prevents cascading failures in distributed systems.
+
+    Outcomes are kept in a fixed-size ring of the last ``sliding_window_size``
+    calls with running failure and slow-call counters, so recording a call
+    and evaluating the window are constant time. Calls in the CLOSED state
+    skip the state lock entirely; HALF_OPEN admits at most
+    ``half_open_max_requests`` concurrent probes.
     """
     
     def __init__(self, name: str, config: Optional[CircuitBreakerConfig] = None):
@@ -93,16 +115,35 @@ class CircuitBreaker:
         # State management
         self.state = CircuitBreakerState.CLOSED
         self.last_failure_time: Optional[datetime] = None
-        self.state_changed_time = datetime.utcnow()
+        self.state_changed_time = datetime.now(timezone.utc)
+        self._half_open_in_flight = 0
+        # Bumped on every state change so probes admitted earlier release nothing
+        self._state_generation = 0
         
-        # Metrics and history
+        # Metrics and sliding window
         self.metrics = CircuitBreakerMetrics()
-        self.request_history: List[RequestResult] = []
+        self._window_size = max(1, self.config.sliding_window_size)
+        self._reset_window()
         
         # Async locks for thread safety
         self._state_lock = asyncio.Lock()
         
         logger.info(f"Circuit breaker '{name}' initialized in {self.state.value} state")
+
+    @property
+    def request_history(self) -> List[RequestResult]:
+        """Outcomes in the sliding window, oldest first."""
+        count = self._window_count
+        start = (self._window_pos - count) % self._window_size
+        history = []
+        for offset in range(count):
+            slot = (start + offset) % self._window_size
+            history.append(RequestResult(
+                success=not self._window_flags[slot] & _FAILED,
+                response_time_ms=self._window_times[slot],
+                error=self._window_errors[slot]
+            ))
+        return history
     
     async def call(self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
         """
@@ -120,16 +161,20 @@ class CircuitBreaker:
             CircuitBreakerOpenError: When circuit is open
             asyncio.TimeoutError: When request times out
         """
-        async with self._state_lock:
-            # Check if we should allow the request
-            if not await self._should_allow_request():
-                self.metrics.total_blocks += 1
-                raise CircuitBreakerOpenError(
-                    f"Circuit breaker '{self.name}' is {self.state.value}, request blocked"
-                )
+        probe = False
+        if self.state is not CircuitBreakerState.CLOSED:
+            async with self._state_lock:
+                # Check if we should allow the request
+                if not await self._should_allow_request():
+                    self.metrics.total_blocks += 1
+                    raise CircuitBreakerOpenError(
+                        f"Circuit breaker '{self.name}' is {self.state.value}, request blocked"
+                    )
+                probe = self.state is CircuitBreakerState.HALF_OPEN
+                generation = self._state_generation
         
         # Execute request with timeout
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             result = await asyncio.wait_for(
                 func(*args, **kwargs),
@@ -137,16 +182,20 @@ class CircuitBreaker:
             )
             
             # Record success
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             await self._record_success(response_time)
             
             return result
             
         except Exception as e:
             # Record failure
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             await self._record_failure(response_time, str(e))
             raise
+
+        finally:
+            if probe and generation == self._state_generation:
+                self._half_open_in_flight -= 1
     
     async def test_service(self, test_func: Callable[..., Awaitable[bool]], *args, **kwargs) -> bool:
         """
@@ -160,14 +209,14 @@ class CircuitBreaker:
         Returns:
             True if service is healthy
         """
+        start_time = time.perf_counter()
         try:
-            start_time = time.time()
             result = await asyncio.wait_for(
                 test_func(*args, **kwargs),
                 timeout=self.config.request_timeout
             )
             
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             
             if result:
                 await self._record_success(response_time)
@@ -177,7 +226,7 @@ class CircuitBreaker:
             return result
             
         except Exception as e:
-            response_time = (time.time() - time.time()) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             await self._record_failure(response_time, str(e))
             return False
     
@@ -199,20 +248,22 @@ class CircuitBreaker:
         async with self._state_lock:
             self.state = CircuitBreakerState.CLOSED
             self.metrics = CircuitBreakerMetrics()
-            self.request_history.clear()
+            self._reset_window()
+            self._half_open_in_flight = 0
+            self._state_generation += 1
             self.last_failure_time = None
-            self.state_changed_time = datetime.utcnow()
+            self.state_changed_time = datetime.now(timezone.utc)
             
             logger.info(f"Circuit breaker '{self.name}' reset to initial state")
     
     async def get_status(self) -> Dict[str, Any]:
         """Get current circuit breaker status."""
         time_since_state_change = (
-            datetime.utcnow() - self.state_changed_time
+            datetime.now(timezone.utc) - self.state_changed_time
         ).total_seconds()
         
-        recent_requests = self.request_history[-self.config.sliding_window_size:]
-        recent_failures = [r for r in recent_requests if not r.success]
+        window_count = self._window_count
+        last_success_time = self.metrics.last_success_time
         
         return {
             "name": self.name,
@@ -222,6 +273,7 @@ class CircuitBreaker:
                 "total_requests": self.metrics.total_requests,
                 "successful_requests": self.metrics.successful_requests,
                 "failed_requests": self.metrics.failed_requests,
+                "slow_requests": self.metrics.slow_requests,
                 "total_blocks": self.metrics.total_blocks,
                 "failure_rate_percent": round(self.metrics.failure_rate, 2),
                 "success_rate_percent": round(self.metrics.success_rate, 2),
@@ -231,10 +283,13 @@ class CircuitBreaker:
                 "state_changes": self.metrics.state_changes
             },
             "recent_window": {
-                "size": len(recent_requests),
-                "failures": len(recent_failures),
-                "failure_rate_percent": (len(recent_failures) / max(1, len(recent_requests))) * 100
+                "size": window_count,
+                "failures": self._window_failures,
+                "failure_rate_percent": (self._window_failures / max(1, window_count)) * 100,
+                "slow_calls": self._window_slow,
+                "slow_call_rate_percent": (self._window_slow / max(1, window_count)) * 100
             },
+            "half_open_in_flight": self._half_open_in_flight,
             "configuration": {
                 "failure_threshold": self.config.failure_threshold,
                 "recovery_timeout": self.config.recovery_timeout,
@@ -242,16 +297,52 @@ class CircuitBreaker:
                 "request_timeout": self.config.request_timeout,
                 "sliding_window_size": self.config.sliding_window_size,
                 "minimum_requests": self.config.minimum_requests,
-                "failure_rate_threshold": self.config.failure_rate_threshold
+                "failure_rate_threshold": self.config.failure_rate_threshold,
+                "half_open_max_requests": self.config.half_open_max_requests,
+                "slow_call_duration_ms": self.config.slow_call_duration_ms,
+                "slow_call_rate_threshold": self.config.slow_call_rate_threshold
             },
             "timestamps": {
                 "last_failure": self.last_failure_time.isoformat() if self.last_failure_time else None,
-                "last_success": self.metrics.last_success_time.isoformat() if self.metrics.last_success_time else None,
+                "last_success": last_success_time.isoformat() if last_success_time else None,
                 "state_changed": self.state_changed_time.isoformat()
             }
         }
     
     # Private methods
+
+    def _reset_window(self) -> None:
+        """Clear the sliding window."""
+        self._window_flags = bytearray(self._window_size)
+        self._window_times = array('d', bytes(8 * self._window_size))
+        self._window_errors: List[Optional[str]] = [None] * self._window_size
+        self._window_pos = 0
+        self._window_count = 0
+        self._window_failures = 0
+        self._window_slow = 0
+
+    def _record_outcome(self, failed: bool, response_time_ms: float, error: Optional[str] = None) -> None:
+        """Add an outcome to the sliding window, evicting the oldest when full."""
+        slow = 0 < self.config.slow_call_duration_ms <= response_time_ms
+        flags = (_FAILED if failed else 0) | (_SLOW if slow else 0)
+
+        pos = self._window_pos
+        if self._window_count == self._window_size:
+            evicted = self._window_flags[pos]
+            self._window_failures -= evicted & _FAILED
+            self._window_slow -= (evicted & _SLOW) >> 1
+        else:
+            self._window_count += 1
+
+        self._window_flags[pos] = flags
+        self._window_times[pos] = response_time_ms
+        self._window_errors[pos] = error
+        self._window_failures += failed
+        self._window_slow += slow
+        self._window_pos = pos + 1 if pos + 1 < self._window_size else 0
+
+        if slow:
+            self.metrics.slow_requests += 1
     
     async def _should_allow_request(self) -> bool:
         """Check if request should be allowed based on current state."""
@@ -261,51 +352,48 @@ class CircuitBreaker:
         if self.state == CircuitBreakerState.OPEN:
             # Check if recovery timeout has passed
             if self.last_failure_time:
-                time_since_failure = datetime.utcnow() - self.last_failure_time
+                time_since_failure = datetime.now(timezone.utc) - self.last_failure_time
                 if time_since_failure.total_seconds() >= self.config.recovery_timeout:
                     await self._change_state(CircuitBreakerState.HALF_OPEN)
+                    self._half_open_in_flight += 1
                     return True
             return False
         
         if self.state == CircuitBreakerState.HALF_OPEN:
-            # Allow limited requests to test recovery
-            return True
+            # Allow a bounded number of concurrent probes to test recovery
+            if self._half_open_in_flight < self.config.half_open_max_requests:
+                self._half_open_in_flight += 1
+                return True
+            return False
         
         return False
     
     async def _record_success(self, response_time_ms: float) -> None:
         """Record successful request."""
-        self.metrics.total_requests += 1
-        self.metrics.successful_requests += 1
-        self.metrics.current_consecutive_successes += 1
-        self.metrics.current_consecutive_failures = 0
-        self.metrics.last_success_time = datetime.utcnow()
+        metrics = self.metrics
+        metrics.total_requests += 1
+        metrics.successful_requests += 1
+        metrics.current_consecutive_successes += 1
+        metrics.current_consecutive_failures = 0
+        metrics.last_success_timestamp = time.time()
         
         # Update average response time
-        if self.metrics.avg_response_time_ms == 0:
-            self.metrics.avg_response_time_ms = response_time_ms
+        if metrics.avg_response_time_ms == 0:
+            metrics.avg_response_time_ms = response_time_ms
         else:
             # Exponential moving average
-            self.metrics.avg_response_time_ms = (
-                0.9 * self.metrics.avg_response_time_ms + 0.1 * response_time_ms
+            metrics.avg_response_time_ms = (
+                0.9 * metrics.avg_response_time_ms + 0.1 * response_time_ms
             )
         
-        # Add to history
-        self.request_history.append(RequestResult(
-            success=True,
-            response_time_ms=response_time_ms
-        ))
-        
-        # Trim history
-        if len(self.request_history) > self.config.sliding_window_size * 2:
-            self.request_history = self.request_history[-self.config.sliding_window_size:]
+        self._record_outcome(False, response_time_ms)
         
         # State transition logic
         if self.state == CircuitBreakerState.HALF_OPEN:
-            if self.metrics.current_consecutive_successes >= self.config.success_threshold:
+            if metrics.current_consecutive_successes >= self.config.success_threshold:
                 await self._change_state(CircuitBreakerState.CLOSED)
-        
-        logger.debug(f"Circuit breaker '{self.name}' recorded success: {response_time_ms:.2f}ms")
+        elif self._window_slow and self.state == CircuitBreakerState.CLOSED:
+            await self._evaluate_state_transition()
     
     async def _record_failure(self, response_time_ms: float, error: str) -> None:
         """Record failed request."""
@@ -313,18 +401,10 @@ class CircuitBreaker:
         self.metrics.failed_requests += 1
         self.metrics.current_consecutive_failures += 1
         self.metrics.current_consecutive_successes = 0
-        self.last_failure_time = datetime.utcnow()
+        self.last_failure_time = datetime.now(timezone.utc)
+        self.metrics.last_failure_time = self.last_failure_time
         
-        # Add to history
-        self.request_history.append(RequestResult(
-            success=False,
-            response_time_ms=response_time_ms,
-            error=error
-        ))
-        
-        # Trim history
-        if len(self.request_history) > self.config.sliding_window_size * 2:
-            self.request_history = self.request_history[-self.config.sliding_window_size:]
+        self._record_outcome(True, response_time_ms, error)
         
         # State transition logic
         await self._evaluate_state_transition()
@@ -334,21 +414,17 @@ class CircuitBreaker:
     async def _evaluate_state_transition(self) -> None:
         """Evaluate if state should change based on current metrics."""
         if self.state == CircuitBreakerState.CLOSED:
-            # Check if we should open
-            should_open = False
-            
             # Check consecutive failures
-            if self.metrics.current_consecutive_failures >= self.config.failure_threshold:
-                should_open = True
+            should_open = self.metrics.current_consecutive_failures >= self.config.failure_threshold
             
-            # Check failure rate in sliding window
-            recent_requests = self.request_history[-self.config.sliding_window_size:]
-            if len(recent_requests) >= self.config.minimum_requests:
-                recent_failures = [r for r in recent_requests if not r.success]
-                failure_rate = (len(recent_failures) / len(recent_requests)) * 100
-                
-                if failure_rate >= self.config.failure_rate_threshold:
-                    should_open = True
+            # Check failure and slow call rates in the sliding window
+            count = self._window_count
+            if not should_open and count >= self.config.minimum_requests:
+                should_open = (
+                    self._window_failures * 100 >= self.config.failure_rate_threshold * count or
+                    (self.config.slow_call_duration_ms > 0 and
+                     self._window_slow * 100 >= self.config.slow_call_rate_threshold * count)
+                )
             
             if should_open:
                 await self._change_state(CircuitBreakerState.OPEN)
@@ -362,8 +438,10 @@ class CircuitBreaker:
         if new_state != self.state:
             old_state = self.state
             self.state = new_state
-            self.state_changed_time = datetime.utcnow()
+            self.state_changed_time = datetime.now(timezone.utc)
             self.metrics.state_changes += 1
+            self._half_open_in_flight = 0
+            self._state_generation += 1
             
             logger.info(f"Circuit breaker '{self.name}' state changed: "
                        f"{old_state.value} -> {new_state.value}")
@@ -382,12 +460,16 @@ class CircuitBreakerManager:
     and endpoints with shared configuration and monitoring.
     """
     
-    def __init__(self, default_config: Optional[CircuitBreakerConfig] = None):
+    def __init__(self, default_config: Optional[CircuitBreakerConfig] = None,
+                 metrics_registry: Optional[MetricsRegistry] = None):
         """Initialize circuit breaker manager."""
         self.default_config = default_config or CircuitBreakerConfig()
         self.circuit_breakers: Dict[str, CircuitBreaker] = {}
         self._lock = asyncio.Lock()
         
+        self.metrics_registry = metrics_registry if metrics_registry is not None else REGISTRY
+        self.metrics_registry.register_collector(self.collect_metric_families)
+        
         logger.info("Circuit breaker manager initialized")
     
     async def get_or_create(self, name: str, config: Optional[CircuitBreakerConfig] = None) -> CircuitBreaker:
@@ -459,6 +541,29 @@ class CircuitBreakerManager:
             "overall_failure_rate": (total_failures / max(1, total_requests)) * 100
         }
 
+    def collect_metric_families(self) -> List[MetricFamily]:
+        """Registry families for every managed circuit breaker."""
+        state = MetricFamily("circuit_breaker_state", "gauge",
+                             "Circuit breaker state (1 for the current state)")
+        requests = MetricFamily("circuit_breaker_requests", "counter",
+                                "Requests through the circuit breaker by outcome")
+        blocked = MetricFamily("circuit_breaker_blocked_requests", "counter",
+                               "Requests rejected while the circuit breaker was open")
+        state_changes = MetricFamily("circuit_breaker_state_changes", "counter",
+                                     "Circuit breaker state transitions")
+        
+        for name, cb in list(self.circuit_breakers.items()):
+            for cb_state in CircuitBreakerState:
+                state.add_sample(1 if cb.state is cb_state else 0,
+                                 {"name": name, "state": cb_state.value})
+            metrics = cb.metrics
+            requests.add_sample(metrics.successful_requests, {"name": name, "outcome": "success"})
+            requests.add_sample(metrics.failed_requests, {"name": name, "outcome": "failure"})
+            blocked.add_sample(metrics.total_blocks, {"name": name})
+            state_changes.add_sample(metrics.state_changes, {"name": name})
+        
+        return [state, requests, blocked, state_changes]
+
 
 # Convenience functions for common patterns
 
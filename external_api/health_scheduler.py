@@ -0,0 +1,338 @@
+"""
+Shared Health Check Scheduler for Service Discovery and Load Balancing
+
+Runs health checks for every registered instance from a single scheduler
+task instead of one polling task per instance. Due checks are kept in a
+timer queue ordered by next due time, intervals are jittered so instances
+registered together drift apart, and a global semaphore caps how many
+probes are in flight. HTTP probes share one pooled client session, and each
+result is fanned out to every subscriber of the instance (service discovery
+and the load balancer probe an instance once per interval, not once each).
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .service_discovery import ServiceInstance
+
+
+logger = logging.getLogger(__name__)
+
+HealthCheck = Callable[["ServiceInstance"], Awaitable[bool]]
+HealthCallback = Callable[["ServiceInstance", bool], Awaitable[None]]
+
+
+@dataclass
+class HealthCheckTarget:
+    """An instance under health checking and the subscribers to its results."""
+    instance: "ServiceInstance"
+    subscribers: Dict[str, Tuple[HealthCallback, float]] = field(default_factory=dict)
+    generation: int = 0
+    checks: int = 0
+    last_result: Optional[bool] = None
+
+    @property
+    def interval(self) -> float:
+        """Check interval: the shortest interval any subscriber asked for."""
+        return min(interval for _, interval in self.subscribers.values())
+
+
+class HealthCheckScheduler:
+    """
+    Single-task health check scheduler.
+
+    Features:
+    - One timer queue entry per instance, one scheduler task overall
+    - Jittered check intervals
+    - Global cap on concurrent probes
+    - Pooled HTTP client shared by all probes
+    - Result fan-out to every subscriber of an instance
+    """
+
+    def __init__(self, config: Dict[str, Any] = None, check: Optional[HealthCheck] = None):
+        """
+        Initialize health check scheduler.
+
+        Args:
+            config: Scheduler configuration
+            check: Probe coroutine; defaults to an HTTP GET on the instance's
+                health_check_url through the shared session
+        """
+        self.config = config or {}
+        self.default_interval = self.config.get("health_check_interval", 30)
+        self.jitter = self.config.get("health_check_jitter", 0.1)
+        self.max_concurrent_checks = self.config.get("max_concurrent_health_checks", 100)
+        self.request_timeout = self.config.get("health_check_timeout", 5.0)
+        self.connect_timeout = self.config.get("health_check_connect_timeout", 2.0)
+        self.check = check if check is not None else self.probe
+
+        self.targets: Dict[str, HealthCheckTarget] = {}
+        self._queue: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight: Set[asyncio.Task] = set()
+        self._active_checks = 0
+        self._session = None
+        self._scheduler_task: Optional[asyncio.Task] = None
+        self._users = 0
+
+        self.stats = {
+            "checks_run": 0,
+            "checks_failed": 0,
+            "max_in_flight": 0
+        }
+
+    @property
+    def running(self) -> bool:
+        """Whether the scheduler task is running."""
+        return self._scheduler_task is not None and not self._scheduler_task.done()
+
+    def __contains__(self, instance_id: str) -> bool:
+        return instance_id in self.targets
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    async def start(self) -> None:
+        """
+        Start the scheduler.
+
+        Start and stop are reference counted so the discovery service and
+        load balancers sharing a scheduler can each start and stop it.
+        """
+        self._users += 1
+        if self.running:
+            return
+
+        # Entries queued while stopped hold delays rather than loop times
+        now = asyncio.get_running_loop().time()
+        self._queue = [(now + delay, generation, instance_id)
+                       for delay, generation, instance_id in self._queue]
+        heapq.heapify(self._queue)
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_checks)
+        self._wakeup = asyncio.Event()
+        self._scheduler_task = asyncio.create_task(self._run())
+        logger.info("Health check scheduler started")
+
+    async def stop(self) -> None:
+        """Release one start; the scheduler stops when the last user stops it."""
+        if self._users == 0:
+            return
+        self._users -= 1
+        if self._users > 0:
+            return
+
+        tasks = [task for task in [self._scheduler_task, *self._in_flight] if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._scheduler_task = None
+        self._in_flight.clear()
+
+        # Check every target as soon as the scheduler is started again
+        self._queue = []
+        for target in self.targets.values():
+            self._schedule(target, 0.0)
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+        logger.info("Health check scheduler stopped")
+
+    def subscribe(self, instance: "ServiceInstance", subscriber: str,
+                  callback: HealthCallback, interval: Optional[float] = None) -> None:
+        """
+        Receive health check results for an instance.
+
+        Args:
+            instance: Instance to check
+            subscriber: Subscriber name, unique per instance
+            callback: Coroutine called with (instance, is_healthy) after each check
+            interval: Check interval in seconds
+        """
+        interval = interval or self.default_interval
+        target = self.targets.get(instance.service_id)
+
+        if target is None:
+            target = HealthCheckTarget(instance=instance)
+            self.targets[instance.service_id] = target
+            target.subscribers[subscriber] = (callback, interval)
+            self._schedule(target, 0.0)
+            return
+
+        previous_interval = target.interval
+        target.instance = instance
+        target.subscribers[subscriber] = (callback, interval)
+        if target.interval < previous_interval:
+            self._schedule(target, self._jittered(target.interval))
+
+    def unsubscribe(self, instance_id: str, subscriber: str) -> None:
+        """Stop delivering results to a subscriber; drop the instance once unsubscribed by all."""
+        target = self.targets.get(instance_id)
+        if target is None:
+            return
+
+        target.subscribers.pop(subscriber, None)
+        if not target.subscribers:
+            # Queue entries for a removed target are skipped when they come due
+            del self.targets[instance_id]
+
+    def subscribers(self, instance_id: str) -> Set[str]:
+        """Names of the subscribers to an instance's results."""
+        target = self.targets.get(instance_id)
+        return set(target.subscribers) if target else set()
+
+    async def probe(self, instance: "ServiceInstance") -> bool:
+        """
+        HTTP health check through the shared session.
+
+        Args:
+            instance: Service instance to check
+
+        Returns:
+            True if healthy
+        """
+        if not instance.health_check_url:
+            return True
+
+        try:
+            import aiohttp
+        except ImportError:
+            logger.warning("aiohttp not available, falling back to basic health check")
+            await asyncio.sleep(0.1)
+            return True
+
+        try:
+            if self._session is None and self.running:
+                self._session = self._create_session(aiohttp)
+
+            if self._session is not None:
+                return await self._get(self._session, instance)
+
+            # Probes outside a running scheduler use a one-off session
+            async with self._create_session(aiohttp) as session:
+                return await self._get(session, instance)
+
+        except asyncio.TimeoutError:
+            logger.warning(f"Health check timeout for {instance.service_id}: {instance.health_check_url}")
+            return False
+
+        except aiohttp.ClientError as e:
+            logger.warning(f"Health check client error for {instance.service_id}: {e}")
+            return False
+
+        except Exception as e:
+            logger.warning(f"Health check failed for {instance.service_id}: {e}")
+            return False
+
+    def get_status(self) -> Dict[str, Any]:
+        """Scheduler statistics."""
+        return {
+            "running": self.running,
+            "targets": len(self.targets),
+            "queued": len(self._queue),
+            "in_flight": self._active_checks,
+            "max_concurrent_checks": self.max_concurrent_checks,
+            **self.stats
+        }
+
+    def _create_session(self, aiohttp):
+        """Pooled client session; the connector limit matches the probe cap."""
+        return aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout, connect=self.connect_timeout),
+            connector=aiohttp.TCPConnector(limit=self.max_concurrent_checks)
+        )
+
+    async def _get(self, session, instance: "ServiceInstance") -> bool:
+        async with session.get(instance.health_check_url) as response:
+            # Consider 200-299 status codes as healthy
+            is_healthy = 200 <= response.status < 300
+
+            if not is_healthy:
+                logger.warning(
+                    f"Health check failed for {instance.service_id}: "
+                    f"HTTP {response.status} from {instance.health_check_url}"
+                )
+            return is_healthy
+
+    def _jittered(self, interval: float) -> float:
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _schedule(self, target: HealthCheckTarget, delay: float) -> None:
+        """Queue the next check of a target, superseding any queued entry."""
+        # Generations are unique across targets, so an entry left behind by
+        # a removed target never matches one re-added under the same id
+        target.generation = next(self._sequence)
+        due = asyncio.get_running_loop().time() + delay if self.running else delay
+        heapq.heappush(self._queue, (due, target.generation, target.instance.service_id))
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        """Scheduler loop: dispatch due checks, then sleep until the next one."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            self._wakeup.clear()
+
+            while self._queue and self._queue[0][0] <= loop.time():
+                _, generation, instance_id = heapq.heappop(self._queue)
+                target = self.targets.get(instance_id)
+                if target is None or target.generation != generation:
+                    continue
+
+                await self._semaphore.acquire()
+                task = asyncio.create_task(self._check_target(target))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+
+            timeout = self._queue[0][0] - loop.time() if self._queue else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _check_target(self, target: HealthCheckTarget) -> None:
+        """Probe one target, fan the result out and queue its next check."""
+        # The permit taken by the scheduler loop is held through fan-out, so
+        # the cap bounds probe tasks as well as open requests
+        self._active_checks += 1
+        self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._active_checks)
+        try:
+            await self._probe_and_notify(target)
+        finally:
+            self._active_checks -= 1
+            self._semaphore.release()
+
+    async def _probe_and_notify(self, target: HealthCheckTarget) -> None:
+        instance = target.instance
+        try:
+            is_healthy = await self.check(instance)
+        except Exception as e:
+            logger.error(f"Health check error for {instance.service_id}: {e}")
+            is_healthy = False
+
+        target.checks += 1
+        target.last_result = is_healthy
+        self.stats["checks_run"] += 1
+        if not is_healthy:
+            self.stats["checks_failed"] += 1
+
+        if self.targets.get(instance.service_id) is not target:
+            return
+
+        self._schedule(target, self._jittered(target.interval))
+
+        for name, (callback, _) in list(target.subscribers.items()):
+            try:
+                await callback(instance, is_healthy)
+            except Exception as e:
+                logger.error(f"Health check subscriber {name} failed for {instance.service_id}: {e}")
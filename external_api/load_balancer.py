@@ -5,7 +5,6 @@ Provides intelligent service load balancing with health-aware distribution,
 circuit breaker integration, and multiple balancing algorithms.
 """
 
-import asyncio
 import logging
 import random
 import time
@@ -140,8 +139,9 @@ class ServiceLoadBalancer:
         self.round_robin_counters: Dict[str, int] = {}
         self.sticky_sessions: Dict[str, str] = {}  # session_id -> instance_id
         
-        # Health monitoring
-        self._health_check_tasks: Dict[str, asyncio.Task] = {}
+        # Health monitoring through the discovery service's scheduler, so an
+        # instance known to both is probed once per interval
+        self.health_scheduler = service_discovery.health_scheduler
         self._running = False
         
         # Request tracking for metrics
@@ -155,6 +155,7 @@ class ServiceLoadBalancer:
             return
         
         self._running = True
+        await self.health_scheduler.start()
         
         # Start health monitoring for existing instances
         for instance_id in self.instances:
@@ -169,13 +170,10 @@ class ServiceLoadBalancer:
         
         self._running = False
         
-        # Cancel all health check tasks
-        for task in self._health_check_tasks.values():
-            task.cancel()
-        
-        # Wait for tasks to complete
-        await asyncio.gather(*self._health_check_tasks.values(), return_exceptions=True)
-        self._health_check_tasks.clear()
+        # Stop health monitoring
+        for instance_id in self.instances:
+            self.health_scheduler.unsubscribe(instance_id, "load_balancer")
+        await self.health_scheduler.stop()
         
         logger.info("ServiceLoadBalancer stopped")
     
@@ -207,10 +205,8 @@ class ServiceLoadBalancer:
             if service_id not in self.instances:
                 return False
             
-            # Cancel health monitoring
-            if service_id in self._health_check_tasks:
-                self._health_check_tasks[service_id].cancel()
-                del self._health_check_tasks[service_id]
+            # Stop health monitoring
+            self.health_scheduler.unsubscribe(service_id, "load_balancer")
             
             # Clean up data
             del self.instances[service_id]
@@ -511,54 +507,36 @@ class ServiceLoadBalancer:
     
     async def _start_health_monitoring(self, instance_id: str) -> None:
         """Start health monitoring for an instance."""
-        if instance_id in self._health_check_tasks:
-            return
-        
-        self._health_check_tasks[instance_id] = asyncio.create_task(
-            self._health_monitor_loop(instance_id)
+        instance = self.instances[instance_id]
+        self.health_scheduler.subscribe(
+            instance.service_instance, "load_balancer", self._apply_health_result,
+            interval=self.health_check_interval
         )
     
-    async def _health_monitor_loop(self, instance_id: str) -> None:
-        """Health monitoring loop for an instance."""
-        while self._running and instance_id in self.instances:
-            try:
-                instance = self.instances[instance_id]
-                
-                # Perform health check
-                is_healthy = await self._perform_health_check(instance.service_instance)
-                
-                # Update health status
-                old_status = instance.health_status
-                
-                if is_healthy:
-                    if instance.metrics.health_score > 80:
-                        instance.health_status = HealthStatus.HEALTHY
-                    elif instance.metrics.health_score > 50:
-                        instance.health_status = HealthStatus.DEGRADED
-                    else:
-                        instance.health_status = HealthStatus.UNHEALTHY
-                else:
-                    instance.health_status = HealthStatus.UNHEALTHY
-                
-                instance.last_health_check = datetime.utcnow()
-                
-                # Log status changes
-                if old_status != instance.health_status:
-                    logger.info(f"Health status changed for {instance_id}: "
-                              f"{old_status.value} -> {instance.health_status.value}")
-                
-                await asyncio.sleep(self.health_check_interval)
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Health monitoring error for {instance_id}: {e}")
-                await asyncio.sleep(self.health_check_interval)
-    
-    async def _perform_health_check(self, service_instance: ServiceInstance) -> bool:
-        """Perform health check on service instance."""
-        # Delegate to service discovery's health check
-        return await self.service_discovery._perform_health_check(service_instance)
+    async def _apply_health_result(self, service_instance: ServiceInstance, is_healthy: bool) -> None:
+        """Update an instance's health status from a scheduled health check."""
+        instance = self.instances.get(service_instance.service_id)
+        if instance is None:
+            return
+        
+        old_status = instance.health_status
+        
+        if is_healthy:
+            if instance.metrics.health_score > 80:
+                instance.health_status = HealthStatus.HEALTHY
+            elif instance.metrics.health_score > 50:
+                instance.health_status = HealthStatus.DEGRADED
+            else:
+                instance.health_status = HealthStatus.UNHEALTHY
+        else:
+            instance.health_status = HealthStatus.UNHEALTHY
+        
+        instance.last_health_check = datetime.utcnow()
+        
+        # Log status changes
+        if old_status != instance.health_status:
+            logger.info(f"Health status changed for {service_instance.service_id}: "
+                      f"{old_status.value} -> {instance.health_status.value}")
     
     async def _check_circuit_breaker(self, instance_id: str) -> None:
         """Check if circuit breaker should be triggered."""
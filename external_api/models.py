@@ -36,6 +36,13 @@ class WebhookConfig:
     max_payload_size: int = 1048576  # 1MB
     rate_limit_requests: int = 100
     rate_limit_window: int = 60  # seconds
+    queue_size: int = 1000  # events accepted but not yet handled
+    worker_count: int = 4
+    delivery_ttl_seconds: int = 3600
+    max_tracked_deliveries: int = 10000
+    idempotency_ttl_seconds: int = 86400  # how long a delivery id suppresses retries
+    max_idempotency_keys: int = 100000
+    dedupe_by_payload_digest: bool = False  # when no delivery id header is sent
 
     def __post_init__(self):
         """Validate configuration parameters."""
@@ -45,6 +52,10 @@ class WebhookConfig:
             raise ValueError(f"Timeout must be positive, got {self.timeout_seconds}")
         if self.max_payload_size <= 0:
             raise ValueError(f"Max payload size must be positive, got {self.max_payload_size}")
+        if self.queue_size <= 0:
+            raise ValueError(f"Queue size must be positive, got {self.queue_size}")
+        if self.worker_count <= 0:
+            raise ValueError(f"Worker count must be positive, got {self.worker_count}")
 
 
 @dataclass
@@ -8,13 +8,17 @@ for all integration agent components and external services.
 import asyncio
 import json
 import logging
+import time
+from array import array
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Iterator, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import uuid
 import psutil
 
+from metrics_registry import REGISTRY, MetricFamily, MetricsRegistry, generate_exposition, sanitize_name
+
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +60,196 @@ class MetricData:
         }
 
 
+_METRIC_TYPES = list(MetricType)
+_METRIC_TYPE_CODES = {metric_type: code for code, metric_type in enumerate(_METRIC_TYPES)}
+_NO_TAGS: Dict[str, str] = {}
+
+
+class MetricSeries:
+    """
+    Fixed-capacity ring of samples for one metric.
+
+    Timestamps, values and type codes live in preallocated ``array``
+    columns, so recording a sample overwrites existing slots rather than
+    allocating an object per sample. Timestamps are kept non-decreasing
+    (a clock stepping backwards is clamped), which lets time-range queries
+    binary-search the ring. Every sample is also folded into a coarser
+    rollup ring of per-bucket count/sum/min/max that outlives the raw
+    samples.
+    """
+
+    def __init__(self, name: str, capacity: int = 10000,
+                 rollup_interval: float = 60.0, rollup_capacity: int = 1440):
+        self.name = name
+        self.capacity = capacity
+        self.total = 0  # Samples ever recorded, including overwritten ones
+        self.sum = 0.0  # Sum of every value ever recorded
+        self.last_value = 0.0
+        self.last_type = MetricType.GAUGE
+
+        self._timestamps = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._types = array('b', bytes(capacity))
+        self._tags: List[Dict[str, str]] = [_NO_TAGS] * capacity
+        self._start = 0
+        self._size = 0
+
+        self.rollup_interval = rollup_interval
+        self.rollup_capacity = rollup_capacity
+        self._bucket_starts = array('d', bytes(8 * rollup_capacity))
+        self._bucket_counts = array('q', bytes(8 * rollup_capacity))
+        self._bucket_sums = array('d', bytes(8 * rollup_capacity))
+        self._bucket_mins = array('d', bytes(8 * rollup_capacity))
+        self._bucket_maxs = array('d', bytes(8 * rollup_capacity))
+        self._rollup_start = 0
+        self._rollup_size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> MetricData:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("metric series index out of range")
+        return self._sample(index)
+
+    def __iter__(self) -> Iterator[MetricData]:
+        for index in range(self._size):
+            yield self._sample(index)
+
+    def append(self, value: float, metric_type: MetricType, tags: Dict[str, str],
+               timestamp: float) -> None:
+        """Record one sample, overwriting the oldest once the ring is full."""
+        if self._size:
+            latest = self._timestamps[(self._start + self._size - 1) % self.capacity]
+            if timestamp < latest:
+                timestamp = latest
+
+        if self._size < self.capacity:
+            slot = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+
+        self._timestamps[slot] = timestamp
+        self._values[slot] = value
+        self._types[slot] = _METRIC_TYPE_CODES[metric_type]
+        self._tags[slot] = tags
+        self.total += 1
+        self.sum += value
+        self.last_value = value
+        self.last_type = metric_type
+
+        self._roll_up(value, timestamp)
+
+    def bisect(self, timestamp: float, right: bool = False) -> int:
+        """Logical index of the first sample at (or, with ``right``, after) a timestamp."""
+        lo, hi = 0, self._size
+        timestamps, start, capacity = self._timestamps, self._start, self.capacity
+        while lo < hi:
+            mid = (lo + hi) // 2
+            sample_time = timestamps[(start + mid) % capacity]
+            if sample_time < timestamp or (right and sample_time == timestamp):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def index_range(self, start_time: Optional[float] = None,
+                    end_time: Optional[float] = None) -> Tuple[int, int]:
+        """Logical [lo, hi) index range of samples within a time range (inclusive)."""
+        lo = self.bisect(start_time) if start_time is not None else 0
+        hi = self.bisect(end_time, right=True) if end_time is not None else self._size
+        return lo, max(lo, hi)
+
+    def values(self, lo: int = 0, hi: Optional[int] = None) -> List[float]:
+        """Sample values for a logical index range."""
+        hi = self._size if hi is None else hi
+        values, start, capacity = self._values, self._start, self.capacity
+        return [values[(start + index) % capacity] for index in range(lo, hi)]
+
+    def samples(self, start_time: Optional[float] = None,
+                end_time: Optional[float] = None) -> List[MetricData]:
+        """Samples within a time range, oldest first."""
+        lo, hi = self.index_range(start_time, end_time)
+        return [self._sample(index) for index in range(lo, hi)]
+
+    def recent_values(self, count: int) -> List[float]:
+        """Values of the newest ``count`` samples still in the ring."""
+        count = min(count, self._size)
+        return self.values(self._size - count)
+
+    def trim_before(self, timestamp: float) -> int:
+        """Drop samples older than a timestamp; returns how many were dropped."""
+        dropped = self.bisect(timestamp)
+        for index in range(dropped):
+            self._tags[(self._start + index) % self.capacity] = _NO_TAGS
+        self._start = (self._start + dropped) % self.capacity
+        self._size -= dropped
+        return dropped
+
+    def rollups(self, start_time: Optional[float] = None,
+                end_time: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Downsampled buckets (count, sum, min, max, avg) within a time range."""
+        buckets = []
+        for index in range(self._rollup_size):
+            slot = (self._rollup_start + index) % self.rollup_capacity
+            bucket_start = self._bucket_starts[slot]
+            if start_time is not None and bucket_start + self.rollup_interval <= start_time:
+                continue
+            if end_time is not None and bucket_start > end_time:
+                break
+            count = self._bucket_counts[slot]
+            buckets.append({
+                "timestamp": datetime.fromtimestamp(bucket_start),
+                "count": count,
+                "sum": self._bucket_sums[slot],
+                "min": self._bucket_mins[slot],
+                "max": self._bucket_maxs[slot],
+                "avg": self._bucket_sums[slot] / count
+            })
+        return buckets
+
+    def _sample(self, index: int) -> MetricData:
+        slot = (self._start + index) % self.capacity
+        return MetricData(
+            name=self.name,
+            value=self._values[slot],
+            metric_type=_METRIC_TYPES[self._types[slot]],
+            tags=dict(self._tags[slot]),
+            timestamp=datetime.fromtimestamp(self._timestamps[slot])
+        )
+
+    def _roll_up(self, value: float, timestamp: float) -> None:
+        bucket_start = timestamp - timestamp % self.rollup_interval
+
+        if self._rollup_size:
+            slot = (self._rollup_start + self._rollup_size - 1) % self.rollup_capacity
+            if self._bucket_starts[slot] == bucket_start:
+                self._bucket_counts[slot] += 1
+                self._bucket_sums[slot] += value
+                if value < self._bucket_mins[slot]:
+                    self._bucket_mins[slot] = value
+                if value > self._bucket_maxs[slot]:
+                    self._bucket_maxs[slot] = value
+                return
+
+        if self._rollup_size < self.rollup_capacity:
+            slot = (self._rollup_start + self._rollup_size) % self.rollup_capacity
+            self._rollup_size += 1
+        else:
+            slot = self._rollup_start
+            self._rollup_start = (self._rollup_start + 1) % self.rollup_capacity
+
+        self._bucket_starts[slot] = bucket_start
+        self._bucket_counts[slot] = 1
+        self._bucket_sums[slot] = value
+        self._bucket_mins[slot] = value
+        self._bucket_maxs[slot] = value
+
+
 @dataclass
 class Alert:
     """Alert data structure."""
@@ -107,15 +301,18 @@ class MonitoringSystem:
     and performance tracking for all integration services.
     """
 
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any] = None,
+                 metrics_registry: Optional[MetricsRegistry] = None):
         """
         Initialize monitoring system.
 
         Args:
             config: Monitoring configuration
+            metrics_registry: Registry the recorded series are exposed through
+                (defaults to the process-wide registry)
         """
         self.config = config or {}
-        self.metrics: Dict[str, List[MetricData]] = {}
+        self.metrics: Dict[str, MetricSeries] = {}
         self.alerts: Dict[str, Alert] = {}
         self.alert_rules: Dict[str, AlertRule] = {}
         self.alert_handlers: List[Callable] = []
@@ -124,6 +321,14 @@ class MonitoringSystem:
         self.retention_hours = self.config.get("retention_hours", 24)
         self.collection_interval = self.config.get("collection_interval", 60)
         self.alert_check_interval = self.config.get("alert_check_interval", 30)
+        self.series_capacity = self.config.get("series_capacity", 10000)
+        self.rollup_interval = self.config.get("rollup_interval", 60)
+        self.rollup_capacity = self.config.get("rollup_capacity", 1440)
+
+        # Alert evaluation state: samples already evaluated per rule
+        # (MetricSeries.total at the last pass) and last alert time per rule
+        self._alert_cursors: Dict[str, int] = {}
+        self._last_alert_at: Dict[str, datetime] = {}
 
         # System monitoring
         self.system_metrics_enabled = self.config.get("system_metrics", True)
@@ -138,6 +343,9 @@ class MonitoringSystem:
         # Default alert rules
         self._setup_default_alert_rules()
 
+        self.metrics_registry = metrics_registry if metrics_registry is not None else REGISTRY
+        self.metrics_registry.register_collector(self.collect_metric_families)
+
         logger.info("MonitoringSystem initialized")
 
     async def start(self) -> None:
@@ -178,32 +386,22 @@ class MonitoringSystem:
         """
         Record a metric value.
 
+        Alert rules are evaluated in batches by the alert processing loop,
+        not per sample.
+
         Args:
             name: Metric name
             value: Metric value
             metric_type: Type of metric
             tags: Optional tags for the metric
         """
-        if tags is None:
-            tags = {}
-
-        metric = MetricData(
-            name=name,
-            value=value,
-            metric_type=metric_type,
-            tags=tags,
-            timestamp=datetime.now()
-        )
-
-        if name not in self.metrics:
-            self.metrics[name] = []
-
-        self.metrics[name].append(metric)
-
-        # Check for alerts
-        asyncio.create_task(self._check_metric_alerts(name, value))
+        series = self.metrics.get(name)
+        if series is None:
+            series = self.metrics[name] = MetricSeries(
+                name, self.series_capacity, self.rollup_interval, self.rollup_capacity
+            )
 
-        logger.debug(f"Recorded metric: {name} = {value}")
+        series.append(value, metric_type, tags or _NO_TAGS, time.time())
 
     def increment_counter(self, name: str, value: float = 1, tags: Dict[str, str] = None) -> None:
         """
@@ -290,15 +488,34 @@ class MonitoringSystem:
         if name not in self.metrics:
             return []
 
-        metrics = self.metrics[name]
+        return self.metrics[name].samples(
+            start_time.timestamp() if start_time else None,
+            end_time.timestamp() if end_time else None
+        )
+
+    def get_metric_rollups(self, name: str, start_time: Optional[datetime] = None,
+                           end_time: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Get downsampled buckets for a metric.
+
+        Buckets span ``rollup_interval`` seconds and are kept for longer
+        than raw samples.
 
-        if start_time:
-            metrics = [m for m in metrics if m.timestamp >= start_time]
+        Args:
+            name: Metric name
+            start_time: Start time filter
+            end_time: End time filter
 
-        if end_time:
-            metrics = [m for m in metrics if m.timestamp <= end_time]
+        Returns:
+            List of buckets with timestamp, count, sum, min, max and avg
+        """
+        if name not in self.metrics:
+            return []
 
-        return sorted(metrics, key=lambda x: x.timestamp)
+        return self.metrics[name].rollups(
+            start_time.timestamp() if start_time else None,
+            end_time.timestamp() if end_time else None
+        )
 
     def get_metric_summary(self, name: str, hours: int = 1) -> Dict[str, Any]:
         """
@@ -311,13 +528,15 @@ class MonitoringSystem:
         Returns:
             Summary statistics
         """
-        start_time = datetime.now() - timedelta(hours=hours)
-        metrics = self.get_metrics(name, start_time=start_time)
-
-        if not metrics:
+        series = self.metrics.get(name)
+        if series is None:
             return {"count": 0, "avg": 0, "min": 0, "max": 0}
 
-        values = [m.value for m in metrics]
+        lo, hi = series.index_range(time.time() - hours * 3600)
+        values = series.values(lo, hi)
+
+        if not values:
+            return {"count": 0, "avg": 0, "min": 0, "max": 0}
 
         return {
             "count": len(values),
@@ -416,7 +635,7 @@ class MonitoringSystem:
         Export all metrics in specified format.
 
         Args:
-            format: Export format ("json" or "prometheus")
+            format: Export format ("json", "prometheus" or "openmetrics")
 
         Returns:
             Exported metrics string
@@ -435,18 +654,43 @@ class MonitoringSystem:
             }
             return json.dumps(export_data, indent=2)
 
-        elif format == "prometheus":
-            # Simple Prometheus format export
-            lines = []
-            for name, metrics in self.metrics.items():
-                if metrics:
-                    latest = metrics[-1]
-                    lines.append(f"{name.replace('.', '_')} {latest.value}")
-            return "\n".join(lines)
+        elif format in ("prometheus", "openmetrics"):
+            return "".join(generate_exposition(
+                self.collect_metric_families(), openmetrics=format == "openmetrics"
+            ))
 
         else:
             raise ValueError(f"Unsupported export format: {format}")
 
+    def collect_metric_families(self) -> List[MetricFamily]:
+        """
+        Registry families for the recorded series.
+
+        Gauges expose their latest value, counters the running total of
+        their increments, and timers and histograms a summary of the count
+        and sum of every value recorded.
+        """
+        families = []
+        for name, series in list(self.metrics.items()):
+            if not series.total:
+                continue
+
+            metric_name = sanitize_name(name)
+            metric_type = series.last_type
+            if metric_type == MetricType.GAUGE:
+                family = MetricFamily(metric_name, "gauge", f"Latest value of {name}")
+                family.add_sample(series.last_value)
+            elif metric_type == MetricType.COUNTER:
+                family = MetricFamily(metric_name, "counter", f"Running total of {name}")
+                family.add_sample(series.sum)
+            else:
+                family = MetricFamily(metric_name, "summary", f"Recorded values of {name}")
+                family.add_sample(series.total, suffix="_count")
+                family.add_sample(series.sum, suffix="_sum")
+            families.append(family)
+
+        return families
+
     async def _metrics_collection_loop(self) -> None:
         """Background task for collecting system metrics."""
         while self._running:
@@ -465,9 +709,10 @@ class MonitoringSystem:
                 await asyncio.sleep(self.collection_interval)
 
     async def _alert_processing_loop(self) -> None:
-        """Background task for processing alerts."""
+        """Background task evaluating alert rules against new samples."""
         while self._running:
             try:
+                await self._evaluate_alerts()
                 await asyncio.sleep(self.alert_check_interval)
 
             except asyncio.CancelledError:
@@ -480,12 +725,10 @@ class MonitoringSystem:
         """Background task for cleaning up old metrics."""
         while self._running:
             try:
-                cutoff_time = datetime.now() - timedelta(hours=self.retention_hours)
+                cutoff = time.time() - self.retention_hours * 3600
 
-                for name, metrics in self.metrics.items():
-                    self.metrics[name] = [
-                        m for m in metrics if m.timestamp > cutoff_time
-                    ]
+                for series in self.metrics.values():
+                    series.trim_before(cutoff)
 
                 await asyncio.sleep(3600)  # Run cleanup every hour
 
@@ -495,23 +738,52 @@ class MonitoringSystem:
                 logger.error(f"Error in cleanup: {e}")
                 await asyncio.sleep(3600)
 
-    async def _check_metric_alerts(self, metric_name: str, value: float) -> None:
-        """Check if a metric triggers any alerts."""
-        for rule in self.alert_rules.values():
-            if rule.metric_name == metric_name and rule.enabled:
-                triggered = False
+    async def _evaluate_alerts(self) -> List[Alert]:
+        """
+        Evaluate every enabled rule against samples recorded since the last pass.
+
+        A rule raises at most one alert per pass, reporting the most extreme
+        new value, and none while within its cooldown.
+
+        Returns:
+            Alerts created in this pass
+        """
+        created = []
+
+        for rule in list(self.alert_rules.values()):
+            series = self.metrics.get(rule.metric_name)
+            if not rule.enabled or series is None:
+                continue
+
+            seen = self._alert_cursors.get(rule.name, 0)
+            self._alert_cursors[rule.name] = series.total
+            if series.total == seen:
+                continue
+
+            values = series.recent_values(series.total - seen)
+            if not values:
+                continue
+
+            value = None
+            if rule.comparison == "gt" and max(values) > rule.threshold:
+                value = max(values)
+            elif rule.comparison == "lt" and min(values) < rule.threshold:
+                value = min(values)
+            elif rule.comparison == "eq" and rule.threshold in values:
+                value = rule.threshold
+
+            if value is None:
+                continue
+
+            last_alert = self._last_alert_at.get(rule.name)
+            if last_alert and datetime.now() - last_alert < timedelta(minutes=rule.cooldown_minutes):
+                continue
 
-                if rule.comparison == "gt" and value > rule.threshold:
-                    triggered = True
-                elif rule.comparison == "lt" and value < rule.threshold:
-                    triggered = True
-                elif rule.comparison == "eq" and value == rule.threshold:
-                    triggered = True
+            created.append(await self._create_alert(rule, value))
 
-                if triggered:
-                    await self._create_alert(rule, value)
+        return created
 
-    async def _create_alert(self, rule: AlertRule, current_value: float) -> None:
+    async def _create_alert(self, rule: AlertRule, current_value: float) -> Alert:
         """Create an alert based on a rule."""
         alert_id = str(uuid.uuid4())
 
@@ -528,6 +800,7 @@ class MonitoringSystem:
         )
 
         self.alerts[alert_id] = alert
+        self._last_alert_at[rule.name] = alert.timestamp
 
         # Notify alert handlers
         for handler in self.alert_handlers:
@@ -537,6 +810,7 @@ class MonitoringSystem:
                 logger.error(f"Error in alert handler: {e}")
 
         logger.warning(f"Alert triggered: {alert.message}")
+        return alert
 
     def _setup_default_alert_rules(self) -> None:
         """Set up default alert rules."""
@@ -12,6 +12,8 @@ from typing import Dict, List, Optional, Callable, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from .health_scheduler import HealthCheckScheduler
+
 
 logger = logging.getLogger(__name__)
 
@@ -61,12 +63,15 @@ class ServiceDiscovery:
     and load balancing capabilities.
     """
 
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any] = None,
+                 health_scheduler: Optional[HealthCheckScheduler] = None):
         """
         Initialize service discovery system.
 
         Args:
             config: Service discovery configuration
+            health_scheduler: Shared health check scheduler; one is created
+                from the configuration if not given
         """
         self.config = config or {}
         self.services: Dict[str, ServiceRegistration] = {}
@@ -74,8 +79,12 @@ class ServiceDiscovery:
         self.health_check_interval = self.config.get("health_check_interval", 30)
         self.cleanup_interval = self.config.get("cleanup_interval", 60)
 
-        # Health checking
-        self._health_check_tasks: Dict[str, asyncio.Task] = {}
+        # Health checking, shared with load balancers built on this registry
+        if health_scheduler is None:
+            health_scheduler = HealthCheckScheduler(
+                self.config, check=lambda instance: self._perform_health_check(instance)
+            )
+        self.health_scheduler = health_scheduler
         self._cleanup_task: Optional[asyncio.Task] = None
         self._running = False
 
@@ -88,6 +97,7 @@ class ServiceDiscovery:
             return
 
         self._running = True
+        await self.health_scheduler.start()
         self._cleanup_task = asyncio.create_task(self._cleanup_expired_services())
         logger.info("Service discovery started")
 
@@ -98,16 +108,13 @@ class ServiceDiscovery:
 
         self._running = False
 
-        # Cancel all health check tasks
-        for task in self._health_check_tasks.values():
-            task.cancel()
+        await self.health_scheduler.stop()
 
         # Cancel cleanup task
         if self._cleanup_task:
             self._cleanup_task.cancel()
 
         # Wait for tasks to complete
-        await asyncio.gather(*self._health_check_tasks.values(), return_exceptions=True)
         if self._cleanup_task:
             await asyncio.gather(self._cleanup_task, return_exceptions=True)
 
@@ -135,8 +142,9 @@ class ServiceDiscovery:
 
             # Start health checking if URL provided
             if instance.health_check_url:
-                self._health_check_tasks[instance.service_id] = asyncio.create_task(
-                    self._health_check_loop(instance.service_id)
+                self.health_scheduler.subscribe(
+                    instance, "discovery", self._apply_health_result,
+                    interval=self.health_check_interval
                 )
             else:
                 # If no health check URL, mark as healthy
@@ -170,10 +178,8 @@ class ServiceDiscovery:
             registration = self.services[service_id]
             registration.status = ServiceStatus.STOPPING
 
-            # Cancel health check task
-            if service_id in self._health_check_tasks:
-                self._health_check_tasks[service_id].cancel()
-                del self._health_check_tasks[service_id]
+            # Stop health checking
+            self.health_scheduler.unsubscribe(service_id, "discovery")
 
             # Remove from registry
             del self.services[service_id]
@@ -350,37 +356,26 @@ class ServiceDiscovery:
             "unique_services": len(service_names),
             "service_names": list(service_names),
             "running": self._running,
-            "health_check_interval": self.health_check_interval
+            "health_check_interval": self.health_check_interval,
+            "health_checks": self.health_scheduler.get_status()
         }
 
-    async def _health_check_loop(self, service_id: str) -> None:
-        """Health check loop for a service."""
-        while self._running and service_id in self.services:
-            try:
-                registration = self.services[service_id]
-
-                # Perform health check
-                is_healthy = await self._perform_health_check(registration.instance)
-
-                # Update status
-                old_status = registration.status
-                new_status = ServiceStatus.HEALTHY if is_healthy else ServiceStatus.UNHEALTHY
-
-                if old_status != new_status:
-                    registration.status = new_status
-                    await self._notify_watchers(
-                        registration.instance.service_name,
-                        "healthy" if is_healthy else "unhealthy",
-                        registration.instance
-                    )
+    async def _apply_health_result(self, instance: ServiceInstance, is_healthy: bool) -> None:
+        """Update a service's status from a scheduled health check."""
+        registration = self.services.get(instance.service_id)
+        if registration is None:
+            return
 
-                await asyncio.sleep(self.health_check_interval)
+        old_status = registration.status
+        new_status = ServiceStatus.HEALTHY if is_healthy else ServiceStatus.UNHEALTHY
 
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Health check error for {service_id}: {e}")
-                await asyncio.sleep(self.health_check_interval)
+        if old_status != new_status:
+            registration.status = new_status
+            await self._notify_watchers(
+                instance.service_name,
+                "healthy" if is_healthy else "unhealthy",
+                instance
+            )
 
     async def _perform_health_check(self, instance: ServiceInstance) -> bool:
         """
@@ -392,51 +387,7 @@ class ServiceDiscovery:
         Returns:
             True if healthy
         """
-        if not instance.health_check_url:
-            return True
-
-        try:
-            import aiohttp
-            import asyncio
-
-            # Real HTTP health check with timeout and retry logic
-            timeout = aiohttp.ClientTimeout(total=5.0, connect=2.0)
-
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(instance.health_check_url) as response:
-                    # Consider 200-299 status codes as healthy
-                    is_healthy = 200 <= response.status < 300
-
-                    if not is_healthy:
-                        logger.warning(
-                            f"Health check failed for {instance.service_id}: "
-                            f"HTTP {response.status} from {instance.health_check_url}"
-                        )
-                    else:
-                        logger.debug(
-                            f"Health check passed for {instance.service_id}: "
-                            f"HTTP {response.status} from {instance.health_check_url}"
-                        )
-
-                    return is_healthy
-
-        except ImportError:
-            logger.warning("aiohttp not available, falling back to basic health check")
-            # Fallback to basic check if aiohttp not available
-            await asyncio.sleep(0.1)
-            return True
-
-        except asyncio.TimeoutError:
-            logger.warning(f"Health check timeout for {instance.service_id}: {instance.health_check_url}")
-            return False
-
-        except aiohttp.ClientError as e:
-            logger.warning(f"Health check client error for {instance.service_id}: {e}")
-            return False
-
-        except Exception as e:
-            logger.warning(f"Health check failed for {instance.service_id}: {e}")
-            return False
+        return await self.health_scheduler.probe(instance)
 
     async def _cleanup_expired_services(self) -> None:
         """Cleanup expired services that haven't sent heartbeats."""
@@ -8,9 +8,11 @@ monitoring, and event-driven service lifecycle management.
 import asyncio
 import json
 import logging
+import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable, Set
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import uuid
@@ -56,6 +58,206 @@ class ServiceRegistryConfig:
     enable_circuit_breakers: bool = True
     health_check_interval: int = 30
     service_ttl: int = 300  # 5 minutes default TTL
+    journal_path: Optional[str] = None  # Defaults to <database_path>.journal
+    journal_fsync: bool = True
+    journal_compact_bytes: int = 4 * 1024 * 1024  # Snapshot once the journal grows past this
+
+
+def _registration_to_dict(registration: ServiceRegistration) -> Dict[str, Any]:
+    return {
+        "instance": asdict(registration.instance),
+        "registered_at": registration.registered_at.isoformat(),
+        "last_heartbeat": registration.last_heartbeat.isoformat(),
+        "status": registration.status.value,
+        "ttl": registration.ttl
+    }
+
+
+def _registration_from_dict(data: Dict[str, Any]) -> ServiceRegistration:
+    return ServiceRegistration(
+        instance=ServiceInstance(**data["instance"]),
+        registered_at=datetime.fromisoformat(data["registered_at"]),
+        last_heartbeat=datetime.fromisoformat(data["last_heartbeat"]),
+        status=ServiceStatus(data["status"]),
+        ttl=data["ttl"]
+    )
+
+
+def _event_to_dict(event: "ServiceEvent") -> Dict[str, Any]:
+    return {
+        "event_id": event.event_id,
+        "event_type": event.event_type.value,
+        "service_id": event.service_id,
+        "service_name": event.service_name,
+        "timestamp": event.timestamp.isoformat(),
+        "details": event.details,
+        "source": event.source
+    }
+
+
+class RegistryJournal:
+    """
+    Append-only write-ahead journal of registry changes.
+
+    Records are compact JSON lines carrying a monotonically increasing
+    sequence number. Appends are buffered and a single writer task commits
+    everything pending with one write and one fsync (group commit), so a
+    burst of registrations costs one disk flush per batch rather than one
+    per change, and the file I/O runs off the event loop.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self.last_seq = 0
+        self.size = 0
+        self._file = None
+        self._pending: List[Tuple[bytes, asyncio.Future]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._io_lock: Optional[asyncio.Lock] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self.stats = {"records": 0, "batches": 0, "compactions": 0}
+
+    def recover(self, after_seq: int = 0) -> List[Dict[str, Any]]:
+        """
+        Read records newer than ``after_seq`` and open the journal for appending.
+
+        A torn final record from a crash mid-write is cut off so new
+        records start on a clean line.
+        """
+        records = []
+        valid_bytes = 0
+        self.last_seq = after_seq
+
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    valid_bytes += len(line)
+                    self.last_seq = max(self.last_seq, record["seq"])
+                    if record["seq"] > after_seq:
+                        records.append(record)
+
+            if valid_bytes < os.path.getsize(self.path):
+                logger.warning(f"Discarding torn journal tail in {self.path}")
+                os.truncate(self.path, valid_bytes)
+
+        self._file = open(self.path, "ab")
+        self.size = valid_bytes
+        return records
+
+    async def start(self) -> None:
+        """Start the group-commit writer."""
+        self._wakeup = asyncio.Event()
+        self._io_lock = asyncio.Lock()
+        self._writer_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Commit pending records and close the journal."""
+        if self._writer_task:
+            self._writer_task.cancel()
+            await asyncio.gather(self._writer_task, return_exceptions=True)
+            self._writer_task = None
+        if self._io_lock:
+            await self._flush()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def append(self, record: Dict[str, Any]) -> asyncio.Future:
+        """
+        Queue a record; the returned future resolves to True once it is durable.
+
+        Callers that don't need durability before continuing can ignore the
+        future. Once the journal is stopped the future resolves to False
+        straight away.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if self._file is None:
+            future.set_result(False)
+            return future
+        self.last_seq += 1
+        record["seq"] = self.last_seq
+        line = json.dumps(record, separators=(",", ":")).encode() + b"\n"
+        self._pending.append((line, future))
+        if self._wakeup:
+            self._wakeup.set()
+        return future
+
+    async def truncate_through(self, seq: int) -> None:
+        """Drop records up to ``seq`` once a snapshot covering them is durable."""
+        async with self._io_lock:
+            await self._flush_locked()
+            loop = asyncio.get_running_loop()
+            self._file = await loop.run_in_executor(None, self._rewrite_sync, seq)
+            self.size = self._file.tell()
+            self.stats["compactions"] += 1
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self._flush()
+
+    async def _flush(self) -> None:
+        async with self._io_lock:
+            await self._flush_locked()
+
+    async def _flush_locked(self) -> None:
+        # Everything appended while the previous batch was being written
+        # goes out together in this one
+        while self._pending:
+            batch, self._pending = self._pending, []
+            data = b"".join(line for line, _ in batch)
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self._write_sync, data)
+                committed = True
+                self.size += len(data)
+                self.stats["records"] += len(batch)
+                self.stats["batches"] += 1
+            except Exception as e:
+                logger.error(f"Journal write failed: {e}")
+                committed = False
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(committed)
+
+    def _write_sync(self, data: bytes) -> None:
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _rewrite_sync(self, seq: int):
+        """
+        Rewrite the journal keeping only records after ``seq``.
+
+        The current handle stays open until the rewritten file has replaced
+        the journal, so a failed rewrite leaves the journal writable.
+        """
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(self.path, "rb") as src, open(tmp_path, "wb") as dst:
+                for line in src:
+                    if json.loads(line)["seq"] > seq:
+                        dst.write(line)
+                dst.flush()
+                if self.fsync:
+                    os.fsync(dst.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        new_file = open(self.path, "ab")
+        self._file.close()
+        return new_file
 
 
 class PersistentServiceRegistry:
@@ -63,7 +265,7 @@ class PersistentServiceRegistry:
     Enhanced service registry with persistent storage and advanced features.
     
     Features:
-    - SQLite database persistence
+    - Write-ahead journal with group commit, snapshotted to SQLite
     - Event-driven architecture
     - Automatic backup and recovery
     - Circuit breaker integration
@@ -82,9 +284,16 @@ class PersistentServiceRegistry:
         self.service_watchers: Dict[str, List[Callable]] = {}
         self.service_dependencies: Dict[str, Set[str]] = {}
         
-        # Database connection
+        # Persistence: changes go to the journal; the database holds
+        # periodic snapshots and the journal is compacted after each one
         self.db_path = self.config.database_path
         self.db_connection: Optional[sqlite3.Connection] = None
+        self.journal_path = self.config.journal_path or f"{self.db_path}.journal"
+        self.journal: Optional[RegistryJournal] = None
+        self._db_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_events: List[ServiceEvent] = []
+        self._snapshot_lock = asyncio.Lock()
+        self._snapshot_task: Optional[asyncio.Task] = None
         
         # Circuit breaker management
         if self.config.enable_circuit_breakers:
@@ -109,6 +318,7 @@ class PersistentServiceRegistry:
             "total_health_checks": 0,
             "total_events": 0,
             "backup_count": 0,
+            "snapshot_count": 0,
             "cleanup_count": 0
         }
         
@@ -119,10 +329,11 @@ class PersistentServiceRegistry:
         if self._running:
             return
         
-        # Initialize database
+        # Initialize database, then recover from snapshot and journal tail
         if self.config.enable_persistence:
             await self._initialize_database()
             await self._load_from_database()
+            await self.journal.start()
         
         # Start background tasks
         self._running = True
@@ -147,16 +358,24 @@ class PersistentServiceRegistry:
             self._backup_task.cancel()
         
         # Wait for tasks to complete
-        tasks = [task for task in [self._cleanup_task, self._backup_task] if task]
+        tasks = [task for task in [self._cleanup_task, self._backup_task, self._snapshot_task] if task]
         await asyncio.gather(*tasks, return_exceptions=True)
         
-        # Final backup
+        # Final snapshot, then close the journal
         if self.config.enable_persistence:
             await self._backup_to_database()
+            if self.journal:
+                await self.journal.stop()
+                self.journal = None
         
         # Close database connection
         if self.db_connection:
-            self.db_connection.close()
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._db_executor, self.db_connection.close)
+            self.db_connection = None
+        if self._db_executor:
+            self._db_executor.shutdown(wait=False)
+            self._db_executor = None
         
         logger.info("Service registry stopped")
     
@@ -223,9 +442,9 @@ class PersistentServiceRegistry:
                 enhanced_instance
             )
             
-            # Persist to database
+            # Persist to journal
             if self.config.enable_persistence:
-                await self._save_service_to_db(registration)
+                await self._journal_service(registration)
             
             self.metrics["total_registrations"] += 1
             
@@ -276,9 +495,9 @@ class PersistentServiceRegistry:
                 service_instance
             )
             
-            # Remove from database
+            # Persist to journal
             if self.config.enable_persistence:
-                await self._remove_service_from_db(service_id)
+                await self._journal_write({"op": "remove", "service_id": service_id})
             
             self.metrics["total_deregistrations"] += 1
             
@@ -322,7 +541,7 @@ class PersistentServiceRegistry:
             
             # Persist changes
             if self.config.enable_persistence:
-                await self._save_service_to_db(registration)
+                await self._journal_service(registration)
             
             logger.info(f"Updated service {service_id} with {len(updates)} changes")
             return True
@@ -483,6 +702,7 @@ class PersistentServiceRegistry:
                 "recent_events": event_types,
                 "configuration": {
                     "database_path": self.config.database_path,
+                    "journal_path": self.journal_path,
                     "persistence_enabled": self.config.enable_persistence,
                     "circuit_breakers_enabled": self.config.enable_circuit_breakers,
                     "service_ttl": self.config.service_ttl,
@@ -511,13 +731,7 @@ class PersistentServiceRegistry:
             
             # Serialize services
             for service_id, registration in self.services.items():
-                backup_data["services"][service_id] = {
-                    "instance": asdict(registration.instance),
-                    "registered_at": registration.registered_at.isoformat(),
-                    "last_heartbeat": registration.last_heartbeat.isoformat(),
-                    "status": registration.status.value,
-                    "ttl": registration.ttl
-                }
+                backup_data["services"][service_id] = _registration_to_dict(registration)
             
             # Serialize dependencies
             for service_id, deps in self.service_dependencies.items():
@@ -525,15 +739,7 @@ class PersistentServiceRegistry:
             
             # Serialize recent events
             for event in self.service_events[-1000:]:  # Last 1000 events
-                backup_data["events"].append({
-                    "event_id": event.event_id,
-                    "event_type": event.event_type.value,
-                    "service_id": event.service_id,
-                    "service_name": event.service_name,
-                    "timestamp": event.timestamp.isoformat(),
-                    "details": event.details,
-                    "source": event.source
-                })
+                backup_data["events"].append(_event_to_dict(event))
             
             # Write backup
             with open(backup_path, 'w') as f:
@@ -552,128 +758,225 @@ class PersistentServiceRegistry:
     async def _initialize_database(self) -> None:
         """Initialize SQLite database."""
         try:
-            self.db_connection = sqlite3.connect(self.db_path)
-            cursor = self.db_connection.cursor()
-            
-            # Create services table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS services (
-                    service_id TEXT PRIMARY KEY,
-                    service_name TEXT NOT NULL,
-                    host TEXT NOT NULL,
-                    port INTEGER NOT NULL,
-                    metadata TEXT,
-                    health_check_url TEXT,
-                    tags TEXT,
-                    version TEXT,
-                    registered_at TEXT,
-                    last_heartbeat TEXT,
-                    status TEXT,
-                    ttl INTEGER
-                )
-            """)
-            
-            # Create events table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS service_events (
-                    event_id TEXT PRIMARY KEY,
-                    event_type TEXT NOT NULL,
-                    service_id TEXT NOT NULL,
-                    service_name TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    details TEXT,
-                    source TEXT
-                )
-            """)
-            
-            # Create dependencies table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS service_dependencies (
-                    service_id TEXT,
-                    dependency_id TEXT,
-                    PRIMARY KEY (service_id, dependency_id)
-                )
-            """)
-            
-            self.db_connection.commit()
+            # All SQLite access goes through one worker thread so the
+            # connection is never used concurrently or on the event loop
+            self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="service-registry-db")
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._db_executor, self._initialize_database_sync)
             logger.info("Database initialized successfully")
             
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
             raise
     
+    def _initialize_database_sync(self) -> None:
+        self.db_connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        cursor = self.db_connection.cursor()
+        
+        # Create services table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS services (
+                service_id TEXT PRIMARY KEY,
+                service_name TEXT NOT NULL,
+                host TEXT NOT NULL,
+                port INTEGER NOT NULL,
+                metadata TEXT,
+                health_check_url TEXT,
+                tags TEXT,
+                version TEXT,
+                registered_at TEXT,
+                last_heartbeat TEXT,
+                status TEXT,
+                ttl INTEGER
+            )
+        """)
+        
+        # Create events table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS service_events (
+                event_id TEXT PRIMARY KEY,
+                event_type TEXT NOT NULL,
+                service_id TEXT NOT NULL,
+                service_name TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                details TEXT,
+                source TEXT
+            )
+        """)
+        
+        # Create dependencies table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS service_dependencies (
+                service_id TEXT,
+                dependency_id TEXT,
+                PRIMARY KEY (service_id, dependency_id)
+            )
+        """)
+        
+        # Journal sequence number covered by the snapshot
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS registry_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+        
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_services_name ON services (service_name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_timestamp ON service_events (timestamp)")
+        
+        self.db_connection.commit()
+    
     async def _load_from_database(self) -> None:
-        """Load services from database."""
+        """Load the latest snapshot, then replay the journal written since."""
+        loop = asyncio.get_running_loop()
+        snapshot_seq = 0
+        
         try:
-            if not self.db_connection:
-                return
-            
-            cursor = self.db_connection.cursor()
-            
-            # Load services
-            cursor.execute("SELECT * FROM services")
-            rows = cursor.fetchall()
+            services, dependencies, snapshot_seq = await loop.run_in_executor(
+                self._db_executor, self._load_snapshot_sync
+            )
+            self.services.update(services)
+            self.service_dependencies.update(dependencies)
             
-            for row in rows:
-                (service_id, service_name, host, port, metadata_json, health_check_url,
-                 tags_json, version, registered_at_str, last_heartbeat_str, status_str, ttl) = row
-                
-                # Parse JSON fields
-                metadata = json.loads(metadata_json) if metadata_json else {}
-                tags = json.loads(tags_json) if tags_json else []
-                
-                # Create service instance
-                instance = ServiceInstance(
-                    service_id=service_id,
-                    service_name=service_name,
-                    host=host,
-                    port=port,
-                    metadata=metadata,
-                    health_check_url=health_check_url,
-                    tags=tags,
-                    version=version
-                )
-                
-                # Create registration
-                registration = ServiceRegistration(
-                    instance=instance,
-                    registered_at=datetime.fromisoformat(registered_at_str),
-                    last_heartbeat=datetime.fromisoformat(last_heartbeat_str),
-                    status=ServiceStatus(status_str),
-                    ttl=ttl
-                )
-                
-                self.services[service_id] = registration
+        except Exception as e:
+            logger.error(f"Failed to load from database: {e}")
+        
+        self.journal = RegistryJournal(self.journal_path, fsync=self.config.journal_fsync)
+        records = await loop.run_in_executor(None, self.journal.recover, snapshot_seq)
+        for record in records:
+            self._apply_journal_record(record)
+        
+        logger.info(f"Loaded {len(self.services)} services from snapshot "
+                   f"and {len(records)} journal records")
+    
+    def _load_snapshot_sync(self) -> Tuple[Dict[str, ServiceRegistration], Dict[str, Set[str]], int]:
+        cursor = self.db_connection.cursor()
+        services: Dict[str, ServiceRegistration] = {}
+        dependencies: Dict[str, Set[str]] = {}
+        
+        # Load services
+        cursor.execute("SELECT * FROM services")
+        for row in cursor.fetchall():
+            (service_id, service_name, host, port, metadata_json, health_check_url,
+             tags_json, version, registered_at_str, last_heartbeat_str, status_str, ttl) = row
             
-            # Load dependencies
-            cursor.execute("SELECT * FROM service_dependencies")
-            dep_rows = cursor.fetchall()
+            instance = ServiceInstance(
+                service_id=service_id,
+                service_name=service_name,
+                host=host,
+                port=port,
+                metadata=json.loads(metadata_json) if metadata_json else {},
+                health_check_url=health_check_url,
+                tags=json.loads(tags_json) if tags_json else [],
+                version=version
+            )
             
-            for service_id, dependency_id in dep_rows:
-                if service_id not in self.service_dependencies:
-                    self.service_dependencies[service_id] = set()
-                self.service_dependencies[service_id].add(dependency_id)
+            services[service_id] = ServiceRegistration(
+                instance=instance,
+                registered_at=datetime.fromisoformat(registered_at_str),
+                last_heartbeat=datetime.fromisoformat(last_heartbeat_str),
+                status=ServiceStatus(status_str),
+                ttl=ttl
+            )
+        
+        # Load dependencies
+        cursor.execute("SELECT * FROM service_dependencies")
+        for service_id, dependency_id in cursor.fetchall():
+            dependencies.setdefault(service_id, set()).add(dependency_id)
+        
+        cursor.execute("SELECT value FROM registry_meta WHERE key = 'journal_seq'")
+        row = cursor.fetchone()
+        return services, dependencies, int(row[0]) if row else 0
+    
+    def _apply_journal_record(self, record: Dict[str, Any]) -> None:
+        """Replay one journal record onto the in-memory registry."""
+        op = record["op"]
+        
+        if op == "put":
+            registration = _registration_from_dict(record["service"])
+            service_id = registration.instance.service_id
+            self.services[service_id] = registration
+            if record.get("dependencies"):
+                self.service_dependencies[service_id] = set(record["dependencies"])
+            else:
+                self.service_dependencies.pop(service_id, None)
+        
+        elif op == "remove":
+            self.services.pop(record["service_id"], None)
+            self.service_dependencies.pop(record["service_id"], None)
+        
+        elif op == "event":
+            # Not yet in the snapshot; written out with the next one
+            data = record["event"]
+            self._pending_events.append(ServiceEvent(
+                event_id=data["event_id"],
+                event_type=ServiceLifecycleEvent(data["event_type"]),
+                service_id=data["service_id"],
+                service_name=data["service_name"],
+                timestamp=datetime.fromisoformat(data["timestamp"]),
+                details=data["details"],
+                source=data["source"]
+            ))
+    
+    async def _journal_service(self, registration: ServiceRegistration) -> None:
+        """Journal the full state of a service registration."""
+        service_id = registration.instance.service_id
+        await self._journal_write({
+            "op": "put",
+            "service": _registration_to_dict(registration),
+            "dependencies": sorted(self.service_dependencies.get(service_id, ()))
+        })
+    
+    async def _journal_write(self, record: Dict[str, Any]) -> None:
+        """Append a record and wait for its group commit."""
+        if not self.journal:
+            return
+        
+        try:
+            if not await self.journal.append(record):
+                logger.error(f"Journal record not committed: {record['op']}")
             
-            logger.info(f"Loaded {len(self.services)} services from database")
+            if self.journal.size > self.config.journal_compact_bytes:
+                self._schedule_snapshot()
             
         except Exception as e:
-            logger.error(f"Failed to load from database: {e}")
+            logger.error(f"Failed to write journal record: {e}")
     
-    async def _save_service_to_db(self, registration: ServiceRegistration) -> None:
-        """Save service registration to database."""
-        try:
-            if not self.db_connection:
-                return
+    def _schedule_snapshot(self) -> None:
+        """Start a snapshot and compaction in the background unless one is running."""
+        if self._snapshot_task and not self._snapshot_task.done():
+            return
+        self._snapshot_task = asyncio.create_task(self._backup_to_database())
+    
+    async def _backup_to_database(self) -> None:
+        """Snapshot current state to the database and compact the journal."""
+        if not self.config.enable_persistence or not self.db_connection or not self.journal:
+            return
+        
+        async with self._snapshot_lock:
+            # Capture without yielding so the state matches the sequence number
+            snapshot = self._capture_snapshot()
             
-            cursor = self.db_connection.cursor()
+            try:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self._db_executor, self._write_snapshot_sync, snapshot)
+                await self.journal.truncate_through(snapshot["seq"])
+                self.metrics["snapshot_count"] += 1
+                logger.debug(f"Registry snapshot written at journal sequence {snapshot['seq']}")
+                
+            except Exception as e:
+                # Events go back in the queue; the journal still holds everything
+                self._pending_events = snapshot["events"] + self._pending_events
+                logger.error(f"Database backup failed: {e}")
+    
+    def _capture_snapshot(self) -> Dict[str, Any]:
+        events, self._pending_events = self._pending_events, []
+        cutoff = datetime.utcnow() - timedelta(hours=self.config.event_retention_hours)
+        
+        services = []
+        for registration in self.services.values():
             instance = registration.instance
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO services 
-                (service_id, service_name, host, port, metadata, health_check_url, 
-                 tags, version, registered_at, last_heartbeat, status, ttl)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            services.append((
                 instance.service_id,
                 instance.service_name,
                 instance.host,
@@ -687,39 +990,54 @@ class PersistentServiceRegistry:
                 registration.status.value,
                 registration.ttl
             ))
-            
-            self.db_connection.commit()
-            
-        except Exception as e:
-            logger.error(f"Failed to save service to database: {e}")
+        
+        dependencies = [
+            (service_id, dependency_id)
+            for service_id, deps in self.service_dependencies.items()
+            for dependency_id in deps
+        ]
+        
+        return {
+            "seq": self.journal.last_seq,
+            "services": services,
+            "dependencies": dependencies,
+            "events": events,
+            "cutoff": cutoff.isoformat()
+        }
     
-    async def _remove_service_from_db(self, service_id: str) -> None:
-        """Remove service from database."""
-        try:
-            if not self.db_connection:
-                return
-            
+    def _write_snapshot_sync(self, snapshot: Dict[str, Any]) -> None:
+        with self.db_connection:
             cursor = self.db_connection.cursor()
-            cursor.execute("DELETE FROM services WHERE service_id = ?", (service_id,))
-            cursor.execute("DELETE FROM service_dependencies WHERE service_id = ? OR dependency_id = ?", 
-                         (service_id, service_id))
-            self.db_connection.commit()
             
-        except Exception as e:
-            logger.error(f"Failed to remove service from database: {e}")
-    
-    async def _backup_to_database(self) -> None:
-        """Backup current state to database."""
-        if not self.config.enable_persistence or not self.db_connection:
-            return
-        
-        try:
-            # This would typically sync in-memory state to database
-            # For now, individual operations handle persistence
-            logger.debug("Database backup completed")
+            cursor.execute("DELETE FROM services")
+            cursor.executemany("""
+                INSERT INTO services 
+                (service_id, service_name, host, port, metadata, health_check_url, 
+                 tags, version, registered_at, last_heartbeat, status, ttl)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, snapshot["services"])
             
-        except Exception as e:
-            logger.error(f"Database backup failed: {e}")
+            cursor.execute("DELETE FROM service_dependencies")
+            cursor.executemany(
+                "INSERT INTO service_dependencies (service_id, dependency_id) VALUES (?, ?)",
+                snapshot["dependencies"]
+            )
+            
+            cursor.executemany("""
+                INSERT OR IGNORE INTO service_events 
+                (event_id, event_type, service_id, service_name, timestamp, details, source)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (event.event_id, event.event_type.value, event.service_id, event.service_name,
+                 event.timestamp.isoformat(), json.dumps(event.details), event.source)
+                for event in snapshot["events"]
+            ])
+            cursor.execute("DELETE FROM service_events WHERE timestamp < ?", (snapshot["cutoff"],))
+            
+            cursor.execute(
+                "INSERT OR REPLACE INTO registry_meta (key, value) VALUES ('journal_seq', ?)",
+                (str(snapshot["seq"]),)
+            )
     
     async def _emit_event(self, event_type: ServiceLifecycleEvent, service_id: str,
                          service_name: str, details: Dict[str, Any]) -> None:
@@ -741,23 +1059,11 @@ class PersistentServiceRegistry:
             if len(self.service_events) > 10000:
                 self.service_events = self.service_events[-5000:]
             
-            # Save event to database
-            if self.config.enable_persistence and self.db_connection:
-                cursor = self.db_connection.cursor()
-                cursor.execute("""
-                    INSERT INTO service_events 
-                    (event_id, event_type, service_id, service_name, timestamp, details, source)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    event.event_id,
-                    event.event_type.value,
-                    event.service_id,
-                    event.service_name,
-                    event.timestamp.isoformat(),
-                    json.dumps(event.details),
-                    event.source
-                ))
-                self.db_connection.commit()
+            # Journal the event; it reaches the database with the next snapshot.
+            # Events don't wait for their commit.
+            if self.config.enable_persistence and self.journal:
+                self._pending_events.append(event)
+                self.journal.append({"op": "event", "event": _event_to_dict(event)})
             
             logger.debug(f"Emitted event: {event_type.value} for service {service_id}")
             
@@ -840,14 +1146,7 @@ class PersistentServiceRegistry:
                 if event.timestamp > cutoff_time
             ]
             
-            # Clean database events
-            if self.config.enable_persistence and self.db_connection:
-                cursor = self.db_connection.cursor()
-                cursor.execute(
-                    "DELETE FROM service_events WHERE timestamp < ?",
-                    (cutoff_time.isoformat(),)
-                )
-                self.db_connection.commit()
+            # Database events past retention are deleted with each snapshot
             
         except Exception as e:
             logger.error(f"Error cleaning up old events: {e}")
\ No newline at end of file
@@ -3,15 +3,25 @@ Webhook Server for External API Integration
 
 Handles incoming webhooks from external systems and routes them to
 appropriate handlers within the LeanVibe Agent Hive system.
+
+Raw request bodies go through ``ingest``: the body is size-checked before
+it is parsed, the event is put on a bounded queue and acknowledged with
+202 straight away, and a pool of workers runs the handlers. Delivery
+tracking is bounded by age and count. Retried deliveries are recognised by
+the provider's delivery id header, or failing that a digest of the body,
+and answered with the original response instead of being processed again.
 """
 
 import asyncio
+import hashlib
 import json
 import logging
+import math
 import time
 import uuid
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, Any, Optional, Callable, List
+from typing import Deque, Dict, Any, Optional, Callable, List, Tuple
 from dataclasses import asdict
 
 from .models import (
@@ -25,6 +35,77 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+_EVENT_TYPES = {event_type.value: event_type for event_type in WebhookEventType}
+
+# Headers carrying a provider's unique id for a delivery (lower case)
+DELIVERY_ID_HEADERS = frozenset({
+    "x-github-delivery",
+    "x-gitlab-event-uuid",
+    "x-webhook-id",
+    "idempotency-key",
+})
+
+
+class IdempotencyIndex:
+    """
+    Time-bounded set of idempotency keys, each with the response first given.
+
+    A key is reserved while its delivery is being handled, so a concurrent
+    duplicate sees it, and either gets its response recorded or is released
+    for retry. Entries are kept in insertion order, so expired entries and
+    entries beyond the size cap are dropped from the front in amortized
+    constant time as new keys are added.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (expiry time, response); the response is None while in flight
+        self._entries: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Response recorded for a key, or None if unseen, expired or in flight."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del self._entries[key]
+            return None
+        return entry[1]
+
+    def reserve(self, key: str) -> bool:
+        """Mark an unseen key as in flight; False if it is recorded or already in flight."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.time():
+            return False
+        self._store(key, None)
+        return True
+
+    def release(self, key: str) -> None:
+        """Drop an in-flight key so the delivery can be retried."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] is None:
+            del self._entries[key]
+
+    def add(self, key: str, response: Dict[str, Any]) -> None:
+        """Record the response for a key."""
+        self._store(key, response)
+
+    def _store(self, key: str, response: Optional[Dict[str, Any]]) -> None:
+        now = time.time()
+        self._entries[key] = (now + self.ttl_seconds, response)
+        self._entries.move_to_end(key)
+
+        entries = self._entries
+        while entries:
+            oldest_key, (expires_at, _) = next(iter(entries.items()))
+            if expires_at > now and len(entries) <= self.max_entries:
+                break
+            del entries[oldest_key]
+
 
 class WebhookServer:
     """
@@ -43,11 +124,26 @@ class WebhookServer:
         """
         self.config = config
         self.handlers: Dict[str, Callable] = {}
-        self.rate_limiter: Dict[str, List[float]] = {}
+        # Sliding window counter per IP: [window index, count, previous window count]
+        self.rate_limiter: Dict[str, List[int]] = {}
         self.server_started = False
-        self.delivery_status: Dict[str, WebhookDelivery] = {}
+        # Deliveries in acknowledgement order, with matching expiry times
+        self.delivery_status: "OrderedDict[str, WebhookDelivery]" = OrderedDict()
+        self._delivery_expiry: Deque[Tuple[float, str]] = deque()
         self._server_task: Optional[asyncio.Task] = None
 
+        self._queue: "asyncio.Queue[Tuple[WebhookEvent, WebhookDelivery]]" = asyncio.Queue(
+            maxsize=config.queue_size
+        )
+        self._workers: List[asyncio.Task] = []
+        self._next_rate_limit_sweep = 0.0
+
+        # Retried deliveries: idempotency key -> first response
+        self.idempotency_index = IdempotencyIndex(
+            config.idempotency_ttl_seconds, config.max_idempotency_keys
+        )
+        self.duplicates_suppressed = 0
+
         logger.info(f"WebhookServer initialized on {config.host}:{config.port}")
 
     async def start_server(self) -> None:
@@ -61,6 +157,9 @@ class WebhookServer:
             logger.info(f"Starting webhook server on {self.config.host}:{self.config.port}")
             await asyncio.sleep(0.1)  # Simulate startup time
 
+            self._workers = [
+                asyncio.create_task(self._worker()) for _ in range(self.config.worker_count)
+            ]
             self.server_started = True
             logger.info("Webhook server started successfully")
 
@@ -69,7 +168,7 @@ class WebhookServer:
             raise
 
     async def stop_server(self) -> None:
-        """Stop the webhook server."""
+        """Stop the webhook server, letting accepted events finish first."""
         if not self.server_started:
             logger.warning("Server not running")
             return
@@ -77,6 +176,16 @@ class WebhookServer:
         try:
             logger.info("Stopping webhook server...")
 
+            try:
+                await asyncio.wait_for(self._queue.join(), self.config.timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.warning(f"Stopping with {self._queue.qsize()} webhook events unprocessed")
+
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+
             if self._server_task:
                 self._server_task.cancel()
                 try:
@@ -121,13 +230,101 @@ class WebhookServer:
             return True
         return False
 
-    async def handle_webhook(self, payload: Dict[str, Any], source_ip: str = "unknown") -> Dict[str, Any]:
+    async def ingest(self, body: bytes, source_ip: str = "unknown",
+                     headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
-        Handle incoming webhook request.
+        Accept a raw webhook request body for asynchronous processing.
+
+        The body is size-checked before parsing. Accepted events are queued
+        for the worker pool and acknowledged immediately; their outcome is
+        recorded in the delivery status. A retried delivery gets the
+        original acknowledgement back, marked as a duplicate, without
+        being parsed or queued again.
+
+        Args:
+            body: Raw request body (JSON)
+            source_ip: Source IP address of the request
+            headers: Request headers, used for the provider's delivery id
+
+        Returns:
+            Response data: 202 with the webhook and event ids when accepted
+        """
+        try:
+            if not self._check_rate_limit(source_ip):
+                logger.warning(f"Rate limit exceeded for {source_ip}")
+                return self._error_response(429, "Rate limit exceeded")
+
+            if len(body) > self.config.max_payload_size:
+                logger.warning(f"Payload too large: {len(body)} bytes")
+                return self._error_response(413, "Payload too large")
+
+            idempotency_key = self._idempotency_key(body, headers)
+            duplicate = self._claim(idempotency_key)
+            if duplicate:
+                return duplicate
+
+            accepted = False
+            try:
+                try:
+                    payload = json.loads(body)
+                except (ValueError, UnicodeDecodeError):
+                    return self._error_response(400, "Invalid JSON payload")
+
+                webhook_event, error = self._create_event(payload, source_ip)
+                if error:
+                    return error
+
+                event_type = webhook_event.event_type.value
+                if event_type not in self.handlers:
+                    logger.warning(f"No handler registered for event type: {event_type}")
+                    return self._error_response(404, f"No handler for event type: {event_type}")
+
+                if not self.server_started:
+                    return self._error_response(503, "Webhook server not running")
+
+                delivery = self._new_delivery(webhook_event, payload["type"], "pending", 202)
+                try:
+                    self._queue.put_nowait((webhook_event, delivery))
+                except asyncio.QueueFull:
+                    logger.warning(f"Webhook queue full, rejecting event from {source_ip}")
+                    return self._error_response(503, "Webhook queue full")
+
+                self._track_delivery(delivery)
+                response = {
+                    "status": "accepted",
+                    "message": "Event accepted for processing",
+                    "code": 202,
+                    "event_id": webhook_event.event_id,
+                    "webhook_id": delivery.webhook_id
+                }
+                if idempotency_key:
+                    self.idempotency_index.add(idempotency_key, response)
+                accepted = True
+                return response
+            finally:
+                # Rejected deliveries stay retryable
+                if idempotency_key and not accepted:
+                    self.idempotency_index.release(idempotency_key)
+
+        except Exception as e:
+            logger.error(f"Error ingesting webhook: {e}")
+            return self._error_response(500, "Internal server error")
+
+    async def handle_webhook(self, payload: Dict[str, Any], source_ip: str = "unknown",
+                             headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Handle an already parsed webhook payload inline.
+
+        The handler runs before this returns. Callers holding the raw
+        request body should use ``ingest`` instead, which avoids
+        re-serializing the payload to measure it and does not wait for
+        the handler. Once a delivery has been processed successfully,
+        retries get the original response back, marked as a duplicate.
 
         Args:
             payload: Webhook payload data
             source_ip: Source IP address of the request
+            headers: Request headers, used for the provider's delivery id
 
         Returns:
             Response data
@@ -136,66 +333,127 @@ class WebhookServer:
             # Rate limiting check
             if not self._check_rate_limit(source_ip):
                 logger.warning(f"Rate limit exceeded for {source_ip}")
-                return {
-                    "status": "error",
-                    "message": "Rate limit exceeded",
-                    "code": 429
-                }
+                return self._error_response(429, "Rate limit exceeded")
 
             # Validate payload size
-            payload_size = len(json.dumps(payload).encode())
-            if payload_size > self.config.max_payload_size:
-                logger.warning(f"Payload too large: {payload_size} bytes")
-                return {
-                    "status": "error",
-                    "message": "Payload too large",
-                    "code": 413
-                }
+            body = json.dumps(payload).encode()
+            if len(body) > self.config.max_payload_size:
+                logger.warning(f"Payload too large: {len(body)} bytes")
+                return self._error_response(413, "Payload too large")
+
+            idempotency_key = self._idempotency_key(body, headers)
+            duplicate = self._claim(idempotency_key)
+            if duplicate:
+                return duplicate
+
+            succeeded = False
+            try:
+                webhook_event, error = self._create_event(payload, source_ip)
+                if error:
+                    return error
+
+                # Process the event
+                response = await self._process_event(webhook_event)
+
+                # Track delivery status
+                delivery = self._new_delivery(
+                    webhook_event,
+                    payload["type"],
+                    "success" if response.get("status") == "success" else "failed",
+                    response.get("code", 200)
+                )
+                self._track_delivery(delivery)
+
+                if idempotency_key and delivery.status == "success":
+                    self.idempotency_index.add(idempotency_key, response)
+                    succeeded = True
+
+                logger.info(f"Processed webhook event {webhook_event.event_id} from {source_ip}")
+                return response
+            finally:
+                # Failed deliveries stay retryable
+                if idempotency_key and not succeeded:
+                    self.idempotency_index.release(idempotency_key)
 
-            # Extract event information
-            event_type = payload.get("type")
-            if not event_type:
-                return {
-                    "status": "error",
-                    "message": "Missing event type",
-                    "code": 400
-                }
+        except Exception as e:
+            logger.error(f"Error handling webhook: {e}")
+            return self._error_response(500, "Internal server error")
 
-            # Create webhook event
-            webhook_event = WebhookEvent(
-                event_type=WebhookEventType(event_type) if event_type in [e.value for e in WebhookEventType] else WebhookEventType.SYSTEM_ALERT,
-                event_id=str(uuid.uuid4()),
-                timestamp=datetime.now(),
-                source=source_ip,
-                payload=payload,
-                priority=EventPriority(payload.get("priority", "medium"))
-            )
+    def _create_event(self, payload: Any, source_ip: str) -> Tuple[Optional[WebhookEvent], Optional[Dict[str, Any]]]:
+        """Build the webhook event for a payload, or the error response rejecting it."""
+        if not isinstance(payload, dict):
+            return None, self._error_response(400, "Payload must be a JSON object")
 
-            # Process the event
-            response = await self._process_event(webhook_event)
-
-            # Track delivery status
-            delivery = WebhookDelivery(
-                webhook_id=str(uuid.uuid4()),
-                event_id=webhook_event.event_id,
-                endpoint_url=f"{self.config.endpoint_prefix}/{event_type}",
-                attempt_count=1,
-                last_attempt=datetime.now(),
-                status="success" if response.get("status") == "success" else "failed",
-                response_code=response.get("code", 200)
-            )
-            self.delivery_status[delivery.webhook_id] = delivery
+        # Extract event information
+        event_type = payload.get("type")
+        if not event_type:
+            return None, self._error_response(400, "Missing event type")
 
-            logger.info(f"Processed webhook event {webhook_event.event_id} from {source_ip}")
-            return response
+        try:
+            priority = EventPriority(payload.get("priority", "medium"))
+        except ValueError:
+            return None, self._error_response(400, "Invalid event priority")
+
+        return WebhookEvent(
+            event_type=_EVENT_TYPES.get(event_type, WebhookEventType.SYSTEM_ALERT),
+            event_id=str(uuid.uuid4()),
+            timestamp=datetime.now(),
+            source=source_ip,
+            payload=payload,
+            priority=priority
+        ), None
+
+    def _idempotency_key(self, body: bytes, headers: Optional[Dict[str, str]]) -> Optional[str]:
+        """Provider delivery id if one was sent, else a digest of the body."""
+        if headers:
+            for name, value in headers.items():
+                if value and name.lower() in DELIVERY_ID_HEADERS:
+                    return f"id:{value}"
+
+        if self.config.dedupe_by_payload_digest:
+            return "sha:" + hashlib.blake2b(body, digest_size=16).hexdigest()
+        return None
+
+    def _claim(self, idempotency_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Reserve a delivery's key before it is dispatched.
 
-        except Exception as e:
-            logger.error(f"Error handling webhook: {e}")
-            return {
-                "status": "error",
-                "message": "Internal server error",
-                "code": 500
-            }
+        Returns None when the delivery should proceed; for a duplicate, the
+        original response marked as a duplicate, or 409 while the original
+        is still being handled.
+        """
+        if not idempotency_key or self.idempotency_index.reserve(idempotency_key):
+            return None
+
+        self.duplicates_suppressed += 1
+        logger.info(f"Duplicate webhook delivery {idempotency_key} suppressed")
+        response = self.idempotency_index.get(idempotency_key)
+        if response is None:
+            return self._error_response(409, "Delivery already in progress")
+        return {**response, "duplicate": True}
+
+    def _error_response(self, code: int, message: str) -> Dict[str, Any]:
+        return {
+            "status": "error",
+            "message": message,
+            "code": code
+        }
+
+    async def _worker(self) -> None:
+        """Run handlers for queued events and record their outcome."""
+        while True:
+            webhook_event, delivery = await self._queue.get()
+            try:
+                response = await self._process_event(webhook_event)
+                delivery.status = "success" if response.get("status") == "success" else "failed"
+                delivery.response_code = response.get("code", 200)
+                delivery.last_attempt = datetime.now()
+                if delivery.status == "failed":
+                    delivery.error_message = response.get("message")
+            except Exception as e:
+                logger.error(f"Webhook worker error for event {webhook_event.event_id}: {e}")
+            finally:
+                self._queue.task_done()
 
     async def _process_event(self, event: WebhookEvent) -> Dict[str, Any]:
         """
@@ -246,10 +504,37 @@ class WebhookServer:
                 "code": 500
             }
 
+    def _new_delivery(self, event: WebhookEvent, event_type: str, status: str,
+                      response_code: int) -> WebhookDelivery:
+        return WebhookDelivery(
+            webhook_id=str(uuid.uuid4()),
+            event_id=event.event_id,
+            endpoint_url=f"{self.config.endpoint_prefix}/{event_type}",
+            attempt_count=1,
+            last_attempt=datetime.now(),
+            status=status,
+            response_code=response_code
+        )
+
+    def _track_delivery(self, delivery: WebhookDelivery) -> None:
+        """Record a delivery, expiring the oldest ones past their TTL or the size cap."""
+        now = time.time()
+        self.delivery_status[delivery.webhook_id] = delivery
+        self._delivery_expiry.append((now + self.config.delivery_ttl_seconds, delivery.webhook_id))
+
+        expiry = self._delivery_expiry
+        while expiry and (expiry[0][0] <= now or len(expiry) > self.config.max_tracked_deliveries):
+            _, webhook_id = expiry.popleft()
+            self.delivery_status.pop(webhook_id, None)
+
     def _check_rate_limit(self, source_ip: str) -> bool:
         """
         Check if request is within rate limits.
 
+        Uses a sliding window counter: the count in the current fixed
+        window plus the previous window's count weighted by how much of it
+        the sliding window still covers. Constant time and memory per IP.
+
         Args:
             source_ip: Source IP address
 
@@ -257,26 +542,39 @@ class WebhookServer:
             True if within limits, False otherwise
         """
         current_time = time.time()
-        window_start = current_time - self.config.rate_limit_window
-
-        # Clean old entries
-        if source_ip in self.rate_limiter:
-            self.rate_limiter[source_ip] = [
-                timestamp for timestamp in self.rate_limiter[source_ip]
-                if timestamp > window_start
-            ]
-        else:
-            self.rate_limiter[source_ip] = []
-
-        # Check current count
-        current_count = len(self.rate_limiter[source_ip])
-        if current_count >= self.config.rate_limit_requests:
+        window = self.config.rate_limit_window
+        window_index = int(current_time // window)
+
+        if current_time >= self._next_rate_limit_sweep:
+            self._sweep_rate_limiter(window_index)
+            self._next_rate_limit_sweep = current_time + window
+
+        entry = self.rate_limiter.get(source_ip)
+        if entry is None:
+            entry = self.rate_limiter[source_ip] = [window_index, 0, 0]
+        elif entry[0] != window_index:
+            entry[2] = entry[1] if entry[0] == window_index - 1 else 0
+            entry[0] = window_index
+            entry[1] = 0
+
+        if self._estimated_count(entry, current_time) >= self.config.rate_limit_requests:
             return False
 
-        # Add current request
-        self.rate_limiter[source_ip].append(current_time)
+        entry[1] += 1
         return True
 
+    def _estimated_count(self, entry: List[int], current_time: float) -> float:
+        """Requests in the sliding window ending now, for an up-to-date entry."""
+        window = self.config.rate_limit_window
+        previous_weight = 1 - (current_time - entry[0] * window) / window
+        return entry[1] + entry[2] * previous_weight
+
+    def _sweep_rate_limiter(self, window_index: int) -> None:
+        """Drop IPs with no requests in the current or previous window."""
+        stale = [ip for ip, entry in self.rate_limiter.items() if entry[0] < window_index - 1]
+        for ip in stale:
+            del self.rate_limiter[ip]
+
     def get_delivery_status(self, webhook_id: str) -> Optional[WebhookDelivery]:
         """
         Get delivery status for a webhook.
@@ -311,13 +609,19 @@ class WebhookServer:
             Rate limit information
         """
         current_time = time.time()
-        window_start = current_time - self.config.rate_limit_window
+        window_index = int(current_time // self.config.rate_limit_window)
 
         active_ips = {}
-        for ip, timestamps in self.rate_limiter.items():
-            active_requests = [t for t in timestamps if t > window_start]
+        for ip, (index, count, previous) in self.rate_limiter.items():
+            if index == window_index:
+                entry = [index, count, previous]
+            elif index == window_index - 1:
+                entry = [window_index, 0, count]
+            else:
+                continue
+            active_requests = math.ceil(self._estimated_count(entry, current_time))
             if active_requests:
-                active_ips[ip] = len(active_requests)
+                active_ips[ip] = active_requests
 
         return {
             "rate_limit_config": {
@@ -340,6 +644,10 @@ class WebhookServer:
             "server_running": self.server_started,
             "registered_handlers": len(self.handlers),
             "active_deliveries": len(self.delivery_status),
+            "queued_events": self._queue.qsize(),
+            "idempotency_keys": len(self.idempotency_index),
+            "duplicates_suppressed": self.duplicates_suppressed,
+            "workers": len(self._workers),
             "config_valid": True,  # Could add actual validation
             "timestamp": datetime.now().isoformat()
         }
@@ -5,9 +5,12 @@ This module provides advanced task allocation and prioritization capabilities
 using machine learning and intelligent decision-making algorithms.
 """
 
+import heapq
+import itertools
 import logging
+import math
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Container, Dict, Iterator, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import json
@@ -137,6 +140,224 @@ class IntelligentTask:
         }
 
 
+class TaskPriorityQueue:
+    """
+    Bounded priority queue of tasks.
+
+    Tasks are ordered by priority (highest first), then deadline (earliest
+    first, tasks with a deadline ahead of those without), then submission
+    order. Push and pop are O(log n); removal by task ID is O(1) and lazy,
+    the dead heap entry is skipped when it surfaces. A second heap keyed on
+    the reverse order finds the task to evict when the queue is full.
+    """
+
+    def __init__(self, maxsize: int = 0, tasks: Optional[List[IntelligentTask]] = None):
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize: Maximum number of queued tasks, 0 for unbounded
+            tasks: Tasks to queue initially
+        """
+        self.maxsize = maxsize
+        self._heap: List[list] = []
+        self._evict_heap: List[list] = []
+        self._entries: Dict[str, list] = {}
+        self._sequence = itertools.count()
+
+        for task in tasks or []:
+            self.push(task)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries
+
+    def __iter__(self) -> Iterator[IntelligentTask]:
+        """Iterate queued tasks in no particular order."""
+        return (entry[-1] for entry in list(self._entries.values()))
+
+    def __getitem__(self, index: int) -> IntelligentTask:
+        """Task at a position in priority order; index 0 is the next task."""
+        if index == 0 and self._entries:
+            return self.peek()
+        return self.ordered()[index]
+
+    def push(self, task: IntelligentTask) -> Optional[IntelligentTask]:
+        """
+        Queue a task, replacing any queued task with the same ID.
+
+        Returns:
+            IntelligentTask: Task evicted to keep the queue within maxsize
+        """
+        self.remove(task.task_id)
+
+        deadline = task.deadline.timestamp() if task.deadline else math.inf
+        created = task.created_at.timestamp()
+        sequence = next(self._sequence)
+
+        entry = [-task.priority.value, deadline, created, sequence, task]
+        self._entries[task.task_id] = entry
+        heapq.heappush(self._heap, entry)
+        heapq.heappush(self._evict_heap, [task.priority.value, -deadline, -created, -sequence, entry])
+
+        if self.maxsize and len(self._entries) > self.maxsize:
+            return self._evict()
+        return None
+
+    def pop(self) -> IntelligentTask:
+        """Remove and return the next task; raises IndexError when empty."""
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            task = entry[-1]
+            if task is not None:
+                del self._entries[task.task_id]
+                entry[-1] = None
+                self._maybe_compact()
+                return task
+        raise IndexError("pop from an empty task queue")
+
+    def peek(self) -> Optional[IntelligentTask]:
+        """Next task without removing it, or None when empty."""
+        while self._heap and self._heap[0][-1] is None:
+            heapq.heappop(self._heap)
+        return self._heap[0][-1] if self._heap else None
+
+    def get(self, task_id: str) -> Optional[IntelligentTask]:
+        """Queued task by ID."""
+        entry = self._entries.get(task_id)
+        return entry[-1] if entry else None
+
+    def remove(self, task_id: str) -> Optional[IntelligentTask]:
+        """Remove a task by ID, returning it if it was queued."""
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return None
+
+        task, entry[-1] = entry[-1], None
+        self._maybe_compact()
+        return task
+
+    def head(self, count: int) -> List[IntelligentTask]:
+        """The first ``count`` tasks in priority order, without removing them (O(count log count))."""
+        self.peek()  # drop dead entries at the root so the walk starts at a live task
+        heap = self._heap
+        tasks: List[IntelligentTask] = []
+        # Walk the heap from the root, always expanding the smallest frontier entry
+        frontier = [(heap[0][:4], 0)] if heap else []
+        while frontier and len(tasks) < count:
+            _, index = heapq.heappop(frontier)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][:4], child))
+            task = heap[index][-1]
+            if task is not None:
+                tasks.append(task)
+        return tasks
+
+    def ordered(self) -> List[IntelligentTask]:
+        """All queued tasks in priority order (O(n log n))."""
+        return [entry[-1] for entry in sorted(self._entries.values(), key=lambda entry: entry[:4])]
+
+    def _evict(self) -> Optional[IntelligentTask]:
+        """Remove the lowest-ordered task."""
+        while self._evict_heap:
+            task = heapq.heappop(self._evict_heap)[-1][-1]
+            if task is not None:
+                return self.remove(task.task_id)
+        return None
+
+    def _maybe_compact(self) -> None:
+        """Rebuild the heaps once dead entries outnumber live ones."""
+        live = len(self._entries)
+        if len(self._heap) > 2 * live + 64:
+            self._heap = [entry for entry in self._heap if entry[-1] is not None]
+            heapq.heapify(self._heap)
+        if len(self._evict_heap) > 2 * live + 64:
+            self._evict_heap = [item for item in self._evict_heap if item[-1][-1] is not None]
+            heapq.heapify(self._evict_heap)
+
+
+class TaskDependencyGraph:
+    """
+    Readiness tracker for queued tasks with dependencies.
+
+    Keeps a count of unmet dependencies for each blocked task and, for each
+    dependency, the set of tasks waiting on it. Completing a task only
+    touches its own dependents, so tracking a dependency graph costs time
+    linear in its edges and blocked tasks are never rescanned.
+    """
+
+    def __init__(self):
+        """Initialize an empty graph."""
+        self._unmet: Dict[str, int] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._unmet)
+
+    def is_blocked(self, task_id: str) -> bool:
+        """Whether a tracked task is waiting on a dependency."""
+        return task_id in self._unmet
+
+    def unmet_dependencies(self, task_id: str) -> int:
+        """Number of dependencies a task is still waiting on."""
+        return self._unmet.get(task_id, 0)
+
+    def add(self, task: IntelligentTask, completed: Container[str]) -> bool:
+        """
+        Track a task.
+
+        Args:
+            task: Task to track
+            completed: IDs of completed tasks
+
+        Returns:
+            bool: True if the task is ready, False if it is blocked
+        """
+        self.discard(task)
+
+        pending = {dep_id for dep_id in task.dependencies if dep_id not in completed}
+        if not pending:
+            return True
+
+        self._unmet[task.task_id] = len(pending)
+        for dep_id in pending:
+            self._dependents.setdefault(dep_id, set()).add(task.task_id)
+        return False
+
+    def complete(self, task_id: str) -> List[str]:
+        """
+        Record a completed task.
+
+        Returns:
+            List[str]: IDs of tasks whose last unmet dependency it was
+        """
+        ready = []
+        for dependent_id in self._dependents.pop(task_id, ()):
+            self._unmet[dependent_id] -= 1
+            if self._unmet[dependent_id] == 0:
+                del self._unmet[dependent_id]
+                ready.append(dependent_id)
+        return ready
+
+    def discard(self, task: IntelligentTask) -> None:
+        """Stop tracking a task."""
+        if self._unmet.pop(task.task_id, None) is None:
+            return
+
+        for dep_id in set(task.dependencies):
+            dependents = self._dependents.get(dep_id)
+            if dependents is not None:
+                dependents.discard(task.task_id)
+                if not dependents:
+                    del self._dependents[dep_id]
+
+
 @dataclass
 class AgentPerformanceProfile:
     """Performance profile for an agent."""
@@ -237,8 +458,9 @@ class IntelligentTaskAllocator:
         self.config = config or {}
         self.logger = logging.getLogger(__name__)
 
-        # Task management
-        self.task_queue: List[IntelligentTask] = []
+        # Task management; task_queue holds every pending task, ready_queue
+        # only those whose dependencies are complete
+        self.task_queue = TaskPriorityQueue(self.config.get('max_task_queue_size', 1000))
         self.active_tasks: Dict[str, IntelligentTask] = {}
         self.completed_tasks: Dict[str, TaskMetrics] = {}
         self.failed_tasks: Dict[str, TaskMetrics] = {}
@@ -249,6 +471,7 @@ class IntelligentTaskAllocator:
 
         # Learning and optimization
         self.task_patterns: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.completed_durations: Dict[Tuple[str, TaskComplexity], List[float]] = defaultdict(list)
         self.allocation_history: List[Dict[str, Any]] = []
 
         # Performance tracking
@@ -265,6 +488,7 @@ class IntelligentTaskAllocator:
         # Configuration
         self.max_task_queue_size = self.config.get('max_task_queue_size', 1000)
         self.allocation_timeout = self.config.get('allocation_timeout', 30.0)
+        self.allocation_lookahead = self.config.get('allocation_lookahead', 16)
         self.performance_window = self.config.get('performance_window', 100)
 
         # Initialize database
@@ -272,6 +496,22 @@ class IntelligentTaskAllocator:
 
         self.logger.info("Intelligent Task Allocator initialized")
 
+    @property
+    def task_queue(self) -> TaskPriorityQueue:
+        """Tasks waiting for allocation, in priority order."""
+        return self._task_queue
+
+    @task_queue.setter
+    def task_queue(self, tasks: List[IntelligentTask]) -> None:
+        if not isinstance(tasks, TaskPriorityQueue):
+            tasks = TaskPriorityQueue(self.max_task_queue_size, tasks)
+        self._task_queue = tasks
+
+        self.ready_queue = TaskPriorityQueue()
+        self.dependency_graph = TaskDependencyGraph()
+        for task in tasks:
+            self._track_dependencies(task)
+
     def _init_database(self) -> None:
         """Initialize SQLite database for task allocation data."""
         db_path = self.config.get('db_path', 'task_allocation.db')
@@ -468,6 +708,42 @@ class IntelligentTaskAllocator:
             await self._update_allocation_metrics(task, "", 0, False)
             return None
 
+    async def allocate_next(
+        self,
+        available_agents: List[AgentInfo],
+        strategy: AllocationStrategy = AllocationStrategy.INTELLIGENT_HYBRID
+    ) -> Optional[Tuple[IntelligentTask, str]]:
+        """
+        Allocate the highest-priority queued task whose dependencies are met.
+
+        A ready task that no available agent can take does not hold back the
+        ones behind it: up to ``allocation_lookahead`` ready tasks are tried
+        in priority order.
+
+        Args:
+            available_agents: List of available agents
+            strategy: Allocation strategy to use
+
+        Returns:
+            Tuple of the allocated task and agent ID, or None if none of the
+            tried tasks could be allocated
+        """
+        first = self.ready_queue.peek()
+        if first is None:
+            return None
+        agent_id = await self.allocate_task(first, available_agents, strategy)
+        if agent_id is not None:
+            return first, agent_id
+
+        for task in self.ready_queue.head(self.allocation_lookahead):
+            # An earlier attempt may have yielded to another allocation
+            if task is first or task.task_id not in self.ready_queue:
+                continue
+            agent_id = await self.allocate_task(task, available_agents, strategy)
+            if agent_id is not None:
+                return task, agent_id
+        return None
+
     async def complete_task(
         self,
         task_id: str,
@@ -512,6 +788,16 @@ class IntelligentTaskAllocator:
         # Store metrics
         if success:
             self.completed_tasks[task_id] = task_metrics
+            durations = self.completed_durations[(task.task_type, task.complexity)]
+            durations.append(execution_duration)
+            if len(durations) > self.performance_window:
+                del durations[0]
+
+            # Queue dependents whose last unmet dependency this was
+            for ready_id in self.dependency_graph.complete(task_id):
+                ready_task = self.task_queue.get(ready_id)
+                if ready_task is not None:
+                    self.ready_queue.push(ready_task)
         else:
             self.failed_tasks[task_id] = task_metrics
 
@@ -674,24 +960,31 @@ class IntelligentTaskAllocator:
 
     async def _add_to_queue(self, task: IntelligentTask) -> None:
         """Add task to the priority queue."""
-        # Insert task in priority order
-        inserted = False
-        for i, queued_task in enumerate(self.task_queue):
-            if self._compare_task_priority(task, queued_task):
-                self.task_queue.insert(i, task)
-                inserted = True
-                break
-
-        if not inserted:
-            self.task_queue.append(task)
-
-        # Maintain queue size limit
-        if len(self.task_queue) > self.max_task_queue_size:
-            # Remove lowest priority tasks
-            self.task_queue = self.task_queue[:self.max_task_queue_size]
+        # The queue evicts its lowest priority task once over the size limit
+        evicted = self.task_queue.push(task)
+        if evicted is not None:
+            self.ready_queue.remove(evicted.task_id)
+            self.dependency_graph.discard(evicted)
+            self.logger.warning(f"Task queue full, dropped task {evicted.task_id} ({evicted.priority.name})")
+
+        if evicted is not task:
+            self._track_dependencies(task)
+
+    def _track_dependencies(self, task: IntelligentTask) -> None:
+        """Queue a task as ready, or hold it in the dependency graph until it is."""
+        if self.dependency_graph.add(task, self.completed_tasks):
+            self.ready_queue.push(task)
+        else:
+            self.ready_queue.remove(task.task_id)
 
     async def _check_dependencies(self, task: IntelligentTask) -> bool:
         """Check if task dependencies are satisfied."""
+        if task.task_id in self.ready_queue:
+            return True
+        if self.dependency_graph.is_blocked(task.task_id):
+            return False
+
+        # Tasks allocated without being queued are checked directly
         for dep_id in task.dependencies:
             if dep_id not in self.completed_tasks:
                 return False
@@ -879,6 +1172,8 @@ class IntelligentTaskAllocator:
         """Perform the actual task allocation."""
         try:
             # Move task to active tasks
+            self.task_queue.remove(task.task_id)
+            self.ready_queue.remove(task.task_id)
             self.active_tasks[task.task_id] = task
 
             # Update agent workload
@@ -905,17 +1200,10 @@ class IntelligentTaskAllocator:
 
     async def _estimate_task_duration(self, task_type: str, complexity: TaskComplexity) -> float:
         """Estimate task duration based on historical data."""
-        # Get historical data for similar tasks
-        similar_tasks = [
-            metrics for metrics in self.completed_tasks.values()
-            if metrics.task_id in [t.task_id for t in self.task_queue + list(self.active_tasks.values())
-                                  if t.task_type == task_type and t.complexity == complexity]
-        ]
-
-        if similar_tasks:
-            durations = [t.execution_duration for t in similar_tasks if t.execution_duration]
-            if durations:
-                return np.mean(durations)
+        # Recent durations of completed tasks of the same type and complexity
+        durations = [d for d in self.completed_durations.get((task_type, complexity), []) if d]
+        if durations:
+            return float(np.mean(durations))
 
         # Default estimates based on complexity
         complexity_estimates = {
@@ -1072,23 +1360,6 @@ class IntelligentTaskAllocator:
             ))
             conn.commit()
 
-    def _compare_task_priority(self, task1: IntelligentTask, task2: IntelligentTask) -> bool:
-        """Compare task priorities for queue ordering."""
-        # Higher priority comes first
-        if task1.priority.value != task2.priority.value:
-            return task1.priority.value > task2.priority.value
-
-        # If same priority, check deadline
-        if task1.deadline and task2.deadline:
-            return task1.deadline < task2.deadline
-        elif task1.deadline:
-            return True
-        elif task2.deadline:
-            return False
-
-        # If no deadline, FIFO
-        return task1.created_at < task2.created_at
-
     def _check_resource_compatibility(
         self,
         requirements: ResourceRequirements,
@@ -1315,6 +1586,8 @@ class IntelligentTaskAllocator:
         """Get comprehensive allocation system summary."""
         return {
             'queue_size': len(self.task_queue),
+            'ready_tasks': len(self.ready_queue),
+            'blocked_tasks': len(self.dependency_graph),
             'active_tasks': len(self.active_tasks),
             'completed_tasks': len(self.completed_tasks),
             'failed_tasks': len(self.failed_tasks),
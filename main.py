@@ -10,11 +10,13 @@ import os
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import uvicorn
 
+from metrics_registry import REGISTRY, CONTENT_TYPE_LATEST, CONTENT_TYPE_OPENMETRICS
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -62,14 +64,13 @@ async def health_check() -> Dict[str, Any]:
 
 # Metrics endpoint (basic implementation)
 @app.get("/metrics")
-async def metrics() -> Dict[str, Any]:
-    """Basic metrics endpoint for Prometheus"""
-    return {
-        "active_agents": 0,
-        "task_queue_size": 0,
-        "response_time_ms": 0,
-        "memory_usage_mb": 0
-    }
+async def metrics(request: Request) -> StreamingResponse:
+    """Prometheus scrape endpoint; OpenMetrics when the scraper asks for it"""
+    openmetrics = "application/openmetrics-text" in request.headers.get("accept", "")
+    return StreamingResponse(
+        REGISTRY.iter_exposition(openmetrics=openmetrics),
+        media_type=CONTENT_TYPE_OPENMETRICS if openmetrics else CONTENT_TYPE_LATEST
+    )
 
 # Root endpoint
 @app.get("/")
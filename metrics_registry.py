@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+Shared Metrics Registry with Prometheus Text Exposition
+
+One process-wide registry of labelled counters, gauges and histograms that
+the API gateway, rate limiter, circuit breakers, monitoring system and
+performance monitor register into, plus a streaming renderer for the
+Prometheus text format (0.0.4) and OpenMetrics.
+
+Features:
+- Counters, gauges and histograms with label children created on first use
+- Scrape-time collectors for values a component already tracks
+- Label sets are escaped and formatted once, when a child is created
+- The renderer yields one chunk per family (or per few hundred samples), so
+  a scrape never builds the whole exposition as one string
+"""
+
+import bisect
+import re
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+CONTENT_TYPE_OPENMETRICS = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+INF = float("inf")
+
+# Seconds; suits request latencies from sub-millisecond to ten seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, INF)
+
+METRIC_TYPES = ("counter", "gauge", "histogram", "summary", "untyped")
+
+# Samples per chunk yielded by the renderer
+CHUNK_SAMPLES = 500
+
+_NAME_RE = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+_LABEL_NAME_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+# (suffix, formatted label set, value); labels are "" or '{a="1",b="2"}'
+Sample = Tuple[str, str, float]
+
+
+def sanitize_name(name: str) -> str:
+    """Turn an arbitrary metric name (e.g. "api.latency") into a valid one."""
+    name = _INVALID_NAME_CHARS.sub("_", name)
+    if not name or name[0].isdigit():
+        name = "_" + name
+    return name
+
+
+def format_value(value: float) -> str:
+    """Format a sample value the way Prometheus clients do."""
+    if value == INF:
+        return "+Inf"
+    if value == -INF:
+        return "-Inf"
+    if value != value:
+        return "NaN"
+    return repr(float(value))
+
+
+def _escape_label_value(value: Any) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def format_labels(labels: Iterable[Tuple[str, Any]]) -> str:
+    """Format label pairs as '{name="value",...}' ("" when there are none)."""
+    pairs = ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels)
+    return "{" + pairs + "}" if pairs else ""
+
+
+def _with_label(label_text: str, name: str, value: str) -> str:
+    """Append one more label to an already formatted label set."""
+    pair = f'{name}="{value}"'
+    return label_text[:-1] + "," + pair + "}" if label_text else "{" + pair + "}"
+
+
+class MetricFamily:
+    """
+    Snapshot of one metric family, as yielded by collectors.
+
+    Counter families are named without the ``_total`` suffix; the renderer
+    adds it to the samples (and, in the 0.0.4 format, to the family name).
+    """
+
+    __slots__ = ("name", "type", "documentation", "samples")
+
+    def __init__(self, name: str, metric_type: str, documentation: str = ""):
+        if metric_type not in METRIC_TYPES:
+            raise ValueError(f"Unsupported metric type: {metric_type}")
+        if metric_type == "counter" and name.endswith("_total"):
+            name = name[:-len("_total")]
+        self.name = name
+        self.type = metric_type
+        self.documentation = documentation
+        self.samples: List[Sample] = []
+
+    def add_sample(self, value: float, labels: Optional[Dict[str, Any]] = None,
+                   suffix: str = "") -> None:
+        """
+        Add a sample.
+
+        Args:
+            value: Sample value
+            labels: Label names and values
+            suffix: Sample name suffix such as "_sum" or "_count"; counter
+                samples default to "_total"
+        """
+        if not suffix and self.type == "counter":
+            suffix = "_total"
+        self.samples.append((suffix, format_labels(labels.items()) if labels else "", value))
+
+
+class _Child:
+    """One labelled time series of a metric."""
+
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> float:
+        return self._value
+
+
+class CounterChild(_Child):
+    __slots__ = ()
+
+    def inc(self, amount: float = 1) -> None:
+        """Increment by a non-negative amount."""
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts")
+        with self._lock:
+            self._value += amount
+
+
+class GaugeChild(_Child):
+    __slots__ = ()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+
+class HistogramChild:
+    """Bucket counts (non-cumulative until rendered), sum and count."""
+
+    __slots__ = ("_upper_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, upper_bounds: Sequence[float]):
+        self._upper_bounds = upper_bounds
+        self._counts = [0] * len(upper_bounds)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect.bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        """Cumulative bucket counts and sum, read consistently."""
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, running = [], 0
+        for count in counts:
+            running += count
+            cumulative.append(running)
+        return cumulative, total
+
+
+class Metric(ABC):
+    """
+    A metric family owned by the registry.
+
+    Unlabelled metrics are used directly (``counter.inc()``); labelled ones
+    through their children (``counter.labels("GET", "200").inc()``).
+    Subclasses provide the child type and how its samples are rendered.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        if not _NAME_RE.match(name):
+            raise ValueError(f"Invalid metric name: {name}")
+        for labelname in labelnames:
+            if not _LABEL_NAME_RE.match(labelname) or labelname.startswith("__"):
+                raise ValueError(f"Invalid label name: {labelname}")
+
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        # label values -> (formatted label set, child)
+        self._children: Dict[Tuple[str, ...], Tuple[str, Any]] = {}
+        self._default = None if self.labelnames else self._new_child()
+        if self._default is not None:
+            self._children[()] = ("", self._default)
+
+    def labels(self, *values: Any, **labels: Any):
+        """Child for a set of label values, created on first use."""
+        if labels:
+            if values:
+                raise ValueError("Pass label values either positionally or by name")
+            try:
+                values = tuple(labels[name] for name in self.labelnames)
+            except KeyError as e:
+                raise ValueError(f"Missing label {e} for {self.name}")
+            if len(labels) != len(self.labelnames):
+                raise ValueError(f"Unexpected labels for {self.name}: {sorted(labels)}")
+        elif len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+
+        key = tuple(str(value) for value in values)
+        entry = self._children.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._children.get(key)
+                if entry is None:
+                    entry = (format_labels(zip(self.labelnames, key)), self._new_child())
+                    self._children[key] = entry
+        return entry[1]
+
+    def remove(self, *values: Any) -> None:
+        """Drop the child for a set of label values."""
+        with self._lock:
+            self._children.pop(tuple(str(value) for value in values), None)
+
+    def clear(self) -> None:
+        """Drop every labelled child."""
+        if not self.labelnames:
+            return
+        with self._lock:
+            self._children.clear()
+
+    def _unlabelled(self):
+        if self._default is None:
+            raise ValueError(f"{self.name} is labelled; use .labels(...)")
+        return self._default
+
+    @abstractmethod
+    def _new_child(self):
+        """Create the child holding one labelled series."""
+
+    @abstractmethod
+    def _samples(self) -> Iterator[Sample]:
+        """Yield the samples of every child."""
+
+
+class Counter(Metric):
+    """Monotonically increasing counter; exposed with a ``_total`` suffix."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        if name.endswith("_total"):
+            name = name[:-len("_total")]
+        super().__init__(name, documentation, labelnames)
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled().inc(amount)
+
+    def get(self) -> float:
+        return self._unlabelled().get()
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def _samples(self) -> Iterator[Sample]:
+        for label_text, child in list(self._children.values()):
+            yield "_total", label_text, child._value
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    type = "gauge"
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._unlabelled().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._unlabelled().set(value)
+
+    def get(self) -> float:
+        return self._unlabelled().get()
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def _samples(self) -> Iterator[Sample]:
+        for label_text, child in list(self._children.values()):
+            yield "", label_text, child._value
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative ``le`` buckets."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        if "le" in labelnames:
+            raise ValueError("Histograms cannot have a label named 'le'")
+        upper_bounds = sorted(float(bound) for bound in buckets)
+        if not upper_bounds or upper_bounds[-1] != INF:
+            upper_bounds.append(INF)
+        self.upper_bounds = tuple(upper_bounds)
+        self._bucket_labels = [format_value(bound) for bound in self.upper_bounds]
+        super().__init__(name, documentation, labelnames)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled().observe(value)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.upper_bounds)
+
+    def _samples(self) -> Iterator[Sample]:
+        for label_text, child in list(self._children.values()):
+            cumulative, total = child.snapshot()
+            for bound, count in zip(self._bucket_labels, cumulative):
+                yield "_bucket", _with_label(label_text, "le", bound), count
+            yield "_count", label_text, cumulative[-1]
+            yield "_sum", label_text, total
+
+
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+class MetricsRegistry:
+    """
+    Registry of metrics and scrape-time collectors.
+
+    ``counter``, ``gauge`` and ``histogram`` return the existing metric when
+    one is already registered under the name, so every instance of a
+    component shares one family. Collectors registered as bound methods are
+    held weakly and drop out once their component is garbage collected.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], Optional[Collector]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram."""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Registered metric by name (counters without ``_total``)."""
+        return self._metrics.get(name)
+
+    def unregister(self, name: str) -> bool:
+        """Remove a metric; returns True if it was registered."""
+        with self._lock:
+            return self._metrics.pop(name, None) is not None
+
+    def register_collector(self, collector: Collector) -> None:
+        """
+        Add a scrape-time collector.
+
+        Args:
+            collector: Callable returning MetricFamily snapshots; bound
+                methods are held weakly
+        """
+        if hasattr(collector, "__self__") and hasattr(collector, "__func__"):
+            ref = weakref.WeakMethod(collector)
+        else:
+            ref = lambda: collector
+        with self._lock:
+            self._collectors.append(ref)
+
+    def unregister_collector(self, collector: Collector) -> None:
+        """Remove a collector."""
+        with self._lock:
+            self._collectors = [ref for ref in self._collectors
+                                if ref() is not None and ref() != collector]
+
+    def collect(self) -> Iterator[Tuple[Optional[Metric], Optional[MetricFamily]]]:
+        """
+        Yield every family: registered metrics first, then collector output.
+
+        Collectors run before anything is yielded, so a collector may also
+        update registered metrics for the scrape. Registered metrics are
+        yielded live (as ``(metric, None)``) so their samples stream;
+        collector families with the same name are merged into one
+        ``(None, family)``, keeping the first sample reported for each series.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            refs = list(self._collectors)
+
+        collected: Dict[str, MetricFamily] = {}
+        series: Dict[str, Set[Tuple[str, str]]] = {}
+        dead = False
+        for ref in refs:
+            collector = ref()
+            if collector is None:
+                dead = True
+                continue
+            for family in collector():
+                existing = collected.get(family.name)
+                if existing is None:
+                    collected[family.name] = family
+                elif existing.type == family.type:
+                    seen = series.get(family.name)
+                    if seen is None:
+                        seen = series[family.name] = {sample[:2] for sample in existing.samples}
+                    for sample in family.samples:
+                        if sample[:2] not in seen:
+                            seen.add(sample[:2])
+                            existing.samples.append(sample)
+
+        if dead:
+            with self._lock:
+                self._collectors = [ref for ref in self._collectors if ref() is not None]
+
+        for metric in metrics:
+            yield metric, None
+
+        for family in collected.values():
+            yield None, family
+
+    def iter_exposition(self, openmetrics: bool = False) -> Iterator[str]:
+        """
+        Stream the exposition text in chunks.
+
+        Args:
+            openmetrics: Render OpenMetrics instead of the Prometheus 0.0.4
+                text format
+        """
+        for metric, family in self.collect():
+            if metric is not None:
+                name, metric_type, documentation = metric.name, metric.type, metric.documentation
+                samples = metric._samples()
+            else:
+                name, metric_type, documentation = family.name, family.type, family.documentation
+                samples = iter(family.samples)
+
+            yield from _render_family(name, metric_type, documentation, samples, openmetrics)
+
+        if openmetrics:
+            yield "# EOF\n"
+
+    def render(self, openmetrics: bool = False) -> str:
+        """Whole exposition as one string (tests and small registries)."""
+        return "".join(self.iter_exposition(openmetrics))
+
+    def _get_or_create(self, cls, name: str, documentation: str,
+                       labelnames: Sequence[str], **kwargs) -> Any:
+        key = name[:-len("_total")] if cls is Counter and name.endswith("_total") else name
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[metric.name] = metric
+                return metric
+
+        if type(metric) is not cls:
+            raise ValueError(f"Metric {key} is already registered as a {metric.type}")
+        if metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {key} is already registered with labels {metric.labelnames}")
+        return metric
+
+
+def generate_exposition(families: Iterable[MetricFamily], openmetrics: bool = False) -> Iterator[str]:
+    """Stream the exposition text of family snapshots outside any registry."""
+    for family in families:
+        yield from _render_family(family.name, family.type, family.documentation,
+                                  iter(family.samples), openmetrics)
+    if openmetrics:
+        yield "# EOF\n"
+
+
+def _render_family(name: str, metric_type: str, documentation: str,
+                   samples: Iterator[Sample], openmetrics: bool) -> Iterator[str]:
+    if openmetrics:
+        family_name = name
+        type_name = "unknown" if metric_type == "untyped" else metric_type
+    else:
+        family_name = name + "_total" if metric_type == "counter" else name
+        type_name = metric_type
+
+    lines = []
+    if documentation:
+        lines.append(f"# HELP {family_name} {_escape_help(documentation)}\n")
+    lines.append(f"# TYPE {family_name} {type_name}\n")
+
+    for suffix, label_text, value in samples:
+        lines.append(f"{name}{suffix}{label_text} {format_value(value)}\n")
+        if len(lines) >= CHUNK_SAMPLES:
+            yield "".join(lines)
+            lines = []
+
+    if lines:
+        yield "".join(lines)
+
+
+# Process-wide default registry
+REGISTRY = MetricsRegistry()
@@ -10,9 +10,13 @@ import asyncio
 import json
 import logging
 import time
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass, asdict
+from itertools import count, islice
+from typing import Deque, Dict, List, Optional, Any, Callable, Hashable
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import queue
 import websockets
@@ -43,6 +47,91 @@ class EventPriority(Enum):
     CRITICAL = "critical"
 
 
+# Hooks are admitted to the execution semaphore in this order
+PRIORITY_ORDER = {
+    EventPriority.CRITICAL: 0,
+    EventPriority.HIGH: 1,
+    EventPriority.MEDIUM: 2,
+    EventPriority.LOW: 3
+}
+
+
+@dataclass
+class HookRegistration:
+    """A registered hook callback with its execution policy."""
+    callback: Callable
+    priority: EventPriority = EventPriority.MEDIUM
+    timeout: Optional[float] = None
+    hook_id: int = 0
+    label: Optional[str] = None
+    # Sync call abandoned after a timeout that is still occupying a pool thread
+    abandoned_call: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def name(self) -> str:
+        """Series name: the registration's label, else the callback name and hook id."""
+        if self.label:
+            return self.label
+        return f"{getattr(self.callback, '__qualname__', repr(self.callback))}#{self.hook_id}"
+
+    @property
+    def stalled(self) -> bool:
+        return self.abandoned_call is not None and not self.abandoned_call.done()
+
+    @property
+    def is_async(self) -> bool:
+        return asyncio.iscoroutinefunction(self.callback)
+
+
+class HookLatencyHistogram:
+    """Fixed-bucket latency histogram for a single hook."""
+
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+        self.timeouts = 0
+        self.skipped = 0
+
+    def record(self, duration_ms: float):
+        self.counts[bisect_left(self.BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket containing the q-th quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index < len(self.BUCKETS_MS):
+                    return float(min(self.BUCKETS_MS[index], self.max_ms))
+                return self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound}ms": count for bound, count in zip(self.BUCKETS_MS, self.counts)}
+        buckets['le_inf'] = self.counts[-1]
+        return {
+            'calls': self.count,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'skipped': self.skipped,
+            'avg_ms': self.total_ms / self.count if self.count else 0.0,
+            'p95_ms': self.quantile(0.95),
+            'max_ms': self.max_ms,
+            'buckets': buckets
+        }
+
+
 @dataclass
 class HookEvent:
     """Represents a hook event with full context."""
@@ -68,17 +157,105 @@ class HookEvent:
         return data
 
 
+class ClientSubscription:
+    """Bounded outbound queue for one streaming client, drained by its own task.
+
+    Pending payloads are kept in insertion order. Events published with a
+    coalesce key replace any still-unsent event with the same key, and when
+    the queue is full the oldest pending event is dropped, so a slow client
+    only ever falls behind itself.
+    """
+
+    def __init__(self, client, max_queue_size: int = 256):
+        self.client = client
+        self.max_queue_size = max_queue_size
+        self.pending: "OrderedDict[Hashable, str]" = OrderedDict()
+        self.ready = asyncio.Event()
+        self.sending = False
+        self.closed = False
+        self.sent_count = 0
+        self.dropped_count = 0
+        self.coalesced_count = 0
+        self._sequence = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def publish(self, payload: str, coalesce_key: Optional[Hashable] = None):
+        """Queue a serialized event without waiting on the client."""
+        if self.closed:
+            return
+
+        if coalesce_key is not None and coalesce_key in self.pending:
+            self.pending[coalesce_key] = payload
+            self.coalesced_count += 1
+        else:
+            if coalesce_key is None:
+                self._sequence += 1
+                coalesce_key = self._sequence
+            self.pending[coalesce_key] = payload
+            if len(self.pending) > self.max_queue_size:
+                self.pending.popitem(last=False)
+                self.dropped_count += 1
+
+        self.ready.set()
+
+    @property
+    def idle(self) -> bool:
+        return self.closed or (not self.pending and not self.sending)
+
+    async def run(self):
+        """Send queued payloads until the client disconnects or is closed."""
+        try:
+            while not self.closed:
+                if not self.pending:
+                    self.ready.clear()
+                    await self.ready.wait()
+                    continue
+
+                _, payload = self.pending.popitem(last=False)
+                self.sending = True
+                try:
+                    await self.client.send(payload)
+                    self.sent_count += 1
+                finally:
+                    self.sending = False
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except Exception as e:
+            logger.warning(f"Streaming client send failed: {e}")
+        finally:
+            self.closed = True
+            self.pending.clear()
+
+    def close(self):
+        """Stop the sender task and discard unsent events."""
+        self.closed = True
+        self.pending.clear()
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'queued': len(self.pending),
+            'sent': self.sent_count,
+            'dropped': self.dropped_count,
+            'coalesced': self.coalesced_count
+        }
+
+
 class EventStream:
     """Handles real-time event streaming via WebSocket and HTTP."""
 
-    def __init__(self, websocket_port: int = 8765, http_port: int = 8766):
+    def __init__(self, websocket_port: int = 8765, http_port: int = 8766,
+                 client_queue_size: int = 256):
         self.websocket_port = websocket_port
         self.http_port = http_port
-        self.websocket_clients = set()
+        self.client_queue_size = client_queue_size
+        self.websocket_clients: Dict[Any, ClientSubscription] = {}
         self.event_queue = queue.Queue()
         self.running = False
         self.websocket_server = None
         self.http_server = None
+        self.dropped_client_events = 0
 
     async def start(self):
         """Start the event streaming servers."""
@@ -100,6 +277,9 @@ class EventStream:
         """Stop the event streaming servers."""
         self.running = False
 
+        for client in list(self.websocket_clients):
+            self.remove_client(client)
+
         if self.websocket_server:
             self.websocket_server.close()
             await self.websocket_server.wait_closed()
@@ -111,7 +291,7 @@ class EventStream:
 
     async def handle_websocket_connection(self, websocket, path):
         """Handle WebSocket client connections."""
-        self.websocket_clients.add(websocket)
+        self.add_client(websocket)
         logger.info(f"WebSocket client connected: {websocket.remote_address}")
 
         try:
@@ -121,7 +301,7 @@ class EventStream:
         except websockets.exceptions.ConnectionClosed:
             pass
         finally:
-            self.websocket_clients.remove(websocket)
+            self.remove_client(websocket)
             logger.info(f"WebSocket client disconnected: {websocket.remote_address}")
 
     async def start_http_server(self):
@@ -170,24 +350,64 @@ class EventStream:
 
         return response
 
-    async def broadcast_event(self, event_data: Dict[str, Any]):
-        """Broadcast event to all connected clients."""
+    def add_client(self, client) -> ClientSubscription:
+        """Register a client and start its sender task."""
+        subscription = self.websocket_clients.get(client)
+        if subscription is None:
+            subscription = ClientSubscription(client, self.client_queue_size)
+            subscription.task = asyncio.get_running_loop().create_task(subscription.run())
+            self.websocket_clients[client] = subscription
+        return subscription
+
+    def remove_client(self, client):
+        """Unregister a client and cancel its sender task."""
+        subscription = self.websocket_clients.pop(client, None)
+        if subscription is not None:
+            self.dropped_client_events += subscription.dropped_count
+            subscription.close()
+
+    async def broadcast_event(self, event_data: Dict[str, Any],
+                              coalesce_key: Optional[Hashable] = None):
+        """Queue an event for every connected client.
+
+        The event is serialized once and handed to each client's bounded
+        queue; sending happens in the per-client tasks, so a slow or stalled
+        client never delays the caller.
+        """
         if not self.websocket_clients:
             return
 
-        event_json = json.dumps(event_data)
+        event_json = json.dumps(event_data, default=str)
 
-        # Send to WebSocket clients
         disconnected_clients = []
-        for client in self.websocket_clients:
-            try:
-                await client.send(event_json)
-            except websockets.exceptions.ConnectionClosed:
+        for client, subscription in self.websocket_clients.items():
+            if subscription.closed:
                 disconnected_clients.append(client)
+            else:
+                subscription.publish(event_json, coalesce_key)
 
         # Clean up disconnected clients
         for client in disconnected_clients:
-            self.websocket_clients.discard(client)
+            self.remove_client(client)
+
+    async def drain(self, timeout: float = 5.0) -> bool:
+        """Wait until every client queue has been sent. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while not all(s.idle for s in self.websocket_clients.values()):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.001)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-client delivery statistics."""
+        clients = [s.get_stats() for s in self.websocket_clients.values()]
+        return {
+            'websocket_clients': len(clients),
+            'queued_events': sum(c['queued'] for c in clients),
+            'dropped_events': self.dropped_client_events + sum(c['dropped'] for c in clients),
+            'coalesced_events': sum(c['coalesced'] for c in clients)
+        }
 
 
 class AgentMonitor:
@@ -287,13 +507,32 @@ class AgentMonitor:
 class HookManager:
     """Main hook manager for real-time observability."""
 
-    def __init__(self, websocket_port: int = 8765, http_port: int = 8766):
+    def __init__(self, websocket_port: int = 8765, http_port: int = 8766,
+                 max_concurrent_hooks: int = 16, default_hook_timeout: float = 5.0,
+                 hook_thread_workers: int = 4):
         self.hooks: Dict[HookType, List[Callable]] = {hook_type: [] for hook_type in HookType}
+        self.hook_registrations: Dict[HookType, List[HookRegistration]] = {
+            hook_type: [] for hook_type in HookType
+        }
+        self.hook_latency: Dict[str, HookLatencyHistogram] = {}
+        self._hook_ids = count(1)
+        self.max_concurrent_hooks = max_concurrent_hooks
+        self.default_hook_timeout = default_hook_timeout
+        self.hook_thread_workers = hook_thread_workers
+        self._hook_semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self._hook_executor: Optional[ThreadPoolExecutor] = None
         self.event_stream = EventStream(websocket_port, http_port)
         self.agent_monitor = AgentMonitor()
         self.running = False
-        self.event_history = []
-        self.max_history_size = 1000
+        self.event_history: Deque[HookEvent] = deque(maxlen=1000)
+
+    @property
+    def max_history_size(self) -> int:
+        return self.event_history.maxlen
+
+    @max_history_size.setter
+    def max_history_size(self, size: int):
+        self.event_history = deque(self.event_history, maxlen=size)
 
     async def start(self):
         """Start the hook manager system."""
@@ -305,43 +544,110 @@ class HookManager:
         """Stop the hook manager system."""
         self.running = False
         await self.event_stream.stop()
+        if self._hook_executor:
+            self._hook_executor.shutdown(wait=False)
+            self._hook_executor = None
         logger.info("Hook Manager stopped")
 
-    def register_hook(self, hook_type: HookType, callback: Callable):
-        """Register a hook callback for specific lifecycle events."""
-        self.hooks[hook_type].append(callback)
+    def register_hook(self, hook_type: HookType, callback: Callable,
+                      priority: EventPriority = EventPriority.MEDIUM,
+                      timeout: Optional[float] = None, name: Optional[str] = None):
+        """Register a hook callback for specific lifecycle events.
+
+        Higher-priority hooks are started first when the concurrency limit is
+        reached. ``timeout`` overrides the manager's default per-hook timeout.
+        Latency is recorded per registration; registrations sharing a
+        ``name`` share one histogram.
+        """
+        registrations = self.hook_registrations[hook_type]
+        registrations.append(HookRegistration(callback, priority, timeout, next(self._hook_ids), name))
+        registrations.sort(key=lambda r: PRIORITY_ORDER[r.priority])
+        self.hooks[hook_type] = [r.callback for r in registrations]
         logger.info(f"Hook registered: {hook_type.value}")
 
     def unregister_hook(self, hook_type: HookType, callback: Callable):
         """Unregister a hook callback."""
         if callback in self.hooks[hook_type]:
-            self.hooks[hook_type].remove(callback)
+            registrations = self.hook_registrations[hook_type]
+            registrations[:] = [r for r in registrations if r.callback != callback]
+            self.hooks[hook_type] = [r.callback for r in registrations]
             logger.info(f"Hook unregistered: {hook_type.value}")
 
-    async def execute_hooks(self, event: HookEvent):
-        """Execute all registered hooks for an event type."""
-        start_time = time.time()
+    def _get_hook_executor(self) -> ThreadPoolExecutor:
+        if self._hook_executor is None:
+            self._hook_executor = ThreadPoolExecutor(max_workers=self.hook_thread_workers,
+                                                     thread_name_prefix="hook")
+        return self._hook_executor
+
+    def _get_hook_semaphore(self) -> asyncio.Semaphore:
+        # One semaphore per loop; the global manager may be driven by several loops
+        loop = asyncio.get_running_loop()
+        semaphore = self._hook_semaphores.get(loop)
+        if semaphore is None:
+            self._hook_semaphores = {l: sem for l, sem in self._hook_semaphores.items() if not l.is_closed()}
+            semaphore = self._hook_semaphores[loop] = asyncio.Semaphore(self.max_concurrent_hooks)
+        return semaphore
+
+    async def _run_hook(self, registration: HookRegistration, hook_type: HookType,
+                        event: HookEvent):
+        """Run one hook under the concurrency limit and its timeout."""
+        timeout = registration.timeout if registration.timeout is not None else self.default_hook_timeout
+        histogram = self.hook_latency.setdefault(
+            f"{hook_type.value}:{registration.name}", HookLatencyHistogram()
+        )
+
+        # A sync hook cannot be interrupted; while an abandoned call is still
+        # running, skip the hook so it holds at most one pool thread
+        if registration.stalled:
+            histogram.skipped += 1
+            return
 
-        # Execute registered hooks
-        for callback in self.hooks[event.hook_type]:
+        async with self._get_hook_semaphore():
+            start = time.perf_counter()
+            pool_call = None
             try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(event)
+                if registration.is_async:
+                    call = registration.callback(event)
                 else:
-                    callback(event)
+                    # Sync hooks run on the pool so they cannot block the event loop
+                    pool_call = self._get_hook_executor().submit(registration.callback, event)
+                    call = asyncio.wrap_future(pool_call)
+                await asyncio.wait_for(call, timeout)
+            except asyncio.TimeoutError:
+                histogram.timeouts += 1
+                if pool_call is not None and not pool_call.done():
+                    registration.abandoned_call = pool_call
+                logger.warning(f"Hook {registration.name} timed out after {timeout:.1f}s "
+                               f"for {hook_type.value}")
             except Exception as e:
-                logger.error(f"Hook execution error: {e}")
+                histogram.errors += 1
+                logger.error(f"Hook execution error in {registration.name}: {e}")
+            finally:
+                histogram.record((time.perf_counter() - start) * 1000)
+
+    async def execute_hooks(self, event: HookEvent):
+        """Execute all registered hooks for an event type concurrently."""
+        start_time = time.time()
+
+        # Execute registered hooks, admitted in priority order
+        registrations = list(self.hook_registrations[event.hook_type])
+        if registrations:
+            await asyncio.gather(*(
+                self._run_hook(registration, event.hook_type, event)
+                for registration in registrations
+            ))
 
         # Update agent monitoring
         self.agent_monitor.track_agent_state(event.agent_id, event.context)
 
-        # Stream event to clients
-        await self.event_stream.broadcast_event(event.to_dict())
+        # Stream event to clients; performance snapshots supersede unsent ones
+        coalesce_key = None
+        if event.hook_type == HookType.PERFORMANCE:
+            coalesce_key = (event.hook_type.value, event.agent_id)
+        await self.event_stream.broadcast_event(event.to_dict(), coalesce_key)
 
-        # Store in history with size management
+        # Store in history; the deque discards the oldest events
         self.event_history.append(event)
-        while len(self.event_history) > self.max_history_size:
-            self.event_history.pop(0)
 
         # Log performance
         execution_time = time.time() - start_time
@@ -373,10 +679,11 @@ class HookManager:
             'hook_manager': {
                 'running': self.running,
                 'event_history_size': len(self.event_history),
-                'registered_hooks': {hook_type.value: len(callbacks) for hook_type, callbacks in self.hooks.items()}
+                'registered_hooks': {hook_type.value: len(callbacks) for hook_type, callbacks in self.hooks.items()},
+                'hook_latency': self.get_hook_stats()
             },
             'event_stream': {
-                'websocket_clients': len(self.event_stream.websocket_clients),
+                **self.event_stream.get_stats(),
                 'websocket_port': self.event_stream.websocket_port,
                 'http_port': self.event_stream.http_port
             },
@@ -390,14 +697,20 @@ class HookManager:
         """Get metrics for a specific agent."""
         return self.agent_monitor.get_agent_metrics(agent_id)
 
+    def get_hook_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-hook latency histograms, slowest hooks first."""
+        ranked = sorted(self.hook_latency.items(), key=lambda item: item[1].max_ms, reverse=True)
+        return {name: histogram.to_dict() for name, histogram in ranked}
+
     def get_event_history(self, limit: int = 100, agent_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get event history with optional filtering."""
-        events = self.event_history
+        events = reversed(self.event_history)
 
         if agent_id:
-            events = [e for e in events if e.agent_id == agent_id]
+            events = (e for e in events if e.agent_id == agent_id)
 
-        return [event.to_dict() for event in events[-limit:]]
+        recent = list(islice(events, limit))
+        return [event.to_dict() for event in reversed(recent)]
 
 
 # Global hook manager instance
@@ -20,13 +20,22 @@ import logging
 import json
 import statistics
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable, Any, Tuple
+from typing import Dict, List, Optional, Callable, Any, Set, Tuple
 from dataclasses import dataclass, field, asdict
-from contextlib import asynccontextmanager
 from enum import Enum
 import threading
 import sqlite3
 import os
+import random
+import math
+import atexit
+import functools
+import inspect
+import sys
+import weakref
+from collections import deque
+
+from metrics_registry import REGISTRY, MetricsRegistry
 
 
 class ComponentType(Enum):
@@ -106,12 +115,509 @@ class PerformanceBaseline:
     last_updated: Optional[datetime] = None
 
 
+class MetricRingBuffer:
+    """Fixed-capacity, preallocated ring buffer of metrics.
+
+    Appending overwrites the oldest slot once full, so recording a metric
+    never allocates or shifts list contents. Iteration yields metrics from
+    oldest to newest, which keeps it a drop-in replacement for the lists
+    previously used for in-memory history.
+    """
+
+    __slots__ = ("capacity", "_slots", "_next", "_size")
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._slots: List[Optional[PerformanceMetrics]] = [None] * capacity
+        self._next = 0
+        self._size = 0
+
+    def append(self, metric: PerformanceMetrics) -> None:
+        """Record a metric, overwriting the oldest one when full."""
+        self._slots[self._next] = metric
+        self._next = (self._next + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        start = (self._next - self._size) % self.capacity
+        slots = self._slots
+        capacity = self.capacity
+        for offset in range(self._size):
+            yield slots[(start + offset) % capacity]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("ring buffer index out of range")
+        return self._slots[(self._next - self._size + index) % self.capacity]
+
+    def clear(self) -> None:
+        """Drop all recorded metrics."""
+        self._slots = [None] * self.capacity
+        self._next = 0
+        self._size = 0
+
+    def drop_older_than(self, cutoff_time: float) -> int:
+        """Drop metrics from the oldest end that started before cutoff_time."""
+        dropped = 0
+        while self._size:
+            oldest = (self._next - self._size) % self.capacity
+            metric = self._slots[oldest]
+            if metric is None or metric.start_time > cutoff_time:
+                break
+            self._slots[oldest] = None
+            self._size -= 1
+            dropped += 1
+        return dropped
+
+
+class MetricBatchWriter:
+    """Single background writer that persists metrics in batches.
+
+    Producers only append to an in-memory deque; a daemon thread drains it
+    every ``flush_interval`` seconds (or as soon as ``batch_size`` metrics
+    are pending) and writes them with ``executemany`` on one persistent
+    SQLite connection in WAL mode. ``before_flush`` runs at the start of
+    every flush so owners can piggyback deferred work on the writer thread.
+    """
+
+    INSERT_SQL = """
+        INSERT INTO performance_metrics (
+            operation_name, component_type, start_time, end_time, duration,
+            success, error_message, metadata, user_id, session_id, client_ip,
+            performance_level, baseline_comparison, timestamp
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def __init__(self, db_path: str, batch_size: int = 500,
+                 flush_interval: float = 1.0, max_pending: int = 100000,
+                 logger: Optional[logging.Logger] = None,
+                 before_flush: Optional[Callable[[], None]] = None):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.logger = logger or logging.getLogger(__name__)
+        self._pending: deque = deque(maxlen=max_pending)
+        self._wakeup = threading.Event()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stopping = False
+        self._exit_hook: Optional[Callable[[], None]] = None
+        self._before_flush = before_flush
+        self.written_count = 0
+
+    def enqueue(self, metric: PerformanceMetrics) -> None:
+        """Queue a metric for persistence without blocking the caller."""
+        self._pending.append(metric)
+        if self._thread is None:
+            self._start()
+        elif len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="perf-metric-writer", daemon=True
+            )
+            self._thread.start()
+            # The exit hook holds the writer weakly so closed writers can be freed
+            self._exit_hook = functools.partial(_close_writer, weakref.ref(self))
+            atexit.register(self._exit_hook)
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        return self._conn
+
+    @staticmethod
+    def _to_row(metric: PerformanceMetrics) -> Tuple:
+        return (
+            metric.operation_name, metric.component_type.value,
+            metric.start_time, metric.end_time, metric.duration,
+            metric.success, metric.error_message,
+            json.dumps(metric.metadata) if metric.metadata else "{}",
+            metric.user_id, metric.session_id, metric.client_ip,
+            metric.performance_level.value if metric.performance_level else None,
+            metric.baseline_comparison,
+            datetime.fromtimestamp(metric.start_time).isoformat()
+        )
+
+    def flush(self) -> int:
+        """Write every pending metric now; returns the number written."""
+        if self._before_flush is not None:
+            try:
+                self._before_flush()
+            except Exception as e:
+                self.logger.error(f"Pre-flush hook error: {e}")
+        written = 0
+        with self._write_lock:
+            pending = self._pending
+            while pending:
+                metrics = []
+                while pending and len(metrics) < self.batch_size:
+                    metrics.append(pending.popleft())
+                try:
+                    conn = self._connection()
+                    with conn:
+                        conn.executemany(self.INSERT_SQL, [self._to_row(m) for m in metrics])
+                    written += len(metrics)
+                except Exception as e:
+                    self.logger.error(f"Database storage error: {e}")
+                    # Requeue the batch ahead of newer metrics for the next flush
+                    pending.extendleft(reversed(metrics))
+                    break
+            self.written_count += written
+        return written
+
+    def close(self) -> None:
+        """Flush outstanding metrics and stop the writer thread."""
+        if self._exit_hook is not None:
+            atexit.unregister(self._exit_hook)
+            self._exit_hook = None
+        self._stopping = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=max(self.flush_interval, 1.0) * 2)
+        self._thread = None
+        self.flush()
+        with self._write_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _drain_monitor_aggregates(monitor_ref: "weakref.ref[UnifiedPerformanceMonitor]") -> None:
+    """Writer pre-flush hook: drain a monitor's aggregation backlog if it is still alive."""
+    monitor = monitor_ref()
+    if monitor is not None:
+        monitor._drain_aggregates()
+
+
+def _close_writer(writer_ref: "weakref.ref[MetricBatchWriter]") -> None:
+    """Exit hook: close a batch writer if it is still alive."""
+    writer = writer_ref()
+    if writer is not None:
+        writer.close()
+
+
+# Health score contribution of each performance level (None -> unknown)
+LEVEL_SCORES: Dict[Optional[PerformanceLevel], int] = {
+    PerformanceLevel.EXCELLENT: 100,
+    PerformanceLevel.GOOD: 80,
+    PerformanceLevel.WARNING: 60,
+    PerformanceLevel.CRITICAL: 40,
+    PerformanceLevel.FAILURE: 20,
+    None: 70
+}
+
+
+class QuantileSketch:
+    """Mergeable streaming quantile sketch with bounded relative error.
+
+    Values are counted in logarithmically sized buckets (as in DDSketch), so
+    any quantile estimate is within ``relative_accuracy`` of the true value
+    and two sketches merge by adding bucket counts.
+    """
+
+    __slots__ = ("relative_accuracy", "_gamma_log", "_gamma", "buckets", "zero_count", "count")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._gamma_log = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 1e-9:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._gamma_log)
+        buckets = self.buckets
+        buckets[index] = buckets.get(index, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        self.count += other.count
+        self.zero_count += other.zero_count
+        buckets = self.buckets
+        for index, count in other.buckets.items():
+            buckets[index] = buckets.get(index, 0) + count
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1)."""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+
+class OperationAggregate:
+    """Running statistics for one operation/component pair in one time bucket.
+
+    Duration statistics, level counts and baseline comparisons cover
+    successful operations only, matching the historical summary semantics.
+    """
+
+    __slots__ = ("count", "error_count", "duration_sum", "duration_min", "duration_max",
+                 "sketch", "level_counts", "comparison_sum", "comparison_count")
+
+    def __init__(self):
+        self.count = 0
+        self.error_count = 0
+        self.duration_sum = 0.0
+        self.duration_min = math.inf
+        self.duration_max = 0.0
+        self.sketch = QuantileSketch()
+        self.level_counts: Dict[Optional[PerformanceLevel], int] = {}
+        self.comparison_sum = 0.0
+        self.comparison_count = 0
+
+    @property
+    def success_count(self) -> int:
+        return self.count - self.error_count
+
+    def add(self, metric: PerformanceMetrics) -> None:
+        self.count += 1
+        if not metric.success:
+            self.error_count += 1
+            return
+        duration = metric.duration or 0.0
+        self.duration_sum += duration
+        if duration < self.duration_min:
+            self.duration_min = duration
+        if duration > self.duration_max:
+            self.duration_max = duration
+        self.sketch.add(duration)
+        level = metric.performance_level
+        self.level_counts[level] = self.level_counts.get(level, 0) + 1
+        if metric.baseline_comparison is not None:
+            self.comparison_sum += metric.baseline_comparison
+            self.comparison_count += 1
+
+    def merge(self, other: "OperationAggregate") -> None:
+        self.count += other.count
+        self.error_count += other.error_count
+        self.duration_sum += other.duration_sum
+        self.duration_min = min(self.duration_min, other.duration_min)
+        self.duration_max = max(self.duration_max, other.duration_max)
+        self.sketch.merge(other.sketch)
+        for level, count in other.level_counts.items():
+            self.level_counts[level] = self.level_counts.get(level, 0) + count
+        self.comparison_sum += other.comparison_sum
+        self.comparison_count += other.comparison_count
+
+    @property
+    def avg_duration(self) -> float:
+        return self.duration_sum / self.success_count if self.success_count else 0.0
+
+    def percentile(self, q: float, min_samples: int) -> float:
+        """Estimated percentile, or the max when there are too few samples."""
+        if self.success_count < min_samples:
+            return self.duration_max
+        return min(max(self.sketch.quantile(q), self.duration_min), self.duration_max)
+
+    def health_score(self) -> float:
+        """Health score (0-100) of the successful operations in this aggregate."""
+        successes = self.success_count
+        if not successes:
+            return 100.0
+        avg_performance = sum(LEVEL_SCORES.get(level, 70) * count
+                              for level, count in self.level_counts.items()) / successes
+        return min(100.0, max(0.0, (0.6 + (avg_performance / 100) * 0.4) * 100))
+
+
+AggregateKey = Tuple[str, ComponentType]
+
+
+class RollingAggregator:
+    """Per-minute rolling aggregates merged on demand for windowed summaries.
+
+    Recent data lives in per-minute buckets; once a bucket is older than
+    ``minute_retention`` minutes it is folded into an hourly bucket, and
+    hourly buckets are dropped after ``retention_hours``. A window query
+    therefore merges at most ``minute_retention + retention_hours`` buckets
+    regardless of how many operations were recorded.
+    """
+
+    def __init__(self, retention_hours: int = 168, minute_retention: int = 120,
+                 recent_errors: int = 5):
+        self.retention_hours = retention_hours
+        self.minute_retention = minute_retention
+        self._minutes: "deque[Tuple[int, Dict[AggregateKey, OperationAggregate]]]" = deque()
+        self._hours: "deque[Tuple[int, Dict[AggregateKey, OperationAggregate]]]" = deque()
+        self._recent_errors_size = recent_errors
+        self.recent_errors: Dict[str, deque] = {}
+
+    def record(self, metric: PerformanceMetrics) -> None:
+        minute = int(metric.start_time // 60)
+        minutes = self._minutes
+        if minutes and minutes[-1][0] == minute:
+            bucket = minutes[-1][1]
+        elif minutes and minute < minutes[-1][0]:
+            bucket = self._bucket_for(minute)
+        else:
+            bucket = {}
+            minutes.append((minute, bucket))
+            self._compact(minute)
+
+        key = (metric.operation_name, metric.component_type)
+        aggregate = bucket.get(key)
+        if aggregate is None:
+            aggregate = bucket[key] = OperationAggregate()
+        aggregate.add(metric)
+
+        if not metric.success:
+            errors = self.recent_errors.get(metric.operation_name)
+            if errors is None:
+                errors = self.recent_errors[metric.operation_name] = deque(maxlen=self._recent_errors_size)
+            errors.append(metric)
+
+    def _bucket_for(self, minute: int) -> Dict[AggregateKey, OperationAggregate]:
+        """Locate the bucket for an out-of-order metric (rare)."""
+        for bucket_minute, bucket in reversed(self._minutes):
+            if bucket_minute == minute:
+                return bucket
+            if bucket_minute < minute:
+                break
+        # Fall back to the oldest retained minute bucket
+        return self._minutes[0][1]
+
+    def _compact(self, current_minute: int) -> None:
+        """Fold aged minute buckets into hourly buckets and expire old hours."""
+        minutes = self._minutes
+        hours = self._hours
+        while minutes and minutes[0][0] <= current_minute - self.minute_retention:
+            minute, bucket = minutes.popleft()
+            hour = minute // 60
+            if not hours or hours[-1][0] != hour:
+                hours.append((hour, {}))
+            target = hours[-1][1]
+            for key, aggregate in bucket.items():
+                existing = target.get(key)
+                if existing is None:
+                    target[key] = aggregate
+                else:
+                    existing.merge(aggregate)
+        current_hour = current_minute // 60
+        while hours and hours[0][0] <= current_hour - self.retention_hours:
+            hours.popleft()
+
+    def window(self, seconds: float, now: Optional[float] = None) -> Dict[AggregateKey, OperationAggregate]:
+        """Merge all buckets overlapping the last ``seconds`` seconds."""
+        now = time.time() if now is None else now
+        cutoff_minute = int((now - seconds) // 60)
+        cutoff_hour = cutoff_minute // 60
+        merged: Dict[AggregateKey, OperationAggregate] = {}
+        for hour, bucket in self._hours:
+            if hour >= cutoff_hour:
+                self._merge_into(merged, bucket)
+        for minute, bucket in self._minutes:
+            if minute >= cutoff_minute:
+                self._merge_into(merged, bucket)
+        return merged
+
+    @staticmethod
+    def _merge_into(merged: Dict[AggregateKey, OperationAggregate],
+                    bucket: Dict[AggregateKey, OperationAggregate]) -> None:
+        for key, aggregate in bucket.items():
+            target = merged.get(key)
+            if target is None:
+                target = merged[key] = OperationAggregate()
+            target.merge(aggregate)
+
+    def clear(self) -> None:
+        self._minutes.clear()
+        self._hours.clear()
+        self.recent_errors.clear()
+
+
+class TrackedOperation:
+    """Async context manager returned by UnifiedPerformanceMonitor.track_operation.
+
+    Implemented as a plain class rather than a generator-based context
+    manager so entering and leaving costs only a couple of attribute
+    accesses on the hot path.
+    """
+
+    __slots__ = ("monitor", "metric")
+
+    def __init__(self, monitor: "UnifiedPerformanceMonitor", operation_name: str,
+                 component_type: ComponentType, metadata: Optional[Dict[str, Any]],
+                 user_id: Optional[str], session_id: Optional[str],
+                 client_ip: Optional[str]):
+        self.monitor = monitor
+        self.metric = PerformanceMetrics(
+            operation_name=operation_name,
+            component_type=component_type,
+            start_time=0.0,
+            metadata=metadata or {},
+            user_id=user_id,
+            session_id=session_id,
+            client_ip=client_ip
+        )
+
+    async def __aenter__(self) -> PerformanceMetrics:
+        self.metric.start_time = time.time()
+        return self.metric
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        end_time = time.time()
+        metric = self.metric
+        monitor = self.monitor
+        if exc is not None and isinstance(exc, Exception):
+            metric.success = False
+            metric.error_message = str(exc)
+            monitor.logger.error(f"Operation {metric.operation_name} ({metric.component_type.value}) failed: {exc}")
+        
+        # Check thresholds and trigger optimizations
+        if monitor._finish_operation(metric, end_time):
+            await monitor._check_performance_thresholds(metric)
+        return False
+
+
 class UnifiedPerformanceMonitor:
     """Unified performance monitoring for all Agent Hive components."""
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 metrics_registry: Optional[MetricsRegistry] = None):
         self.config = config or self._get_default_config()
-        self.metrics: List[PerformanceMetrics] = []
+        self.metrics = MetricRingBuffer(self.config.get("max_in_memory_metrics", 10000))
         self.alerts: List[str] = []
         self.logger = logging.getLogger(__name__)
         
@@ -120,14 +626,61 @@ class UnifiedPerformanceMonitor:
         self._setup_component_baselines()
         
         # Performance tracking
-        self.component_metrics: Dict[ComponentType, List[PerformanceMetrics]] = {
-            component: [] for component in ComponentType
+        component_capacity = self.config.get("max_component_metrics", 1000)
+        self.component_metrics: Dict[ComponentType, MetricRingBuffer] = {
+            component: MetricRingBuffer(component_capacity) for component in ComponentType
         }
         
+        # Pre-aggregated rolling windows backing summaries and dashboards
+        self.aggregator = RollingAggregator(
+            retention_hours=self.config.get("aggregate_retention_hours", 168)
+        )
+        
+        # Registry metrics: every operation, including sampled-out ones
+        self.metrics_registry = metrics_registry if metrics_registry is not None else REGISTRY
+        self._operations_metric = self.metrics_registry.counter(
+            "performance_operations", "Tracked operations by outcome",
+            ["component", "operation", "outcome"]
+        )
+        self._duration_metric = self.metrics_registry.histogram(
+            "performance_operation_duration_seconds", "Duration of successful tracked operations",
+            ["component", "operation"]
+        )
+        # Operations with their own label: baselined or configured ones, then the
+        # first max_metric_operations others; the rest are counted as "other"
+        self._labelled_operations: Set[str] = set(self.baselines) | set(self.config.get("metric_operations", ()))
+        self._max_labelled_operations = (
+            len(self._labelled_operations) + self.config.get("max_metric_operations", 100)
+        )
+        # (component, operation) -> (success counter, error counter, duration histogram) children
+        self._operation_series: Dict[Tuple[ComponentType, str], Tuple[Any, Any, Any]] = {}
+        
+        # Sampling for very hot operations (operation_name -> keep probability)
+        self.sampling_rates: Dict[str, float] = dict(self.config.get("sampling_rates", {}))
+        self.default_sampling_rate: float = self.config.get("default_sampling_rate", 1.0)
+        
         # Database for persistent storage
         self.db_path = self.config.get("db_path", "performance_metrics.db")
+        self._persistent = self.config.get("enable_persistent_storage", True)
         self._init_database()
         
+        # Finished operations are folded into the aggregates off the hot path:
+        # the writer thread drains this backlog before each flush and readers
+        # drain it before looking at the aggregates.
+        self._unaggregated: deque = deque()
+        batch_size = self.config.get("flush_batch_size", 500)
+        self._aggregate_backlog_limit: int = self.config.get(
+            "aggregate_backlog_limit", 100000 if self._persistent else batch_size
+        )
+        self._writer = MetricBatchWriter(
+            self.db_path,
+            batch_size=batch_size,
+            flush_interval=self.config.get("flush_interval_seconds", 1.0),
+            logger=self.logger,
+            before_flush=functools.partial(_drain_monitor_aggregates, weakref.ref(self))
+        )
+        self.metrics_registry.register_collector(self._collect_aggregates)
+        
         # Performance optimization
         self.optimization_strategies = {
             ComponentType.SECURITY: self._optimize_security_performance,
@@ -156,6 +709,14 @@ class UnifiedPerformanceMonitor:
             "auto_optimization": True,
             "baseline_sample_size": 1000,
             "enable_persistent_storage": True,
+            "max_in_memory_metrics": 10000,
+            "max_component_metrics": 1000,
+            "flush_batch_size": 500,
+            "flush_interval_seconds": 1.0,
+            "aggregate_retention_hours": 168,
+            "default_sampling_rate": 1.0,
+            "sampling_rates": {},
+            "max_metric_operations": 100,
             "component_targets": {
                 "security": {
                     "jwt_auth_ms": 50,
@@ -256,6 +817,7 @@ class UnifiedPerformanceMonitor:
             
         try:
             conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -319,85 +881,148 @@ class UnifiedPerformanceMonitor:
             except asyncio.CancelledError:
                 pass
         
+        await self.flush_metrics()
         self.logger.info("Performance monitoring stopped")
     
-    @asynccontextmanager
-    async def track_operation(self, operation_name: str, component_type: ComponentType,
-                             metadata: Optional[Dict[str, Any]] = None,
-                             user_id: Optional[str] = None,
-                             session_id: Optional[str] = None,
-                             client_ip: Optional[str] = None):
+    def set_sampling_rate(self, operation_name: str, rate: float) -> None:
+        """Keep only ``rate`` (0-1] of successful, healthy calls of an operation."""
+        if not 0.0 < rate <= 1.0:
+            raise ValueError("sampling rate must be in (0, 1]")
+        self.sampling_rates[operation_name] = rate
+    
+    async def flush_metrics(self) -> int:
+        """Aggregate and persist all queued metrics immediately."""
+        if not self._persistent:
+            self._drain_aggregates()
+            return 0
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._writer.flush)
+    
+    def track_operation(self, operation_name: str, component_type: ComponentType,
+                        metadata: Optional[Dict[str, Any]] = None,
+                        user_id: Optional[str] = None,
+                        session_id: Optional[str] = None,
+                        client_ip: Optional[str] = None) -> "TrackedOperation":
         """Enhanced context manager for tracking operation performance."""
-        start_time = time.time()
-        metric = PerformanceMetrics(
-            operation_name=operation_name,
-            component_type=component_type,
-            start_time=start_time,
-            metadata=metadata or {},
-            user_id=user_id,
-            session_id=session_id,
-            client_ip=client_ip
-        )
+        return TrackedOperation(self, operation_name, component_type, metadata,
+                                user_id, session_id, client_ip)
+    
+    def _finish_operation(self, metric: PerformanceMetrics, end_time: float) -> bool:
+        """Classify a finished operation and record it; returns True if kept."""
+        duration_ms = (end_time - metric.start_time) * 1000
+        metric.end_time = end_time
+        metric.duration = duration_ms
         
-        try:
-            yield metric
-            metric.success = True
-        except Exception as e:
-            metric.success = False
-            metric.error_message = str(e)
-            self.logger.error(f"Operation {operation_name} ({component_type.value}) failed: {e}")
-            raise
-        finally:
-            end_time = time.time()
-            duration = end_time - start_time
-            duration_ms = duration * 1000
-            
-            metric.end_time = end_time
-            metric.duration = duration_ms
+        # Determine performance level and baseline comparison
+        baseline = self.baselines.get(metric.operation_name)
+        if baseline:
+            metric.baseline_comparison = ((duration_ms - baseline.target_duration_ms) / baseline.target_duration_ms) * 100
             
-            # Determine performance level and baseline comparison
-            baseline = self.baselines.get(operation_name)
-            if baseline:
-                metric.baseline_comparison = ((duration_ms - baseline.target_duration_ms) / baseline.target_duration_ms) * 100
-                
-                if duration_ms <= baseline.warning_threshold_ms:
-                    metric.performance_level = PerformanceLevel.EXCELLENT
-                elif duration_ms <= baseline.critical_threshold_ms:
-                    metric.performance_level = PerformanceLevel.GOOD
-                elif duration_ms <= baseline.failure_threshold_ms:
-                    metric.performance_level = PerformanceLevel.WARNING
-                else:
-                    metric.performance_level = PerformanceLevel.FAILURE
-            else:
+            if duration_ms <= baseline.warning_threshold_ms:
+                metric.performance_level = PerformanceLevel.EXCELLENT
+            elif duration_ms <= baseline.critical_threshold_ms:
                 metric.performance_level = PerformanceLevel.GOOD
-            
-            # Store metric
-            with self._lock:
-                self.metrics.append(metric)
-                self.component_metrics[component_type].append(metric)
-                
-                # Limit in-memory storage
-                if len(self.metrics) > 10000:
-                    self.metrics = self.metrics[-5000:]
-                if len(self.component_metrics[component_type]) > 1000:
-                    self.component_metrics[component_type] = self.component_metrics[component_type][-500:]
-            
-            # Persist to database
-            await self._store_metric_async(metric)
-            
-            # Check thresholds and trigger optimizations
-            await self._check_performance_thresholds(metric)
-            
-            self.logger.debug(f"Tracked {operation_name} ({component_type.value}): {duration_ms:.2f}ms - {metric.performance_level.value}")
+            elif duration_ms <= baseline.failure_threshold_ms:
+                metric.performance_level = PerformanceLevel.WARNING
+            else:
+                metric.performance_level = PerformanceLevel.FAILURE
+        else:
+            metric.performance_level = PerformanceLevel.GOOD
+        
+        if not self._should_record(metric):
+            # Sampled-out calls still count towards the rolling aggregates
+            self._defer_aggregate(metric)
+            return False
+        
+        self._record_metric(metric)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Tracked {metric.operation_name} ({metric.component_type.value}): {duration_ms:.2f}ms - {metric.performance_level.value}")
+        return baseline is not None
+    
+    def _should_record(self, metric: PerformanceMetrics) -> bool:
+        """Apply sampling; failures and degraded calls are always recorded."""
+        rate = self.sampling_rates.get(metric.operation_name, self.default_sampling_rate)
+        if rate >= 1.0:
+            return True
+        if not metric.success or metric.performance_level in (
+            PerformanceLevel.WARNING, PerformanceLevel.CRITICAL, PerformanceLevel.FAILURE
+        ):
+            return True
+        return random.random() < rate
+    
+    def _record_metric(self, metric: PerformanceMetrics) -> None:
+        """Append a finished metric to the in-memory rings and persistence queue."""
+        with self._lock:
+            self.metrics.append(metric)
+            self.component_metrics[metric.component_type].append(metric)
+        self._defer_aggregate(metric)
+        
+        if self._persistent:
+            self._writer.enqueue(metric)
+    
+    def _defer_aggregate(self, metric: PerformanceMetrics) -> None:
+        """Queue a metric for aggregation, draining inline only once the backlog is full."""
+        self._unaggregated.append(metric)
+        if len(self._unaggregated) >= self._aggregate_backlog_limit:
+            self._drain_aggregates()
+    
+    def _drain_aggregates(self) -> None:
+        """Fold every deferred metric into the rolling aggregates and registry metrics."""
+        pending = self._unaggregated
+        with self._lock:
+            while pending:
+                self._aggregate(pending.popleft())
+    
+    def _collect_aggregates(self) -> List[Any]:
+        """Registry collector: bring the operation series up to date before a scrape."""
+        self._drain_aggregates()
+        return []
+    
+    def _aggregate(self, metric: PerformanceMetrics) -> None:
+        """Fold a metric into the rolling aggregates and registry metrics; caller holds the lock."""
+        self.aggregator.record(metric)
+        series = self._operation_series.get((metric.component_type, metric.operation_name))
+        if series is None:
+            series = self._new_operation_series(metric.component_type, metric.operation_name)
+        if metric.success:
+            series[0].inc()
+            series[2].observe((metric.duration or 0.0) / 1000)
+        else:
+            series[1].inc()
+    
+    def _new_operation_series(self, component_type: ComponentType, operation_name: str) -> Tuple[Any, Any, Any]:
+        """Registry children for an operation, collapsing unlisted operations past the cap into "other"."""
+        if operation_name not in self._labelled_operations:
+            if len(self._labelled_operations) >= self._max_labelled_operations:
+                operation_name = "other"
+                series = self._operation_series.get((component_type, operation_name))
+                if series is not None:
+                    return series
+            else:
+                self._labelled_operations.add(operation_name)
+        
+        component = component_type.value
+        series = (
+            self._operations_metric.labels(component, operation_name, "success"),
+            self._operations_metric.labels(component, operation_name, "error"),
+            self._duration_metric.labels(component, operation_name)
+        )
+        self._operation_series[(component_type, operation_name)] = series
+        return series
     
     async def _check_performance_thresholds(self, metric: PerformanceMetrics) -> None:
         """Check performance thresholds and trigger optimizations."""
+        if self._evaluate_thresholds(metric):
+            await self._trigger_optimization(metric)
+    
+    def _evaluate_thresholds(self, metric: PerformanceMetrics) -> bool:
+        """Raise threshold alerts; returns True when auto-optimization should run."""
         if not metric.duration or not metric.performance_level:
-            return
+            return False
         
         baseline = self.baselines.get(metric.operation_name)
         if not baseline:
-            return
+            return False
         
         component_name = f"{metric.component_type.value}.{metric.operation_name}"
         
@@ -407,8 +1032,7 @@ class UnifiedPerformanceMonitor:
             self.logger.critical(alert)
             
             # Trigger auto-optimization
-            if self.config.get("auto_optimization", True):
-                await self._trigger_optimization(metric)
+            return self.config.get("auto_optimization", True)
                 
         elif metric.performance_level == PerformanceLevel.WARNING:
             alert = f"⚠️ WARNING: {component_name} took {metric.duration:.2f}ms (approaching critical threshold: {baseline.critical_threshold_ms}ms)"
@@ -418,6 +1042,22 @@ class UnifiedPerformanceMonitor:
         elif metric.performance_level == PerformanceLevel.EXCELLENT:
             if metric.baseline_comparison and metric.baseline_comparison < -50:  # 50% better than target
                 self.logger.info(f"🚀 EXCELLENT: {component_name} performed {abs(metric.baseline_comparison):.1f}% better than target ({metric.duration:.2f}ms vs {baseline.target_duration_ms}ms)")
+        return False
+    
+    def _check_performance_thresholds_sync(self, metric: PerformanceMetrics) -> None:
+        """Threshold check for synchronous callers.
+        
+        Alerts are raised inline; auto-optimization is scheduled on the running
+        event loop when there is one and skipped otherwise.
+        """
+        if not self._evaluate_thresholds(metric):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.logger.debug(f"No running event loop; skipping optimization for {metric.operation_name}")
+            return
+        loop.create_task(self._trigger_optimization(metric))
     
     async def _trigger_optimization(self, metric: PerformanceMetrics):
         """Trigger component-specific optimization."""
@@ -488,45 +1128,6 @@ class UnifiedPerformanceMonitor:
         """Optimize rate limiting performance."""
         await self._optimize_security_performance(metric)
     
-    async def _store_metric_async(self, metric: PerformanceMetrics):
-        """Store metric to database asynchronously."""
-        if not self.config.get("enable_persistent_storage", True):
-            return
-            
-        try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._store_metric_sync, metric)
-        except Exception as e:
-            self.logger.error(f"Failed to store metric: {e}")
-    
-    def _store_metric_sync(self, metric: PerformanceMetrics):
-        """Store metric to database synchronously."""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            metric_dict = metric.to_dict()
-            cursor.execute("""
-                INSERT INTO performance_metrics (
-                    operation_name, component_type, start_time, end_time, duration,
-                    success, error_message, metadata, user_id, session_id, client_ip,
-                    performance_level, baseline_comparison, timestamp
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                metric_dict["operation_name"], metric_dict["component_type"],
-                metric_dict["start_time"], metric_dict["end_time"], metric_dict["duration"],
-                metric_dict["success"], metric_dict["error_message"], metric_dict["metadata"],
-                metric_dict["user_id"], metric_dict["session_id"], metric_dict["client_ip"],
-                metric_dict["performance_level"], metric_dict["baseline_comparison"],
-                metric_dict["timestamp"]
-            ))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            self.logger.error(f"Database storage error: {e}")
-    
     async def _monitoring_loop(self):
         """Background monitoring loop."""
         while self._running:
@@ -574,21 +1175,7 @@ class UnifiedPerformanceMonitor:
             return 100.0
         
         success_rate = len([m for m in metrics if m.success]) / len(metrics)
-        
-        performance_scores = []
-        for metric in metrics:
-            if metric.performance_level == PerformanceLevel.EXCELLENT:
-                performance_scores.append(100)
-            elif metric.performance_level == PerformanceLevel.GOOD:
-                performance_scores.append(80)
-            elif metric.performance_level == PerformanceLevel.WARNING:
-                performance_scores.append(60)
-            elif metric.performance_level == PerformanceLevel.CRITICAL:
-                performance_scores.append(40)
-            elif metric.performance_level == PerformanceLevel.FAILURE:
-                performance_scores.append(20)
-            else:
-                performance_scores.append(70)
+        performance_scores = [LEVEL_SCORES.get(metric.performance_level, 70) for metric in metrics]
         
         avg_performance = statistics.mean(performance_scores) if performance_scores else 70
         
@@ -639,12 +1226,9 @@ class UnifiedPerformanceMonitor:
             
             # Clean in-memory data
             with self._lock:
-                self.metrics = [m for m in self.metrics if m.start_time > cutoff_time]
-                for component_type in self.component_metrics:
-                    self.component_metrics[component_type] = [
-                        m for m in self.component_metrics[component_type] 
-                        if m.start_time > cutoff_time
-                    ]
+                self.metrics.drop_older_than(cutoff_time)
+                for ring in self.component_metrics.values():
+                    ring.drop_older_than(cutoff_time)
             
             # Clean database
             if self.config.get("enable_persistent_storage", True):
@@ -683,44 +1267,41 @@ class UnifiedPerformanceMonitor:
     def get_performance_summary(self, component_type: Optional[ComponentType] = None,
                                hours: int = 24) -> Dict[str, Any]:
         """Get comprehensive performance summary."""
-        cutoff_time = time.time() - (hours * 3600)
-        
-        # Filter metrics
-        if component_type:
-            relevant_metrics = [
-                m for m in self.component_metrics[component_type]
-                if m.start_time > cutoff_time
-            ]
-        else:
-            relevant_metrics = [
-                m for m in self.metrics
-                if m.start_time > cutoff_time
-            ]
+        self._drain_aggregates()
+        with self._lock:
+            window = self.aggregator.window(hours * 3600)
+        return self._summarize_window(window, component_type, hours)
+    
+    def _summarize_window(self, window: Dict[AggregateKey, OperationAggregate],
+                          component_type: Optional[ComponentType],
+                          hours: int) -> Dict[str, Any]:
+        """Build a performance summary from merged rolling aggregates."""
+        total = OperationAggregate()
+        per_component: Dict[ComponentType, OperationAggregate] = {}
+        per_operation: Dict[str, OperationAggregate] = {}
+        for (operation_name, comp_type), aggregate in window.items():
+            if component_type and comp_type != component_type:
+                continue
+            total.merge(aggregate)
+            if not component_type:
+                per_component.setdefault(comp_type, OperationAggregate()).merge(aggregate)
+            else:
+                per_operation.setdefault(operation_name, OperationAggregate()).merge(aggregate)
         
-        if not relevant_metrics:
+        if not total.count:
             return {
                 "status": "no_data",
                 "message": f"No performance data available for last {hours} hours",
                 "component_type": component_type.value if component_type else "all"
             }
         
-        successful_metrics = [m for m in relevant_metrics if m.success and m.duration]
-        failed_metrics = [m for m in relevant_metrics if not m.success]
-        
-        if not successful_metrics:
+        if not total.success_count:
             return {
                 "status": "all_failed",
-                "failed_count": len(failed_metrics),
+                "failed_count": total.error_count,
                 "component_type": component_type.value if component_type else "all"
             }
         
-        durations = [m.duration for m in successful_metrics]
-        avg_duration = statistics.mean(durations)
-        max_duration = max(durations)
-        min_duration = min(durations)
-        p95_duration = statistics.quantiles(durations, n=20)[18] if len(durations) >= 20 else max_duration
-        p99_duration = statistics.quantiles(durations, n=100)[98] if len(durations) >= 100 else max_duration
-        
         # Performance level distribution
         level_counts = {
             PerformanceLevel.EXCELLENT: 0,
@@ -729,42 +1310,32 @@ class UnifiedPerformanceMonitor:
             PerformanceLevel.CRITICAL: 0,
             PerformanceLevel.FAILURE: 0
         }
-        
-        for metric in successful_metrics:
-            if metric.performance_level:
-                level_counts[metric.performance_level] += 1
+        for level, count in total.level_counts.items():
+            if level:
+                level_counts[level] += count
         
         # Calculate overall health score
-        health_score = self._calculate_component_health(successful_metrics)
+        health_score = total.health_score()
         
         # Component-specific insights
         component_breakdown = {}
-        if not component_type:  # Overall summary
-            for comp_type in ComponentType:
-                comp_metrics = [m for m in successful_metrics if m.component_type == comp_type]
-                if comp_metrics:
-                    comp_durations = [m.duration for m in comp_metrics]
-                    component_breakdown[comp_type.value] = {
-                        "count": len(comp_metrics),
-                        "avg_duration_ms": round(statistics.mean(comp_durations), 2),
-                        "health_score": round(self._calculate_component_health(comp_metrics), 1)
-                    }
+        for comp_type in ComponentType:
+            comp_aggregate = per_component.get(comp_type)
+            if comp_aggregate and comp_aggregate.success_count:
+                component_breakdown[comp_type.value] = {
+                    "count": comp_aggregate.success_count,
+                    "avg_duration_ms": round(comp_aggregate.avg_duration, 2),
+                    "health_score": round(comp_aggregate.health_score(), 1)
+                }
         
         # Baseline comparisons
         baseline_analysis = {}
-        if component_type:
-            for metric in successful_metrics:
-                baseline = self.baselines.get(metric.operation_name)
-                if baseline and metric.baseline_comparison is not None:
-                    if metric.operation_name not in baseline_analysis:
-                        baseline_analysis[metric.operation_name] = []
-                    baseline_analysis[metric.operation_name].append(metric.baseline_comparison)
-        
-        for operation, comparisons in baseline_analysis.items():
-            baseline_analysis[operation] = {
-                "avg_vs_target_percent": round(statistics.mean(comparisons), 1),
-                "samples": len(comparisons)
-            }
+        for operation, aggregate in per_operation.items():
+            if operation in self.baselines and aggregate.comparison_count:
+                baseline_analysis[operation] = {
+                    "avg_vs_target_percent": round(aggregate.comparison_sum / aggregate.comparison_count, 1),
+                    "samples": aggregate.comparison_count
+                }
         
         return {
             "status": "excellent" if health_score >= 90 else 
@@ -774,15 +1345,15 @@ class UnifiedPerformanceMonitor:
             "component_type": component_type.value if component_type else "all",
             "time_period_hours": hours,
             "metrics": {
-                "total_operations": len(relevant_metrics),
-                "successful_operations": len(successful_metrics),
-                "failed_operations": len(failed_metrics),
-                "success_rate_percent": round((len(successful_metrics) / len(relevant_metrics)) * 100, 1),
-                "avg_duration_ms": round(avg_duration, 2),
-                "p95_duration_ms": round(p95_duration, 2),
-                "p99_duration_ms": round(p99_duration, 2),
-                "min_duration_ms": round(min_duration, 2),
-                "max_duration_ms": round(max_duration, 2)
+                "total_operations": total.count,
+                "successful_operations": total.success_count,
+                "failed_operations": total.error_count,
+                "success_rate_percent": round((total.success_count / total.count) * 100, 1),
+                "avg_duration_ms": round(total.avg_duration, 2),
+                "p95_duration_ms": round(total.percentile(0.95, 20), 2),
+                "p99_duration_ms": round(total.percentile(0.99, 100), 2),
+                "min_duration_ms": round(total.duration_min, 2),
+                "max_duration_ms": round(total.duration_max, 2)
             },
             "performance_levels": {
                 level.value: count for level, count in level_counts.items()
@@ -794,29 +1365,33 @@ class UnifiedPerformanceMonitor:
     
     def get_operation_stats(self, operation_name: str, hours: int = 24) -> Dict[str, Any]:
         """Get detailed statistics for a specific operation."""
-        cutoff_time = time.time() - (hours * 3600)
-        operation_metrics = [
-            m for m in self.metrics 
-            if (m.operation_name == operation_name and 
-                m.duration is not None and
-                m.start_time > cutoff_time)
-        ]
+        self._drain_aggregates()
+        with self._lock:
+            window = self.aggregator.window(hours * 3600)
+        return self._operation_stats_from_window(window, operation_name, hours)
+    
+    def _operation_stats_from_window(self, window: Dict[AggregateKey, OperationAggregate],
+                                     operation_name: str, hours: int) -> Dict[str, Any]:
+        """Build detailed operation statistics from merged rolling aggregates."""
+        aggregate = OperationAggregate()
+        operation_component: Optional[ComponentType] = None
+        for (name, comp_type), comp_aggregate in window.items():
+            if name == operation_name:
+                aggregate.merge(comp_aggregate)
+                if operation_component is None:
+                    operation_component = comp_type
         
-        if not operation_metrics:
+        if not aggregate.count:
             return {"status": "no_data", "operation": operation_name}
         
-        successful_metrics = [m for m in operation_metrics if m.success]
-        failed_metrics = [m for m in operation_metrics if not m.success]
-        
-        if not successful_metrics:
+        if not aggregate.success_count:
             return {
                 "status": "all_failed",
                 "operation": operation_name,
-                "failed_count": len(failed_metrics)
+                "failed_count": aggregate.error_count
             }
         
-        durations = [m.duration for m in successful_metrics]
-        success_rate = len(successful_metrics) / len(operation_metrics) * 100
+        success_rate = aggregate.success_count / aggregate.count * 100
         
         # Get baseline information
         baseline = self.baselines.get(operation_name)
@@ -832,31 +1407,34 @@ class UnifiedPerformanceMonitor:
             }
         
         # Performance level breakdown
-        level_counts = {}
-        for level in PerformanceLevel:
-            level_counts[level.value] = len([m for m in successful_metrics if m.performance_level == level])
+        level_counts = {
+            level.value: aggregate.level_counts.get(level, 0) for level in PerformanceLevel
+        }
         
-        # Baseline comparisons for recent metrics
-        baseline_comparisons = [m.baseline_comparison for m in successful_metrics if m.baseline_comparison is not None]
+        cutoff_time = time.time() - (hours * 3600)
+        recent_errors = [
+            m for m in self.aggregator.recent_errors.get(operation_name, ())
+            if m.start_time > cutoff_time
+        ]
         
         return {
             "operation": operation_name,
             "time_period_hours": hours,
-            "component_type": successful_metrics[0].component_type.value if successful_metrics else None,
-            "count": len(operation_metrics),
+            "component_type": operation_component.value if operation_component else None,
+            "count": aggregate.count,
             "success_rate_percent": round(success_rate, 1),
             "performance": {
-                "avg_duration_ms": round(statistics.mean(durations), 2),
-                "p95_duration_ms": round(statistics.quantiles(durations, n=20)[18], 2) if len(durations) >= 20 else round(max(durations), 2),
-                "p99_duration_ms": round(statistics.quantiles(durations, n=100)[98], 2) if len(durations) >= 100 else round(max(durations), 2),
-                "min_duration_ms": round(min(durations), 2),
-                "max_duration_ms": round(max(durations), 2)
+                "avg_duration_ms": round(aggregate.avg_duration, 2),
+                "p95_duration_ms": round(aggregate.percentile(0.95, 20), 2),
+                "p99_duration_ms": round(aggregate.percentile(0.99, 100), 2),
+                "min_duration_ms": round(aggregate.duration_min, 2),
+                "max_duration_ms": round(aggregate.duration_max, 2)
             },
             "performance_levels": level_counts,
             "baseline": baseline_info,
             "baseline_comparison": {
-                "avg_vs_target_percent": round(statistics.mean(baseline_comparisons), 1) if baseline_comparisons else None,
-                "samples_with_comparison": len(baseline_comparisons)
+                "avg_vs_target_percent": round(aggregate.comparison_sum / aggregate.comparison_count, 1) if aggregate.comparison_count else None,
+                "samples_with_comparison": aggregate.comparison_count
             },
             "recent_errors": [
                 {
@@ -864,7 +1442,7 @@ class UnifiedPerformanceMonitor:
                     "error": m.error_message,
                     "metadata": m.metadata
                 }
-                for m in failed_metrics[-5:]  # Last 5 errors
+                for m in recent_errors
             ]
         }
     
@@ -874,6 +1452,8 @@ class UnifiedPerformanceMonitor:
             self.metrics.clear()
             for component_type in self.component_metrics:
                 self.component_metrics[component_type].clear()
+            self._unaggregated.clear()
+            self.aggregator.clear()
             self.alerts.clear()
         
         self.logger.info("Cleared all performance metrics")
@@ -978,15 +1558,19 @@ class UnifiedPerformanceMonitor:
     def export_performance_data(self, format: str = "json", hours: int = 24) -> str:
         """Export performance data in specified format."""
         if format == "json":
+            # Merge the rolling aggregates once and derive every section from them
+            self._drain_aggregates()
+            with self._lock:
+                window = self.aggregator.window(hours * 3600)
             export_data = {
-                "summary": self.get_performance_summary(hours=hours),
+                "summary": self._summarize_window(window, None, hours),
                 "baselines": self.get_performance_baselines(),
                 "component_summaries": {
-                    component.value: self.get_performance_summary(component, hours)
+                    component.value: self._summarize_window(window, component, hours)
                     for component in ComponentType
                 },
                 "operation_stats": {
-                    name: self.get_operation_stats(name, hours)
+                    name: self._operation_stats_from_window(window, name, hours)
                     for name in self.baselines.keys()
                 },
                 "exported_at": datetime.now().isoformat(),
@@ -1021,46 +1605,344 @@ performance_monitor = UnifiedPerformanceMonitor()
 PerformanceMonitor = UnifiedPerformanceMonitor
 
 
-def performance_tracked(operation_name: str, metadata: Optional[Dict[str, Any]] = None):
-    """Decorator for tracking function performance."""
+class TrackingRegistry:
+    """Runtime switches for decorator-based performance tracking.
+
+    Tracking can be turned off globally or per operation, and call-stack
+    profiling turned on per operation, without redeploying. Operations listed
+    in the ``PERF_TRACKING_DISABLED`` / ``PERF_PROFILED_OPERATIONS``
+    environment variables (comma separated) start disabled / profiled.
+    """
+
+    def __init__(self):
+        self.enabled = os.environ.get("PERF_TRACKING_ENABLED", "1") != "0"
+        self._disabled = set(filter(None, os.environ.get("PERF_TRACKING_DISABLED", "").split(",")))
+        self._profiled: Dict[str, Optional[float]] = {
+            name: None for name in filter(None, os.environ.get("PERF_PROFILED_OPERATIONS", "").split(","))
+        }
+
+    def is_enabled(self, operation_name: str) -> bool:
+        return self.enabled and operation_name not in self._disabled
+
+    def enable(self, operation_name: Optional[str] = None) -> None:
+        """Enable tracking for one operation, or globally when no name is given."""
+        if operation_name is None:
+            self.enabled = True
+        else:
+            self._disabled.discard(operation_name)
+
+    def disable(self, operation_name: Optional[str] = None) -> None:
+        """Disable tracking for one operation, or globally when no name is given."""
+        if operation_name is None:
+            self.enabled = False
+        else:
+            self._disabled.add(operation_name)
+
+    def enable_profiling(self, operation_name: str, threshold_ms: Optional[float] = None) -> None:
+        """Sample call stacks of calls running longer than threshold_ms.
+
+        Without an explicit threshold the operation's baseline target is used.
+        """
+        self._profiled[operation_name] = threshold_ms
+
+    def disable_profiling(self, operation_name: str) -> None:
+        self._profiled.pop(operation_name, None)
+
+    def profiling_threshold(self, operation_name: str,
+                            monitor: "UnifiedPerformanceMonitor") -> Optional[float]:
+        """Profiling threshold in seconds, or None when profiling is off."""
+        if operation_name not in self._profiled:
+            return None
+        threshold_ms = self._profiled[operation_name]
+        if threshold_ms is None:
+            baseline = monitor.baselines.get(operation_name)
+            if not baseline:
+                return None
+            threshold_ms = baseline.target_duration_ms
+        return threshold_ms / 1000
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current registry state."""
+        return {
+            "enabled": self.enabled,
+            "disabled_operations": sorted(self._disabled),
+            "profiled_operations": dict(self._profiled)
+        }
+
+
+class StackSampler:
+    """Low-overhead call-stack sampler for slow tracked operations.
+
+    Synchronous calls register the thread they run on, coroutines the
+    asyncio task they run in, together with a deadline. Task stacks are read
+    from the task's own coroutine chain, so other tasks sharing the event
+    loop thread are not charged to the operation. A single daemon thread,
+    idle while nothing is registered, wakes every ``interval`` seconds and
+    samples the stacks of registered calls that have passed their deadline.
+    Samples are kept as folded stacks (``outer;inner;leaf`` -> count), ready
+    for flame-graph tooling.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 48,
+                 max_stacks_per_operation: int = 500):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.max_stacks_per_operation = max_stacks_per_operation
+        self.samples: Dict[str, Dict[str, int]] = {}
+        self._active: Dict[int, Tuple[Any, str, float]] = {}
+        self._next_token = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def begin(self, operation_name: str, threshold_seconds: float,
+              task: Optional[asyncio.Task] = None) -> int:
+        """Register a call on the current thread, or in ``task``; returns a token for end()."""
+        target = threading.get_ident() if task is None else (threading.get_ident(), task)
+        with self._lock:
+            self._next_token += 1
+            token = self._next_token
+            self._active[token] = (target, operation_name,
+                                   time.perf_counter() + threshold_seconds)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="perf-stack-sampler", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return token
+
+    def end(self, token: int) -> None:
+        with self._lock:
+            self._active.pop(token, None)
+
+    def _run(self) -> None:
+        while True:
+            if not self._active:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            time.sleep(self.interval)
+            self._sample()
+
+    def _sample(self) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            due = [(target, name) for target, name, deadline in self._active.values() if now >= deadline]
+        if not due:
+            return
+        frames = sys._current_frames()
+        for target, operation_name in due:
+            if isinstance(target, int):
+                stack = self._thread_stack(frames.get(target))
+            else:
+                thread_id, task = target
+                stack = self._task_stack(task, frames.get(thread_id))
+            if not stack:
+                continue
+            folded = ";".join(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}:{frame.f_lineno}"
+                              for frame in stack)
+            with self._lock:
+                operation_samples = self.samples.setdefault(operation_name, {})
+                if folded in operation_samples or len(operation_samples) < self.max_stacks_per_operation:
+                    operation_samples[folded] = operation_samples.get(folded, 0) + 1
+
+    def _thread_stack(self, frame, outermost=None) -> list:
+        """Frames from ``frame`` out to ``outermost`` (or the thread's root), outermost first."""
+        stack = []
+        while frame is not None:
+            if len(stack) < self.max_depth:
+                stack.append(frame)
+            if frame is outermost:
+                break
+            frame = frame.f_back
+        else:
+            if outermost is not None:
+                return []
+        stack.reverse()
+        return stack
+
+    def _task_stack(self, task: asyncio.Task, thread_frame) -> list:
+        """Frames belonging to a task, outermost first."""
+        if task.done():
+            return []
+        coro = task.get_coro()
+        outermost = getattr(coro, "cr_frame", None)
+        if outermost is None:
+            return []
+
+        # While the task runs its frames are the top of the loop thread's stack
+        if getattr(coro, "cr_running", False):
+            return self._thread_stack(thread_frame, outermost)
+
+        # Suspended: follow the await chain down to the innermost coroutine
+        stack = []
+        while coro is not None and len(stack) < self.max_depth:
+            frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+            if frame is None:
+                break
+            stack.append(frame)
+            coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+        return stack
+
+    def get_samples(self, operation_name: str, top: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Folded stacks for an operation, most frequent first."""
+        with self._lock:
+            stacks = list(self.samples.get(operation_name, {}).items())
+        stacks.sort(key=lambda item: item[1], reverse=True)
+        return stacks[:top] if top else stacks
+
+    def clear(self, operation_name: Optional[str] = None) -> None:
+        with self._lock:
+            if operation_name is None:
+                self.samples.clear()
+            else:
+                self.samples.pop(operation_name, None)
+
+
+tracking_registry = TrackingRegistry()
+stack_sampler = StackSampler()
+
+
+def performance_tracked(operation_name: str, metadata: Optional[Dict[str, Any]] = None,
+                        component_type: ComponentType = ComponentType.SYSTEM,
+                        monitor: Optional[UnifiedPerformanceMonitor] = None):
+    """Decorator for tracking function performance.
+    
+    Supports plain functions, coroutines, generators and async generators;
+    generator timings cover the whole iteration. Tracking can be toggled at
+    runtime through ``tracking_registry``; a disabled operation calls straight
+    through without allocating a metric.
+    """
     def decorator(func: Callable) -> Callable:
-        async def async_wrapper(*args, **kwargs):
-            async with performance_monitor.track_operation(operation_name, metadata):
-                return await func(*args, **kwargs)
+        def resolve_monitor() -> UnifiedPerformanceMonitor:
+            return monitor or performance_monitor
         
+        def begin_profile(mon: UnifiedPerformanceMonitor,
+                          task: Optional[asyncio.Task] = None) -> Optional[int]:
+            threshold = tracking_registry.profiling_threshold(operation_name, mon)
+            return None if threshold is None else stack_sampler.begin(operation_name, threshold, task)
+        
+        def finish_sync(mon: UnifiedPerformanceMonitor, metric: PerformanceMetrics,
+                        token: Optional[int]) -> None:
+            if token is not None:
+                stack_sampler.end(token)
+            if mon._finish_operation(metric, time.time()):
+                mon._check_performance_thresholds_sync(metric)
+        
+        def new_metric() -> PerformanceMetrics:
+            return PerformanceMetrics(
+                operation_name=operation_name,
+                component_type=component_type,
+                start_time=time.time(),
+                metadata=metadata or {}
+            )
+        
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def async_gen_wrapper(*args, **kwargs):
+                if not tracking_registry.is_enabled(operation_name):
+                    async for item in func(*args, **kwargs):
+                        yield item
+                    return
+                mon = resolve_monitor()
+                token = begin_profile(mon, asyncio.current_task())
+                metric = new_metric()
+                try:
+                    async for item in func(*args, **kwargs):
+                        yield item
+                except Exception as e:
+                    metric.success = False
+                    metric.error_message = str(e)
+                    raise
+                finally:
+                    if token is not None:
+                        stack_sampler.end(token)
+                    if mon._finish_operation(metric, time.time()):
+                        await mon._check_performance_thresholds(metric)
+            return async_gen_wrapper
+        
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not tracking_registry.is_enabled(operation_name):
+                    return await func(*args, **kwargs)
+                mon = resolve_monitor()
+                token = begin_profile(mon, asyncio.current_task())
+                try:
+                    async with mon.track_operation(operation_name, component_type, metadata=metadata):
+                        return await func(*args, **kwargs)
+                finally:
+                    if token is not None:
+                        stack_sampler.end(token)
+            return async_wrapper
+        
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def gen_wrapper(*args, **kwargs):
+                if not tracking_registry.is_enabled(operation_name):
+                    return (yield from func(*args, **kwargs))
+                mon = resolve_monitor()
+                token = begin_profile(mon)
+                metric = new_metric()
+                try:
+                    return (yield from func(*args, **kwargs))
+                except Exception as e:
+                    metric.success = False
+                    metric.error_message = str(e)
+                    raise
+                finally:
+                    finish_sync(mon, metric, token)
+            return gen_wrapper
+        
+        @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            # For sync functions, we need to create a simple timing wrapper
-            start_time = time.time()
+            if not tracking_registry.is_enabled(operation_name):
+                return func(*args, **kwargs)
+            mon = resolve_monitor()
+            token = begin_profile(mon)
+            metric = new_metric()
             try:
-                result = func(*args, **kwargs)
-                duration = time.time() - start_time
-                
-                metric = PerformanceMetrics(
-                    operation_name=operation_name,
-                    start_time=start_time,
-                    end_time=time.time(),
-                    duration=duration,
-                    success=True,
-                    metadata=metadata or {}
-                )
-                performance_monitor.metrics.append(metric)
-                performance_monitor._check_performance_thresholds(metric)
-                return result
+                return func(*args, **kwargs)
             except Exception as e:
-                duration = time.time() - start_time
-                metric = PerformanceMetrics(
-                    operation_name=operation_name,
-                    start_time=start_time,
-                    end_time=time.time(),
-                    duration=duration,
-                    success=False,
-                    error_message=str(e),
-                    metadata=metadata or {}
-                )
-                performance_monitor.metrics.append(metric)
-                performance_monitor._check_performance_thresholds(metric)
+                metric.success = False
+                metric.error_message = str(e)
                 raise
-        
-        return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+            finally:
+                finish_sync(mon, metric, token)
+        return sync_wrapper
     
-    return decorator
\ No newline at end of file
+    return decorator
+
+
+def track_jwt_authentication(metadata: Optional[Dict[str, Any]] = None):
+    """Track a JWT authentication call against its baseline."""
+    return performance_tracked("jwt_authentication", metadata, ComponentType.AUTHENTICATION)
+
+
+def track_rbac_authorization(metadata: Optional[Dict[str, Any]] = None):
+    """Track an RBAC authorization check against its baseline."""
+    return performance_tracked("rbac_authorization", metadata, ComponentType.AUTHORIZATION)
+
+
+def track_rate_limiting(metadata: Optional[Dict[str, Any]] = None):
+    """Track a rate limit check against its baseline."""
+    return performance_tracked("rate_limiting", metadata, ComponentType.RATE_LIMITING)
+
+
+def track_service_discovery(metadata: Optional[Dict[str, Any]] = None):
+    """Track a service discovery lookup against its baseline."""
+    return performance_tracked("service_discovery", metadata, ComponentType.SERVICE_DISCOVERY)
+
+
+def track_load_balancing(metadata: Optional[Dict[str, Any]] = None):
+    """Track a load balancing decision against its baseline."""
+    return performance_tracked("load_balancing", metadata, ComponentType.LOAD_BALANCER)
+
+
+def track_api_gateway_request(metadata: Optional[Dict[str, Any]] = None):
+    """Track API gateway request processing against its baseline."""
+    return performance_tracked("api_gateway_request", metadata, ComponentType.API_GATEWAY)
+
+
+def track_end_to_end_request(metadata: Optional[Dict[str, Any]] = None):
+    """Track a full end-to-end request against its baseline."""
+    return performance_tracked("end_to_end_request", metadata, ComponentType.SYSTEM)
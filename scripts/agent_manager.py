@@ -9,13 +9,112 @@ Provides capabilities to spawn, monitor, and manage agents in separate tmux wind
 import os
 import subprocess
 import json
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import argparse
 
 
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _git_dir(worktree_dir: Path) -> Optional[Path]:
+    """Return the git directory of a repository or linked worktree."""
+    dot_git = worktree_dir / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        content = dot_git.read_text().strip()
+    except OSError:
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    git_dir = Path(content[len("gitdir:"):].strip())
+    return git_dir if git_dir.is_absolute() else (worktree_dir / git_dir).resolve()
+
+
+class AgentDiscoveryCache:
+    """Process-wide cache of discovered agents for one base directory.
+
+    Discovery results stay valid until a watched path changes. Watched paths
+    are the worktrees/ directory, the repository's worktree registry
+    (.git/worktrees), and each discovered worktree's directory, CLAUDE.md, and
+    HEAD/reflog. They are polled with stat() at most once per
+    ``poll_interval``. Per-worktree results (CLAUDE.md classification, last
+    commit time) are memoized by mtime, so a rescan only re-reads the
+    worktrees that changed.
+    """
+
+    _instances: Dict[Path, "AgentDiscoveryCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, poll_interval: float = 1.0):
+        self.poll_interval = poll_interval
+        self.agents: Optional[Dict[str, Dict]] = None
+        self.watched: Tuple[Path, ...] = ()
+        self.fingerprint: Optional[Tuple] = None
+        self.last_check = 0.0
+        self.scan_count = 0
+        self.memo: Dict[Tuple[str, Path], Tuple[Optional[int], object]] = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_base_dir(cls, base_dir: Path) -> "AgentDiscoveryCache":
+        key = Path(base_dir).resolve()
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls()
+            return cls._instances[key]
+
+    @classmethod
+    def clear_all(cls):
+        with cls._instances_lock:
+            cls._instances.clear()
+
+    def _fingerprint(self) -> Tuple:
+        return tuple(_mtime(path) for path in self.watched)
+
+    def get(self, discover: Callable[[], Tuple[Dict[str, Dict], List[Path]]]) -> Dict[str, Dict]:
+        """Return cached agents, rescanning with ``discover`` if anything changed.
+
+        ``discover`` returns the agents and the paths to watch for changes.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self.agents is not None and now - self.last_check < self.poll_interval:
+                return self.agents
+            self.last_check = now
+
+            if self.agents is not None and self._fingerprint() == self.fingerprint:
+                return self.agents
+
+            agents, watched = discover()
+            self.agents = agents
+            self.watched = tuple(watched)
+            self.fingerprint = self._fingerprint()
+            self.scan_count += 1
+            return agents
+
+    def invalidate(self):
+        with self.lock:
+            self.agents = None
+
+    def memoize(self, kind: str, path: Path, mtime: Optional[int], compute: Callable[[], object]):
+        """Return ``compute()``, reusing the previous result while ``mtime`` is unchanged."""
+        cached = self.memo.get((kind, path))
+        if cached is not None and cached[0] == mtime and mtime is not None:
+            return cached[1]
+        value = compute()
+        self.memo[(kind, path)] = (mtime, value)
+        return value
+
+
 class TmuxAgentManager:
     """Manages agents using tmux sessions and windows."""
 
@@ -23,11 +122,35 @@ class TmuxAgentManager:
         self.base_dir = Path(base_dir)
         self.worktrees_dir = self.base_dir / "worktrees"
         self.session_name = session_name
-        self.agents = self._discover_agents()
+        self.discovery_cache = AgentDiscoveryCache.for_base_dir(self.base_dir)
+
+    @property
+    def agents(self) -> Dict[str, Dict]:
+        """Discovered agents, served from the process-wide discovery cache."""
+        return self._discover_agents()
+
+    def refresh_agents(self) -> Dict[str, Dict]:
+        """Force a rescan of agent worktrees."""
+        self.discovery_cache.invalidate()
+        return self._discover_agents()
 
     def _discover_agents(self) -> Dict[str, Dict]:
         """Discover all agent worktrees and their configurations."""
+        return self.discovery_cache.get(self._scan_agents)
+
+    def _watch_worktree(self, watched: List[Path], worktree_dir: Path):
+        git_dir = _git_dir(worktree_dir)
+        watched.extend([worktree_dir, worktree_dir / "CLAUDE.md"])
+        if git_dir:
+            watched.extend([git_dir / "HEAD", git_dir / "logs" / "HEAD"])
+
+    def _scan_agents(self) -> Tuple[Dict[str, Dict], List[Path]]:
+        """Scan worktrees; returns the agents and the paths to watch."""
         agents = {}
+        watched = [self.worktrees_dir]
+        base_git_dir = _git_dir(self.base_dir)
+        if base_git_dir:
+            watched.append(base_git_dir / "worktrees")
 
         # First, discover agents in standard worktrees/ directory
         if self.worktrees_dir.exists():
@@ -35,6 +158,7 @@ class TmuxAgentManager:
                 if worktree_dir.is_dir():
                     agent_name = worktree_dir.name
                     claude_file = worktree_dir / "CLAUDE.md"
+                    self._watch_worktree(watched, worktree_dir)
 
                     if claude_file.exists():
                         agents[agent_name] = {
@@ -66,6 +190,7 @@ class TmuxAgentManager:
                             current_worktree.name not in agents and
                             current_worktree.name != "agent-hive"):
                             claude_file = current_worktree / "CLAUDE.md"
+                            self._watch_worktree(watched, current_worktree)
                             if claude_file.exists():
                                 # Extract agent name from path
                                 agent_name = current_worktree.name
@@ -85,10 +210,16 @@ class TmuxAgentManager:
         except Exception as e:
             print(f"Warning: Could not discover git worktrees: {e}")
 
-        return agents
+        return agents, watched
 
     def _is_agent_specific_claude(self, claude_file: Path) -> bool:
         """Check if CLAUDE.md file is agent-specific (not generic orchestrator)."""
+        return self.discovery_cache.memoize(
+            "claude", claude_file, _mtime(claude_file),
+            lambda: self._classify_claude_file(claude_file)
+        )
+
+    def _classify_claude_file(self, claude_file: Path) -> bool:
         try:
             content = claude_file.read_text()
             # Skip if it looks like a generic orchestrator file
@@ -103,6 +234,14 @@ class TmuxAgentManager:
 
     def _get_last_activity(self, worktree_dir: Path) -> Optional[datetime]:
         """Get last git activity in worktree."""
+        git_dir = _git_dir(worktree_dir)
+        reflog_mtime = _mtime(git_dir / "logs" / "HEAD") if git_dir else None
+        return self.discovery_cache.memoize(
+            "last_activity", worktree_dir, reflog_mtime,
+            lambda: self._query_last_activity(worktree_dir)
+        )
+
+    def _query_last_activity(self, worktree_dir: Path) -> Optional[datetime]:
         try:
             result = subprocess.run(
                 ["git", "log", "-1", "--format=%ct"],
@@ -126,27 +265,27 @@ class TmuxAgentManager:
         result = self._tmux_command(["has-session", "-t", self.session_name])
         return result.returncode == 0
 
-    def _window_exists(self, window_name: str) -> bool:
-        """Check if tmux window exists in session."""
-        result = self._tmux_command(["list-windows", "-t", self.session_name, "-F", "#{window_name}"])
-        if result.returncode == 0:
-            return window_name in result.stdout.splitlines()
-        return False
-
-    def _get_window_status(self, window_name: str) -> Optional[str]:
-        """Get status of a specific tmux window."""
+    def _list_windows(self) -> Dict[str, str]:
+        """Get the status of every window in the session with one tmux call."""
         result = self._tmux_command([
             "list-windows", "-t", self.session_name, "-F", "#{window_name}:#{window_active}:#{window_flags}"
         ])
+        windows = {}
         if result.returncode == 0:
             for line in result.stdout.splitlines():
-                if line.startswith(window_name + ":"):
-                    parts = line.split(":")
-                    if len(parts) >= 3:
-                        active = parts[1] == "1"
-                        flags = parts[2]
-                        return f"{'active' if active else 'inactive'}:{flags}"
-        return None
+                parts = line.rsplit(":", 2)
+                if len(parts) == 3:
+                    active = parts[1] == "1"
+                    windows[parts[0]] = f"{'active' if active else 'inactive'}:{parts[2]}"
+        return windows
+
+    def _window_exists(self, window_name: str) -> bool:
+        """Check if tmux window exists in session."""
+        return window_name in self._list_windows()
+
+    def _get_window_status(self, window_name: str) -> Optional[str]:
+        """Get status of a specific tmux window."""
+        return self._list_windows().get(window_name)
 
     def _get_starting_prompt(self, agent_name: str) -> Optional[str]:
         """Get appropriate starting prompt for agent."""
@@ -286,16 +425,16 @@ class TmuxAgentManager:
         if not self._session_exists():
             return {}
 
+        windows = self._list_windows()
         status = {}
         for agent_name, agent in self.agents.items():
             window_name = agent["window_name"]
-            window_status = self._get_window_status(window_name)
 
             status[agent_name] = {
                 "name": agent_name,
                 "window_name": window_name,
-                "exists": self._window_exists(window_name),
-                "status": window_status,
+                "exists": window_name in windows,
+                "status": windows.get(window_name),
                 "path": str(agent["path"])
             }
 
@@ -5,20 +5,54 @@ Monitors context usage and triggers sleep/wake patterns to preserve knowledge
 """
 
 import argparse
+import asyncio
 import hashlib
 import json
 import logging
 import re
-import subprocess
 import sys
 import tempfile
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+def _parse_json_or_raw(output: str) -> Any:
+    try:
+        return json.loads(output)
+    except json.JSONDecodeError:
+        return {"raw_output": output}
+
+
+@dataclass
+class StateCollector:
+    """A command whose output becomes one field of the captured state"""
+    section: str
+    key: Optional[str]
+    command: List[str]
+    timeout: float
+    ttl: float
+    parse: Callable[[str], Any] = str.strip
+
+
+STATE_COLLECTORS = [
+    StateCollector("agent_status", None, ["python", "scripts/check_agent_status.py", "--format", "json"],
+                   timeout=30, ttl=60, parse=_parse_json_or_raw),
+    StateCollector("project_status", "uncommitted_changes", ["git", "status", "--porcelain"],
+                   timeout=10, ttl=5),
+    StateCollector("project_status", "recent_commits", ["git", "log", "--oneline", "-10"],
+                   timeout=10, ttl=30),
+    StateCollector("project_status", "open_prs",
+                   ["gh", "pr", "list", "--state", "open", "--json", "number,title,headRefName"],
+                   timeout=15, ttl=120, parse=json.loads),
+]
+
+
 class ContextMemoryManager:
     """Manages context window usage and automatic memory consolidation"""
 
@@ -36,6 +70,13 @@ class ContextMemoryManager:
         self.critical_threshold = 85  # Immediate consolidation required
         self.emergency_threshold = 95  # Emergency sleep/wake cycle
 
+        # State collectors run concurrently; results are reused within each collector's TTL
+        self.collectors = list(STATE_COLLECTORS)
+        self._collector_cache: Dict[str, Tuple[float, Any]] = {}
+
+        # Snapshot sections are stored separately and rewritten only when changed
+        self.snapshot_sections_dir = self.memory_dir / "snapshot_sections"
+
     def _calculate_checksum(self, content: str) -> str:
         """Calculate SHA-256 checksum of content"""
         return hashlib.sha256(content.encode('utf-8')).hexdigest()
@@ -220,35 +261,15 @@ class ContextMemoryManager:
         }
 
         try:
-            # Get agent status
-            cmd = ["python", "scripts/check_agent_status.py", "--format", "json"]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            if result.returncode == 0:
-                try:
-                    state["agent_status"] = json.loads(result.stdout)
-                except json.JSONDecodeError:
-                    state["agent_status"] = {"raw_output": result.stdout}
-
-            # Get git status
-            cmd = ["git", "status", "--porcelain"]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                state["project_status"]["uncommitted_changes"] = result.stdout.strip()
-
-            # Get recent commits
-            cmd = ["git", "log", "--oneline", "-10"]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                state["project_status"]["recent_commits"] = result.stdout.strip()
-
-            # Get PR status
-            cmd = ["gh", "pr", "list", "--state", "open", "--json", "number,title,headRefName"]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-            if result.returncode == 0:
-                try:
-                    state["project_status"]["open_prs"] = json.loads(result.stdout)
-                except json.JSONDecodeError:
-                    pass
+            # All collectors run at once, so capture takes as long as the slowest one
+            results = await asyncio.gather(*(self._run_collector(c) for c in self.collectors))
+            for collector, value in zip(self.collectors, results):
+                if value is None:
+                    continue
+                if collector.key is None:
+                    state[collector.section] = value
+                else:
+                    state[collector.section][collector.key] = value
 
             # Check active agent worktrees
             worktree_paths = list(Path("new-worktrees").glob("*"))
@@ -259,6 +280,47 @@ class ContextMemoryManager:
 
         return state
 
+    def _collector_name(self, collector: StateCollector) -> str:
+        return f"{collector.section}.{collector.key}" if collector.key else collector.section
+
+    async def _run_collector(self, collector: StateCollector) -> Any:
+        """Run one collector command, returning its parsed output or None on failure"""
+        name = self._collector_name(collector)
+        cached = self._collector_cache.get(name)
+        if cached and time.monotonic() - cached[0] < collector.ttl:
+            return cached[1]
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *collector.command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.project_root
+            )
+        except OSError as e:
+            logger.debug(f"Collector {name} unavailable: {e}")
+            return None
+
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=collector.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            logger.warning(f"Collector {name} timed out after {collector.timeout}s")
+            # A stale value is better than none
+            return cached[1] if cached else None
+
+        if process.returncode != 0:
+            return cached[1] if cached else None
+
+        try:
+            value = collector.parse(stdout.decode(errors="replace"))
+        except (ValueError, TypeError):
+            return None
+
+        self._collector_cache[name] = (time.monotonic(), value)
+        return value
+
     async def _update_essential_knowledge(self, current_state: Dict):
         """Update the essential knowledge file with latest discoveries"""
         essential_file = self.memory_dir / "ESSENTIAL_WORKFLOW_KNOWLEDGE.md"
@@ -365,11 +427,34 @@ class ContextMemoryManager:
     async def _save_memory_snapshot(self, current_state: Dict, level: str):
         """Save memory snapshot for wake protocol"""
         snapshot_file = self.memory_dir / "LATEST_MEMORY_SNAPSHOT.json"
+        previous = self._read_snapshot_manifest(snapshot_file)
+        previous_sections = previous.get("sections", {}) if previous else {}
+
+        # Only sections whose content changed are rewritten
+        self.snapshot_sections_dir.mkdir(parents=True, exist_ok=True)
+        sections = {}
+        changed = []
+        for name, value in current_state.items():
+            if name == "timestamp":
+                continue
+            checksum = self._calculate_checksum(json.dumps(value, separators=(',', ':'), sort_keys=True, default=str))
+            section_file = self.snapshot_sections_dir / f"{name}.json"
+            entry = previous_sections.get(name)
+            if entry and entry.get("checksum") == checksum and section_file.exists():
+                sections[name] = entry
+                continue
+
+            content = json.dumps({"section": name, "data": value}, default=str)
+            if not self._atomic_write_file(section_file, content, backup=False):
+                continue
+            sections[name] = {"checksum": checksum, "updated": current_state["timestamp"]}
+            changed.append(name)
 
         snapshot = {
             "consolidation_level": level,
             "timestamp": current_state["timestamp"],
-            "state": current_state,
+            "sections": sections,
+            "changed_sections": changed,
             "wake_instructions": [
                 "Read .claude/memory/ESSENTIAL_WORKFLOW_KNOWLEDGE.md immediately",
                 "Check agent status with scripts/check_agent_status.py",
@@ -381,7 +466,34 @@ class ContextMemoryManager:
         with open(snapshot_file, 'w') as f:
             json.dump(snapshot, f, indent=2)
 
-        logger.info("✅ Memory snapshot saved for wake protocol")
+        logger.info(f"✅ Memory snapshot saved for wake protocol ({len(changed)} changed section(s))")
+
+    def _read_snapshot_manifest(self, snapshot_file: Path) -> Optional[Dict]:
+        try:
+            with open(snapshot_file, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def load_memory_snapshot(self) -> Optional[Dict]:
+        """Load the latest snapshot with its state reassembled from section files"""
+        snapshot = self._read_snapshot_manifest(self.memory_dir / "LATEST_MEMORY_SNAPSHOT.json")
+        if snapshot is None:
+            return None
+
+        # Snapshots written before sections were split carry the state inline
+        if "state" in snapshot:
+            return snapshot
+
+        state = {"timestamp": snapshot.get("timestamp")}
+        for name in snapshot.get("sections", {}):
+            try:
+                with open(self.snapshot_sections_dir / f"{name}.json", 'r') as f:
+                    state[name] = json.load(f).get("data")
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Snapshot section {name} unreadable: {e}")
+        snapshot["state"] = state
+        return snapshot
 
     async def wake_from_memory(self) -> Dict:
         """Restore essential knowledge and state from memory"""
@@ -406,11 +518,8 @@ class ContextMemoryManager:
                 logger.info("✅ Essential workflow knowledge restored")
 
             # 2. Restore latest memory snapshot
-            snapshot_file = self.memory_dir / "LATEST_MEMORY_SNAPSHOT.json"
-            if snapshot_file.exists():
-                with open(snapshot_file, 'r') as f:
-                    snapshot = json.load(f)
-
+            snapshot = self.load_memory_snapshot()
+            if snapshot is not None:
                 wake_summary["memory_snapshot_restored"] = True
                 wake_summary["last_consolidation"] = snapshot.get("timestamp")
                 wake_summary["consolidation_level"] = snapshot.get("consolidation_level")
@@ -515,5 +624,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
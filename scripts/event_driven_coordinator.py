@@ -8,12 +8,20 @@ Monitors coordination_alerts.json and triggers intelligent responses
 import json
 import asyncio
 import logging
+import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Set
+from typing import Dict, List, Any, Optional
 import signal
 import sys
 
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,16 +30,137 @@ logging.basicConfig(
 )
 logger = logging.getLogger('event_coordinator')
 
+
+class LogFollower:
+    """
+    Follows an append-only JSON-lines file by byte offset.
+
+    Only complete lines are returned; a trailing partial line is buffered
+    until its newline arrives. Rotation (the path now names a different file)
+    and truncation are detected and reading restarts at the beginning of the
+    new file. The offset of the last consumed line is persisted to
+    ``offset_file`` on ``commit`` so a restart resumes where it stopped.
+    """
+
+    def __init__(self, path: Path, offset_file: Optional[Path] = None, chunk_size: int = 65536):
+        self.path = Path(path)
+        self.offset_file = Path(offset_file) if offset_file else self.path.with_name(self.path.name + ".offset")
+        self.chunk_size = chunk_size
+        self._file = None
+        self._inode: Optional[int] = None
+        self._partial = b""
+        self.offset = 0
+        self.rotations = 0
+
+    def open(self):
+        """Open the file and seek to the persisted offset if it still applies."""
+        if not self._open_current():
+            return
+
+        saved = self._load_offset()
+        size = os.fstat(self._file.fileno()).st_size
+        if saved and saved.get("inode") == self._inode and saved.get("offset", 0) <= size:
+            self.offset = saved["offset"]
+            self._file.seek(self.offset)
+
+    def close(self):
+        """Close the file handle."""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _open_current(self) -> bool:
+        try:
+            handle = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        self.close()
+        self._file = handle
+        self._inode = os.fstat(handle.fileno()).st_ino
+        self._partial = b""
+        self.offset = 0
+        return True
+
+    def _load_offset(self) -> Optional[Dict[str, int]]:
+        try:
+            with open(self.offset_file, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def read_lines(self) -> List[bytes]:
+        """Return the complete lines appended since the last call."""
+        if self._file is None:
+            self.open()
+            if self._file is None:
+                return []
+
+        lines = self._drain()
+
+        # Rotated or truncated: finish the old file above, then switch
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            return lines
+        if current.st_ino != self._inode or current.st_size < self._file.tell():
+            if self._partial:
+                logger.warning(f"Dropping {len(self._partial)} byte partial line from rotated {self.path}")
+            self.rotations += 1
+            if self._open_current():
+                lines.extend(self._drain())
+        return lines
+
+    def _drain(self) -> List[bytes]:
+        chunks = [self._partial]
+        while True:
+            chunk = self._file.read(self.chunk_size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        data = b"".join(chunks)
+
+        end = data.rfind(b"\n") + 1
+        self._partial = data[end:]
+        self.offset = self._file.tell() - len(self._partial)
+        return [line for line in data[:end].split(b"\n") if line.strip()]
+
+    def commit(self):
+        """Persist the offset of the last complete line read."""
+        state = {"inode": self._inode, "offset": self.offset}
+        tmp = self.offset_file.with_name(self.offset_file.name + ".tmp")
+        try:
+            with open(tmp, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.offset_file)
+        except OSError as e:
+            logger.warning(f"Could not persist offset for {self.path}: {e}")
+
+
+class AlertsFileHandler(FileSystemEventHandler):
+    """Wakes the coordinator when the alerts file changes."""
+
+    def __init__(self, path: Path, loop: asyncio.AbstractEventLoop, wakeup: asyncio.Event):
+        self.path = str(path.resolve())
+        self.loop = loop
+        self.wakeup = wakeup
+
+    def on_any_event(self, event):
+        paths = {os.path.abspath(event.src_path), os.path.abspath(getattr(event, 'dest_path', '') or '')}
+        if self.path in paths:
+            self.loop.call_soon_threadsafe(self.wakeup.set)
+
 class EventDrivenCoordinator:
     """
     Real-time event-driven coordination system.
     Processes events from accountability system and triggers appropriate responses.
     """
 
-    def __init__(self, alerts_file: str = "coordination_alerts.json"):
+    def __init__(self, alerts_file: str = "coordination_alerts.json", fallback_poll_interval: float = 0.5):
         self.alerts_file = Path(alerts_file)
-        self.processed_events: Set[str] = set()
-        self.last_file_size = 0
+        self.follower = LogFollower(self.alerts_file)
+        self.fallback_poll_interval = fallback_poll_interval
+        self.observer = None
+        self._wakeup: Optional[asyncio.Event] = None
         self.running = False
         self.start_time = datetime.now()
 
@@ -72,21 +201,23 @@ class EventDrivenCoordinator:
         if not self.alerts_file.exists():
             logger.warning(f"Creating alerts file: {self.alerts_file}")
             self.alerts_file.touch()
-            self.last_file_size = 0
-        else:
-            self.last_file_size = self.alerts_file.stat().st_size
-            logger.info(f"📊 Initial file size: {self.last_file_size} bytes")
 
-        self.running = True
+        self.follower.open()
+        logger.info(f"📊 Resuming at byte offset {self.follower.offset}")
 
-        # Process any existing events first
-        await self._process_existing_events()
+        self.running = True
+        self._wakeup = asyncio.Event()
+        poll_interval = self._start_watcher()
 
-        # Start main monitoring loop
+        # Events written while stopped are picked up by the first check
         try:
             while self.running:
                 await self._check_for_new_events()
-                await asyncio.sleep(0.5)  # Check every 500ms for responsiveness
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
 
         except KeyboardInterrupt:
             logger.info("🛑 Coordinator stopped by user")
@@ -100,9 +231,36 @@ class EventDrivenCoordinator:
     def stop(self):
         """Stop the coordinator."""
         self.running = False
+        self.wake()
+
+    def wake(self):
+        """Check the alerts file now instead of waiting for the next wakeup."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _start_watcher(self) -> float:
+        """Watch the alerts file for changes; returns the safety poll interval."""
+        if Observer is None:
+            logger.info(f"📡 watchdog not installed, polling every {self.fallback_poll_interval}s")
+            return self.fallback_poll_interval
+
+        handler = AlertsFileHandler(self.alerts_file, asyncio.get_running_loop(), self._wakeup)
+        self.observer = Observer()
+        self.observer.schedule(handler, str(self.alerts_file.resolve().parent), recursive=False)
+        self.observer.start()
+        logger.info("📡 Watching alerts file for changes")
+        # Filesystem events drive processing; the timeout only guards against missed events
+        return max(self.fallback_poll_interval, 5.0)
 
     async def _shutdown(self):
         """Clean shutdown with statistics."""
+        if self.observer:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+        self.follower.commit()
+        self.follower.close()
+
         uptime = datetime.now() - self.start_time
         logger.info("📊 Event-Driven Coordinator Statistics:")
         logger.info(f"   Uptime: {uptime}")
@@ -113,74 +271,47 @@ class EventDrivenCoordinator:
         logger.info(f"   Errors: {self.stats['errors_encountered']}")
         logger.info("✅ Coordinator shutdown complete")
 
-    async def _process_existing_events(self):
-        """Process any existing events in the file."""
-        if not self.alerts_file.exists() or self.alerts_file.stat().st_size == 0:
-            return
-
-        logger.info("🔍 Processing existing events...")
-
-        try:
-            with open(self.alerts_file, 'r') as f:
-                content = f.read()
-
-            events = self._parse_events_from_content(content)
-            logger.info(f"📋 Found {len(events)} existing events")
-
-            for event in events:
-                await self._process_event(event)
-
-        except Exception as e:
-            logger.error(f"Error processing existing events: {e}")
-            self.stats["errors_encountered"] += 1
-
     async def _check_for_new_events(self):
-        """Check for new events in the alerts file."""
+        """Process events appended to the alerts file since the last check."""
         try:
-            if not self.alerts_file.exists():
+            lines = self.follower.read_lines()
+            if not lines:
                 return
 
-            current_size = self.alerts_file.stat().st_size
-            if current_size <= self.last_file_size:
-                return  # No new content
-
-            # Read new content only
-            with open(self.alerts_file, 'r') as f:
-                f.seek(self.last_file_size)
-                new_content = f.read()
+            events = self._parse_event_lines(lines)
+            logger.info(f"📨 {len(events)} new event(s) detected")
 
-            if new_content.strip():
-                events = self._parse_events_from_content(new_content)
-                logger.info(f"📨 {len(events)} new event(s) detected")
-
-                for event in events:
+            # read_lines has already moved past these lines, so one failing
+            # event must not drop the rest of the batch
+            for event in events:
+                try:
                     await self._process_event(event)
+                except Exception as e:
+                    logger.error(f"Error processing event {event.get('type', 'UNKNOWN')}: {e}")
+                    self.stats["errors_encountered"] += 1
 
-            self.last_file_size = current_size
+            # Persist the position once the batch is handled
+            self.follower.commit()
 
         except Exception as e:
             logger.error(f"Error checking for new events: {e}")
             self.stats["errors_encountered"] += 1
 
-    def _parse_events_from_content(self, content: str) -> List[Dict[str, Any]]:
-        """Parse events from file content (one JSON object per line)."""
+    def _parse_event_lines(self, lines: List[bytes]) -> List[Dict[str, Any]]:
+        """Parse events from complete lines (one JSON object per line)."""
         events = []
-        for line in content.strip().split('\n'):
-            if line.strip():
-                try:
-                    event = json.loads(line.strip())
-                    event_id = self._get_event_id(event)
-                    if event_id not in self.processed_events:
-                        events.append(event)
-                        self.processed_events.add(event_id)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to parse event line: {line[:100]}... - {e}")
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                logger.warning(f"Failed to parse event line: {line[:100]!r}... - {e}")
+                continue
+            if not isinstance(event, dict):
+                logger.warning(f"Ignoring non-object event line: {line[:100]!r}")
+                continue
+            events.append(event)
         return events
 
-    def _get_event_id(self, event: Dict[str, Any]) -> str:
-        """Generate unique event ID to prevent duplicate processing."""
-        return f"{event.get('type', 'unknown')}_{event.get('timestamp', '')}_{event.get('task_id', '')}"
-
     async def _process_event(self, event: Dict[str, Any]):
         """Process a single coordination event."""
         event_type = event.get('type', 'UNKNOWN')
@@ -475,8 +606,8 @@ class EventDrivenCoordinator:
             "running": self.running,
             "uptime_seconds": uptime.total_seconds(),
             "alerts_file": str(self.alerts_file),
-            "file_size": self.last_file_size,
-            "processed_events": len(self.processed_events),
+            "offset": self.follower.offset,
+            "rotations": self.follower.rotations,
             "statistics": self.stats,
             "last_check": datetime.now().isoformat()
         }
@@ -519,6 +650,7 @@ async def main():
     coordinator = EventDrivenCoordinator(args.alerts_file)
 
     if args.status:
+        coordinator.follower.open()
         status = coordinator.get_status()
         print("📊 Event-Driven Coordinator Status:")
         for key, value in status.items():
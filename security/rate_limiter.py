@@ -21,6 +21,7 @@ import threading
 from concurrent.futures import ThreadPoolExecutor
 
 from config.auth_models import Permission
+from metrics_registry import REGISTRY, MetricsRegistry
 
 
 logger = logging.getLogger(__name__)
@@ -250,7 +251,8 @@ class RateLimiter:
     - Performance optimized with minimal overhead
     """
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 metrics_registry: Optional[MetricsRegistry] = None):
         """Initialize rate limiter."""
         self.config = config or self._get_default_config()
         
@@ -268,6 +270,19 @@ class RateLimiter:
         self.alert_callbacks: List[callable] = []
         self.metrics: Dict[str, Any] = defaultdict(int)
         
+        # Registry metrics, shared by every rate limiter in the process
+        self.metrics_registry = metrics_registry if metrics_registry is not None else REGISTRY
+        self._checks_metric = self.metrics_registry.counter(
+            "rate_limit_checks", "Rate limit checks by result", ["result"]
+        )
+        self._violations_metric = self.metrics_registry.counter(
+            "rate_limit_violations", "Rate limit violations by rule and severity", ["rule", "severity"]
+        )
+        self._check_duration_metric = self.metrics_registry.histogram(
+            "rate_limit_check_duration_seconds", "Time spent checking rate limits",
+            buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+        )
+        
         # Thread safety
         self._lock = threading.RLock()
         self._cleanup_task = None
@@ -403,6 +418,7 @@ class RateLimiter:
             RateLimitStatus with decision and metadata
         """
         start_time = time.time()
+        result = "allowed"
         
         try:
             with self._lock:
@@ -433,6 +449,7 @@ class RateLimiter:
                     
                     if not allowed:
                         # Rate limit exceeded
+                        result = "limited"
                         violation = self._record_violation(rule, limiter_key, request_context)
                         
                         # Calculate retry after
@@ -466,6 +483,7 @@ class RateLimiter:
                 
         except Exception as e:
             logger.error(f"Rate limit check error: {e}")
+            result = "error"
             # Fail open for system stability
             return RateLimitStatus(
                 allowed=True,
@@ -480,6 +498,8 @@ class RateLimiter:
             self.check_times.append(check_time)
             self.metrics["total_checks"] += 1
             self.metrics["total_check_time_ms"] += check_time
+            self._checks_metric.labels(result).inc()
+            self._check_duration_metric.observe(check_time / 1000)
     
     def _get_applicable_rules(self, request_context: Dict[str, Any]) -> List[RateLimitConfig]:
         """Get applicable rules for request context, sorted by priority."""
@@ -583,6 +603,7 @@ class RateLimiter:
         
         self.violations.append(violation)
         self.violation_count += 1
+        self._violations_metric.labels(rule.name, violation.severity).inc()
         
         # Keep only recent violations
         if len(self.violations) > self.config.get("max_violations_stored", 10000):
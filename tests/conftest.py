@@ -43,6 +43,11 @@ except ImportError as e:
         pass
 
 
+def pytest_configure(config):
+    """Register custom markers used across the suite."""
+    config.addinivalue_line("markers", "performance: performance and overhead benchmarks")
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an instance of the default event loop for the test session."""
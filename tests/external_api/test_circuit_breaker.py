@@ -4,7 +4,7 @@ Tests for Circuit Breaker component.
 
 import pytest
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 pytestmark = pytest.mark.asyncio
 
@@ -102,7 +102,7 @@ class TestCircuitBreaker:
         assert circuit_breaker.state == CircuitBreakerState.OPEN
         
         # Manually set failure time to past to trigger recovery
-        circuit_breaker.last_failure_time = datetime.utcnow() - timedelta(
+        circuit_breaker.last_failure_time = datetime.now(timezone.utc) - timedelta(
             seconds=circuit_breaker.config.recovery_timeout + 1
         )
         
@@ -118,7 +118,7 @@ class TestCircuitBreaker:
         """Test circuit breaker closes from half-open on sufficient successes."""
         # Set to half-open state
         circuit_breaker.state = CircuitBreakerState.HALF_OPEN
-        circuit_breaker.state_changed_time = datetime.utcnow()
+        circuit_breaker.state_changed_time = datetime.now(timezone.utc)
         
         async def successful_function():
             return "success"
@@ -134,7 +134,7 @@ class TestCircuitBreaker:
         """Test circuit breaker reopens from half-open on failure."""
         # Set to half-open state
         circuit_breaker.state = CircuitBreakerState.HALF_OPEN
-        circuit_breaker.state_changed_time = datetime.utcnow()
+        circuit_breaker.state_changed_time = datetime.now(timezone.utc)
         
         async def failing_function():
             raise Exception("Still failing")
@@ -279,6 +279,140 @@ class TestCircuitBreaker:
         assert abs(circuit_breaker.metrics.success_rate - 66.67) < 0.1
 
 
+class TestCircuitBreakerWindow:
+    """Test suite for the sliding window, half-open probes and slow calls."""
+
+    async def test_window_counters_evict_oldest(self):
+        """Test window counters track only the last sliding_window_size calls."""
+        cb = CircuitBreaker("window", CircuitBreakerConfig(
+            sliding_window_size=4, minimum_requests=100, failure_threshold=100
+        ))
+
+        async def failing():
+            raise ValueError("down")
+
+        async def ok():
+            return "ok"
+
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                await cb.call(failing)
+        for _ in range(4):
+            await cb.call(ok)
+
+        status = await cb.get_status()
+        assert status["recent_window"]["size"] == 4
+        assert status["recent_window"]["failures"] == 0
+        assert [r.success for r in cb.request_history] == [True] * 4
+        assert cb.metrics.failed_requests == 3
+
+    async def test_half_open_admits_bounded_probes(self):
+        """Test half-open state admits at most half_open_max_requests concurrent probes."""
+        cb = CircuitBreaker("probes", CircuitBreakerConfig(half_open_max_requests=2, success_threshold=5))
+        cb.state = CircuitBreakerState.HALF_OPEN
+        release = asyncio.Event()
+
+        async def probe():
+            await release.wait()
+            return "ok"
+
+        in_flight = [asyncio.create_task(cb.call(probe)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitBreakerOpenError):
+            await cb.call(probe)
+
+        release.set()
+        assert await asyncio.gather(*in_flight) == ["ok", "ok"]
+        assert await cb.call(probe) == "ok"
+        assert cb.metrics.total_blocks == 1
+
+    async def test_slow_calls_open_circuit(self):
+        """Test circuit opens when the slow call rate crosses its threshold."""
+        cb = CircuitBreaker("slow", CircuitBreakerConfig(
+            sliding_window_size=4, minimum_requests=4,
+            slow_call_duration_ms=20, slow_call_rate_threshold=50.0
+        ))
+
+        async def slow():
+            await asyncio.sleep(0.03)
+            return "late"
+
+        async def fast():
+            return "quick"
+
+        await cb.call(fast)
+        await cb.call(fast)
+        await cb.call(slow)
+        assert cb.state == CircuitBreakerState.CLOSED
+        await cb.call(slow)
+
+        assert cb.state == CircuitBreakerState.OPEN
+        assert cb.metrics.slow_requests == 2
+        assert cb.metrics.failed_requests == 0
+
+    async def test_closed_calls_skip_state_lock(self):
+        """Test calls in the closed state do not contend on the state lock."""
+        cb = CircuitBreaker("fast-path")
+
+        async def ok():
+            return "ok"
+
+        async with cb._state_lock:
+            assert await asyncio.wait_for(cb.call(ok), 1) == "ok"
+
+    async def test_late_probes_do_not_release_new_slots(self):
+        """Test probes finishing after a state change leave the new half-open count alone."""
+        cb = CircuitBreaker("generations", CircuitBreakerConfig(half_open_max_requests=2, success_threshold=5))
+        cb.state = CircuitBreakerState.HALF_OPEN
+        release_stale, release_fresh = asyncio.Event(), asyncio.Event()
+
+        async def probe(release):
+            await release.wait()
+            return "ok"
+
+        stale = [asyncio.create_task(cb.call(probe, release_stale)) for _ in range(2)]
+        await asyncio.sleep(0)
+        await cb.force_open()
+        await cb._change_state(CircuitBreakerState.HALF_OPEN)
+        fresh = [asyncio.create_task(cb.call(probe, release_fresh)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert cb._half_open_in_flight == 2
+
+        release_stale.set()
+        await asyncio.gather(*stale)
+        assert cb._half_open_in_flight == 2
+        with pytest.raises(CircuitBreakerOpenError):
+            await cb.call(probe, release_fresh)
+
+        release_fresh.set()
+        await asyncio.gather(*fresh)
+        assert cb._half_open_in_flight == 0
+
+    async def test_history_keeps_errors_and_utc_times(self):
+        """Test request_history reports errors and success times are timezone-aware."""
+        cb = CircuitBreaker("history", CircuitBreakerConfig(failure_threshold=100, minimum_requests=100))
+
+        async def failing():
+            raise ValueError("down")
+
+        async def ok():
+            return "ok"
+
+        with pytest.raises(ValueError):
+            await cb.call(failing)
+        await cb.call(ok)
+
+        assert [(r.success, r.error) for r in cb.request_history] == [(False, "down"), (True, None)]
+        assert cb.metrics.last_success_time.tzinfo is not None
+
+        # Every timestamp the breaker reports is timezone-aware and comparable
+        assert all(r.timestamp.tzinfo is not None for r in cb.request_history)
+        timestamps = (await cb.get_status())["timestamps"]
+        parsed = [datetime.fromisoformat(value) for value in timestamps.values()]
+        assert all(ts.tzinfo is not None for ts in parsed)
+        assert max(parsed) >= min(parsed)
+
+
 class TestCircuitBreakerManager:
     """Test suite for CircuitBreakerManager class."""
 
@@ -0,0 +1,193 @@
+"""
+Tests for the shared health check scheduler.
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from external_api.health_scheduler import HealthCheckScheduler
+from external_api.load_balancer import HealthStatus, ServiceLoadBalancer
+from external_api.service_discovery import ServiceDiscovery, ServiceInstance, ServiceStatus
+
+
+def make_instance(index, health_check_url="http://localhost:9/health"):
+    return ServiceInstance(
+        service_id=f"svc-{index}",
+        service_name="svc",
+        host="localhost",
+        port=9000 + index,
+        metadata={},
+        health_check_url=health_check_url
+    )
+
+
+class CountingCheck:
+    """Probe recording call counts and peak concurrency."""
+
+    def __init__(self, delay=0.0, healthy=True):
+        self.delay = delay
+        self.healthy = healthy
+        self.calls = {}
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, instance):
+        self.calls[instance.service_id] = self.calls.get(instance.service_id, 0) + 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return self.healthy
+
+
+async def wait_until(predicate, timeout=5.0):
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+class TestHealthCheckScheduler:
+    """Scheduling, concurrency cap and subscriptions."""
+
+    @pytest.mark.asyncio
+    async def test_thousands_of_instances_with_one_task(self):
+        check = CountingCheck(delay=0.01)
+        scheduler = HealthCheckScheduler(
+            {"health_check_interval": 60, "max_concurrent_health_checks": 50}, check=check
+        )
+        results = {}
+
+        async def record(instance, is_healthy):
+            results[instance.service_id] = is_healthy
+
+        for index in range(2000):
+            scheduler.subscribe(make_instance(index), "test", record)
+
+        tasks_before = len(asyncio.all_tasks())
+        await scheduler.start()
+        await wait_until(lambda: len(results) == 2000)
+
+        assert set(check.calls.values()) == {1}
+        assert check.peak <= 50
+        assert scheduler.stats["max_in_flight"] <= 50
+        assert len(asyncio.all_tasks()) <= tasks_before + 1
+        assert all(results.values())
+
+        await scheduler.stop()
+        assert not scheduler.running
+
+    @pytest.mark.asyncio
+    async def test_jittered_rescheduling(self):
+        check = CountingCheck()
+        scheduler = HealthCheckScheduler(
+            {"health_check_interval": 0.1, "health_check_jitter": 0.5}, check=check
+        )
+
+        async def ignore(instance, is_healthy):
+            pass
+
+        for index in range(20):
+            scheduler.subscribe(make_instance(index), "test", ignore)
+        await scheduler.start()
+        await asyncio.sleep(0.5)
+        await scheduler.stop()
+
+        # Interval 0.1s +/- 50%: each instance runs 1 + 3..10 checks in 0.5s
+        assert all(4 <= calls <= 11 for calls in check.calls.values())
+        assert len(set(check.calls.values())) > 1
+        samples = [scheduler._jittered(1.0) for _ in range(1000)]
+        assert 0.5 <= min(samples) < 0.6 and 1.4 < max(samples) <= 1.5
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_stops_checks(self):
+        check = CountingCheck()
+        scheduler = HealthCheckScheduler({"health_check_interval": 0.05}, check=check)
+
+        async def ignore(instance, is_healthy):
+            pass
+
+        instance = make_instance(1)
+        scheduler.subscribe(instance, "a", ignore)
+        scheduler.subscribe(instance, "b", ignore)
+        await scheduler.start()
+        await wait_until(lambda: check.calls.get("svc-1", 0) >= 2)
+
+        scheduler.unsubscribe("svc-1", "a")
+        assert scheduler.subscribers("svc-1") == {"b"}
+        scheduler.unsubscribe("svc-1", "b")
+        assert "svc-1" not in scheduler
+        calls = check.calls["svc-1"]
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+
+        assert check.calls["svc-1"] <= calls + 1
+
+    @pytest.mark.asyncio
+    async def test_pooled_http_probe(self):
+        async def ok(request):
+            return web.Response(text="ok")
+
+        async def broken(request):
+            return web.Response(status=503)
+
+        app = web.Application()
+        app.router.add_get("/ok", ok)
+        app.router.add_get("/broken", broken)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        scheduler = HealthCheckScheduler({"max_concurrent_health_checks": 4})
+        await scheduler.start()
+        try:
+            healthy = make_instance(1, f"http://127.0.0.1:{port}/ok")
+            unhealthy = make_instance(2, f"http://127.0.0.1:{port}/broken")
+
+            assert await scheduler.probe(healthy) is True
+            session = scheduler._session
+            assert await scheduler.probe(unhealthy) is False
+            assert await scheduler.probe(make_instance(3, health_check_url=None)) is True
+            assert scheduler._session is session
+            assert session.connector.limit == 4
+        finally:
+            await scheduler.stop()
+            await runner.cleanup()
+
+        assert session.closed
+
+
+class TestResultFanOut:
+    """Discovery and load balancer share one probe per instance."""
+
+    @pytest.mark.asyncio
+    async def test_one_probe_updates_both(self):
+        check = CountingCheck(healthy=False)
+        scheduler = HealthCheckScheduler({"health_check_interval": 60}, check=check)
+        discovery = ServiceDiscovery({"health_check_interval": 60}, health_scheduler=scheduler)
+        balancer = ServiceLoadBalancer(discovery, {"health_check_interval": 60})
+
+        instance = make_instance(1)
+        await discovery.register_service(instance)
+        await balancer.add_instance(instance)
+        await discovery.start()
+        await balancer.start()
+
+        await wait_until(lambda: balancer.instances["svc-1"].last_health_check is not None)
+
+        assert check.calls == {"svc-1": 1}
+        assert await discovery.get_service_status("svc-1") == ServiceStatus.UNHEALTHY
+        assert balancer.instances["svc-1"].health_status == HealthStatus.UNHEALTHY
+
+        # The load balancer keeps the shared scheduler alive after discovery stops
+        await discovery.stop()
+        assert scheduler.running
+        await balancer.stop()
+        assert not scheduler.running
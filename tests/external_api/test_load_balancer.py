@@ -403,13 +403,15 @@ class TestServiceLoadBalancer:
         await load_balancer.start()
         assert load_balancer._running is True
         
-        # Verify health check task was created
-        assert sample_service_instance_1.service_id in load_balancer._health_check_tasks
+        # Verify the instance was subscribed to health checks
+        scheduler = load_balancer.health_scheduler
+        assert "load_balancer" in scheduler.subscribers(sample_service_instance_1.service_id)
         
         # Stop load balancer
         await load_balancer.stop()
         assert load_balancer._running is False
-        assert len(load_balancer._health_check_tasks) == 0
+        assert not scheduler.subscribers(sample_service_instance_1.service_id)
+        assert not scheduler.running
 
     async def test_circuit_breaker_recovery(self, load_balancer, sample_service_instance_1):
         """Test circuit breaker recovery after timeout."""
@@ -5,6 +5,8 @@ Tests for Monitoring System component.
 import pytest
 import asyncio
 import json
+import random
+import tracemalloc
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 
@@ -14,8 +16,10 @@ from external_api.monitoring_system import (
     MetricType,
     Alert,
     AlertRule,
-    AlertSeverity
+    AlertSeverity,
+    MetricSeries
 )
+from metrics_registry import MetricsRegistry
 
 
 class TestMonitoringSystem:
@@ -334,6 +338,30 @@ class TestMonitoringSystem:
         assert "test_metric 42.0" in lines
         assert "another_metric 100.0" in lines
 
+    @pytest.mark.asyncio
+    async def test_export_metrics_prometheus_types(self):
+        """Test counters, gauges and timers are typed and exposed through the registry."""
+        registry = MetricsRegistry()
+        monitoring = MonitoringSystem({"system_metrics": False}, metrics_registry=registry)
+        monitoring.increment_counter("api.requests")
+        monitoring.increment_counter("api.requests", 2)
+        monitoring.set_gauge("queue.depth", 5)
+        monitoring.set_gauge("queue.depth", 3)
+        monitoring.record_timer("api.latency", 10.0)
+        monitoring.record_timer("api.latency", 30.0)
+
+        lines = monitoring.export_metrics("prometheus").split("\n")
+        assert "# TYPE api_requests_total counter" in lines
+        assert "api_requests_total 3.0" in lines
+        assert "# TYPE queue_depth gauge" in lines
+        assert "queue_depth 3.0" in lines
+        assert "# TYPE api_latency summary" in lines
+        assert "api_latency_count 2.0" in lines
+        assert "api_latency_sum 40.0" in lines
+
+        assert monitoring.export_metrics("openmetrics").endswith("# EOF\n")
+        assert "queue_depth 3.0" in registry.render()
+
     async def test_export_metrics_invalid_format(self, monitoring_system):
         """Test exporting metrics with invalid format."""
         with pytest.raises(ValueError, match="Unsupported export format"):
@@ -457,3 +485,120 @@ class TestMonitoringSystem:
 
         # Check old metrics are removed
         assert len(monitoring_system.metrics["test.metric"]) == 0
+
+
+class TestMetricSeries:
+    """Test suite for the ring-buffer metric store."""
+
+    def test_ring_keeps_newest_samples(self):
+        """Test that a full ring overwrites the oldest samples."""
+        series = MetricSeries("test.metric", capacity=100)
+        for i in range(250):
+            series.append(float(i), MetricType.GAUGE, {}, 1000.0 + i)
+
+        assert len(series) == 100
+        assert series.total == 250
+        assert series[0].value == 150.0
+        assert series[-1].value == 249.0
+        assert [m.value for m in series] == [float(i) for i in range(150, 250)]
+
+    def test_time_range_matches_linear_scan(self):
+        """Test binary-search range queries against a full scan."""
+        rng = random.Random(7)
+        series = MetricSeries("test.metric", capacity=500)
+        timestamp = 1000.0
+        recorded = []
+        for i in range(1200):
+            timestamp += rng.choice([0.0, 0.5, 1.0, 2.0])
+            series.append(float(i), MetricType.GAUGE, {}, timestamp)
+            recorded.append((timestamp, float(i)))
+        kept = recorded[-500:]
+
+        for _ in range(50):
+            start = rng.uniform(kept[0][0] - 10, timestamp)
+            end = start + rng.uniform(0, 100)
+            expected = [value for ts, value in kept if start <= ts <= end]
+            assert [m.value for m in series.samples(start, end)] == expected
+
+    def test_rollups_and_trim(self):
+        """Test that rollup buckets summarize samples and outlive trimming."""
+        series = MetricSeries("test.metric", capacity=1000, rollup_interval=60)
+        for i in range(180):
+            series.append(float(i % 60), MetricType.TIMER, {"route": "/a"}, 6000.0 + i)
+
+        buckets = series.rollups()
+        assert [b["count"] for b in buckets] == [60, 60, 60]
+        assert buckets[0]["min"] == 0.0 and buckets[0]["max"] == 59.0
+        assert buckets[0]["avg"] == 29.5
+        assert len(series.rollups(start_time=6100.0)) == 2
+
+        assert series.trim_before(6120.0) == 120
+        assert len(series) == 60
+        assert series[0].tags == {"route": "/a"}
+        assert len(series.rollups()) == 3
+
+    def test_recording_does_not_allocate(self):
+        """Test that recording into a full ring holds no extra memory."""
+        monitoring = MonitoringSystem({"series_capacity": 1000})
+        for i in range(2000):
+            monitoring.record_metric("test.metric", float(i))
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for i in range(20000):
+                monitoring.record_metric("test.metric", float(i))
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        assert after - before < 4096
+        assert len(monitoring.metrics["test.metric"]) == 1000
+
+
+class TestBatchedAlerts:
+    """Test suite for periodic alert evaluation."""
+
+    @pytest.fixture
+    def monitoring_system(self):
+        monitoring = MonitoringSystem({"system_metrics": False})
+        monitoring.add_alert_rule(AlertRule(
+            name="Slow",
+            metric_name="api.latency",
+            threshold=100.0,
+            comparison="gt",
+            severity=AlertSeverity.HIGH,
+            component="api",
+            cooldown_minutes=0
+        ))
+        return monitoring
+
+    @pytest.mark.asyncio
+    async def test_one_alert_per_pass_without_tasks(self, monitoring_system):
+        """Test that samples are evaluated together without a task per sample."""
+        tasks_before = len(asyncio.all_tasks())
+        for i in range(1000):
+            monitoring_system.record_metric("api.latency", 50.0 + (i == 500) * 200.0 + (i == 700) * 100.0)
+        assert len(asyncio.all_tasks()) == tasks_before
+
+        alerts = await monitoring_system._evaluate_alerts()
+        assert len(alerts) == 1
+        assert alerts[0].current_value == 250.0
+
+        # Only samples recorded since the last pass are evaluated
+        assert await monitoring_system._evaluate_alerts() == []
+        monitoring_system.record_metric("api.latency", 20.0)
+        assert await monitoring_system._evaluate_alerts() == []
+        monitoring_system.record_metric("api.latency", 120.0)
+        assert len(await monitoring_system._evaluate_alerts()) == 1
+
+    @pytest.mark.asyncio
+    async def test_cooldown_suppresses_repeat_alerts(self, monitoring_system):
+        """Test that a rule in cooldown does not alert again."""
+        monitoring_system.alert_rules["Slow"].cooldown_minutes = 5
+        monitoring_system.record_metric("api.latency", 300.0)
+        assert len(await monitoring_system._evaluate_alerts()) == 1
+
+        monitoring_system.record_metric("api.latency", 400.0)
+        assert await monitoring_system._evaluate_alerts() == []
+        assert len(monitoring_system.get_active_alerts()) == 1
@@ -262,8 +262,8 @@ class TestServiceDiscovery:
         # Register service with health check
         await service_discovery.register_service(sample_service_instance)
 
-        # Check that health check task is created
-        assert sample_service_instance.service_id in service_discovery._health_check_tasks
+        # Check that the instance is scheduled for health checks
+        assert sample_service_instance.service_id in service_discovery.health_scheduler
 
         # Wait a bit for health check to run
         await asyncio.sleep(0.1)
@@ -5,6 +5,7 @@ Tests for Service Registry component.
 import pytest
 import asyncio
 import os
+import sqlite3
 import tempfile
 from datetime import datetime, timedelta
 
@@ -552,4 +553,168 @@ class TestPersistentServiceRegistry:
         result = await service_registry.register_service(instance)
         assert result is True
         
-        await service_registry.stop()
\ No newline at end of file
+        await service_registry.stop()
+
+class TestRegistryJournal:
+    """Test suite for journaled persistence."""
+
+    @pytest.fixture
+    def journal_config(self, tmp_path):
+        """Create configuration with database and journal in a temp directory."""
+        return ServiceRegistryConfig(
+            database_path=str(tmp_path / "registry.db"),
+            enable_circuit_breakers=False,
+            journal_fsync=False
+        )
+
+    @staticmethod
+    def make_instance(index):
+        return ServiceInstance(
+            service_id=f"svc-{index:04d}",
+            service_name=f"service-{index % 3}",
+            host="10.0.0.1",
+            port=8000 + index,
+            metadata={"index": index}
+        )
+
+    @staticmethod
+    async def crash(registry):
+        """Stop background work without the final snapshot."""
+        registry._running = False
+        for task in [registry._cleanup_task, registry._backup_task]:
+            task.cancel()
+        await registry.journal.stop()
+        registry.db_connection.close()
+        registry._db_executor.shutdown()
+
+    async def test_recovery_replays_journal_tail(self, journal_config):
+        """Changes since the last snapshot are recovered from the journal."""
+        registry = PersistentServiceRegistry(journal_config)
+        await registry.start()
+        await registry.register_service(self.make_instance(1), dependencies=["svc-0002"])
+        await registry._backup_to_database()
+
+        await registry.register_service(self.make_instance(2))
+        await registry.register_service(self.make_instance(3))
+        await registry.update_service("svc-0002", {"tags": ["canary"]})
+        await registry.deregister_service("svc-0003")
+        await self.crash(registry)
+
+        recovered = PersistentServiceRegistry(journal_config)
+        await recovered.start()
+
+        assert set(recovered.services) == {"svc-0001", "svc-0002"}
+        assert recovered.services["svc-0002"].instance.tags == ["canary"]
+        assert recovered.service_dependencies["svc-0001"] == {"svc-0002"}
+
+        # Events from the journal tail reach the database with the next snapshot
+        await recovered.stop()
+        with sqlite3.connect(journal_config.database_path) as conn:
+            event_types = [row[0] for row in conn.execute("SELECT event_type FROM service_events")]
+        assert event_types.count("registered") == 3
+        assert event_types.count("deregistered") == 1
+
+    async def test_group_commit_batches_concurrent_writes(self, journal_config):
+        """A registration storm is committed in far fewer writes than records."""
+        registry = PersistentServiceRegistry(journal_config)
+        await registry.start()
+
+        results = await asyncio.gather(*[
+            registry.register_service(self.make_instance(i)) for i in range(200)
+        ])
+
+        assert all(results)
+        stats = registry.journal.stats
+        assert stats["records"] == 400  # One registration and one event each
+        assert stats["batches"] < stats["records"] / 4
+        await registry.stop()
+
+    async def test_compaction_after_snapshot(self, journal_config):
+        """The journal is compacted once a snapshot covers it."""
+        journal_config.journal_compact_bytes = 4096
+        registry = PersistentServiceRegistry(journal_config)
+        await registry.start()
+
+        for i in range(50):
+            await registry.register_service(self.make_instance(i))
+        await asyncio.gather(registry._snapshot_task, return_exceptions=True)
+
+        assert registry.metrics["snapshot_count"] >= 1
+        assert registry.journal.stats["compactions"] >= 1
+        assert registry.journal.size < 4096 + 2048
+        await registry.stop()
+
+        assert os.path.getsize(registry.journal_path) == 0
+        recovered = PersistentServiceRegistry(journal_config)
+        await recovered.start()
+        assert len(recovered.services) == 50
+        assert len(await recovered.discover_services("service-1")) == 17
+        await recovered.stop()
+
+    async def test_torn_tail_is_discarded(self, journal_config):
+        """A partial record left by a crash is cut off on recovery."""
+        registry = PersistentServiceRegistry(journal_config)
+        await registry.start()
+        await registry.register_service(self.make_instance(1))
+        await self.crash(registry)
+
+        with open(registry.journal_path, "a") as f:
+            f.write('{"op":"put","seq":99,"serv')
+
+        recovered = PersistentServiceRegistry(journal_config)
+        await recovered.start()
+        assert set(recovered.services) == {"svc-0001"}
+        await recovered.register_service(self.make_instance(2))
+        await self.crash(recovered)
+
+        again = PersistentServiceRegistry(journal_config)
+        await again.start()
+        assert set(again.services) == {"svc-0001", "svc-0002"}
+        await again.stop()
+
+    async def test_writes_after_journal_stop_return(self, journal_config):
+        """Changes made once the journal is closed fail fast instead of hanging."""
+        registry = PersistentServiceRegistry(journal_config)
+        await registry.start()
+        await registry.register_service(self.make_instance(1))
+        await registry.journal.stop()
+
+        assert await asyncio.wait_for(registry.journal.append({"op": "noop"}), timeout=1) is False
+        await asyncio.wait_for(registry.register_service(self.make_instance(2)), timeout=1)
+        await asyncio.wait_for(registry.deregister_service("svc-0001"), timeout=1)
+
+        await registry.stop()
+        assert registry.journal is None
+
+    async def test_failed_compaction_keeps_journal_writable(self, journal_config, monkeypatch):
+        """A rewrite that fails leaves the journal open for later records."""
+        registry = PersistentServiceRegistry(journal_config)
+        await registry.start()
+        await registry.register_service(self.make_instance(1))
+
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+
+        with monkeypatch.context() as patch:
+            patch.setattr("external_api.service_registry.os.replace", fail_replace)
+            with pytest.raises(OSError):
+                await registry.journal.truncate_through(registry.journal.last_seq)
+        assert not os.path.exists(f"{registry.journal_path}.tmp")
+
+        await registry.register_service(self.make_instance(2))
+        await self.crash(registry)
+
+        recovered = PersistentServiceRegistry(journal_config)
+        await recovered.start()
+        assert set(recovered.services) == {"svc-0001", "svc-0002"}
+        await recovered.stop()
+
+    async def test_indexes_created(self, journal_config):
+        """Service name and event timestamp lookups are indexed."""
+        registry = PersistentServiceRegistry(journal_config)
+        await registry.start()
+        await registry.stop()
+
+        with sqlite3.connect(journal_config.database_path) as conn:
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_services_name", "idx_events_timestamp"} <= indexes
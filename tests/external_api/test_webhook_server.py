@@ -4,9 +4,15 @@ Tests for WebhookServer component.
 
 import pytest
 import asyncio
+import json
+import time
 from datetime import datetime
 
-from external_api.webhook_server import WebhookServer
+import pytest_asyncio
+
+pytestmark = pytest.mark.asyncio
+
+from external_api.webhook_server import IdempotencyIndex, WebhookServer
 from external_api.models import (
     WebhookConfig,
     WebhookEvent,
@@ -311,3 +317,277 @@ class TestWebhookServer:
                 source="",
                 payload={"data": "test"}
             )
+
+
+class TestWebhookIngestion:
+    """Test suite for queued ingestion of raw webhook bodies."""
+
+    @staticmethod
+    def body(event_type="task_created", **fields):
+        return json.dumps({"type": event_type, **fields}).encode()
+
+    async def test_ingest_acknowledges_before_handler_runs(self):
+        server = WebhookServer(WebhookConfig(worker_count=2))
+        release = asyncio.Event()
+        handled = []
+
+        async def handler(event):
+            await release.wait()
+            handled.append(event.event_id)
+            return {"ok": True}
+
+        server.register_handler("task_created", handler)
+        await server.start_server()
+
+        result = await server.ingest(self.body(), "10.0.0.1")
+        assert result["status"] == "accepted"
+        assert result["code"] == 202
+        delivery = server.get_delivery_status(result["webhook_id"])
+        assert delivery.status == "pending"
+        assert handled == []
+
+        release.set()
+        await server.stop_server()
+        assert handled == [result["event_id"]]
+        assert delivery.status == "success"
+        assert delivery.response_code == 200
+
+    async def test_ingest_rejects_before_parsing(self):
+        server = WebhookServer(WebhookConfig(max_payload_size=64))
+        await server.start_server()
+
+        # Oversized bodies are rejected on length alone, even if not JSON
+        assert (await server.ingest(b"{" * 100))["code"] == 413
+        assert (await server.ingest(b"not json"))["code"] == 400
+        assert (await server.ingest(b"[1, 2]"))["code"] == 400
+        assert (await server.ingest(self.body(priority="urgent")))["code"] == 400
+        assert (await server.ingest(self.body()))["code"] == 404
+        assert server.delivery_status == {}
+
+        await server.stop_server()
+
+    async def test_full_queue_sheds_load(self):
+        server = WebhookServer(WebhookConfig(queue_size=2, worker_count=1))
+        release = asyncio.Event()
+
+        async def handler(event):
+            await release.wait()
+
+        server.register_handler("task_created", handler)
+        await server.start_server()
+
+        codes = [(await server.ingest(self.body(), "10.0.0.1"))["code"] for _ in range(3)]
+        assert codes == [202, 202, 503]
+
+        # Once the worker takes an event there is room for one more
+        await asyncio.sleep(0)
+        codes = [(await server.ingest(self.body(), "10.0.0.1"))["code"] for _ in range(2)]
+        assert codes == [202, 503]
+        assert (await server.health_check())["queued_events"] == 2
+
+        release.set()
+        await server.stop_server()
+        assert all(d.status == "success" for d in server.delivery_status.values())
+
+    async def test_handler_failures_recorded_on_delivery(self):
+        server = WebhookServer(WebhookConfig())
+
+        async def handler(event):
+            raise ValueError("boom")
+
+        server.register_handler("task_created", handler)
+        await server.start_server()
+        result = await server.ingest(self.body())
+        await server.stop_server()
+
+        delivery = server.get_delivery_status(result["webhook_id"])
+        assert delivery.status == "failed"
+        assert delivery.response_code == 500
+        assert "boom" in delivery.error_message
+
+    async def test_sliding_window_rate_limit(self, monkeypatch):
+        server = WebhookServer(WebhookConfig(rate_limit_requests=10, rate_limit_window=60))
+        now = [6000.0]
+        monkeypatch.setattr("external_api.webhook_server.time.time", lambda: now[0])
+
+        assert all(server._check_rate_limit("1.1.1.1") for _ in range(10))
+        assert server._check_rate_limit("1.1.1.1") is False
+        assert server.rate_limiter["1.1.1.1"] == [100, 10, 0]
+
+        # Halfway through the next window half of the previous count still applies
+        now[0] = 6090.0
+        assert sum(server._check_rate_limit("1.1.1.1") for _ in range(10)) == 5
+        assert server.get_rate_limit_status()["active_clients"] == {"1.1.1.1": 10}
+
+        # IPs idle for two windows are swept
+        now[0] = 6300.0
+        server._check_rate_limit("2.2.2.2")
+        assert list(server.rate_limiter) == ["2.2.2.2"]
+
+    async def test_delivery_tracking_is_bounded(self, monkeypatch):
+        server = WebhookServer(WebhookConfig(max_tracked_deliveries=5, delivery_ttl_seconds=60,
+                                             rate_limit_requests=1000))
+        now = [1000.0]
+        monkeypatch.setattr("external_api.webhook_server.time.time", lambda: now[0])
+
+        async def handler(event):
+            return {}
+
+        server.register_handler("task_created", handler)
+        await server.start_server()
+        ids = [(await server.ingest(self.body()))["webhook_id"] for _ in range(8)]
+        assert list(server.delivery_status) == ids[-5:]
+
+        now[0] = 1061.0
+        latest = (await server.ingest(self.body()))["webhook_id"]
+        assert list(server.delivery_status) == [latest]
+        await server.stop_server()
+
+    @pytest.mark.performance
+    async def test_burst_acknowledged_in_sub_millisecond_time(self):
+        server = WebhookServer(WebhookConfig(rate_limit_requests=100000, queue_size=5000))
+
+        async def handler(event):
+            await asyncio.sleep(0.001)
+
+        server.register_handler("task_created", handler)
+        await server.start_server()
+
+        body = self.body(action="opened", repository={"full_name": "org/repo"}, sender={"login": "dev"})
+        start = time.perf_counter()
+        results = [await server.ingest(body, f"10.0.{i % 4}.1") for i in range(2000)]
+        per_ack_ms = (time.perf_counter() - start) * 1000 / len(results)
+
+        assert all(r["code"] == 202 for r in results)
+        assert per_ack_ms < 1.0
+        await server.stop_server()
+
+
+class TestWebhookIdempotency:
+    """Test suite for suppression of retried deliveries."""
+
+    @pytest_asyncio.fixture
+    async def server(self):
+        server = WebhookServer(WebhookConfig(rate_limit_requests=1000, dedupe_by_payload_digest=True))
+        self.handled = []
+
+        async def handler(event):
+            self.handled.append(event.payload["data"])
+            return {"processed": True}
+
+        server.register_handler("task_created", handler)
+        await server.start_server()
+        yield server
+        if server.server_started:
+            await server.stop_server()
+
+    @staticmethod
+    def body(data):
+        return json.dumps({"type": "task_created", "data": data}).encode()
+
+    async def test_retry_with_delivery_id_is_replayed(self, server):
+        first = await server.ingest(self.body("a"), headers={"X-GitHub-Delivery": "d-1"})
+        # Retries may differ in body (e.g. retry counters) but share the delivery id
+        retry = await server.ingest(self.body("a2"), headers={"x-github-delivery": "d-1"})
+        other = await server.ingest(self.body("a"), headers={"X-GitHub-Delivery": "d-2"})
+        await server.stop_server()
+
+        assert retry == {**first, "duplicate": True}
+        assert other["webhook_id"] != first["webhook_id"]
+        assert self.handled == ["a", "a"]
+        assert len(server.delivery_status) == 2
+        assert server.duplicates_suppressed == 1
+
+    async def test_identical_body_without_delivery_id(self, server):
+        first = await server.ingest(self.body("b"))
+        retry = await server.ingest(self.body("b"))
+        await server.stop_server()
+
+        assert retry["duplicate"] is True
+        assert retry["event_id"] == first["event_id"]
+        assert self.handled == ["b"]
+
+        server.config.dedupe_by_payload_digest = False
+        assert server._idempotency_key(self.body("b"), {}) is None
+
+    async def test_rejected_deliveries_stay_retryable(self):
+        server = WebhookServer(WebhookConfig())
+
+        async def handler(event):
+            return {}
+
+        server.register_handler("task_created", handler)
+
+        # Not running: 503, and the retry after startup is accepted
+        assert (await server.ingest(self.body("c")))["code"] == 503
+        await server.start_server()
+        result = await server.ingest(self.body("c"))
+        assert result["code"] == 202 and "duplicate" not in result
+        await server.stop_server()
+
+    async def test_handle_webhook_replays_only_successes(self, server):
+        calls = []
+
+        async def flaky(event):
+            calls.append(event.event_id)
+            if len(calls) == 1:
+                raise RuntimeError("transient")
+            return {"ok": True}
+
+        server.register_handler("task_created", flaky)
+        payload = {"type": "task_created", "data": "d"}
+
+        assert (await server.handle_webhook(payload))["code"] == 500
+        first = await server.handle_webhook(payload)
+        retry = await server.handle_webhook(payload)
+
+        assert first["code"] == 200
+        assert retry == {**first, "duplicate": True}
+        assert len(calls) == 2
+
+    async def test_concurrent_duplicate_is_suppressed_while_in_flight(self, server):
+        release = asyncio.Event()
+        calls = []
+
+        async def slow(event):
+            calls.append(event.event_id)
+            await release.wait()
+            return {"ok": True}
+
+        server.register_handler("task_created", slow)
+        headers = {"X-GitHub-Delivery": "d-3"}
+        first = asyncio.create_task(server.handle_webhook({"type": "task_created", "data": "e"}, headers=headers))
+        await asyncio.sleep(0)
+
+        concurrent = await server.handle_webhook({"type": "task_created", "data": "e"}, headers=headers)
+        assert concurrent["code"] == 409
+        assert (await server.ingest(self.body("e"), headers=headers))["code"] == 409
+
+        release.set()
+        first = await first
+        retry = await server.handle_webhook({"type": "task_created", "data": "e"}, headers=headers)
+        assert retry == {**first, "duplicate": True}
+        assert len(calls) == 1
+        assert server.duplicates_suppressed == 3
+
+    async def test_index_is_time_and_size_bounded(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("external_api.webhook_server.time.time", lambda: now[0])
+        index = IdempotencyIndex(ttl_seconds=60, max_entries=3)
+
+        for key in "abcd":
+            index.add(key, {"key": key})
+        assert len(index) == 3
+        assert index.get("a") is None
+        assert index.get("d") == {"key": "d"}
+
+        now[0] = 1061.0
+        assert index.get("d") is None
+        index.add("e", {"key": "e"})
+        assert len(index) == 1
+
+        assert index.reserve("f") and not index.reserve("f") and not index.reserve("e")
+        assert index.get("f") is None
+        index.release("e")
+        index.release("f")
+        assert index.reserve("f") and index.get("e") == {"key": "e"}
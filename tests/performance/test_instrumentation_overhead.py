@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Instrumentation overhead benchmarks for UnifiedPerformanceMonitor.
+
+Measures the per-call cost of wrapping an operation in track_operation
+against calling it uninstrumented, and verifies that the ring-buffer
+history and batched persistence behave correctly.
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from performance_monitor import (
+    ComponentType, MetricBatchWriter, MetricRingBuffer, PerformanceMetrics, UnifiedPerformanceMonitor
+)
+
+
+ITERATIONS = 20000
+
+
+def make_monitor(tmp_path, **overrides):
+    """Create a monitor writing to a temporary database."""
+    config = {
+        "db_path": str(tmp_path / "metrics.db"),
+        "enable_persistent_storage": True,
+        "flush_interval_seconds": 0.05,
+        "auto_optimization": False,
+    }
+    config.update(overrides)
+    return UnifiedPerformanceMonitor(config)
+
+
+def count_rows(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM performance_metrics").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestMetricRingBuffer:
+    """Ring buffer semantics."""
+
+    def test_overwrites_oldest_when_full(self):
+        ring = MetricRingBuffer(3)
+        for i in range(5):
+            ring.append(PerformanceMetrics(f"op{i}", ComponentType.SYSTEM, start_time=float(i)))
+
+        assert len(ring) == 3
+        assert [m.operation_name for m in ring] == ["op2", "op3", "op4"]
+        assert ring[-1].operation_name == "op4"
+        assert [m.operation_name for m in ring[-2:]] == ["op3", "op4"]
+
+    def test_drop_older_than(self):
+        ring = MetricRingBuffer(10)
+        for i in range(6):
+            ring.append(PerformanceMetrics(f"op{i}", ComponentType.SYSTEM, start_time=float(i)))
+
+        assert ring.drop_older_than(2.0) == 3
+        assert [m.operation_name for m in ring] == ["op3", "op4", "op5"]
+
+
+class TestBatchedPersistence:
+    """Batched writer and sampling behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_are_flushed_in_batches(self, tmp_path):
+        monitor = make_monitor(tmp_path)
+        for _ in range(250):
+            async with monitor.track_operation("batched_op", ComponentType.SYSTEM):
+                pass
+
+        await monitor.flush_metrics()
+        assert monitor._writer.written_count == 250
+        assert count_rows(monitor.db_path) == 250
+        assert len(monitor.component_metrics[ComponentType.SYSTEM]) == 250
+
+    def test_failed_batches_are_kept_for_retry(self, tmp_path):
+        writer = MetricBatchWriter(str(tmp_path), batch_size=10)
+        for i in range(25):
+            writer._pending.append(PerformanceMetrics(f"op{i}", ComponentType.SYSTEM, start_time=float(i)))
+
+        # A directory is not a database, so every write fails
+        assert writer.flush() == 0
+        assert writer.pending_count == 25
+
+        writer.db_path = str(tmp_path / "metrics.db")
+        writer._conn = None
+        conn = sqlite3.connect(writer.db_path)
+        conn.execute("CREATE TABLE performance_metrics (operation_name, component_type, start_time, end_time, "
+                     "duration, success, error_message, metadata, user_id, session_id, client_ip, "
+                     "performance_level, baseline_comparison, timestamp)")
+        conn.close()
+        assert writer.flush() == 25
+        assert [row[0] for row in sqlite3.connect(writer.db_path).execute(
+            "SELECT operation_name FROM performance_metrics ORDER BY rowid")] == [f"op{i}" for i in range(25)]
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_sampling_keeps_failures(self, tmp_path):
+        monitor = make_monitor(tmp_path, enable_persistent_storage=False)
+        monitor.set_sampling_rate("hot_op", 0.01)
+
+        for _ in range(1000):
+            async with monitor.track_operation("hot_op", ComponentType.SYSTEM):
+                pass
+        with pytest.raises(RuntimeError):
+            async with monitor.track_operation("hot_op", ComponentType.SYSTEM):
+                raise RuntimeError("boom")
+
+        recorded = list(monitor.metrics)
+        assert len(recorded) < 100
+        assert any(not m.success for m in recorded)
+
+
+@pytest.mark.performance
+class TestInstrumentationOverhead:
+    """Micro-benchmark of instrumented vs uninstrumented call cost."""
+
+    @pytest.mark.asyncio
+    async def test_track_operation_overhead(self, tmp_path):
+        # Keep the writer idle during the timed loop so only the caller's path
+        # is measured; aggregation and persistence happen when it flushes.
+        monitor = make_monitor(tmp_path, flush_interval_seconds=60.0, flush_batch_size=ITERATIONS + 1)
+
+        async def operation():
+            return None
+
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            await operation()
+        bare = (time.perf_counter() - start) / ITERATIONS
+
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            async with monitor.track_operation("bench_op", ComponentType.SYSTEM):
+                await operation()
+        instrumented = (time.perf_counter() - start) / ITERATIONS
+
+        overhead_us = (instrumented - bare) * 1_000_000
+        print(f"✅ Instrumentation overhead: {overhead_us:.2f}µs/call "
+              f"(bare {bare * 1_000_000:.2f}µs, instrumented {instrumented * 1_000_000:.2f}µs)")
+
+        await monitor.flush_metrics()
+        assert count_rows(monitor.db_path) == ITERATIONS
+        assert monitor.get_operation_stats("bench_op")["count"] == ITERATIONS
+        # A few microseconds per call, with some headroom for shared CI runners
+        assert overhead_us < 10, f"Instrumentation overhead {overhead_us:.2f}µs/call too high"
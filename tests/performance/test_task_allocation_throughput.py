@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Task queue benchmarks for IntelligentTaskAllocator.
+
+Verifies the ordering, removal and eviction rules of TaskPriorityQueue and
+the readiness tracking of TaskDependencyGraph, and measures submit and
+allocate throughput with 100k tasks queued.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from advanced_orchestration.models import (
+    AgentInfo, AgentMetadata, AgentRegistration, AgentStatus, ResourceRequirements
+)
+from intelligent_task_allocation import (
+    AllocationStrategy, IntelligentTask, IntelligentTaskAllocator, TaskComplexity,
+    TaskDependencyGraph, TaskPriority, TaskPriorityQueue
+)
+
+
+QUEUED_TASKS = 100_000
+
+
+def make_task(task_id, priority=TaskPriority.MEDIUM, deadline=None, **kwargs):
+    return IntelligentTask(
+        task_id=task_id,
+        task_type="processing",
+        priority=priority,
+        complexity=TaskComplexity.SIMPLE,
+        requirements=ResourceRequirements(),
+        deadline=deadline,
+        **kwargs
+    )
+
+
+def make_allocator(tmp_path, **overrides):
+    config = {"db_path": str(tmp_path / "task_allocation.db")}
+    config.update(overrides)
+    return IntelligentTaskAllocator(config)
+
+
+def make_agent(agent_id):
+    registration = AgentRegistration(
+        agent_id=agent_id,
+        capabilities=["processing"],
+        resource_requirements=ResourceRequirements(),
+        metadata=AgentMetadata(
+            agent_type="worker",
+            version="1.0.0",
+            startup_time=datetime.now(),
+            last_heartbeat=datetime.now(),
+            capabilities=["processing"],
+            resource_requirements=ResourceRequirements()
+        )
+    )
+    return AgentInfo(agent_id=agent_id, status=AgentStatus.HEALTHY, registration=registration)
+
+
+class TestTaskPriorityQueue:
+    """Ordering, lazy removal and eviction."""
+
+    def test_priority_then_deadline_then_fifo(self):
+        now = datetime.now()
+        queue = TaskPriorityQueue()
+        queue.push(make_task("low", TaskPriority.LOW))
+        queue.push(make_task("medium_first"))
+        queue.push(make_task("medium_late", deadline=now + timedelta(hours=2)))
+        queue.push(make_task("medium_soon", deadline=now + timedelta(hours=1)))
+        queue.push(make_task("medium_second"))
+        queue.push(make_task("critical", TaskPriority.CRITICAL))
+
+        expected = ["critical", "medium_soon", "medium_late", "medium_first", "medium_second", "low"]
+        assert [task.task_id for task in queue.ordered()] == expected
+        assert [task.task_id for task in queue.head(3)] == expected[:3]
+        assert queue[0].task_id == "critical"
+        assert [queue.pop().task_id for _ in range(len(queue))] == expected
+        with pytest.raises(IndexError):
+            queue.pop()
+
+    def test_remove_is_lazy_and_compacts(self):
+        queue = TaskPriorityQueue()
+        for i in range(1000):
+            queue.push(make_task(f"t{i}"))
+
+        for i in range(0, 1000, 2):
+            assert queue.remove(f"t{i}").task_id == f"t{i}"
+        assert queue.remove("t0") is None
+
+        assert len(queue) == 500 and "t1" in queue and "t0" not in queue
+        assert queue.peek().task_id == "t1"
+        assert len(queue._heap) <= 2 * len(queue) + 64
+
+    def test_evicts_lowest_ordered_task(self):
+        queue = TaskPriorityQueue(maxsize=3)
+        queue.push(make_task("high", TaskPriority.HIGH))
+        queue.push(make_task("low_first", TaskPriority.LOW))
+        queue.push(make_task("low_second", TaskPriority.LOW))
+
+        assert queue.push(make_task("urgent", TaskPriority.URGENT)).task_id == "low_second"
+        assert queue.push(make_task("low_third", TaskPriority.LOW)).task_id == "low_third"
+        assert [task.task_id for task in queue.ordered()] == ["urgent", "high", "low_first"]
+
+
+class TestDependencyReadiness:
+    """Blocked tasks wait in the dependency graph until their dependencies complete."""
+
+    def test_graph_counts_unmet_dependencies(self):
+        graph = TaskDependencyGraph()
+        assert graph.add(make_task("root"), completed=set())
+        assert not graph.add(make_task("join", dependencies=["a", "b", "b"]), completed=set())
+        assert not graph.add(make_task("after_a", dependencies=["a", "done"]), completed={"done"})
+        assert graph.unmet_dependencies("join") == 2 and len(graph) == 2
+
+        assert sorted(graph.complete("a")) == ["after_a"]
+        assert graph.complete("a") == []
+        assert graph.complete("b") == ["join"]
+        assert len(graph) == 0
+
+        blocked = make_task("blocked", dependencies=["x"])
+        graph.add(blocked, completed=set())
+        graph.discard(blocked)
+        assert graph.complete("x") == [] and not graph.is_blocked("blocked")
+
+    @pytest.mark.asyncio
+    async def test_dependents_become_ready_on_success(self, tmp_path):
+        allocator = make_allocator(tmp_path)
+        agents = [make_agent("agent_1"), make_agent("agent_2")]
+        requirements = ResourceRequirements()
+
+        first = await allocator.submit_task("processing", TaskPriority.LOW, TaskComplexity.SIMPLE, requirements)
+        second = await allocator.submit_task("processing", TaskPriority.CRITICAL, TaskComplexity.SIMPLE,
+                                             requirements, dependencies=[first.task_id])
+        retry = await allocator.submit_task("processing", TaskPriority.LOW, TaskComplexity.SIMPLE, requirements)
+        third = await allocator.submit_task("processing", TaskPriority.HIGH, TaskComplexity.SIMPLE,
+                                            requirements, dependencies=[retry.task_id])
+        assert len(allocator.task_queue) == 4 and len(allocator.ready_queue) == 2
+        assert await allocator.allocate_task(second, agents) is None
+
+        task, agent_id = await allocator.allocate_next(agents)
+        assert task is first
+
+        # A failed dependency keeps its dependents blocked
+        await allocator.complete_task(first.task_id, agent_id, False, 1.0, 0.5, {})
+        assert allocator.dependency_graph.is_blocked(second.task_id)
+
+        # The failing agent is blacklisted for similar tasks
+        task, retry_agent_id = await allocator.allocate_next(agents)
+        assert task is retry and retry_agent_id != agent_id
+        assert await allocator.allocate_next(agents) is None
+
+        await allocator.complete_task(retry.task_id, retry_agent_id, True, 1.0, 0.9, {})
+        task, third_agent_id = await allocator.allocate_next(agents)
+        assert task is third and third_agent_id != agent_id
+        assert allocator.get_allocation_summary()["blocked_tasks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unplaceable_task_does_not_block_the_queue(self, tmp_path):
+        allocator = make_allocator(tmp_path)
+        agents = [make_agent("agent_1")]
+        requirements = ResourceRequirements()
+
+        stuck = await allocator.submit_task("processing", TaskPriority.CRITICAL, TaskComplexity.SIMPLE,
+                                            requirements, context={"required_capabilities": ["gpu"]})
+        placeable = await allocator.submit_task("processing", TaskPriority.LOW, TaskComplexity.SIMPLE, requirements)
+
+        task, agent_id = await allocator.allocate_next(agents)
+        assert task is placeable and agent_id == "agent_1"
+        assert await allocator.allocate_next(agents) is None
+        assert allocator.ready_queue.peek() is stuck
+
+    @pytest.mark.performance
+    def test_layered_graph_tracks_in_linear_time(self):
+        width, depth = 1000, 50
+        layers = [[make_task(f"t{layer}_{i}", dependencies=[f"t{layer - 1}_{(i + j) % width}" for j in range(3)])
+                   for i in range(width)] for layer in range(1, depth)]
+        edges = sum(len(task.dependencies) for layer in layers for task in layer)
+
+        graph = TaskDependencyGraph()
+        completed = set()
+        start = time.perf_counter()
+        for layer in layers:
+            for task in layer:
+                graph.add(task, completed)
+        ready = 0
+        for i in range(width):
+            ready += len(graph.complete(f"t0_{i}"))
+        for layer in layers:
+            for task in layer:
+                ready += len(graph.complete(task.task_id))
+        elapsed_us = (time.perf_counter() - start) / edges * 1_000_000
+
+        print(f"✅ Dependency graph with {edges} edges: {elapsed_us:.2f}µs/edge")
+        assert ready == width * (depth - 1) and len(graph) == 0
+        assert elapsed_us < 20, f"Dependency tracking took {elapsed_us:.2f}µs/edge"
+
+
+@pytest.mark.performance
+class TestAllocationThroughput:
+    """Submit and allocate with a deep queue."""
+
+    @pytest.mark.asyncio
+    async def test_submit_and_allocate_at_100k_queued(self, tmp_path):
+        allocator = make_allocator(tmp_path, max_task_queue_size=QUEUED_TASKS)
+        priorities = list(TaskPriority)
+        requirements = ResourceRequirements()
+
+        start = time.perf_counter()
+        for i in range(QUEUED_TASKS):
+            await allocator.submit_task("processing", priorities[i % len(priorities)],
+                                        TaskComplexity.SIMPLE, requirements)
+        submit_us = (time.perf_counter() - start) / QUEUED_TASKS * 1_000_000
+
+        agents = [make_agent(f"agent_{i}") for i in range(100)]
+        allocations = 1000
+        start = time.perf_counter()
+        for _ in range(allocations):
+            task, agent_id = await allocator.allocate_next(agents, AllocationStrategy.ROUND_ROBIN)
+            assert task.priority == TaskPriority.CRITICAL
+        allocate_us = (time.perf_counter() - start) / allocations * 1_000_000
+
+        print(f"✅ Task queue at {QUEUED_TASKS} tasks: submit {submit_us:.1f}µs/task, "
+              f"allocate {allocate_us:.1f}µs/task")
+
+        assert len(allocator.task_queue) == QUEUED_TASKS - allocations
+        assert len(allocator.active_tasks) == allocations
+        # Generous bounds; the list-based queue took milliseconds per submit at this depth
+        assert submit_us < 200, f"Submit took {submit_us:.1f}µs/task"
+        assert allocate_us < 1000, f"Allocate took {allocate_us:.1f}µs/task"
@@ -0,0 +1,128 @@
+"""
+Tests for concurrent consensus and voting rounds in AgentCoordinationProtocols.
+
+Participants answer over an in-process transport with configurable delays,
+so round latency can be compared against per-participant latency.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from agent_coordination_protocols import (
+    AgentCoordinationProtocols, CoordinationSession, CoordinationStrategy
+)
+from agent_message_transport import InProcessHub, InProcessTransport
+
+
+class Participant(AgentCoordinationProtocols):
+    """Agent answering coordination requests after a fixed delay."""
+
+    def __init__(self, agent_id, hub, delay=0.0, support=True, vote=None):
+        super().__init__(agent_id, {"transport": InProcessTransport(hub)})
+        self.delay = delay
+        self.support = support
+        self.vote = vote
+
+    async def _evaluate_coordination_request(self, request_info):
+        await asyncio.sleep(self.delay)
+        response = {"support": self.support}
+        if self.vote is not None:
+            response["vote"] = self.vote
+        return response
+
+
+async def serve(agent):
+    while True:
+        await agent.process_messages(timeout=0.05)
+
+
+@pytest.fixture
+def network():
+    """Coordinator plus participants, each with a running message loop."""
+    hub = InProcessHub()
+    coordinator = Participant("coordinator", hub)
+    created = []
+
+    async def build(**participants):
+        agents = [coordinator] + [Participant(agent_id, hub, **options)
+                                  for agent_id, options in participants.items()]
+        for agent in agents:
+            await agent.receive_messages()
+        created.extend(asyncio.create_task(serve(agent)) for agent in agents)
+        coordinator.active_sessions["s1"] = CoordinationSession(
+            session_id="s1",
+            participants={agent.agent_id for agent in agents},
+            coordinator_id="coordinator",
+            strategy=CoordinationStrategy.CONSENSUS,
+            objective="test"
+        )
+        return coordinator
+
+    yield build
+
+    for task in created:
+        task.cancel()
+
+
+class TestConsensusRounds:
+    """Scatter-gather consensus rounds."""
+
+    @pytest.mark.asyncio
+    async def test_round_waits_for_slowest_not_sum(self, network):
+        coordinator = await network(**{f"p{i}": {"delay": 0.2} for i in range(5)})
+
+        start = time.perf_counter()
+        result = await coordinator.consensus_decision("s1", {"plan": "a"}, round_timeout=5.0)
+        elapsed = time.perf_counter() - start
+
+        assert result["consensus_reached"]
+        assert elapsed < 0.6
+        assert not coordinator.pending_responses
+
+    @pytest.mark.asyncio
+    async def test_quorum_ends_round_early(self, network):
+        coordinator = await network(
+            fast1={"delay": 0.0}, fast2={"delay": 0.0}, slow={"delay": 2.0}
+        )
+
+        start = time.perf_counter()
+        result = await coordinator.consensus_decision("s1", {"plan": "a"}, round_timeout=5.0, quorum=2)
+
+        assert result["consensus_reached"]
+        assert time.perf_counter() - start < 1.0
+        assert not coordinator.pending_responses
+
+    @pytest.mark.asyncio
+    async def test_round_deadline_bounds_latency(self, network):
+        coordinator = await network(fast={"delay": 0.0}, stuck={"delay": 10.0})
+
+        start = time.perf_counter()
+        result = await coordinator.consensus_decision(
+            "s1", {"plan": "a"}, max_rounds=2, round_timeout=0.3, quorum=2
+        )
+
+        assert not result["consensus_reached"]
+        assert time.perf_counter() - start < 1.5
+        assert not coordinator.pending_responses
+
+
+class TestVoting:
+    """Voting through the same scatter-gather primitive."""
+
+    @pytest.mark.asyncio
+    async def test_votes_gathered_concurrently(self, network):
+        coordinator = await network(
+            a={"delay": 0.2, "vote": {"option_id": "x"}},
+            b={"delay": 0.2, "vote": {"option_id": "x"}},
+            c={"delay": 0.2, "vote": {"option_id": "y"}}
+        )
+
+        start = time.perf_counter()
+        await coordinator.vote_on_decision("s1", [{"id": "x"}, {"id": "y"}], timeout=5.0)
+        elapsed = time.perf_counter() - start
+
+        decision = coordinator.active_sessions["s1"].decisions[-1]
+        assert sorted(vote["option_id"] for vote in decision["votes"]) == ["x", "x", "y"]
+        assert elapsed < 0.5
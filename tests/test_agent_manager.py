@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for agent discovery caching in the tmux agent manager.
+"""
+
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from scripts.agent_manager import AgentDiscoveryCache, TmuxAgentManager
+
+AGENT_CLAUDE = "# Agent Identity\nSpecialization: testing\n"
+
+
+def make_agent(base_dir, name):
+    worktree = base_dir / "worktrees" / name
+    worktree.mkdir(parents=True)
+    (worktree / "CLAUDE.md").write_text(AGENT_CLAUDE)
+    return worktree
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    AgentDiscoveryCache.clear_all()
+    make_agent(tmp_path, "pm-agent")
+    make_agent(tmp_path, "quality-agent")
+    yield tmp_path
+    AgentDiscoveryCache.clear_all()
+
+
+def bump_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestAgentDiscoveryCache:
+    """Discovery is served from cache until watched paths change."""
+
+    def test_repeated_listing_does_not_rescan(self, base_dir):
+        manager = TmuxAgentManager(base_dir=str(base_dir))
+        manager.discovery_cache.poll_interval = 0
+
+        assert set(manager.agents) == {"pm-agent", "quality-agent"}
+        with patch("scripts.agent_manager.subprocess.run") as run:
+            for _ in range(20):
+                assert len(manager.agents) == 2
+            run.assert_not_called()
+        assert manager.discovery_cache.scan_count == 1
+
+    def test_cache_is_shared_and_invalidated_by_changes(self, base_dir):
+        first = TmuxAgentManager(base_dir=str(base_dir))
+        second = TmuxAgentManager(base_dir=str(base_dir))
+        first.discovery_cache.poll_interval = 0
+        assert second.discovery_cache is first.discovery_cache
+
+        assert len(first.agents) == 2
+        new_worktree = make_agent(base_dir, "docs-agent")
+        bump_mtime(base_dir / "worktrees")
+        assert "docs-agent" in second.agents
+
+        assert first.discovery_cache.scan_count == 2
+
+        bump_mtime(new_worktree / "CLAUDE.md")
+        assert len(first.agents) == 3
+        assert first.discovery_cache.scan_count == 3
+
+    def test_claude_classification_is_memoized(self, base_dir):
+        manager = TmuxAgentManager(base_dir=str(base_dir))
+        claude_file = base_dir / "worktrees" / "pm-agent" / "CLAUDE.md"
+
+        assert manager._is_agent_specific_claude(claude_file)
+        with patch.object(manager, "_classify_claude_file") as classify:
+            assert manager._is_agent_specific_claude(claude_file)
+            classify.assert_not_called()
+
+        claude_file.write_text("LeanVibe Orchestrator\nRole: Orchestrator\n")
+        bump_mtime(claude_file)
+        assert not manager._is_agent_specific_claude(claude_file)
+
+    def test_window_status_uses_single_tmux_call(self, base_dir):
+        manager = TmuxAgentManager(base_dir=str(base_dir))
+        windows = "agent-pm-agent:1:*\nagent-quality-agent:0:-\nother:0:\n"
+
+        with patch.object(manager, "_tmux_command",
+                          return_value=subprocess.CompletedProcess([], 0, windows, "")) as tmux:
+            status = manager.list_agent_windows()
+
+        # has-session plus one list-windows
+        assert tmux.call_count == 2
+        assert status["pm-agent"]["status"] == "active:*"
+        assert status["quality-agent"]["exists"]
+        assert status["quality-agent"]["status"] == "inactive:-"
+
+    def test_dashboard_imports_outside_repo_root(self, tmp_path):
+        pytest.importorskip("fastapi")
+        dashboard_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dashboard")
+        code = f"import sys; sys.path.insert(0, {dashboard_dir!r}); import server; print(server.TmuxAgentManager.__name__)"
+
+        result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "TmuxAgentManager"
@@ -0,0 +1,206 @@
+"""
+Tests for agent message transports and batched delivery in
+AgentCoordinationProtocols.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from agent_coordination_protocols import AgentCoordinationProtocols, AgentMessage, MessageType, Priority
+from agent_message_transport import (
+    InProcessHub, InProcessTransport, RedisStreamsTransport, UnixSocketTransport,
+    default_hub, pack_frames, split_frames, unpack_frames
+)
+
+
+class LocalRedisStreams:
+    """In-memory stand-in for the redis.asyncio stream commands."""
+
+    def __init__(self):
+        self.streams = {}
+        self.sequence = 0
+        self.changed = asyncio.Condition()
+
+    async def xadd(self, name, fields, maxlen=None, approximate=True):
+        self.sequence += 1
+        entry_id = f"{int(time.time() * 1000)}-{self.sequence}".encode()
+        entries = self.streams.setdefault(name, [])
+        entries.append((entry_id, dict(fields)))
+        if maxlen is not None:
+            del entries[:-maxlen]
+        async with self.changed:
+            self.changed.notify_all()
+        return entry_id
+
+    def _after(self, name, last_id):
+        def key(entry_id):
+            ms, seq = (entry_id.decode() if isinstance(entry_id, bytes) else entry_id).split("-")
+            return int(ms), int(seq)
+        return [e for e in self.streams.get(name, []) if key(e[0]) > key(last_id)]
+
+    async def xrevrange(self, name, max="+", min="-", count=None):
+        return list(reversed(self.streams.get(name, [])))[:count]
+
+    async def xread(self, streams, count=None, block=None):
+        def collect():
+            result = []
+            for name, last_id in streams.items():
+                entries = self._after(name, last_id)[:count]
+                if entries:
+                    result.append((name.encode(), entries))
+            return result
+
+        result = collect()
+        if not result and block:
+            async with self.changed:
+                try:
+                    await asyncio.wait_for(self.changed.wait_for(lambda: bool(collect())), block / 1000)
+                except asyncio.TimeoutError:
+                    pass
+            result = collect()
+        return result
+
+
+def make_agents(transport_factory, *agent_ids):
+    return {agent_id: AgentCoordinationProtocols(agent_id, {"transport": transport_factory()})
+            for agent_id in agent_ids}
+
+
+async def close_all(agents):
+    for agent in agents.values():
+        await agent.close()
+
+
+class TestFraming:
+    """Length-prefixed frames."""
+
+    def test_round_trip_and_partial_frames(self):
+        payloads = [b"", b"a", b"x" * 70000]
+        data = pack_frames(payloads)
+        assert unpack_frames(data) == payloads
+
+        complete, consumed = split_frames(data[:-10])
+        assert complete == [b"", b"a"]
+        assert consumed == 9
+
+    def test_message_bytes_round_trip(self):
+        message = AgentMessage("m1", "a", "b", MessageType.TASK_REQUEST, Priority.HIGH,
+                               {"task_id": "t1"}, correlation_id="c1")
+        decoded = AgentMessage.from_bytes(message.to_bytes())
+        assert decoded == message
+
+
+class TestTransports:
+    """Delivery across each backend."""
+
+    async def exchange(self, agents):
+        sender, receiver = agents["sender"], agents["receiver"]
+        await receiver.receive_messages()  # binds the receiver before anything is sent
+
+        sender.known_agents = {"receiver": {}}
+        await sender.broadcast_message(MessageType.STATUS_UPDATE, {"state": "ready"})
+        for i in range(1000):
+            await sender.send_message("receiver", MessageType.HEARTBEAT, {"seq": i})
+        await sender.flush_messages()
+
+        received = 0
+        deadline = time.monotonic() + 5
+        while received < 1001 and time.monotonic() < deadline:
+            received += await receiver.receive_messages(timeout=0.5)
+
+        assert received == 1001
+        assert [m.content.get("seq") for m in list(receiver.message_queue)[1:]] == list(range(1000))
+        await receiver.process_messages()
+        assert receiver.known_agents["sender"]["status"] == {"state": "ready"}
+        # Sends are batched rather than one transport call per message
+        assert sender.transport.stats["batches_sent"] <= 10
+
+    @pytest.mark.asyncio
+    async def test_in_process(self):
+        hub = InProcessHub()
+        agents = make_agents(lambda: InProcessTransport(hub), "sender", "receiver")
+        await self.exchange(agents)
+        await close_all(agents)
+
+    @pytest.mark.asyncio
+    async def test_unix_socket(self, tmp_path):
+        agents = make_agents(lambda: UnixSocketTransport(str(tmp_path / "sockets")), "sender", "receiver")
+        await self.exchange(agents)
+        await close_all(agents)
+
+    @pytest.mark.asyncio
+    async def test_redis_streams(self):
+        redis = LocalRedisStreams()
+        agents = make_agents(lambda: RedisStreamsTransport(redis), "sender", "receiver")
+        await self.exchange(agents)
+        assert len(redis.streams["agent-hive:inbox:receiver"]) <= 10
+        await close_all(agents)
+
+    def test_default_hub_is_per_event_loop(self):
+        async def hub_of_new_transport():
+            transport = InProcessTransport()
+            assert transport.hub is default_hub()
+            return transport.hub
+
+        assert asyncio.run(hub_of_new_transport()) is not asyncio.run(hub_of_new_transport())
+
+
+class TestRedisStreamsReceive:
+    """Inbox position and payload limits of RedisStreamsTransport."""
+
+    @pytest.mark.asyncio
+    async def test_receive_caps_payloads_not_entries(self):
+        redis = LocalRedisStreams()
+        sender, receiver = RedisStreamsTransport(redis), RedisStreamsTransport(redis)
+        await receiver.start("receiver")
+        await sender.send_batch("receiver", [b"a", b"b", b"c"])
+        await sender.send_batch("receiver", [b"d", b"e"])
+
+        assert await receiver.receive(max_messages=2) == [b"a", b"b"]
+        assert await receiver.receive(max_messages=2) == [b"c", b"d"]
+        assert await receiver.receive(max_messages=2) == [b"e"]
+        assert await receiver.receive(max_messages=2) == []
+
+    @pytest.mark.asyncio
+    async def test_restart_does_not_replay_inbox(self):
+        redis = LocalRedisStreams()
+        sender = RedisStreamsTransport(redis)
+        await sender.send_batch("receiver", [b"old"])
+
+        receiver = RedisStreamsTransport(redis)
+        await receiver.start("receiver")
+        await sender.send_batch("receiver", [b"new"])
+        assert await receiver.receive() == [b"new"]
+
+        replay = RedisStreamsTransport(redis, start_id="0-0")
+        await replay.start("receiver")
+        assert await replay.receive() == [b"old", b"new"]
+
+
+@pytest.mark.performance
+class TestTransportThroughput:
+    """Throughput of batched delivery over a Unix socket."""
+
+    @pytest.mark.asyncio
+    async def test_unix_socket_throughput(self, tmp_path):
+        count = 20000
+        agents = make_agents(lambda: UnixSocketTransport(str(tmp_path / "sockets")), "sender", "receiver")
+        sender, receiver = agents["sender"], agents["receiver"]
+        await receiver.receive_messages()
+
+        start = time.perf_counter()
+        for i in range(count):
+            await sender.send_message("receiver", MessageType.HEARTBEAT, {"seq": i})
+        await sender.flush_messages()
+
+        received = 0
+        while received < count:
+            received += await receiver.receive_messages(timeout=1.0)
+        elapsed = time.perf_counter() - start
+
+        print(f"✅ Unix socket transport: {count / elapsed:,.0f} messages/s")
+        assert received == count
+        assert count / elapsed > 5000
+        await close_all(agents)
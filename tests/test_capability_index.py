@@ -0,0 +1,108 @@
+"""
+Tests for the capability index behind find_agents_with_capability.
+"""
+
+import random
+
+import pytest
+
+from agent_coordination_protocols import (
+    AgentCapability, AgentCoordinationProtocols, AgentMessage, CapabilityIndex, MessageType, Priority
+)
+
+
+def make_capability(capability_id, name="analysis", performance_score=0.8, availability=1.0):
+    return AgentCapability(
+        capability_id=capability_id,
+        name=name,
+        description=name,
+        performance_score=performance_score,
+        resource_requirements={},
+        availability=availability,
+        specializations=[]
+    )
+
+
+class TestCapabilityIndex:
+    """Ranking, filtering and replacement."""
+
+    def test_matches_full_scan(self):
+        rng = random.Random(3)
+        index = CapabilityIndex()
+        everything = []
+        for agent in range(300):
+            for slot in range(3):
+                capability = make_capability(
+                    f"c{agent}-{slot}", name=rng.choice(["analysis", "testing", "deploy"]),
+                    performance_score=round(rng.random(), 2), availability=round(rng.random(), 2)
+                )
+                index.add(f"agent-{agent}", capability)
+                everything.append((f"agent-{agent}", capability))
+
+        expected = [(a, c) for a, c in everything
+                    if c.name == "testing" and c.performance_score >= 0.6 and c.availability >= 0.4]
+        result = index.top_k("testing", min_performance=0.6, min_availability=0.4)
+
+        assert {(a, c.capability_id) for a, c in result} == {(a, c.capability_id) for a, c in expected}
+        scores = [c.performance_score for _, c in result]
+        assert scores == sorted(scores, reverse=True)
+        assert index.top_k("testing", k=5, min_performance=0.6, min_availability=0.4) == result[:5]
+
+        # A strict availability cutoff scans the availability ranking instead
+        expected = [(a, c) for a, c in everything
+                    if c.name == "testing" and c.performance_score >= 0.2 and c.availability >= 0.9]
+        result = index.top_k("testing", min_performance=0.2, min_availability=0.9)
+        assert {(a, c.capability_id) for a, c in result} == {(a, c.capability_id) for a, c in expected}
+        scores = [c.performance_score for _, c in result]
+        assert scores == sorted(scores, reverse=True)
+        assert index.top_k("testing", k=5, min_performance=0.2, min_availability=0.9) == result[:5]
+
+    def test_replace_and_remove(self):
+        index = CapabilityIndex()
+        index.add("a1", make_capability("c1", performance_score=0.5))
+        index.add("a2", make_capability("c2", performance_score=0.7))
+        index.add("a1", make_capability("c1", performance_score=0.9))
+
+        assert [agent for agent, _ in index.top_k("analysis")] == ["a1", "a2"]
+        assert len(index) == 2
+
+        index.remove_agent("a1")
+        assert [agent for agent, _ in index.top_k("analysis")] == ["a2"]
+        assert "a1" not in index.by_agent
+        assert index.top_k("missing") == []
+
+
+class TestCoordinationIndexing:
+    """Index maintenance inside AgentCoordinationProtocols."""
+
+    @pytest.mark.asyncio
+    async def test_announcements_update_index(self):
+        protocols = AgentCoordinationProtocols("me")
+        for score in (0.6, 0.95):
+            await protocols._handle_capability_announcement(AgentMessage(
+                "m", "peer", "me", MessageType.CAPABILITY_ANNOUNCEMENT, Priority.MEDIUM,
+                {"capability": make_capability("c1", performance_score=score).to_dict()}
+            ))
+
+        found = await protocols.find_agents_with_capability("analysis", limit=1)
+        assert found[0][0] == "peer"
+        assert found[0][1].performance_score == 0.95
+        assert len(protocols.capability_index) == 1
+
+    @pytest.mark.asyncio
+    async def test_assignment_rebuilds_index(self):
+        protocols = AgentCoordinationProtocols("me")
+        protocols.agent_capabilities = {"peer": {"c1": make_capability("c1")}}
+
+        assert protocols.agent_capabilities["peer"]["c1"].name == "analysis"
+        assert len(await protocols.find_agents_with_capability("analysis")) == 1
+
+    def test_agent_capabilities_is_read_only(self):
+        protocols = AgentCoordinationProtocols("me")
+        protocols.agent_capabilities = {"peer": {"c1": make_capability("c1")}}
+
+        with pytest.raises(TypeError):
+            protocols.agent_capabilities["other"] = {}
+        with pytest.raises(TypeError):
+            protocols.agent_capabilities["peer"]["c2"] = make_capability("c2")
+        assert len(protocols.capability_index) == 1
@@ -0,0 +1,56 @@
+"""
+Startup tests for cli.py.
+
+Subsystems are imported by the commands that use them, so importing the CLI
+or printing help must not load orchestration, the external API stack or the
+performance monitor. Measured with ``python -X importtime`` in a fresh
+interpreter.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("advanced_orchestration", "external_api", "performance_monitor", "sklearn")
+
+IMPORT_BUDGET_MS = 200
+
+
+def import_times(*args):
+    """Run the interpreter with -X importtime; return {module: cumulative_us}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_help_does_not_load_subsystems():
+    times = import_times("cli.py", "--help")
+    loaded = [name for name in times if name.split(".")[0] in HEAVY_MODULES]
+    assert loaded == []
+
+
+def test_constructing_cli_is_lazy():
+    times = import_times("-c", "import cli; cli.LeanVibeCLI()")
+    assert not [name for name in times if name.split(".")[0] in HEAVY_MODULES]
+
+
+@pytest.mark.performance
+def test_import_within_budget():
+    # Best of three to ride out a cold filesystem cache
+    cumulative_ms = min(import_times("-c", "import cli")["cli"] for _ in range(3)) / 1000
+    print(f"✅ cli import: {cumulative_ms:.1f} ms")
+    assert cumulative_ms < IMPORT_BUDGET_MS
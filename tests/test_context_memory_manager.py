@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent state capture and incremental snapshots in the context memory manager.
+"""
+
+import sys
+import time
+
+import pytest
+
+from scripts.context_memory_manager import ContextMemoryManager, StateCollector
+
+
+def python_collector(section, key, code, timeout=5.0, ttl=0.0):
+    return StateCollector(section, key, [sys.executable, "-c", code], timeout=timeout, ttl=ttl)
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return ContextMemoryManager()
+
+
+class TestStateCapture:
+    """Collectors run concurrently with timeouts and TTL caching."""
+
+    @pytest.mark.asyncio
+    async def test_capture_takes_slowest_collector_time(self, manager):
+        sleep = "import time; time.sleep(0.4); print('{}')"
+        manager.collectors = [
+            python_collector("project_status", f"k{i}", sleep.format(i)) for i in range(4)
+        ]
+
+        start = time.perf_counter()
+        state = await manager._capture_current_state()
+        elapsed = time.perf_counter() - start
+
+        assert state["project_status"] == {f"k{i}": str(i) for i in range(4)}
+        assert elapsed < 1.2
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_missing_command(self, manager):
+        manager.collectors = [
+            python_collector("project_status", "stuck", "import time; time.sleep(10)", timeout=0.3),
+            StateCollector("project_status", "missing", ["no-such-command-xyz"], timeout=1, ttl=0),
+            python_collector("project_status", "ok", "print('fine')"),
+        ]
+
+        start = time.perf_counter()
+        state = await manager._capture_current_state()
+
+        assert state["project_status"] == {"ok": "fine"}
+        assert time.perf_counter() - start < 2
+
+    @pytest.mark.asyncio
+    async def test_results_cached_within_ttl(self, manager):
+        collector = python_collector("project_status", "now", "import time; print(time.time())", ttl=60)
+        manager.collectors = [collector]
+
+        first = await manager._capture_current_state()
+        second = await manager._capture_current_state()
+        assert first["project_status"]["now"] == second["project_status"]["now"]
+
+
+class TestIncrementalSnapshots:
+    """Only changed sections are rewritten."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_sections_are_not_rewritten(self, manager):
+        state = {
+            "timestamp": "2025-01-01T00:00:00",
+            "agent_status": {"pm-agent": "active"},
+            "project_status": {"recent_commits": "abc first"},
+            "active_work": {"worktrees": []},
+            "critical_insights": []
+        }
+        await manager._save_memory_snapshot(state, "normal")
+        agent_file = manager.snapshot_sections_dir / "agent_status.json"
+        written_at = agent_file.stat().st_mtime_ns
+
+        state = dict(state, timestamp="2025-01-01T00:05:00",
+                     project_status={"recent_commits": "def second"})
+        await manager._save_memory_snapshot(state, "critical")
+
+        snapshot = manager.load_memory_snapshot()
+        assert snapshot["changed_sections"] == ["project_status"]
+        assert agent_file.stat().st_mtime_ns == written_at
+        assert snapshot["state"]["project_status"] == {"recent_commits": "def second"}
+        assert snapshot["state"]["agent_status"] == {"pm-agent": "active"}
+        assert snapshot["consolidation_level"] == "critical"
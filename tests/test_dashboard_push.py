@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the dashboard delta push hub.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from dashboard.push import DashboardPushHub
+
+
+def frames(websocket):
+    return [json.loads(call.args[0]) for call in websocket.send_text.call_args_list]
+
+
+class TestDashboardPushHub:
+    """Snapshot diffs, subscriptions and frame encoding."""
+
+    @pytest.mark.asyncio
+    async def test_only_changes_are_pushed(self):
+        hub = DashboardPushHub()
+        websocket = AsyncMock()
+        await hub.connect(websocket, ["agents"])
+
+        await hub.publish_snapshot("agents", {"pm": {"status": "active"}, "qa": {"status": "active"}})
+        assert not await hub.publish_snapshot("agents", {"pm": {"status": "active"}, "qa": {"status": "active"}})
+        await hub.publish_snapshot("agents", {"pm": {"status": "error"}})
+
+        sent = frames(websocket)
+        assert [f["type"] for f in sent] == ["agents_snapshot", "agents_delta", "agents_delta"]
+        assert sent[-1]["changed"] == {"pm": {"status": "error"}}
+        assert sent[-1]["removed"] == ["qa"]
+
+    @pytest.mark.asyncio
+    async def test_frame_encoded_once_for_all_clients(self):
+        hub = DashboardPushHub()
+        clients = [AsyncMock() for _ in range(50)]
+        for websocket in clients:
+            await hub.connect(websocket)
+        encoded_before = hub.frames_encoded
+
+        await hub.publish_snapshot("metrics", {"cpu_usage": 12.5})
+
+        assert hub.frames_encoded == encoded_before + 1
+        assert all(frames(ws)[-1]["changed"] == {"cpu_usage": 12.5} for ws in clients)
+
+    @pytest.mark.asyncio
+    async def test_subscriptions_filter_topics(self):
+        hub = DashboardPushHub()
+        websocket = AsyncMock()
+        await hub.connect(websocket, ["metrics"])
+        await hub.publish_snapshot("agents", {"pm": {"status": "active"}})
+        assert all(f["topic"] == "metrics" for f in frames(websocket))
+
+        await hub.handle_message(websocket, json.dumps({"action": "subscribe", "topics": ["agents"]}))
+        assert frames(websocket)[-1] == {
+            "type": "agents_snapshot", "topic": "agents", "items": {"pm": {"status": "active"}}
+        }
+
+        await hub.handle_message(websocket, json.dumps({"action": "unsubscribe", "topics": ["metrics"]}))
+        assert not hub.has_subscribers("metrics")
+
+    @pytest.mark.asyncio
+    async def test_stalled_client_is_dropped(self):
+        hub = DashboardPushHub(send_timeout=0.05)
+
+        async def stall(frame):
+            await asyncio.sleep(10)
+
+        stalled = Mock()
+        stalled.send_text = AsyncMock(side_effect=stall)
+        healthy = AsyncMock()
+        await hub.connect(healthy)
+        await hub.connect(stalled, [])
+        await hub.handle_message(stalled, json.dumps({"action": "subscribe", "topics": ["metrics"]}))
+
+        assert stalled not in hub.clients
+        await hub.publish("metrics", {"type": "metric_update"})
+        assert frames(healthy)[-1] == {"type": "metric_update"}
@@ -0,0 +1,157 @@
+"""
+Tests for the distributed tracing system.
+
+Covers the on-disk span log exporter with replay and head/tail sampling.
+All tests export to local files only.
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+import distributed_tracing_system
+from distributed_tracing_system import (
+    DistributedTracingSystem, FallbackSpanExporter, JaegerExporter, OTLPSpanExporter, SpanLogExporter,
+    WorkflowType, read_span_log, replay_span_log
+)
+
+
+class UnreachableExporter(SpanExporter):
+    """Network exporter whose collector cannot be reached."""
+
+    def export(self, spans):
+        raise ConnectionError("collector unreachable")
+
+    def shutdown(self):
+        pass
+
+
+class CollectingExporter(SpanExporter):
+    """Exporter keeping spans in memory."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+@pytest.fixture
+def tracing(tmp_path):
+    """Tracing system writing to a temporary span log."""
+    system = DistributedTracingSystem(exporters=["file"], span_log_dir=str(tmp_path / "traces"))
+    yield system
+    system.shutdown()
+
+
+class TestTracingSystem:
+    """End-to-end tracing with the local span log."""
+
+    def test_workflow_spans_are_logged_and_replayable(self, tracing, tmp_path):
+        tracing.start_workflow_trace("wf-1", WorkflowType.TASK_EXECUTION, ["agent-a"])
+        with tracing.trace_task_execution("task-1", "build", "agent-a", workflow_id="wf-1"):
+            pass
+        with pytest.raises(RuntimeError):
+            with tracing.trace_agent_operation("agent-a", "deploy", workflow_id="wf-1"):
+                raise RuntimeError("deploy failed")
+        tracing.complete_workflow_trace("wf-1", status="failed")
+
+        summary = tracing.get_agent_trace_summary("agent-a")
+        assert summary["total_spans"] == 2
+        assert summary["error_spans"] == 1
+
+        tracing.tracer_provider.force_flush()
+        records = list(read_span_log(str(tmp_path / "traces")))
+        assert {record["n"] for record in records} >= {"task_build", "workflow_task_execution"}
+        # Workflow spans share the workflow's trace
+        assert len({record["t"] for record in records}) == 1
+
+        collector = CollectingExporter()
+        assert replay_span_log(str(tmp_path / "traces"), collector) == len(records)
+        assert collector.spans[0].name == records[0]["n"]
+
+    def test_missing_network_exporter_falls_back_to_span_log(self, tmp_path):
+        if JaegerExporter is not None or OTLPSpanExporter is not None:
+            pytest.skip("network exporters are installed")
+
+        system = DistributedTracingSystem(exporters=["otlp", "jaeger"], span_log_dir=str(tmp_path / "fallback"))
+        try:
+            assert system.get_system_trace_overview()["tracing_enabled"]
+            assert len(system.exporters) == 1
+            assert isinstance(system.exporters[0], SpanLogExporter)
+        finally:
+            system.shutdown()
+
+    def test_failed_exports_fall_back_to_span_log(self, tmp_path):
+        fallback = FallbackSpanExporter(UnreachableExporter(), SpanLogExporter(str(tmp_path / "fallback")))
+        system = DistributedTracingSystem(exporters=[fallback])
+        try:
+            with system.trace_task_execution("t1", "build", "agent-a"):
+                pass
+            system.tracer_provider.force_flush()
+        finally:
+            system.shutdown()
+
+        assert fallback.fallback_count == 1
+        assert [record["n"] for record in read_span_log(str(tmp_path / "fallback"))] == ["task_build"]
+
+    def test_span_log_is_anchored_to_data_dir(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        system = DistributedTracingSystem(exporters=["file"], data_dir=str(tmp_path / "data"))
+        try:
+            assert system.span_log_dir == str(tmp_path / "data" / "traces")
+            assert DistributedTracingSystem(exporters=[]).span_log_dir.startswith(os.path.dirname(
+                os.path.abspath(distributed_tracing_system.__file__)))
+        finally:
+            system.shutdown()
+        assert not (tmp_path / "traces").exists()
+
+    def test_tail_sampling_keeps_failures(self, tmp_path):
+        collector = CollectingExporter()
+        system = DistributedTracingSystem(exporters=[collector], tail_sample_rate=0.0,
+                                          slow_threshold_ms=60000)
+        try:
+            for i in range(20):
+                with system.trace_task_execution(f"ok-{i}", "fast", "agent-a"):
+                    pass
+            with pytest.raises(ValueError):
+                with system.trace_task_execution("bad", "fast", "agent-a"):
+                    raise ValueError("boom")
+            system.tracer_provider.force_flush()
+        finally:
+            system.shutdown()
+
+        assert [span.attributes["task.id"] for span in collector.spans] == ["bad"]
+
+
+class TestSpanLogRotation:
+    """Rotation of the on-disk span log."""
+
+    def test_rotates_and_keeps_newest_files(self, tmp_path):
+        collector = CollectingExporter()
+        source = DistributedTracingSystem(exporters=[collector])
+        try:
+            for i in range(50):
+                with source.trace_task_execution(f"t{i}", "rotate", "agent-a"):
+                    pass
+            source.tracer_provider.force_flush()
+        finally:
+            source.shutdown()
+
+        exporter = SpanLogExporter(str(tmp_path / "rotating"), max_bytes=2048, max_files=3)
+        exporter.export(collector.spans)
+        exporter.shutdown()
+
+        files = sorted((tmp_path / "rotating").iterdir())
+        assert len(files) == 3
+        records = list(read_span_log(str(tmp_path / "rotating")))
+        assert 0 < len(records) < 50
+        assert records[-1]["a"]["task.id"] == "t49"
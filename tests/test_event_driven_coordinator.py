@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for alerts log following in the event-driven coordinator.
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from scripts.event_driven_coordinator import EventDrivenCoordinator, LogFollower
+
+
+def append(path, text):
+    with open(path, "a") as f:
+        f.write(text)
+
+
+def event_line(task_id):
+    return json.dumps({"type": "DEADLINE_WARNING", "task_id": task_id}) + "\n"
+
+
+class TestLogFollower:
+    """Offsets, partial lines, rotation and truncation."""
+
+    def test_partial_line_is_buffered(self, tmp_path):
+        path = tmp_path / "alerts.json"
+        path.write_text(event_line("t1") + '{"type": "DEADL')
+        follower = LogFollower(path)
+
+        assert [json.loads(line)["task_id"] for line in follower.read_lines()] == ["t1"]
+        append(path, 'INE_WARNING", "task_id": "t2"}\n')
+        assert [json.loads(line)["task_id"] for line in follower.read_lines()] == ["t2"]
+        assert follower.read_lines() == []
+        assert follower.offset == path.stat().st_size
+
+    def test_offset_survives_restart(self, tmp_path):
+        path = tmp_path / "alerts.json"
+        path.write_text(event_line("t1") + event_line("t2"))
+        follower = LogFollower(path)
+        assert len(follower.read_lines()) == 2
+        follower.commit()
+        follower.close()
+
+        append(path, event_line("t3"))
+        resumed = LogFollower(path)
+        assert [json.loads(line)["task_id"] for line in resumed.read_lines()] == ["t3"]
+
+    def test_rotation_reads_old_tail_then_new_file(self, tmp_path):
+        path = tmp_path / "alerts.json"
+        path.write_text(event_line("t1"))
+        follower = LogFollower(path)
+        assert len(follower.read_lines()) == 1
+
+        append(path, event_line("t2"))
+        os.rename(path, tmp_path / "alerts.json.1")
+        path.write_text(event_line("t3"))
+
+        assert [json.loads(line)["task_id"] for line in follower.read_lines()] == ["t2", "t3"]
+        assert follower.rotations == 1
+
+    def test_truncation_restarts_from_beginning(self, tmp_path):
+        path = tmp_path / "alerts.json"
+        path.write_text(event_line("t1") + event_line("t2"))
+        follower = LogFollower(path)
+        follower.read_lines()
+
+        with open(path, "w") as f:
+            f.write(event_line("t3"))
+        assert [json.loads(line)["task_id"] for line in follower.read_lines()] == ["t3"]
+
+
+class TestCoordinatorIngestion:
+    """End-to-end wakeup and dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_wake_processes_appended_events(self, tmp_path):
+        path = tmp_path / "alerts.json"
+        path.write_text(event_line("old"))
+        coordinator = EventDrivenCoordinator(str(path), fallback_poll_interval=30.0)
+        processed = []
+
+        async def record(event):
+            processed.append((event["task_id"], time.perf_counter()))
+        coordinator._process_event = record
+
+        runner = asyncio.create_task(coordinator.start())
+        for _ in range(100):
+            if processed:
+                break
+            await asyncio.sleep(0.01)
+
+        appended_at = time.perf_counter()
+        append(path, event_line("new"))
+        coordinator.wake()
+        for _ in range(100):
+            if len(processed) == 2:
+                break
+            await asyncio.sleep(0.01)
+
+        coordinator.stop()
+        await asyncio.wait_for(runner, 5)
+
+        assert [task_id for task_id, _ in processed] == ["old", "new"]
+        assert processed[1][1] - appended_at < 0.5
+        assert json.loads((tmp_path / "alerts.json.offset").read_text())["offset"] == path.stat().st_size
+
+    @pytest.mark.asyncio
+    async def test_bad_events_do_not_drop_the_batch(self, tmp_path):
+        path = tmp_path / "alerts.json"
+        path.write_text(event_line("t1") + "[1, 2]\n" + '"text"\n' + event_line("boom") + event_line("t2"))
+        coordinator = EventDrivenCoordinator(str(path))
+        processed = []
+
+        async def record(event):
+            if event["task_id"] == "boom":
+                raise RuntimeError("handler failed")
+            processed.append(event["task_id"])
+        coordinator._process_event = record
+
+        await coordinator._check_for_new_events()
+
+        assert processed == ["t1", "t2"]
+        assert coordinator.stats["errors_encountered"] == 1
+        assert json.loads((tmp_path / "alerts.json.offset").read_text())["offset"] == path.stat().st_size
+        coordinator.follower.close()
@@ -6,6 +6,9 @@ Comprehensive test suite for the observability system components.
 """
 
 import pytest
+import asyncio
+import threading
+import time
 from datetime import datetime
 from unittest.mock import Mock, patch, AsyncMock
 
@@ -195,15 +198,67 @@ class TestEventStream:
         # Mock WebSocket clients
         mock_client1 = AsyncMock()
         mock_client2 = AsyncMock()
-        stream.websocket_clients = {mock_client1, mock_client2}
+        stream.add_client(mock_client1)
+        stream.add_client(mock_client2)
 
         event_data = {"type": "test", "data": "test_data"}
 
         await stream.broadcast_event(event_data)
+        assert await stream.drain()
 
         # Verify both clients received the event
         mock_client1.send.assert_called_once()
         mock_client2.send.assert_called_once()
+        stream.remove_client(mock_client1)
+        stream.remove_client(mock_client2)
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_broadcast(self):
+        """Test that a stalled client only drops its own oldest events."""
+        stream = EventStream(client_queue_size=5)
+        release = asyncio.Event()
+
+        async def stalled_send(payload):
+            await release.wait()
+
+        slow_client = Mock()
+        slow_client.send = AsyncMock(side_effect=stalled_send)
+        fast_client = AsyncMock()
+        stream.add_client(slow_client)
+        stream.add_client(fast_client)
+
+        for i in range(20):
+            await asyncio.wait_for(stream.broadcast_event({"index": i}), timeout=0.1)
+            await asyncio.sleep(0)
+
+        assert fast_client.send.call_count == 20
+        stats = stream.get_stats()
+        assert stats["queued_events"] == 5
+        assert stats["dropped_events"] > 0
+
+        release.set()
+        assert await stream.drain()
+        last_payload = slow_client.send.call_args_list[-1].args[0]
+        assert '"index": 19' in last_payload
+        stream.remove_client(slow_client)
+        stream.remove_client(fast_client)
+
+    @pytest.mark.asyncio
+    async def test_coalesced_events_replace_unsent(self):
+        """Test that events with the same coalesce key replace unsent ones."""
+        stream = EventStream()
+        client = AsyncMock()
+        subscription = stream.add_client(client)
+
+        for value in range(10):
+            await stream.broadcast_event({"cpu": value}, coalesce_key=("performance", "agent_001"))
+
+        assert len(subscription.pending) == 1
+        assert await stream.drain()
+        client.send.assert_called_once()
+        assert '"cpu": 9' in client.send.call_args.args[0]
+        stream.remove_client(client)
+        assert subscription.task.cancelled() or subscription.task.done() or subscription.closed
 
 
 class TestHookManager:
@@ -321,6 +376,122 @@ class TestHookManager:
         assert event.priority == EventPriority.HIGH
         assert len(manager.event_history) == 1
 
+    @pytest.mark.asyncio
+    async def test_hooks_run_concurrently_with_timeouts(self):
+        """Test that slow hooks run concurrently and are bounded by their timeout."""
+        manager = HookManager(default_hook_timeout=1.0)
+        manager.event_stream = AsyncMock()
+        manager.event_stream.broadcast_event = AsyncMock()
+
+        async def slow_notifier(event):
+            await asyncio.sleep(0.2)
+
+        async def stuck_notifier(event):
+            await asyncio.sleep(10)
+
+        def blocking_hook(event):
+            time.sleep(0.2)
+
+        for _ in range(3):
+            manager.register_hook(HookType.NOTIFICATION, slow_notifier, name="slow_notifier")
+        manager.register_hook(HookType.NOTIFICATION, blocking_hook)
+        manager.register_hook(HookType.NOTIFICATION, stuck_notifier, timeout=0.1)
+
+        event = HookEvent(
+            event_id="test_concurrent",
+            hook_type=HookType.NOTIFICATION,
+            agent_id="agent_001",
+            session_id="session_001",
+            timestamp=datetime.now(),
+            priority=EventPriority.MEDIUM,
+            context={}
+        )
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await manager.execute_hooks(event)
+        elapsed = loop.time() - start
+
+        # Serial execution would take at least 0.9s
+        assert elapsed < 0.6
+        stats = manager.get_hook_stats()
+        stuck = next(v for k, v in stats.items() if "stuck_notifier" in k)
+        assert stuck["timeouts"] == 1
+        slow = next(v for k, v in stats.items() if "slow_notifier" in k)
+        assert slow["calls"] == 3
+        assert slow["p95_ms"] >= 100
+        manager._hook_executor.shutdown(wait=False)
+
+    @pytest.mark.asyncio
+    async def test_hook_series_are_per_registration(self):
+        """Test that closures sharing a qualname get separate latency series."""
+        manager = HookManager()
+        manager.event_stream = AsyncMock()
+        manager.event_stream.broadcast_event = AsyncMock()
+
+        def make_hook():
+            async def hook(event):
+                pass
+            return hook
+
+        manager.register_hook(HookType.STOP, make_hook())
+        manager.register_hook(HookType.STOP, make_hook())
+        manager.register_hook(HookType.STOP, lambda event: None, name="audit")
+        await manager.create_and_process_event(HookType.STOP, "agent_001", "session_001", {})
+
+        stats = manager.get_hook_stats()
+        assert len(stats) == 3
+        assert "stop:audit" in stats
+        assert all(entry["calls"] == 1 for entry in stats.values())
+        manager._hook_executor.shutdown(wait=False)
+
+    @pytest.mark.asyncio
+    async def test_stuck_sync_hook_holds_one_thread(self):
+        """Test that a timed-out sync hook is skipped until its call finishes."""
+        manager = HookManager(hook_thread_workers=2)
+        manager.event_stream = AsyncMock()
+        manager.event_stream.broadcast_event = AsyncMock()
+        release = threading.Event()
+        calls = []
+
+        def stuck_hook(event):
+            calls.append(event.event_id)
+            release.wait(5)
+
+        manager.register_hook(HookType.ERROR, stuck_hook, timeout=0, name="stuck")
+        for _ in range(3):
+            await manager.create_and_process_event(HookType.ERROR, "agent_001", "session_001", {})
+
+        stats = manager.get_hook_stats()["error:stuck"]
+        assert len(calls) == 1
+        assert stats["timeouts"] == 1 and stats["skipped"] == 2
+
+        release.set()
+        manager._hook_executor.shutdown(wait=True)
+        assert not manager.hook_registrations[HookType.ERROR][0].stalled
+
+    @pytest.mark.asyncio
+    async def test_hooks_admitted_in_priority_order(self):
+        """Test that critical hooks start first when concurrency is limited."""
+        manager = HookManager(max_concurrent_hooks=1)
+        manager.event_stream = AsyncMock()
+        manager.event_stream.broadcast_event = AsyncMock()
+        order = []
+
+        def make_hook(label):
+            async def hook(event):
+                order.append(label)
+            return hook
+
+        manager.register_hook(HookType.ERROR, make_hook("low"), priority=EventPriority.LOW)
+        manager.register_hook(HookType.ERROR, make_hook("medium"))
+        manager.register_hook(HookType.ERROR, make_hook("critical"), priority=EventPriority.CRITICAL)
+
+        await manager.create_and_process_event(HookType.ERROR, "agent_001", "session_001", {})
+
+        assert order == ["critical", "medium", "low"]
+        assert all(stats["errors"] == 0 for stats in manager.get_hook_stats().values())
+
     def test_system_metrics(self):
         """Test system metrics retrieval."""
         manager = HookManager()
@@ -338,7 +509,7 @@ class TestHookManager:
         manager = HookManager()
         manager.max_history_size = 3
 
-        # Add events beyond max size using the actual method
+        # Add events beyond max size
         for i in range(5):
             event = HookEvent(
                 event_id=f"test_{i}",
@@ -350,9 +521,6 @@ class TestHookManager:
                 context={"index": i}
             )
             manager.event_history.append(event)
-            # Apply the same logic as execute_hooks
-            while len(manager.event_history) > manager.max_history_size:
-                manager.event_history.pop(0)
 
         # Should keep only the last 3 events
         assert len(manager.event_history) == 3
@@ -0,0 +1,147 @@
+"""
+Tests for the shared metrics registry and Prometheus exposition.
+"""
+
+import gc
+import time
+
+import pytest
+
+from metrics_registry import CHUNK_SAMPLES, Metric, MetricFamily, MetricsRegistry, sanitize_name
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestMetrics:
+    """Counters, gauges and histograms with labels."""
+
+    def test_labelled_counter_and_gauge(self, registry):
+        requests = registry.counter("http_requests_total", "Requests", ["method", "status"])
+        requests.labels("GET", 200).inc()
+        requests.labels(method="GET", status="200").inc(2)
+        requests.labels("POST", 500).inc()
+        inflight = registry.gauge("inflight", "In flight")
+        inflight.inc(3)
+        inflight.dec()
+
+        lines = registry.render().splitlines()
+        assert lines[:2] == ["# HELP http_requests_total Requests", "# TYPE http_requests_total counter"]
+        assert 'http_requests_total{method="GET",status="200"} 3.0' in lines
+        assert 'http_requests_total{method="POST",status="500"} 1.0' in lines
+        assert "inflight 2.0" in lines
+
+        with pytest.raises(ValueError):
+            requests.inc()
+        with pytest.raises(ValueError):
+            requests.labels("GET")
+        with pytest.raises(ValueError):
+            requests.labels("GET", 200).inc(-1)
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        latency = registry.histogram("latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            latency.labels("/a").observe(value)
+
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1.0' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1.0"} 3.0' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4.0' in lines
+        assert 'latency_seconds_count{route="/a"} 4.0' in lines
+        assert 'latency_seconds_sum{route="/a"} 4.05' in lines
+
+    def test_get_or_create_shares_families(self, registry):
+        first = registry.counter("jobs", "Jobs", ["queue"])
+        assert registry.counter("jobs_total", "Jobs", ["queue"]) is first
+        with pytest.raises(ValueError, match="already registered as a counter"):
+            registry.gauge("jobs", "Jobs")
+        with pytest.raises(ValueError, match="labels"):
+            registry.counter("jobs", "Jobs", ["other"])
+
+
+class TestExposition:
+    """Text format details, collectors and streaming."""
+
+    def test_escaping_and_openmetrics(self, registry):
+        registry.counter("events", 'Events with "quotes" and \\ backslash\nnewline', ["path"]) \
+            .labels('C:\\dir\n"x"').inc()
+
+        text = registry.render()
+        assert '# HELP events_total Events with "quotes" and \\\\ backslash\\nnewline' in text
+        assert 'events_total{path="C:\\\\dir\\n\\"x\\""} 1.0' in text
+
+        openmetrics = registry.render(openmetrics=True)
+        assert "# TYPE events counter" in openmetrics
+        assert openmetrics.endswith("# EOF\n")
+
+    def test_collectors_merge_and_are_weak(self, registry):
+        class Component:
+            def __init__(self, name):
+                self.name = name
+
+            def collect(self):
+                family = MetricFamily("component_up", "gauge", "Component up")
+                family.add_sample(1, {"name": self.name})
+                return [family]
+
+        first, second = Component("a"), Component("b")
+        registry.register_collector(first.collect)
+        registry.register_collector(second.collect)
+
+        text = registry.render()
+        assert text.count("# TYPE component_up gauge") == 1
+        assert 'component_up{name="a"} 1.0' in text and 'component_up{name="b"} 1.0' in text
+
+        del second
+        gc.collect()
+        assert 'name="b"' not in registry.render()
+        registry.unregister_collector(first.collect)
+        assert registry.render() == ""
+
+    def test_merged_collectors_dedupe_series(self, registry):
+        def collector(value, names):
+            def collect():
+                family = MetricFamily("breaker_state", "gauge", "Breaker state")
+                for name in names:
+                    family.add_sample(value, {"name": name})
+                return [family]
+            return collect
+
+        first, second = collector(1, ["a", "b"]), collector(2, ["b", "c"])
+        registry.register_collector(first)
+        registry.register_collector(second)
+
+        lines = registry.render().splitlines()
+        assert [line for line in lines if line.startswith("breaker_state{")] == [
+            'breaker_state{name="a"} 1.0', 'breaker_state{name="b"} 1.0', 'breaker_state{name="c"} 2.0'
+        ]
+
+    def test_metric_base_is_abstract(self):
+        with pytest.raises(TypeError):
+            Metric("plain", "Plain")
+
+    def test_sanitize_name(self):
+        assert sanitize_name("api.response-time") == "api_response_time"
+        assert sanitize_name("5xx") == "_5xx"
+
+    @pytest.mark.performance
+    def test_busy_gateway_scrape_streams_quickly(self, registry):
+        requests = registry.counter("api_requests", "Requests", ["route", "method", "status"])
+        latency = registry.histogram("api_request_duration_seconds", "Latency", ["route", "method"])
+        for route in range(200):
+            for method in ("GET", "POST"):
+                latency.labels(f"/r{route}", method).observe(0.01)
+                for status in (200, 404, 500):
+                    requests.labels(f"/r{route}", method, status).inc()
+
+        start = time.perf_counter()
+        chunks = list(registry.iter_exposition())
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"✅ scrape of {sum(c.count(chr(10)) for c in chunks)} lines: {elapsed_ms:.1f} ms")
+
+        assert len(chunks) > 1
+        assert max(chunk.count("\n") for chunk in chunks) <= CHUNK_SAMPLES
+        assert "".join(chunks).count("api_request_duration_seconds_bucket") == 400 * 14
+        assert elapsed_ms < 100
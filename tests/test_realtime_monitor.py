@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the real-time agent monitor's git collector and resource sampler.
+"""
+
+import subprocess
+import time
+
+import pytest
+
+from dashboard.realtime_monitor import GitActivityCollector, RealtimeAgentMonitor, ResourceSampler
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def commit(repo, name, content):
+    (repo / name).write_text(content)
+    git(repo, "add", name)
+    git(repo, "-c", "user.name=Agent", "-c", "user.email=agent@example.com",
+        "commit", "-q", "-m", f"Update {name}")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "agent-repo"
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    commit(path, "a.txt", "one\n")
+    commit(path, "a.txt", "one\ntwo\nthree\n")
+    return path
+
+
+class TestGitActivityCollector:
+    """Fingerprint-gated git queries."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_repo_is_not_requeried(self, repo):
+        collector = GitActivityCollector()
+
+        changed, activity = await collector.collect(repo)
+        assert changed
+        assert activity["recent_commits"] == 2
+        assert activity["lines_changed"] == 2
+        assert activity["branch"] == "main"
+
+        invocations = collector.git_invocations
+        for _ in range(5):
+            changed, cached = await collector.collect(repo)
+            assert not changed
+            assert cached == activity
+        assert collector.git_invocations == invocations
+
+        time.sleep(0.01)
+        commit(repo, "b.txt", "new\n")
+        changed, activity = await collector.collect(repo)
+        assert changed
+        assert activity["recent_commits"] == 3
+
+    @pytest.mark.asyncio
+    async def test_linked_worktree_is_fingerprinted(self, repo, tmp_path):
+        worktree = tmp_path / "agent-worktree"
+        git(repo, "worktree", "add", "-q", "-b", "feature", str(worktree))
+        collector = GitActivityCollector()
+
+        changed, activity = await collector.collect(worktree)
+        assert changed
+        assert activity["branch"] == "feature"
+
+        before = collector.fingerprint(worktree)
+        time.sleep(0.01)
+        commit(worktree, "c.txt", "feature\n")
+        assert collector.fingerprint(worktree) != before
+        assert collector.fingerprint(repo) is not None
+
+    @pytest.mark.asyncio
+    async def test_non_repository_is_skipped(self, tmp_path):
+        collector = GitActivityCollector()
+        assert await collector.collect(tmp_path) == (False, None)
+        assert collector.git_invocations == 0
+
+
+class TestResourceSampling:
+    """Background psutil sampling."""
+
+    def test_sampler_runs_off_the_event_loop(self):
+        sampler = ResourceSampler(interval=0.05)
+        sampler.start()
+        try:
+            deadline = time.time() + 2
+            while sampler.latest()["memory_percent"] == 0.0 and time.time() < deadline:
+                time.sleep(0.01)
+            assert sampler.latest()["memory_percent"] > 0
+        finally:
+            sampler.stop()
+
+    @pytest.mark.asyncio
+    async def test_monitor_reports_git_activity_once(self, repo):
+        monitor = RealtimeAgentMonitor()
+        assert await monitor._get_git_activity("agent", repo) is not None
+        assert await monitor._get_git_activity("agent", repo) is None
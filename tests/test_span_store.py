@@ -0,0 +1,69 @@
+"""
+Tests for the bounded, time-partitioned span store.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from distributed_tracing_system import SpanStore, SpanType
+
+
+class TestSpanStore:
+    """Time-partitioned span store."""
+
+    def test_agent_summary_uses_counters(self):
+        store = SpanStore()
+        now = datetime.now()
+        store.add("s1", {"span_type": SpanType.TASK.value, "workflow_id": "w1", "start_time": now}, ("a1",))
+        store.add("s2", {"span_type": SpanType.COMMUNICATION.value, "workflow_id": None,
+                         "start_time": now}, ("a1", "a2"))
+        store.finish("s1", now + timedelta(seconds=2), error=True)
+
+        summary = store.agent_summary("a1", now - timedelta(minutes=5))
+        assert summary["total_spans"] == 2
+        assert summary["error_spans"] == 1
+        assert summary["task_spans"] == 1
+        assert summary["communication_spans"] == 1
+        assert summary["avg_span_duration"] == pytest.approx(2.0)
+        assert summary["workflow_ids"] == {"w1"}
+        assert store.agent_summary("a2", now - timedelta(minutes=5))["total_spans"] == 1
+
+    def test_expiry_drops_whole_buckets(self):
+        store = SpanStore()
+        old = datetime.now() - timedelta(hours=3)
+        for i in range(100):
+            store.add(f"old{i}", {"span_type": SpanType.TASK.value, "workflow_id": "w",
+                                  "start_time": old}, ("a1",))
+        store.add("new", {"span_type": SpanType.TASK.value, "workflow_id": "w",
+                          "start_time": datetime.now()}, ("a1",))
+
+        assert store.expire_before(datetime.now() - timedelta(hours=1)) == 100
+        assert len(store) == 1
+        assert list(store.agent_spans["a1"]) == ["new"]
+        assert list(store.workflow_spans["w"]) == ["new"]
+
+    def test_memory_is_capped(self):
+        store = SpanStore(max_spans=50, max_spans_per_agent=20)
+        start = datetime.now() - timedelta(hours=2)
+        for i in range(500):
+            store.add(f"s{i}", {"span_type": SpanType.TASK.value, "workflow_id": None,
+                                "start_time": start + timedelta(seconds=i * 10)}, ("a1",))
+
+        assert len(store) <= 50
+        assert len(store.agent_spans["a1"]) <= 20
+
+    def test_cap_holds_within_a_single_bucket(self):
+        store = SpanStore(max_spans=50)
+        now = datetime.now()
+        for i in range(200):
+            store.add(f"s{i}", {"span_type": SpanType.TASK.value, "workflow_id": "w",
+                                "start_time": now}, ("a1",))
+
+        assert len(store) == 50
+        assert "s149" not in store and "s150" in store
+        assert list(store.agent_spans["a1"])[0] == "s150"
+        assert list(store.workflow_spans["w"])[0] == "s150"
+        assert store.agent_summary("a1", now - timedelta(minutes=5))["total_spans"] == 200
@@ -0,0 +1,292 @@
+"""
+Tests for the unified performance monitor's rolling aggregates.
+
+These cover the per-minute aggregation that backs get_performance_summary,
+get_operation_stats, print_dashboard and export_performance_data, and the
+performance_tracked instrumentation decorator.
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import time
+
+import pytest
+
+from metrics_registry import MetricsRegistry
+from performance_monitor import (
+    ComponentType, OperationAggregate, PerformanceLevel, PerformanceMetrics,
+    QuantileSketch, RollingAggregator, TrackingRegistry,
+    UnifiedPerformanceMonitor, performance_tracked, tracking_registry, stack_sampler
+)
+
+
+def make_metric(operation_name="op", component_type=ComponentType.SYSTEM, start_time=0.0,
+                duration=10.0, success=True, level=PerformanceLevel.GOOD):
+    """Create a finished metric."""
+    return PerformanceMetrics(
+        operation_name=operation_name,
+        component_type=component_type,
+        start_time=start_time,
+        end_time=start_time + duration / 1000,
+        duration=duration,
+        success=success,
+        error_message=None if success else "failed",
+        performance_level=level
+    )
+
+
+@pytest.fixture
+def monitor(tmp_path):
+    """Create a monitor without persistent storage."""
+    return UnifiedPerformanceMonitor({
+        "db_path": str(tmp_path / "metrics.db"),
+        "enable_persistent_storage": False,
+        "auto_optimization": False
+    })
+
+
+class TestQuantileSketch:
+    """Streaming quantile sketch accuracy and merging."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(3, 1) for _ in range(5000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        exact_p95 = statistics.quantiles(values, n=20)[18]
+        assert sketch.quantile(0.95) == pytest.approx(exact_p95, rel=0.03)
+
+    def test_merge_matches_single_sketch(self):
+        combined, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for value in range(1, 1001):
+            combined.add(value)
+            (left if value % 2 else right).add(value)
+
+        left.merge(right)
+        assert left.count == combined.count
+        assert left.quantile(0.5) == combined.quantile(0.5)
+
+
+class TestRollingAggregator:
+    """Minute buckets, hourly compaction and windowed merges."""
+
+    def test_window_only_includes_recent_buckets(self):
+        aggregator = RollingAggregator()
+        now = 1_000_000.0
+        aggregator.record(make_metric(start_time=now - 7200))
+        aggregator.record(make_metric(start_time=now - 30))
+        aggregator.record(make_metric(start_time=now - 10, success=False))
+
+        window = aggregator.window(600, now=now)
+        aggregate = window[("op", ComponentType.SYSTEM)]
+        assert aggregate.count == 2
+        assert aggregate.error_count == 1
+
+    def test_old_minutes_compact_into_hours(self):
+        aggregator = RollingAggregator(retention_hours=24, minute_retention=60)
+        start = 3600.0 * 1000
+        for minute in range(180):
+            aggregator.record(make_metric(start_time=start + minute * 60))
+
+        assert len(aggregator._minutes) <= 60
+        window = aggregator.window(4 * 3600, now=start + 180 * 60)
+        assert window[("op", ComponentType.SYSTEM)].count == 180
+
+    def test_expired_hours_are_dropped(self):
+        aggregator = RollingAggregator(retention_hours=2, minute_retention=60)
+        start = 3600.0 * 1000
+        for minute in range(0, 6 * 60, 10):
+            aggregator.record(make_metric(start_time=start + minute * 60))
+
+        assert len(aggregator._hours) <= 2
+
+
+class TestSummaries:
+    """Summaries derived from rolling aggregates."""
+
+    @pytest.mark.asyncio
+    async def test_summary_counts_and_durations(self, monitor):
+        for _ in range(30):
+            async with monitor.track_operation("summary_op", ComponentType.DATABASE):
+                pass
+        with pytest.raises(ValueError):
+            async with monitor.track_operation("summary_op", ComponentType.DATABASE):
+                raise ValueError("bad query")
+
+        summary = monitor.get_performance_summary(ComponentType.DATABASE, hours=1)
+        assert summary["metrics"]["total_operations"] == 31
+        assert summary["metrics"]["failed_operations"] == 1
+        assert summary["metrics"]["min_duration_ms"] <= summary["metrics"]["p95_duration_ms"]
+        assert summary["metrics"]["p95_duration_ms"] <= summary["metrics"]["max_duration_ms"]
+
+        overall = monitor.get_performance_summary(hours=1)
+        assert overall["component_breakdown"]["database"]["count"] == 30
+
+        stats = monitor.get_operation_stats("summary_op", hours=1)
+        assert stats["count"] == 31
+        assert stats["component_type"] == "database"
+        assert stats["recent_errors"][0]["error"] == "bad query"
+
+    @pytest.mark.asyncio
+    async def test_sampled_calls_still_counted(self, monitor):
+        monitor.set_sampling_rate("hot_op", 0.01)
+        for _ in range(500):
+            async with monitor.track_operation("hot_op", ComponentType.SYSTEM):
+                pass
+
+        assert len(monitor.metrics) < 500
+        assert monitor.get_operation_stats("hot_op", hours=1)["count"] == 500
+
+    def test_no_data_and_export(self, monitor):
+        assert monitor.get_performance_summary(hours=1)["status"] == "no_data"
+
+        exported = json.loads(monitor.export_performance_data("json", hours=1))
+        assert exported["summary"]["status"] == "no_data"
+        assert set(exported["component_summaries"]) == {c.value for c in ComponentType}
+
+    def test_operation_labels_are_bounded(self, tmp_path):
+        registry = MetricsRegistry()
+        monitor = UnifiedPerformanceMonitor({
+            "db_path": str(tmp_path / "metrics.db"),
+            "enable_persistent_storage": False,
+            "max_metric_operations": 2
+        }, metrics_registry=registry)
+        for name in ("op_a", "op_b", "op_c", "op_d", "jwt_authentication", "op_a"):
+            monitor._record_metric(make_metric(name))
+        monitor._record_metric(make_metric("op_e", success=False))
+
+        # Series are updated off the hot path; a scrape brings them up to date
+        exposition = registry.render()
+        assert 'operation="other"' in exposition
+        operations = registry.get("performance_operations")
+        labelled = {key[1] for key in operations._children}
+        assert labelled == {"op_a", "op_b", "other", "jwt_authentication"}
+        assert operations.labels("system", "other", "success").get() == 2
+        assert operations.labels("system", "other", "error").get() == 1
+        assert operations.labels("system", "op_a", "success").get() == 2
+
+    def test_aggregate_health_matches_metric_health(self, monitor):
+        metrics = [make_metric(level=level) for level in PerformanceLevel]
+        aggregate = OperationAggregate()
+        for metric in metrics:
+            aggregate.add(metric)
+
+        assert aggregate.health_score() == pytest.approx(monitor._calculate_component_health(metrics))
+
+
+class TestPerformanceTracked:
+    """Decorator support for every callable kind plus runtime toggles."""
+
+    def test_sync_function_records_component_and_metadata(self, monitor):
+        @performance_tracked("sync_op", {"source": "test"}, ComponentType.DATABASE, monitor=monitor)
+        def work(x):
+            return x * 2
+
+        assert work(21) == 42
+        assert work.__name__ == "work"
+        metric = monitor.metrics[-1]
+        assert metric.component_type == ComponentType.DATABASE
+        assert metric.metadata == {"source": "test"}
+
+    def test_sync_failure_runs_threshold_check_without_loop(self, monitor):
+        @performance_tracked("rate_limiting", component_type=ComponentType.RATE_LIMITING, monitor=monitor)
+        def slow():
+            time.sleep(0.03)
+            raise RuntimeError("limit store down")
+
+        with pytest.raises(RuntimeError):
+            slow()
+        assert not monitor.metrics[-1].success
+        assert any("rate_limiting" in alert for alert in monitor.alerts)
+
+    @pytest.mark.asyncio
+    async def test_async_function(self, monitor):
+        @performance_tracked("async_op", monitor=monitor)
+        async def work():
+            return "done"
+
+        assert await work() == "done"
+        assert monitor.get_operation_stats("async_op", hours=1)["count"] == 1
+
+    def test_generator_times_whole_iteration(self, monitor):
+        @performance_tracked("gen_op", monitor=monitor)
+        def numbers():
+            for i in range(3):
+                time.sleep(0.005)
+                yield i
+
+        assert list(numbers()) == [0, 1, 2]
+        assert monitor.metrics[-1].duration >= 15
+
+    @pytest.mark.asyncio
+    async def test_async_generator(self, monitor):
+        @performance_tracked("agen_op", monitor=monitor)
+        async def numbers():
+            for i in range(3):
+                yield i
+
+        assert [i async for i in numbers()] == [0, 1, 2]
+        assert monitor.metrics[-1].operation_name == "agen_op"
+
+    def test_registry_disables_tracking(self, monitor):
+        @performance_tracked("toggled_op", monitor=monitor)
+        def work():
+            return 1
+
+        tracking_registry.disable("toggled_op")
+        try:
+            work()
+            assert len(monitor.metrics) == 0
+        finally:
+            tracking_registry.enable("toggled_op")
+        work()
+        assert len(monitor.metrics) == 1
+
+    def test_slow_calls_are_stack_sampled(self, monitor):
+        @performance_tracked("profiled_op", monitor=monitor)
+        def slow_leaf():
+            time.sleep(0.1)
+
+        tracking_registry.enable_profiling("profiled_op", threshold_ms=10)
+        try:
+            slow_leaf()
+        finally:
+            tracking_registry.disable_profiling("profiled_op")
+
+        samples = stack_sampler.get_samples("profiled_op")
+        assert samples
+        assert any("slow_leaf" in stack for stack, _ in samples)
+        stack_sampler.clear("profiled_op")
+
+    @pytest.mark.asyncio
+    async def test_coroutines_are_sampled_per_task(self, monitor):
+        @performance_tracked("profiled_async_op", monitor=monitor)
+        async def slow_coroutine():
+            await asyncio.sleep(0.15)
+
+        async def busy_neighbour():
+            await asyncio.sleep(0.02)
+            time.sleep(0.1)
+
+        tracking_registry.enable_profiling("profiled_async_op", threshold_ms=10)
+        try:
+            await asyncio.gather(slow_coroutine(), busy_neighbour())
+        finally:
+            tracking_registry.disable_profiling("profiled_async_op")
+
+        samples = stack_sampler.get_samples("profiled_async_op")
+        assert any("slow_coroutine" in stack for stack, _ in samples)
+        # The neighbour blocks the loop thread but runs in another task
+        assert not any("busy_neighbour" in stack for stack, _ in samples)
+        stack_sampler.clear("profiled_async_op")
+
+    def test_registry_snapshot(self):
+        registry = TrackingRegistry()
+        registry.disable("a")
+        registry.enable_profiling("b", 5)
+        assert registry.snapshot()["disabled_operations"] == ["a"]
+        assert registry.snapshot()["profiled_operations"] == {"b": 5}